@@ -26,6 +26,7 @@ from ecs_composex.common.troposphere_tools import (
     add_resource,
     add_update_mapping,
 )
+from ecs_composex.compose.x_resources.helpers import lookup_resources_concurrently
 
 
 def define_acm_certs(new_resources: list[Certificate], acm_stack: ComposeXStack):
@@ -58,13 +59,15 @@ def resolve_lookup(
     """
     if not keyisset(module.mapping_key, settings.mappings):
         settings.mappings[module.mapping_key] = {}
+    lookup_resources_concurrently(
+        settings,
+        lookup_resources,
+        ACM_ARN_RE,
+        get_cert_config,
+        CfnAcmCertificate.resource_type,
+        "acm:certificate",
+    )
     for resource in lookup_resources:
-        resource.lookup_resource(
-            ACM_ARN_RE,
-            get_cert_config,
-            CfnAcmCertificate.resource_type,
-            "acm:certificate",
-        )
         resource.init_outputs()
         resource.generate_cfn_mappings_from_lookup_properties()
         resource.generate_outputs()
@@ -37,6 +37,7 @@ from ecs_composex.common.troposphere_tools import (
     build_template,
 )
 from ecs_composex.compose.x_resources.api_x_resources import ApiXResource
+from ecs_composex.compose.x_resources.helpers import lookup_resources_concurrently
 from ecs_composex.resources_import import import_record_properties
 
 
@@ -200,14 +201,16 @@ class XStack(ComposeXStack):
         if module.lookup_resources:
             if not keyisset(module.mapping_key, settings.mappings):
                 settings.mappings[module.mapping_key] = {}
+            lookup_resources_concurrently(
+                settings,
+                module.lookup_resources,
+                APS_WORKSPACE_ARN_RE,
+                None,
+                Workspace.resource_type,
+                "aps:workspace",
+                use_arn_for_id=True,
+            )
             for resource in module.lookup_resources:
-                resource.lookup_resource(
-                    APS_WORKSPACE_ARN_RE,
-                    None,
-                    Workspace.resource_type,
-                    "aps:workspace",
-                    use_arn_for_id=True,
-                )
                 settings.mappings[module.mapping_key].update(
                     {resource.logical_name: resource.mappings}
                 )
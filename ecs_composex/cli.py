@@ -10,14 +10,39 @@ import logging
 import sys
 import warnings
 
-from ecs_composex.common.aws import deploy, plan
+from ecs_composex import __version__
 from ecs_composex.common.logging import LOG
-from ecs_composex.common.settings import ComposeXSettings
-from ecs_composex.common.stacks import process_stacks
-from ecs_composex.compose.compose_services.service_image.docker_opts import (
-    evaluate_ecr_configs,
+from ecs_composex.common.settings_args import (
+    DEFAULT_IMAGE_DIGESTS_TTL,
+    DEFAULT_LOOKUP_TTL,
+    SettingsArgs,
 )
-from ecs_composex.ecs_composex import generate_full_template
+
+
+def positive_int(value: str) -> int:
+    """
+    Argparse type for the arguments which must be an integer greater than 0
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value} is not an integer")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} must be greater than 0")
+    return number
+
+
+def api_calls_budget(value: str) -> str:
+    """
+    Argparse type validating an API calls budget, as N, service=N or service.Operation=N
+    """
+    from ecs_composex.common.aws_calls import parse_budgets
+
+    try:
+        parse_budgets([value])
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+    return value
 
 
 class ArgparseHelper(argparse._HelpAction):
@@ -37,12 +62,13 @@ class ArgparseHelper(argparse._HelpAction):
         for subparsers_action in subparsers_actions:
             for choice, subparser in list(subparsers_action.choices.items()):
                 if choice in [
-                    cmd["name"] for cmd in ComposeXSettings.active_commands
+                    cmd["name"] for cmd in SettingsArgs.active_commands
                 ] or choice in [
-                    cmd["name"] for cmd in ComposeXSettings.validation_commands
+                    cmd["name"] for cmd in SettingsArgs.validation_commands
                 ]:
                     print(f"Command '{choice}'")
                     print(subparser.format_usage())
+        parser.exit()
 
 
 def main_parser():
@@ -58,7 +84,7 @@ def main_parser():
     )
 
     cmd_parsers = parser.add_subparsers(
-        dest=ComposeXSettings.command_arg, help="Command to execute."
+        dest=SettingsArgs.command_arg, help="Command to execute."
     )
     base_command_parser = argparse.ArgumentParser(add_help=False)
     files_parser = argparse.ArgumentParser(add_help=False)
@@ -66,7 +92,7 @@ def main_parser():
     files_parser.add_argument(
         "-f",
         "--docker-compose-file",
-        dest=ComposeXSettings.input_file_arg,
+        dest=SettingsArgs.input_file_arg,
         required=True,
         help="Path to the Docker compose file",
         action="append",
@@ -77,8 +103,8 @@ def main_parser():
         required=False,
         help="Output directory to write all the templates to.",
         type=str,
-        dest=ComposeXSettings.output_dir_arg,
-        default=ComposeXSettings.default_output_dir,
+        dest=SettingsArgs.output_dir_arg,
+        default=SettingsArgs.default_output_dir,
     )
     base_command_parser.add_argument(
         "-n",
@@ -87,26 +113,34 @@ def main_parser():
         help="Name of your stack / docker project",
         required=True,
         type=str,
-        dest=ComposeXSettings.name_arg,
+        dest=SettingsArgs.name_arg,
     )
     base_command_parser.add_argument(
         "--format",
         help="Defines the format you want to use.",
         type=str,
-        dest=ComposeXSettings.format_arg,
-        choices=ComposeXSettings.allowed_formats,
-        default=ComposeXSettings.default_format,
+        dest=SettingsArgs.format_arg,
+        choices=SettingsArgs.allowed_formats,
+        default=SettingsArgs.default_format,
+    )
+    base_command_parser.add_argument(
+        "--compact",
+        dest=SettingsArgs.compact_arg,
+        action="store_true",
+        default=False,
+        help="Renders the templates without indentation, to keep them smaller: JSON without whitespaces, YAML in"
+        " flow style on a single line.",
     )
     base_command_parser.add_argument(
         "--region",
         required=False,
-        dest=ComposeXSettings.region_arg,
+        dest=SettingsArgs.region_arg,
         help="Specify the region you want to build for"
         "default use default region from config or environment vars",
     )
     base_command_parser.add_argument(
         "--azs",
-        dest=ComposeXSettings.zones_arg,
+        dest=SettingsArgs.zones_arg,
         default=[],
         action="append",
         required=False,
@@ -129,7 +163,7 @@ def main_parser():
     )
     base_command_parser.add_argument(
         "--role-arn",
-        dest=ComposeXSettings.arn_arg,
+        dest=SettingsArgs.arn_arg,
         help="Allow you to run API calls using a specific IAM role, within same or for cross-account",
         required=False,
     )
@@ -140,9 +174,139 @@ def main_parser():
         required=False,
         action="store_true",
     )
+    extras_parser.add_argument(
+        "--force-update",
+        dest=SettingsArgs.force_update_arg,
+        action="store_true",
+        default=False,
+        help="On up/plan, updates the stack, or creates the change set, even if the rendered templates and"
+        " parameters are the same as the deployed ones.",
+    )
+    extras_parser.add_argument(
+        "--wait",
+        dest=SettingsArgs.wait_arg,
+        action="store_true",
+        default=False,
+        help="On up, follows the stack and nested stacks events until the deployment is complete, reports how long"
+        " each resource took, and fails if the deployment did.",
+    )
+    extras_parser.add_argument(
+        "--wait-timeout",
+        dest=SettingsArgs.wait_timeout_arg,
+        type=int,
+        required=False,
+        default=SettingsArgs.default_wait_timeout,
+        help="With --wait, maximum time, in seconds, to wait for the deployment.",
+    )
+    extras_parser.add_argument(
+        "--render-workers",
+        dest=SettingsArgs.render_workers_arg,
+        type=positive_int,
+        required=False,
+        default=SettingsArgs.default_render_workers,
+        help="Maximum number of nested stacks to render, upload and validate concurrently.",
+    )
+    extras_parser.add_argument(
+        "--lookup-workers",
+        dest=SettingsArgs.lookup_workers_arg,
+        type=positive_int,
+        required=False,
+        default=SettingsArgs.default_lookup_workers,
+        help="Maximum number of x-resources Lookup to run concurrently.",
+    )
+    extras_parser.add_argument(
+        "--ecr-scans-workers",
+        dest=SettingsArgs.ecr_scans_workers_arg,
+        type=positive_int,
+        required=False,
+        default=SettingsArgs.default_ecr_scans_workers,
+        help="Maximum number of ECR images scans to evaluate concurrently.",
+    )
+    extras_parser.add_argument(
+        "--ecr-scans-timeout",
+        dest=SettingsArgs.ecr_scans_timeout_arg,
+        type=int,
+        required=False,
+        default=SettingsArgs.default_ecr_scans_timeout,
+        help="Maximum time, in seconds, to wait for all the ECR images scans reports.",
+    )
+    extras_parser.add_argument(
+        "--content-hash-uploads",
+        dest=SettingsArgs.content_hash_uploads_arg,
+        action="store_true",
+        default=False,
+        help="Upload files under a key based on their content hash. Unchanged files are not uploaded again.",
+    )
+    extras_parser.add_argument(
+        "--verify-uploads",
+        dest=SettingsArgs.verify_uploads_arg,
+        action="store_true",
+        default=False,
+        help="With --content-hash-uploads, checks the object exists in the bucket instead of trusting the local manifest.",
+    )
+    extras_parser.add_argument(
+        "--no-validation-cache",
+        dest=SettingsArgs.no_validation_cache_arg,
+        action="store_true",
+        default=False,
+        help="Validates all templates with CloudFormation, even if previously validated.",
+    )
+    extras_parser.add_argument(
+        "--lookup-cache",
+        dest=SettingsArgs.lookup_cache_arg,
+        type=str,
+        required=False,
+        help="Directory to store the Lookup results in, i.e. of the x-resources, x-vpc, x-cluster and secrets,"
+        " to re-use them in later executions.",
+    )
+    extras_parser.add_argument(
+        "--lookup-ttl",
+        dest=SettingsArgs.lookup_ttl_arg,
+        type=str,
+        required=False,
+        default=DEFAULT_LOOKUP_TTL,
+        help="How long the cached Lookup results are valid for, i.e. 30m, 1h, 2d. Default 1h",
+    )
+    extras_parser.add_argument(
+        "--image-digests-ttl",
+        dest=SettingsArgs.image_digests_ttl_arg,
+        type=str,
+        required=False,
+        default=DEFAULT_IMAGE_DIGESTS_TTL,
+        help="With x-docker_opts.InterpolateWithDigest, how long the images digests resolved from the registries are"
+        " cached for, i.e. 30m, 1h. 0 to always query the registries. Default 15m",
+    )
+    extras_parser.add_argument(
+        "--offline",
+        dest=SettingsArgs.offline_arg,
+        action="store_true",
+        default=False,
+        help="Renders without calling AWS: Lookup from the lookup cache only, "
+        "AZs from --azs or the local cache, no ECR scans nor CloudFormation validation.",
+    )
+    extras_parser.add_argument(
+        "--profile",
+        dest=SettingsArgs.profile_arg,
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="TRACE_FILE",
+        help="Records the wall time, CPU time and peak memory of each phase, module, family and stack, and writes"
+        " them as a Chrome trace to TRACE_FILE. Defaults to <output-dir>/<name>.trace.json",
+    )
+    extras_parser.add_argument(
+        "--api-calls-budget",
+        dest=SettingsArgs.api_calls_budget_arg,
+        action="append",
+        type=api_calls_budget,
+        required=False,
+        metavar="[SERVICE[.Operation]=]CALLS",
+        help="Fails once done if more AWS API calls than budgeted were made, in total or for the service/operation."
+        " i.e. 50, ec2=20, ec2.DescribeSubnets=4. Can be repeated.",
+    )
     extras_parser.add_argument(
         "--ignore-ecr-findings",
-        dest=ComposeXSettings.ecr_arg,
+        dest=SettingsArgs.ecr_arg,
         action="store_true",
         default=False,
         help="For services with x-ecr defined, ignores errors if any found",
@@ -167,22 +331,75 @@ def main_parser():
         required=False,
         type=bool,
     )
-    for command in ComposeXSettings.active_commands:
+    for command in SettingsArgs.active_commands:
         cmd_parsers.add_parser(
             name=command["name"],
             help=command["help"],
             parents=[base_command_parser, files_parser, extras_parser],
         )
-    for command in ComposeXSettings.validation_commands:
+    for command in SettingsArgs.validation_commands:
         cmd_parsers.add_parser(
             name=command["name"], help=command["help"], parents=[files_parser]
         )
 
-    for command in ComposeXSettings.neutral_commands:
+    for command in SettingsArgs.neutral_commands:
         cmd_parsers.add_parser(name=command["name"], help=command["help"])
+    add_serve_parser(cmd_parsers)
     return parser
 
 
+def add_serve_parser(cmd_parsers) -> None:
+    serve_parser = cmd_parsers.add_parser(
+        name=SettingsArgs.serve_arg,
+        help="Runs a local render server, which keeps the specs, policies, AWS sessions and lookups warm across"
+        " renders. POST the compose files to /render to get the rendered templates",
+    )
+    serve_parser.add_argument(
+        "--host",
+        dest=SettingsArgs.serve_host_arg,
+        default=SettingsArgs.default_serve_host,
+        help=f"Address to listen on. Default {SettingsArgs.default_serve_host}",
+    )
+    serve_parser.add_argument(
+        "--port",
+        dest=SettingsArgs.serve_port_arg,
+        type=int,
+        default=SettingsArgs.default_serve_port,
+        help=f"Port to listen on. Default {SettingsArgs.default_serve_port}",
+    )
+    serve_parser.add_argument(
+        "--socket",
+        dest=SettingsArgs.serve_socket_arg,
+        required=False,
+        help="Path of the Unix socket to listen on, instead of --host and --port",
+    )
+    serve_parser.add_argument(
+        "--lookup-cache",
+        dest=SettingsArgs.lookup_cache_arg,
+        type=str,
+        required=False,
+        help="Directory to store the Lookup results in. Defaults to the compose-x cache directory",
+    )
+    serve_parser.add_argument(
+        "--lookup-ttl",
+        dest=SettingsArgs.lookup_ttl_arg,
+        type=str,
+        required=False,
+        default=DEFAULT_LOOKUP_TTL,
+        help="How long the Lookup results are valid for, i.e. 30m, 1h, 2d. Default 1h",
+    )
+    serve_parser.add_argument(
+        "--offline",
+        dest=SettingsArgs.offline_arg,
+        action="store_true",
+        default=False,
+        help="Renders without calling AWS, with the lookup cache only. Requests must set the Zones.",
+    )
+    serve_parser.add_argument(
+        "--loglevel", type=str, help="Log level. Defaults to INFO", required=False
+    )
+
+
 def main():
     """
     Main entry point for CLI
@@ -212,8 +429,26 @@ def main():
                 f"Log level value {args.loglevel} is invalid. Must me one of {valid_levels}"
             )
     LOG.debug(args)
+    if getattr(args, SettingsArgs.command_arg, None) == "version":
+        print("ECS ComposeX", __version__)
+        return 0
+    if getattr(args, SettingsArgs.command_arg, None) == SettingsArgs.serve_arg:
+        from ecs_composex.serve import serve
+
+        return serve(vars(args))
+
+    from ecs_composex.common.aws import deploy, plan
+    from ecs_composex.common.settings import ComposeXSettings
+    from ecs_composex.common.stacks import process_stacks
+    from ecs_composex.common.stacks.deployment_monitor import DeploymentMonitor
+    from ecs_composex.compose.compose_services.service_image.docker_opts import (
+        evaluate_ecr_configs,
+    )
+    from ecs_composex.ecs_composex import generate_full_template
+
     settings = ComposeXSettings(**vars(args))
-    settings.set_bucket_name_from_account_id()
+    if (settings.upload or settings.bucket_prefix_path) and not settings.offline:
+        settings.set_bucket_name_from_account_id()
     LOG.debug(settings)
 
     if settings.deploy and not settings.upload:
@@ -221,22 +456,80 @@ def main():
             "You must update the templates in order to deploy. We won't be deploying."
         )
         settings.deploy = False
-    scan_results = evaluate_ecr_configs(settings)
+    with settings.profiler.phase("evaluate_ecr_configs"):
+        scan_results = evaluate_ecr_configs(settings)
     if scan_results:
         return scan_results
-    root_stack = generate_full_template(settings)
-    process_stacks(root_stack, settings)
+    with settings.profiler.phase("generate_full_template"):
+        root_stack = generate_full_template(settings)
+    with settings.profiler.phase("process_stacks"):
+        process_stacks(root_stack, settings)
+    if settings.profiler.enabled:
+        settings.profiler.log_summary()
+        settings.profiler.save(settings.profile_file)
+        settings.profiler.stop()
 
+    monitor = None
+    stack_id = None
     try:
         if settings.deploy:
-            deploy(settings, root_stack)
-            return 0
+            if settings.wait_for_deployment:
+                monitor = DeploymentMonitor(
+                    settings.session.client("cloudformation"),
+                    settings.name,
+                    settings.render_workers,
+                )
+                monitor.mark()
+            stack_id = deploy(settings, root_stack)
         elif settings.plan:
             plan(settings, root_stack, apply=args.apply, cleanup=args.cleanup)
     except Exception as error:
         LOG.error("Failed to execute the command successfully")
         LOG.exception(error)
         return 2
+    budgets_status = check_api_calls_budgets(settings)
+    if monitor and stack_id:
+        return wait_for_deployment(settings, monitor, stack_id) or budgets_status
+    return budgets_status
+
+
+def wait_for_deployment(settings, monitor, stack_id: str) -> int:
+    """
+    Follows the deployment until the root stack status is final, and reports how long each resource took.
+    The API calls budgets are checked before, so that the polling does not count.
+
+    :return: status code
+    """
+    from ecs_composex.common.stacks.deployment_monitor import SUCCESS_STATUSES
+
+    try:
+        status = monitor.wait(stack_id, settings.wait_timeout)
+    except TimeoutError as error:
+        LOG.error(error)
+        status = None
+    print(monitor.format_report())
+    if status in SUCCESS_STATUSES:
+        LOG.info(f"Stack {settings.name} - {status}")
+        return 0
+    LOG.error(f"Stack {settings.name} - Deployment failed: {status}")
+    return 4
+
+
+def check_api_calls_budgets(settings) -> int:
+    """
+    Logs the AWS API calls made, and checks them against the budgets.
+
+    :return: status code
+    """
+    from ecs_composex.common.aws_calls import API_CALLS
+    from ecs_composex.exceptions import ApiCallsBudgetExceeded
+
+    API_CALLS.log_summary()
+    try:
+        API_CALLS.enforce_budgets(settings.api_calls_budgets)
+    except ApiCallsBudgetExceeded as error:
+        LOG.error(error.args[0])
+        return 3
     return 0
 
 
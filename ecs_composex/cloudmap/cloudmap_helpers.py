@@ -24,6 +24,7 @@ from ecs_composex.cloudmap.cloudmap_params import (
     ZONES_PATTERN,
 )
 from ecs_composex.common.logging import LOG
+from ecs_composex.compose.x_resources.helpers import lookup_resources_concurrently
 from ecs_composex.exceptions import ComposeBaseException, IncompatibleOptions
 
 
@@ -37,13 +38,15 @@ def resolve_lookup(lookup_resources, settings, module: XResourceModule):
     """
     if not keyisset(module.mapping_key, settings.mappings):
         settings.mappings[module.mapping_key] = {}
+    lookup_resources_concurrently(
+        settings,
+        lookup_resources,
+        ZONES_PATTERN,
+        lookup_service_discovery_namespace,
+        PrivateDnsNamespace.resource_type,
+        "",
+    )
     for resource in lookup_resources:
-        resource.lookup_resource(
-            ZONES_PATTERN,
-            lookup_service_discovery_namespace,
-            PrivateDnsNamespace.resource_type,
-            "",
-        )
         resource.init_outputs()
         resource.generate_cfn_mappings_from_lookup_properties()
         resource.generate_outputs()
@@ -66,7 +69,7 @@ def x_cloud_lookup_and_new_vpc(settings: ComposeXSettings, vpc_stack: VpcStack):
 
     lookup_namespaces = [
         namespace
-        for namespace in settings.x_resources
+        for namespace in settings.x_resources_registry.by_kind["lookup"]
         if isinstance(namespace, PrivateNamespace) and namespace.lookup_properties
     ]
     if lookup_namespaces and not vpc_stack.is_void:
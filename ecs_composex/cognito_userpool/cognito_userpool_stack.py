@@ -33,6 +33,7 @@ from ecs_composex.compose.x_resources.environment_x_resources import (
     AwsEnvironmentResource,
 )
 from ecs_composex.compose.x_resources.helpers import (
+    lookup_resources_concurrently,
     set_lookup_resources,
     set_new_resources,
     set_resources,
@@ -106,13 +107,15 @@ def resolve_lookup(
     """
     if not keyisset(module.mapping_key, settings.mappings):
         settings.mappings[module.mapping_key] = {}
+    lookup_resources_concurrently(
+        settings,
+        lookup_resources,
+        USER_POOL_RE,
+        get_userpool_config,
+        CfnUserPool.resource_type,
+        "cognito-idp",
+    )
     for resource in lookup_resources:
-        resource.lookup_resource(
-            USER_POOL_RE,
-            get_userpool_config,
-            CfnUserPool.resource_type,
-            "cognito-idp",
-        )
         resource.init_outputs()
         resource.generate_cfn_mappings_from_lookup_properties()
         resource.generate_outputs()
@@ -14,12 +14,12 @@ if TYPE_CHECKING:
     from .stacks import ComposeXStack
 
 import re
-from datetime import datetime as dt
 from math import ceil, log
-from uuid import uuid4
+from os import environ, path
 
-DATE = dt.utcnow().isoformat()
-FILE_PREFIX = f'{dt.utcnow().strftime("%Y/%m/%d/%H%M")}/{str(uuid4().hex)[:6]}'
+CACHE_DIR = environ.get(
+    "COMPOSE_X_CACHE_DIR", path.expanduser(path.join("~", ".compose-x", "cache"))
+)
 NONALPHANUM = re.compile(r"([^a-zA-Z\d]+)")
 
 
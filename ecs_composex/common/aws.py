@@ -10,36 +10,196 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Union
 
 if TYPE_CHECKING:
-    from boto3.session import Session
     from ecs_composex.common.settings import ComposeXSettings
     from ecs_composex.common.stacks import ComposeXStack
+    from ecs_composex.common.stacks.deployed_diff import StacksDiff
 
 import re
+from contextlib import contextmanager
 from copy import deepcopy
 from datetime import datetime as dt
-from time import sleep
+from datetime import timedelta, timezone
+from os import environ
+from threading import Lock, RLock, local
+from weakref import WeakKeyDictionary
 
+from boto3.session import Session
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from compose_x_common.aws import get_assume_role_session, validate_iam_role_arn
 from compose_x_common.aws.arns import ARNS_PER_TAGGINGAPI_TYPE
 from compose_x_common.compose_x_common import keyisset
 from tabulate import tabulate
 
+from ecs_composex.common.aws_calls import API_CALLS
 from ecs_composex.common.logging import LOG
 from ecs_composex.iam import ROLE_ARN_ARG
 
+LOOKUP_RETRIES_CONFIG = Config(retries={"mode": "adaptive", "total_max_attempts": 10})
+_LOOKUP_SCOPE = local()
+
+
+@contextmanager
+def lookup_retries():
+    """
+    The clients the thread gets from a ThreadSafeSession use the adaptive retry mode: each client rate-limits its
+    own calls and backs off when throttled, which the concurrent lookups would otherwise run into.
+    """
+    previous = getattr(_LOOKUP_SCOPE, "enabled", False)
+    _LOOKUP_SCOPE.enabled = True
+    try:
+        yield
+    finally:
+        _LOOKUP_SCOPE.enabled = previous
+
+
+def get_lookup_retries_config(session: Session) -> Config | None:
+    """
+    :return: the retries config for the lookup clients, None outside of lookup_retries() or if the user set the
+      retry mode
+    """
+    if not getattr(_LOOKUP_SCOPE, "enabled", False):
+        return None
+    if environ.get("AWS_RETRY_MODE") or keyisset(
+        "retry_mode", session._session.get_scoped_config()
+    ):
+        return None
+    return LOOKUP_RETRIES_CONFIG
+
+
+class ThreadSafeSession(Session):
+    """
+    boto3 Session that creates its clients and resources one at a time, so that it can be shared between threads.
+    Clients being thread-safe, they are kept per service and region and re-used.
+    The clients used for the lookups, within lookup_retries(), use the adaptive retry mode, unless configured otherwise.
+    Records the API calls made with API_CALLS.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_lock = RLock()
+        self._clients: dict = {}
+        API_CALLS.attach(self)
+
+    def client(self, service_name, region_name=None, *args, **kwargs):
+        with self._create_lock:
+            if args or kwargs:
+                return super().client(service_name, region_name, *args, **kwargs)
+            config = get_lookup_retries_config(self)
+            client_key = (service_name, region_name, config is not None)
+            if client_key not in self._clients:
+                self._clients[client_key] = super().client(
+                    service_name, region_name, config=config
+                )
+            return self._clients[client_key]
+
+    def resource(self, *args, **kwargs):
+        with self._create_lock:
+            return super().resource(*args, **kwargs)
+
+
+class SessionPool:
+    """
+    Keeps the sessions for the IAM roles assumed during the execution, per source session, role ARN and region,
+    until their credentials are about to expire. Also memoizes the caller identity of each session.
+
+    :cvar timedelta expiry_margin: how long before expiry the role is assumed again
+    """
+
+    expiry_margin = timedelta(minutes=5)
+
+    def __init__(self):
+        self._lock = Lock()
+        self._roles: WeakKeyDictionary = WeakKeyDictionary()
+        self._identities: WeakKeyDictionary = WeakKeyDictionary()
+
+    def _get_entry(self, cache: WeakKeyDictionary, session: Session, key) -> list:
+        with self._lock:
+            entries = cache.setdefault(session, {})
+            if key not in entries:
+                entries[key] = [Lock(), None]
+            return entries[key]
+
+    def get_role_session(
+        self,
+        session: Session,
+        arn: str,
+        region_name: str = None,
+        session_name: str = None,
+    ) -> ThreadSafeSession:
+        entry = self._get_entry(self._roles, session, (arn, region_name))
+        with entry[0]:
+            if entry[1] is None or entry[1][1] - self.expiry_margin <= dt.now(
+                timezone.utc
+            ):
+                role_session, role = get_assume_role_session(
+                    session,
+                    arn,
+                    session_name=session_name,
+                    region=region_name,
+                    include_full_return=True,
+                )
+                entry[1] = (
+                    ThreadSafeSession(
+                        region_name=role_session.region_name,
+                        aws_access_key_id=role["Credentials"]["AccessKeyId"],
+                        aws_secret_access_key=role["Credentials"]["SecretAccessKey"],
+                        aws_session_token=role["Credentials"]["SessionToken"],
+                    ),
+                    role["Credentials"]["Expiration"],
+                )
+            return entry[1][0]
+
+    def get_caller_identity(self, session: Session) -> dict:
+        entry = self._get_entry(self._identities, session, "CallerIdentity")
+        with entry[0]:
+            if entry[1] is None:
+                entry[1] = session.client("sts").get_caller_identity()
+            return entry[1]
+
+
+SESSION_POOL = SessionPool()
+
+
+OFFLINE_HANDLER_ID = "compose-x-offline"
+
+
+def raise_offline_api_call(model, **kwargs):
+    raise LookupError(
+        f"Offline - Cannot call {model.service_model.service_name}.{model.name}."
+        " Only the x-resources lookups cached with --lookup-cache can be rendered offline"
+    )
+
+
+def block_api_calls(session: Session) -> None:
+    """
+    Makes the AWS API calls made with the session raise a LookupError, for the offline mode.
+    Only applies to the clients created after.
+    """
+    session.events.register_first(
+        "before-call.*.*", raise_offline_api_call, unique_id=OFFLINE_HANDLER_ID
+    )
+
+
+def get_account_id(session: Session) -> str:
+    """
+    Function to get the account ID of the session, calling STS only once per session.
+    """
+    return SESSION_POOL.get_caller_identity(session)["Account"]
+
 
 def get_cross_role_session(
     session: Session, arn: str, region_name: str = None, session_name: str = None
 ) -> Session:
     """
-    Function to override ComposeXSettings session to specific session for Lookup
+    Function to override ComposeXSettings session to specific session for Lookup.
+    The session is shared for the same role and region until its credentials are about to expire.
     """
     if not session_name:
         session_name = "ComposeX@Lookup"
     try:
-        return get_assume_role_session(
-            session, arn, session_name=session_name, region=region_name
+        return SESSION_POOL.get_role_session(
+            session, arn, region_name=region_name, session_name=session_name
         )
     except ClientError:
         LOG.error(f"Failed to use the Role ARN {arn}")
@@ -56,6 +216,15 @@ def define_lookup_role_from_info(info: dict, session: Session) -> Session:
     return get_cross_role_session(session, info[ROLE_ARN_ARG])
 
 
+def get_lookup_account_id(info: dict | str, session: Session) -> str:
+    """
+    Function to get the account ID of the Lookup RoleArn if set, else of the session.
+    """
+    if isinstance(info, dict) and keyisset(ROLE_ARN_ARG, info):
+        return info[ROLE_ARN_ARG].split(":")[4]
+    return get_account_id(session)
+
+
 def set_filters_from_tags_list(tags: list) -> list:
     """
     Simple function to define the tags filters to use
@@ -95,18 +264,94 @@ def define_tagsgroups_filter_tags(tags: list[dict]) -> list:
     raise TypeError("Tags must be one of", [list, dict], "Got", type(tags))
 
 
+class TaggedResourcesIndex:
+    """
+    All the resources of a given type, as returned by the Resource Groups Tagging API, indexed by tag key and value
+    so that the lookups can be resolved in memory.
+
+    :ivar list[dict] mappings: the ResourceTagMappingList of all the resources
+    :ivar dict tags: for each tag key, for each value, the position of the resources in mappings
+    """
+
+    def __init__(self, mappings: list[dict]):
+        self.mappings = mappings
+        self.tags: dict[str, dict[str, set[int]]] = {}
+        for position, mapping in enumerate(mappings):
+            for tag in mapping.get("Tags", []):
+                self.tags.setdefault(tag["Key"], {}).setdefault(
+                    tag["Value"], set()
+                ).add(position)
+
+    def search(self, tag_filters) -> list[dict]:
+        """
+        Same logic as the API TagFilters: the resources must match all the keys, and any of the values of each key.
+        A key without values matches any value.
+        """
+        found: set[int] = set(range(len(self.mappings)))
+        for tag_filter in tag_filters:
+            values = self.tags.get(tag_filter["Key"], {})
+            if tag_filter.get("Values"):
+                matching = set().union(
+                    *(values.get(str(value), set()) for value in tag_filter["Values"])
+                )
+            else:
+                matching = set().union(*values.values())
+            found &= matching
+            if not found:
+                break
+        return [self.mappings[position] for position in sorted(found)]
+
+
+_TAGGED_RESOURCES: WeakKeyDictionary = WeakKeyDictionary()
+_TAGGED_RESOURCES_LOCK = Lock()
+
+
+def get_tagged_resources_index(
+    session: Session, aws_resource_search: str
+) -> TaggedResourcesIndex:
+    """
+    Retrieves, only once per session, region and resource type, all the resources of that type with pagination,
+    and indexes them by tags.
+    """
+    with _TAGGED_RESOURCES_LOCK:
+        session_groups = _TAGGED_RESOURCES.setdefault(session, {})
+        group_key = (session.region_name, aws_resource_search)
+        if group_key not in session_groups:
+            session_groups[group_key] = [Lock(), None]
+        group = session_groups[group_key]
+    with group[0]:
+        if group[1] is None:
+            client = session.client("resourcegroupstaggingapi")
+            mappings: list[dict] = []
+            for page in client.get_paginator("get_resources").paginate(
+                ResourceTypeFilters=[aws_resource_search]
+            ):
+                mappings += page.get("ResourceTagMappingList", [])
+            LOG.debug(
+                f"Indexed {len(mappings)} {aws_resource_search} resources in {session.region_name}"
+            )
+            group[1] = TaggedResourcesIndex(mappings)
+        return group[1]
+
+
+def clear_tagged_resources_indexes() -> None:
+    """
+    Clears the tagged resources indexes of all sessions, for the next lookups to see the resources created since.
+    """
+    with _TAGGED_RESOURCES_LOCK:
+        _TAGGED_RESOURCES.clear()
+
+
 def get_resources_from_tags(
     session: Session, aws_resource_search: str, search_tags: list
 ) -> dict | None:
     """
-    Function to retrieve AWS Resources ARNs from the tags using the Resource Groups Tagging API
+    Function to retrieve AWS Resources ARNs from the tags using the Resource Groups Tagging API.
+    All the lookups for the same resource type share the same, paginated, API results.
     """
     try:
-        client = session.client("resourcegroupstaggingapi")
-        resources_r = client.get_resources(
-            ResourceTypeFilters=[aws_resource_search], TagFilters=search_tags
-        )
-        return resources_r
+        index = get_tagged_resources_index(session, aws_resource_search)
+        return {"ResourceTagMappingList": index.search(search_tags)}
     except ClientError as error:
         LOG.error(error)
         LOG.error("Not processing this resource. Skipping")
@@ -299,6 +544,28 @@ def validate_can_deploy_stack_from_settings(
         )
 
 
+def get_deployed_stacks_diff(
+    settings: ComposeXSettings, root_stack: ComposeXStack
+) -> StacksDiff | None:
+    """
+    Compares the rendered stacks with the deployed ones, and prints the differences.
+    Returns None with --force-update, or if the deployed stacks could not be compared, to update them regardless.
+    """
+    if settings.force_update:
+        return None
+    from ecs_composex.common.stacks.deployed_diff import get_stacks_diff
+
+    try:
+        stacks_diff = get_stacks_diff(settings, root_stack)
+    except (ClientError, OSError, ValueError) as error:
+        LOG.warning(f"{settings.name} - Unable to compare with the deployed stacks")
+        LOG.warning(error)
+        return None
+    if stacks_diff.has_changes:
+        print(stacks_diff.format())
+    return stacks_diff
+
+
 def deploy(settings: ComposeXSettings, root_stack: ComposeXStack) -> str | None:
     """
     Function to deploy (create or update) the stack to CFN.
@@ -317,6 +584,10 @@ def deploy(settings: ComposeXSettings, root_stack: ComposeXStack) -> str | None:
         LOG.info(res["StackId"])
         return res["StackId"]
     elif assert_can_update_stack(client, settings.name):
+        stacks_diff = get_deployed_stacks_diff(settings, root_stack)
+        if stacks_diff and not stacks_diff.has_changes:
+            LOG.info(f"Stack {settings.name} is up to date. Skipping the update.")
+            return stacks_diff.stack_id
         LOG.warning(f"Stack {settings.name} already exists. Updating.")
         res = client.update_stack(
             StackName=settings.name,
@@ -343,6 +614,8 @@ def get_change_set_status(
     If the changeset already exists, in a ready status, we dump a display of expected changes and return the status.
 
     """
+    from ecs_composex.common.stacks.deployment_monitor import AdaptivePolling
+
     pending_statuses = [
         "CREATE_PENDING",
         "CREATE_IN_PROGRESS",
@@ -353,6 +626,7 @@ def get_change_set_status(
     ]
     success_statuses = ["CREATE_COMPLETE", "DELETE_COMPLETE"]
     failed_statuses = ["DELETE_FAILED", "FAILED", "UPDATE_ROLLBACK_FAILED"]
+    polling = AdaptivePolling(min_interval=2, max_interval=10)
     ready = False
     status = None
     while not ready:
@@ -363,11 +637,12 @@ def get_change_set_status(
             raise SystemExit("Change set is unsucessful", status["Status"])
         if status["Status"] in pending_statuses:
             print(
-                "ChangeSet creation in progress. Waiting 10 seconds",
+                f"ChangeSet creation in progress. Waiting {polling.interval:.0f} seconds",
                 end="\r",
                 flush=True,
             )
-            sleep(10)
+            polling.wait()
+            polling.idle()
         elif status["Status"] in success_statuses:
             ready = True
 
@@ -400,22 +675,29 @@ def plan(
     validate_can_deploy_stack_from_settings(settings, root_stack)
     client = settings.session.client("cloudformation")
     change_set_name = f"{settings.name}" + "-ecs-compose-x-" + dt.now().strftime("%s")
-    if assert_can_create_stack(client, settings.name) or assert_can_update_stack(
-        client, settings.name
-    ):
-        client.create_change_set(
-            StackName=settings.name,
-            Capabilities=["CAPABILITY_IAM", "CAPABILITY_AUTO_EXPAND"],
-            Parameters=root_stack.render_parameters_list_cfn(),
-            TemplateURL=root_stack.TemplateURL,
-            UsePreviousTemplate=False,
-            IncludeNestedStacks=True,
-            ChangeSetType="CREATE",
-            ChangeSetName=change_set_name,
-        )
-        status = get_change_set_status(client, change_set_name, settings)
-        if status:
-            plan_user_input(settings, client, change_set_name, apply, cleanup)
+    can_create = assert_can_create_stack(client, settings.name)
+    if not can_create and assert_can_update_stack(client, settings.name):
+        stacks_diff = get_deployed_stacks_diff(settings, root_stack)
+        if stacks_diff and not stacks_diff.has_changes:
+            LOG.info(
+                f"Stack {settings.name} is up to date. Skipping the change set creation."
+            )
+            return
+    elif not can_create:
+        return
+    client.create_change_set(
+        StackName=settings.name,
+        Capabilities=["CAPABILITY_IAM", "CAPABILITY_AUTO_EXPAND"],
+        Parameters=root_stack.render_parameters_list_cfn(),
+        TemplateURL=root_stack.TemplateURL,
+        UsePreviousTemplate=False,
+        IncludeNestedStacks=True,
+        ChangeSetType="CREATE",
+        ChangeSetName=change_set_name,
+    )
+    status = get_change_set_status(client, change_set_name, settings)
+    if status:
+        plan_user_input(settings, client, change_set_name, apply, cleanup)
 
 
 def plan_user_input(
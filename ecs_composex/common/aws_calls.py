@@ -0,0 +1,282 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2025 John Mille <john@compose-x.io>
+
+"""
+Instrumentation of the AWS API calls made during the execution, via the botocore events of the sessions.
+
+Counts the calls, their latency, retries and throttles, per service and operation, and the calls made per scope,
+i.e. per x-resource lookup, ECR scan or stack. Budgets can be set for the total, a service or an operation, which
+are enforced at the end of the execution to catch changes that add API calls.
+"""
+
+from __future__ import annotations
+
+import re
+from contextlib import contextmanager
+from threading import Lock, local
+from time import perf_counter
+
+from boto3.session import Session
+
+from ecs_composex.common.logging import LOG
+from ecs_composex.exceptions import ApiCallsBudgetExceeded
+
+THROTTLING_ERROR_CODES: frozenset = frozenset(
+    [
+        "Throttling",
+        "ThrottlingException",
+        "ThrottledException",
+        "RequestThrottledException",
+        "TooManyRequestsException",
+        "ProvisionedThroughputExceededException",
+        "TransactionInProgressException",
+        "RequestLimitExceeded",
+        "BandwidthLimitExceeded",
+        "LimitExceededException",
+        "RequestThrottled",
+        "SlowDown",
+        "PriorRequestNotComplete",
+        "EC2ThrottledException",
+    ]
+)
+BUDGET_RE = re.compile(
+    r"^(?:(?P<target>[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9]+)?)=)?(?P<calls>\d+)$"
+)
+CONTEXT_KEY = "compose_x_api_call"
+UNSCOPED = "-"
+
+
+class OperationCalls:
+    """
+    Calls statistics of an API operation
+    """
+
+    def __init__(self):
+        self.calls: int = 0
+        self.errors: int = 0
+        self.retries: int = 0
+        self.throttles: int = 0
+        self.latency: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "Calls": self.calls,
+            "Errors": self.errors,
+            "Retries": self.retries,
+            "Throttles": self.throttles,
+            "LatencyMs": round(self.latency * 1000, 1),
+        }
+
+
+def parse_budgets(budgets: list[str] | None) -> dict:
+    """
+    Parses the budgets, set as N for all the calls, service=N or service.Operation=N
+
+    :return: the maximum calls per target, None for all the calls
+    :raises: ValueError if a budget is not valid
+    """
+    parsed: dict = {}
+    for budget in budgets or []:
+        parts = BUDGET_RE.match(str(budget))
+        if not parts:
+            raise ValueError(
+                f"API calls budget {budget} is not valid. Expected N, service=N or service.Operation=N"
+            )
+        parsed[parts.group("target")] = int(parts.group("calls"))
+    return parsed
+
+
+class ApiCallsRecorder:
+    """
+    Records the API calls of the sessions it is attached to. The scope of the calls is set per thread.
+
+    :ivar dict operations: the OperationCalls per (service, operation)
+    :ivar dict scopes: the number of calls per scope, per (service, operation)
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._local = local()
+        self.operations: dict = {}
+        self.scopes: dict = {}
+
+    def attach(self, session: Session) -> None:
+        """
+        Registers the handlers on the session events. Only applies to the clients created after.
+        """
+        events = session.events
+        events.register_first(
+            "before-call.*.*", self.before_call, unique_id=f"{CONTEXT_KEY}-before"
+        )
+        events.register(
+            "after-call.*.*", self.after_call, unique_id=f"{CONTEXT_KEY}-after"
+        )
+        events.register(
+            "after-call-error.*.*",
+            self.after_call_error,
+            unique_id=f"{CONTEXT_KEY}-error",
+        )
+        events.register(
+            "needs-retry.*.*", self.needs_retry, unique_id=f"{CONTEXT_KEY}-retry"
+        )
+
+    @property
+    def scope(self) -> str:
+        return getattr(self._local, "scope", UNSCOPED)
+
+    @contextmanager
+    def scoped(self, scope: str):
+        """
+        Attributes the calls made by the thread to the scope
+        """
+        previous = self.scope
+        self._local.scope = scope
+        try:
+            yield
+        finally:
+            self._local.scope = previous
+
+    def get_operation(self, service: str, operation: str) -> OperationCalls:
+        key = (service, operation)
+        if key not in self.operations:
+            self.operations[key] = OperationCalls()
+        return self.operations[key]
+
+    def before_call(self, model, context, **kwargs) -> None:
+        context[CONTEXT_KEY] = (
+            model.service_model.service_name,
+            model.name,
+            self.scope,
+            perf_counter(),
+        )
+
+    def record(self, context: dict, error: bool, retries: int = 0) -> None:
+        call = context.pop(CONTEXT_KEY, None)
+        if call is None:
+            return
+        service, operation, scope, start = call
+        with self._lock:
+            operation_calls = self.get_operation(service, operation)
+            operation_calls.calls += 1
+            operation_calls.errors += int(error)
+            operation_calls.retries += retries
+            operation_calls.latency += perf_counter() - start
+            scope_calls = self.scopes.setdefault(scope, {})
+            scope_calls[(service, operation)] = (
+                scope_calls.get((service, operation), 0) + 1
+            )
+
+    def after_call(self, http_response, parsed, context, **kwargs) -> None:
+        retries = 0
+        if isinstance(parsed, dict):
+            retries = parsed.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+        self.record(context, http_response.status_code >= 300, retries)
+
+    def after_call_error(self, context, **kwargs) -> None:
+        self.record(context, True)
+
+    def needs_retry(self, response=None, operation=None, **kwargs) -> None:
+        """
+        Counts the throttled attempts. Does not change the retry decision.
+        """
+        if not response or operation is None:
+            return
+        parsed = response[1]
+        if (
+            isinstance(parsed, dict)
+            and parsed.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+        ):
+            with self._lock:
+                self.get_operation(
+                    operation.service_model.service_name, operation.name
+                ).throttles += 1
+
+    @property
+    def total_calls(self) -> int:
+        return sum(calls.calls for calls in self.operations.values())
+
+    def get_calls(self, target: str = None) -> int:
+        """
+        :param str target: service or service.Operation. All calls if None
+        """
+        if target is None:
+            return self.total_calls
+        service, _, operation = target.partition(".")
+        return sum(
+            calls.calls
+            for (_service, _operation), calls in self.operations.items()
+            if _service == service and (not operation or _operation == operation)
+        )
+
+    def get_exceeded_budgets(self, budgets: dict) -> list[str]:
+        return [
+            f"{target or 'all'}: {self.get_calls(target)} calls, budget {budget}"
+            for target, budget in budgets.items()
+            if self.get_calls(target) > budget
+        ]
+
+    def enforce_budgets(self, budgets: dict) -> None:
+        """
+        :param dict budgets: the maximum number of calls, per service, service.Operation, or None for all calls
+        :raises: ApiCallsBudgetExceeded when more calls than budgeted were made
+        """
+        exceeded = self.get_exceeded_budgets(budgets)
+        if exceeded:
+            raise ApiCallsBudgetExceeded(
+                f"AWS API calls over budget - {'; '.join(exceeded)}", exceeded
+            )
+
+    def to_dict(self) -> dict:
+        return {
+            "Operations": {
+                f"{service}.{operation}": calls.to_dict()
+                for (service, operation), calls in sorted(self.operations.items())
+            },
+            "Scopes": {
+                scope: sum(calls.values())
+                for scope, calls in sorted(self.scopes.items())
+            },
+        }
+
+    def log_summary(self) -> None:
+        if not self.operations:
+            return
+        totals = OperationCalls()
+        for calls in self.operations.values():
+            totals.calls += calls.calls
+            totals.errors += calls.errors
+            totals.retries += calls.retries
+            totals.throttles += calls.throttles
+            totals.latency += calls.latency
+        LOG.info(
+            f"AWS API calls - {totals.calls} calls, {totals.errors} errors, {totals.retries} retries,"
+            f" {totals.throttles} throttles, {totals.latency:.2f}s total latency"
+        )
+        for (service, operation), calls in sorted(
+            self.operations.items(), key=lambda item: item[1].calls, reverse=True
+        ):
+            LOG.info(
+                f"AWS API calls - {service}.{operation}: {calls.calls} calls,"
+                f" {calls.latency * 1000 / calls.calls:.0f}ms avg, {calls.retries} retries,"
+                f" {calls.throttles} throttles, {calls.errors} errors"
+            )
+        for scope, scope_calls in sorted(
+            self.scopes.items(), key=lambda item: sum(item[1].values()), reverse=True
+        ):
+            if scope == UNSCOPED:
+                continue
+            LOG.info(
+                f"AWS API calls - {scope}: "
+                + ", ".join(
+                    f"{service}.{operation} x{count}"
+                    for (service, operation), count in sorted(scope_calls.items())
+                )
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self.operations.clear()
+            self.scopes.clear()
+
+
+API_CALLS = ApiCallsRecorder()
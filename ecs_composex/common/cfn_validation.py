@@ -0,0 +1,149 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2025 John Mille <john@compose-x.io>
+
+"""
+Local, structural, validation of the CloudFormation templates, to catch dangling references before calling the
+CloudFormation API.
+"""
+
+from __future__ import annotations
+
+import re
+
+from ecs_composex.exceptions import TemplateValidationError
+
+SUB_VARIABLE = re.compile(r"\$\{(?!!)([^}]+)}")
+
+
+class TemplateReferences:
+    """
+    Walks a template, as a dict, and keeps track of all the references to parameters, resources, mappings and
+    conditions it could not find in the template.
+
+    :ivar list[str] errors: list of the dangling references found
+    """
+
+    def __init__(self, template: dict):
+        self.parameters = set(template.get("Parameters", {}).keys())
+        self.resources = set(template.get("Resources", {}).keys())
+        self.mappings: dict = template.get("Mappings", {})
+        self.conditions = set(template.get("Conditions", {}).keys())
+        self.errors: list[str] = []
+
+    def is_referenceable(self, name: str) -> bool:
+        return (
+            name.startswith("AWS::")
+            or name in self.parameters
+            or name in self.resources
+        )
+
+    def check_ref(self, value, location: str) -> None:
+        if isinstance(value, str) and not self.is_referenceable(value):
+            self.errors.append(f"{location} - Ref to undeclared {value}")
+
+    def check_getatt(self, value, location: str) -> None:
+        if isinstance(value, str):
+            value = value.split(".", 1)
+        if isinstance(value, list) and value and isinstance(value[0], str):
+            if value[0] not in self.resources:
+                self.errors.append(
+                    f"{location} - GetAtt to undeclared resource {value[0]}"
+                )
+
+    def check_findinmap(self, value, location: str) -> None:
+        if not isinstance(value, list) or not value or not isinstance(value[0], str):
+            return
+        if value[0] not in self.mappings:
+            self.errors.append(
+                f"{location} - FindInMap to undeclared mapping {value[0]}"
+            )
+            return
+        if len(value) > 1 and isinstance(value[1], str):
+            if value[1] not in self.mappings[value[0]]:
+                self.errors.append(
+                    f"{location} - FindInMap to undeclared key {value[0]}.{value[1]}"
+                )
+            elif len(value) > 2 and isinstance(value[2], str):
+                if value[2] not in self.mappings[value[0]][value[1]]:
+                    self.errors.append(
+                        f"{location} - FindInMap to undeclared key {value[0]}.{value[1]}.{value[2]}"
+                    )
+
+    def check_sub(self, value, location: str) -> None:
+        local_variables: dict = {}
+        if isinstance(value, list) and value:
+            if len(value) > 1 and isinstance(value[1], dict):
+                local_variables = value[1]
+            value = value[0]
+        if not isinstance(value, str):
+            return
+        for variable in SUB_VARIABLE.findall(value):
+            if variable in local_variables:
+                continue
+            name = variable.split(".", 1)[0] if "." in variable else variable
+            if "." in variable and name in self.resources:
+                continue
+            if not self.is_referenceable(variable):
+                self.errors.append(f"{location} - Sub to undeclared {variable}")
+
+    def check_condition(self, value, location: str) -> None:
+        if isinstance(value, str) and value not in self.conditions:
+            self.errors.append(f"{location} - undeclared condition {value}")
+
+    def walk(self, value, location: str, in_conditions: bool = False) -> None:
+        """
+        Recursively goes over the properties to find the intrinsic functions.
+        Condition is only a function within the Conditions section, resources properties can be named Condition.
+        """
+        if isinstance(value, dict):
+            for key, sub_value in value.items():
+                if key == "Ref":
+                    self.check_ref(sub_value, location)
+                elif key == "Fn::GetAtt":
+                    self.check_getatt(sub_value, location)
+                elif key == "Fn::FindInMap":
+                    self.check_findinmap(sub_value, location)
+                elif key == "Fn::Sub":
+                    self.check_sub(sub_value, location)
+                elif key == "Fn::If" and isinstance(sub_value, list) and sub_value:
+                    self.check_condition(sub_value[0], location)
+                elif key == "Condition" and in_conditions:
+                    self.check_condition(sub_value, location)
+                self.walk(sub_value, location, in_conditions)
+        elif isinstance(value, list):
+            for item in value:
+                self.walk(item, location, in_conditions)
+
+    def validate(self, template: dict) -> list[str]:
+        for name, resource in template.get("Resources", {}).items():
+            depends_on = resource.get("DependsOn", [])
+            for dependency in (
+                [depends_on] if isinstance(depends_on, str) else depends_on
+            ):
+                if dependency not in self.resources:
+                    self.errors.append(
+                        f"Resources.{name} - DependsOn undeclared resource {dependency}"
+                    )
+            self.check_condition(resource.get("Condition"), f"Resources.{name}")
+            self.walk(resource.get("Properties", {}), f"Resources.{name}")
+        for name, definition in template.get("Outputs", {}).items():
+            self.check_condition(definition.get("Condition"), f"Outputs.{name}")
+            self.walk(definition, f"Outputs.{name}")
+        for name, definition in template.get("Conditions", {}).items():
+            self.walk(definition, f"Conditions.{name}", in_conditions=True)
+        return self.errors
+
+
+def validate_template_references(template: dict, template_name: str = None) -> None:
+    """
+    Validates that all the Ref, GetAtt, FindInMap, Sub and conditions of the template point to something declared.
+
+    :param dict template: the template as a dict
+    :param str template_name: the name of the template, for errors reporting
+    :raises: TemplateValidationError
+    """
+    errors = TemplateReferences(template).validate(template)
+    if errors:
+        raise TemplateValidationError(
+            f"{template_name} - {len(errors)} dangling references found", errors
+        )
@@ -5,6 +5,7 @@
 Global settings and variables re-used across the project
 """
 
+import re
 from os import environ
 
 XFILE_DEST = "ComposeXFile"
@@ -13,3 +14,8 @@ CFN_EXPORT_DELIMITER = environ.get("COMPOSE_X_EXPORTS_SEPARATOR", r"::")
 X_KEY = r"x-"
 X_AWS_KEY = r"x-aws-"
 TAGS_SEPARATOR = environ.get("COMPOSE_X_TAGS_SEPARATOR", r":")
+ROLE_ARN_ARG = "RoleArn"
+X_RESOURCE_ARN_RE = re.compile(r"^(?P<res_key>x-[\S]+)::(?P<res_name>[\S]+)$")
+X_RESOURCE_ATTRIBUTE_RE = re.compile(
+    r"^(?P<res_key>x-[\S]+)::(?P<res_name>[\S]+)::(?P<return_value>[\S]+)$"
+)
@@ -12,28 +12,89 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from ecs_composex.common.settings import ComposeXSettings
 
+import json
 import pprint
+from contextlib import contextmanager
+from datetime import datetime as dt
+from hashlib import sha256
+from os import makedirs, path, remove, replace
 from os.path import abspath
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from weakref import WeakKeyDictionary
 
-import yaml
+from botocore.exceptions import ClientError
 from retry import retry
+from troposphere import Template
 
-try:
-    from yaml import CDumper as Dumper
-except ImportError:
-    from yaml import Dumper
+from ecs_composex.common import CACHE_DIR
+from ecs_composex.common.cfn_validation import validate_template_references
+from ecs_composex.common.logging import LOG
+from ecs_composex.common.serializers import (
+    JSON_MIME,
+    TEMPLATE_BODY_MAX_SIZE,
+    TEMPLATE_URL_MAX_SIZE,
+    YAML_MIME,
+    BodyDigest,
+    DigestWriter,
+    compact_json,
+    dump_content,
+    dump_template,
+)
+
+_CLIENTS: WeakKeyDictionary = WeakKeyDictionary()
+_CLIENTS_LOCK = Lock()
+
+
+def get_session_client(session, service_name: str):
+    """
+    Returns a client for the given service, created once per session.
+    boto3 sessions are not thread-safe but clients are, so the clients are created under a lock and shared
+    across the threads rendering the stacks.
 
-import json
-from os import makedirs
+    :param boto3.session.Session session:
+    :param str service_name:
+    """
+    with _CLIENTS_LOCK:
+        session_clients = _CLIENTS.setdefault(session, {})
+        if service_name not in session_clients:
+            session_clients[service_name] = session.client(service_name)
+        return session_clients[service_name]
 
-from botocore.exceptions import ClientError
-from troposphere import Template
 
-from ecs_composex.common import FILE_PREFIX
-from ecs_composex.common.logging import LOG
+class LocalFiles:
+    """
+    Resolves the paths of the local files the compose files refer to, such as env files.
+    Within a root directory scope, relative paths are resolved from the root directory, and files outside of it
+    are refused. The render server scopes each render to its request directory.
+    """
 
-JSON_MIME = "application/json"
-YAML_MIME = "application/x-yaml"
+    def __init__(self):
+        self.root_dir: str | None = None
+
+    @contextmanager
+    def scoped(self, root_dir: str):
+        previous = self.root_dir
+        self.root_dir = path.realpath(root_dir)
+        try:
+            yield
+        finally:
+            self.root_dir = previous
+
+    def get_path(self, file_path: str) -> str:
+        """
+        :return: the absolute path of the file
+        :raises: ValueError if the file is outside of the root directory
+        """
+        if self.root_dir is None:
+            return abspath(file_path)
+        real_path = path.realpath(path.join(self.root_dir, file_path))
+        if path.commonpath([self.root_dir, real_path]) != self.root_dir:
+            raise ValueError(f"{file_path} is outside of the project directory")
+        return real_path
+
+
+LOCAL_FILES = LocalFiles()
 
 
 def upload_file(
@@ -46,8 +107,8 @@ def upload_file(
 ):
     """Upload template_body to a file in s3 with given prefix and bucket_name
 
-    :param body: Template body, would come from troposphere template to_json() or to_yaml()
-    :type body: str
+    :param body: Template body, or the file object to read it from
+    :type body: str | typing.IO
     :param bucket_name: name of the bucket to upload the file to
     :type bucket_name: str
     :param file_name: Name of the file
@@ -60,10 +121,10 @@ def upload_file(
     if mime is None:
         mime = JSON_MIME
     if prefix is None:
-        prefix = FILE_PREFIX
+        prefix = settings.file_prefix
 
     key = f"{prefix}/{file_name}"
-    client = settings.session.client("s3")
+    client = get_session_client(settings.session, "s3")
     client.put_object(
         Body=body,
         Key=key,
@@ -75,6 +136,198 @@ def upload_file(
     return f"https://s3.amazonaws.com/{bucket_name}/{key}"
 
 
+class LocalJsonCache:
+    """
+    Thread-safe JSON file stored in the compose-x cache directory, loaded once and saved on demand.
+
+    :ivar str file_path: path to the cache file
+    :ivar dict objects: the cache content
+    """
+
+    default_file_name = "cache.json"
+
+    def __init__(self, file_path: str = None):
+        self.file_path = (
+            file_path if file_path else path.join(CACHE_DIR, self.default_file_name)
+        )
+        self.objects: dict = {}
+        self._lock = Lock()
+        try:
+            with open(self.file_path) as cache_fd:
+                self.objects = json.loads(cache_fd.read())
+        except (OSError, ValueError):
+            LOG.debug(f"No valid cache found at {self.file_path}")
+
+    def get(self, key: str):
+        with self._lock:
+            return self.objects.get(key)
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self.objects[key] = value
+
+    def save(self) -> None:
+        """
+        Writes the cache to a temporary file first, unique to the process, then replaces the cache file with it.
+        The cache is only an optimization: failing to write it is logged, and does not fail the execution.
+        """
+        with self._lock:
+            tmp_path = None
+            try:
+                cache_dir = path.dirname(path.abspath(self.file_path))
+                makedirs(cache_dir, exist_ok=True)
+                with NamedTemporaryFile(
+                    "w",
+                    dir=cache_dir,
+                    prefix=f"{path.basename(self.file_path)}.",
+                    suffix=".tmp",
+                    delete=False,
+                ) as cache_fd:
+                    tmp_path = cache_fd.name
+                    cache_fd.write(json.dumps(self.objects, indent=1))
+                replace(tmp_path, self.file_path)
+            except OSError as error:
+                LOG.warning(f"Could not save the cache to {self.file_path}: {error}")
+                if tmp_path and path.exists(tmp_path):
+                    remove(tmp_path)
+
+
+class UploadsManifest(LocalJsonCache):
+    """
+    Local record of the content-addressed objects uploaded to S3, so that unchanged files are not uploaded again.
+    Objects are indexed by s3://bucket/key with their SHA256 and URL
+    """
+
+    default_file_name = "uploads_manifest.json"
+
+    def get_url(self, bucket_name: str, key: str, body_hash: str) -> str | None:
+        _object = self.get(f"s3://{bucket_name}/{key}")
+        if _object and _object["sha256"] == body_hash:
+            return _object["url"]
+        return None
+
+    def record(self, bucket_name: str, key: str, body_hash: str, url: str) -> None:
+        self.set(f"s3://{bucket_name}/{key}", {"sha256": body_hash, "url": url})
+
+
+class ValidationCache(LocalJsonCache):
+    """
+    Local record of the SHA256 of the templates bodies that CloudFormation successfully validated, with the
+    date of validation.
+    """
+
+    default_file_name = "validated_templates.json"
+
+    def is_valid(self, body_hash: str) -> bool:
+        return self.get(body_hash) is not None
+
+    def record(self, body_hash: str) -> None:
+        self.set(body_hash, dt.utcnow().isoformat())
+
+
+class AvailabilityZonesCache(LocalJsonCache):
+    """
+    Local record of the availability zones names of each account and region, so that DescribeAvailabilityZones is
+    called once per account and region, and to render without access to AWS.
+    The zones available differ between accounts, so the entries are indexed by account ID and region.
+    """
+
+    default_file_name = "availability_zones.json"
+
+    def get_zones(self, account_id: str, region: str) -> list[str] | None:
+        entry = self.get(f"{account_id}:{region}")
+        return entry["Zones"] if isinstance(entry, dict) else None
+
+    def get_latest_zones(self, region: str) -> list[str] | None:
+        """
+        The zones of the region last recorded, for any account, for the offline mode where the account is not known.
+        """
+        with self._lock:
+            entries = [
+                entry
+                for key, entry in self.objects.items()
+                if key.endswith(f":{region}") and isinstance(entry, dict)
+            ]
+        if not entries:
+            return None
+        return max(entries, key=lambda entry: entry["Date"])["Zones"]
+
+    def record(self, account_id: str, region: str, zones: list[str]) -> None:
+        self.set(
+            f"{account_id}:{region}",
+            {"Zones": zones, "Date": dt.utcnow().isoformat()},
+        )
+
+
+def object_exists(client, bucket_name: str, key: str) -> bool:
+    """
+    Checks whether the object exists in the bucket.
+
+    :param client: S3 client
+    :param str bucket_name:
+    :param str key:
+    """
+    try:
+        client.head_object(Bucket=bucket_name, Key=key)
+        return True
+    except ClientError as error:
+        if error.response["Error"]["Code"] in ["404", "NoSuchKey", "403"]:
+            return False
+        raise
+
+
+def get_body_hash(body: str, generated_on: str = None) -> str:
+    """
+    Returns the SHA256 of the body. The generation date set in the templates metadata changes on every execution,
+    so it is left out of the hash.
+    """
+    if generated_on:
+        body = body.replace(generated_on, "")
+    return sha256(body.encode("utf-8")).hexdigest()
+
+
+def upload_content_addressed_file(
+    body: str,
+    bucket_name: str,
+    file_name: str,
+    settings: ComposeXSettings,
+    mime: str = None,
+    body_hash: str = None,
+) -> str:
+    """
+    Uploads the file to S3 under a key derived from the SHA256 of its body. If the uploads manifest, or the bucket
+    when settings.verify_uploads is set, already has the object, the upload is skipped and its URL is re-used.
+
+    :param body: the body, or the file object to read it from, in which case body_hash must be set.
+    :param str body_hash: the SHA256 of the body, as per get_body_hash, if already known.
+    :returns: url_path, the https://s3.amazonaws.com/ URL to the file
+    :rtype: str
+    """
+    if body_hash is None:
+        body_hash = get_body_hash(body, settings.generated_on)
+    prefix = (
+        f"{settings.bucket_prefix_path}/{body_hash}"
+        if settings.bucket_prefix_path
+        else body_hash
+    )
+    key = f"{prefix}/{file_name}"
+    manifest = settings.uploads_manifest
+    url = manifest.get_url(bucket_name, key, body_hash)
+    if url and not settings.verify_uploads:
+        LOG.info(f"{file_name} is unchanged. Skipping upload.")
+        return url
+    if settings.verify_uploads and object_exists(
+        get_session_client(settings.session, "s3"), bucket_name, key
+    ):
+        LOG.info(f"{file_name} already in s3://{bucket_name}/{key}. Skipping upload.")
+        url = f"https://s3.amazonaws.com/{bucket_name}/{key}"
+    else:
+        url = upload_file(body, bucket_name, file_name, settings, prefix, mime)
+        LOG.info(f"{file_name} uploaded successfully to {url}")
+    manifest.record(bucket_name, key, body_hash, url)
+    return url
+
+
 class RetryThis(Exception):
     pass
 
@@ -88,7 +341,7 @@ def validate_wrapper(session, body: str = None, url: str = None):
     :param url:
     :return:
     """
-    client = session.client("cloudformation")
+    client = get_session_client(session, "cloudformation")
     try:
         if url:
             client.validate_template(TemplateURL=url)
@@ -105,9 +358,12 @@ class FileArtifact:
     Class to handle files artifacts, such as configuration files or templates.
     It will allow to upload the content to S3 or write to local filesystem.
     It also handles CloudFormation templates validation.
+    The templates and content are serialized straight to the output file, which is then read for upload.
 
     :cvar str url: The URL in S3 where the file will be uploaded to or available from.
     :cvar str body: The content of the FileArtifact
+    :cvar str body_hash: SHA256 of the body, as per get_body_hash, once written.
+    :cvar int body_size: Size of the body in bytes, once written.
     :cvar troposphere.Template template: the CFN template
     :cvar str file_name: the base name of the file
     :cvar str mime: MIME-type of the file
@@ -134,8 +390,12 @@ class FileArtifact:
         self.template = None
         self.content = None
         self.file_name = file_name
-        self.body = None
+        self._body = None
+        self.body_hash = None
+        self.body_size = None
+        self.template_dict = None
         self.url = None
+        self.generated_on = settings.generated_on
         if file_format is None:
             file_format = settings.format
         if template is not None and not isinstance(template, Template):
@@ -164,58 +424,148 @@ class FileArtifact:
             raise TypeError("format is of type", type(file_format), "expected", str)
         self.define_file_specs(file_name, file_format, settings)
         self.file_path = f"{settings.output_dir}/{self.file_name}"
+        output_dir = abspath(settings.output_dir)
+        if path.commonpath([output_dir, abspath(self.file_path)]) != output_dir:
+            raise ValueError(
+                f"{self.file_name} would be written outside of {settings.output_dir}"
+            )
 
     def __repr__(self):
         return self.file_path
 
+    @property
+    def body(self) -> str | None:
+        """
+        The content of the file. Once written, it is read back from the file only when needed.
+        """
+        if self._body is None and self.body_hash is not None:
+            with open(self.file_path) as body_fd:
+                self._body = body_fd.read()
+        return self._body
+
+    @body.setter
+    def body(self, body: str | None) -> None:
+        self._body = body
+        self.body_hash = (
+            get_body_hash(body, self.generated_on) if body is not None else None
+        )
+        self.body_size = len(body.encode("utf-8")) if body is not None else None
+
     def upload(self, settings: ComposeXSettings):
         """
         Method to handle uploading the files to S3.
         """
-        self.url = upload_file(
-            body=self.body,
-            settings=settings,
-            bucket_name=settings.bucket_name,
-            file_name=self.file_name,
-            mime=self.mime,
-        )
+        if self.body_hash is None:
+            self.write(settings)
+        with open(self.file_path, "rb") as body_fd:
+            if settings.content_hash_uploads:
+                self.url = upload_content_addressed_file(
+                    body=body_fd,
+                    settings=settings,
+                    bucket_name=settings.bucket_name,
+                    file_name=self.file_name,
+                    mime=self.mime,
+                    body_hash=self.body_hash,
+                )
+                return
+            self.url = upload_file(
+                body=body_fd,
+                settings=settings,
+                bucket_name=settings.bucket_name,
+                file_name=self.file_name,
+                mime=self.mime,
+            )
         LOG.info(f"{self.file_name} uploaded successfully to {self.url}")
 
     def write(self, settings):
         """
         Method to write the files to local filesystem based on parameters (directory name etc.)
+        The body is serialized straight to the file, and its SHA256 computed along the way.
         """
         try:
             makedirs(settings.output_dir, exist_ok=True)
             LOG.debug(f"Created directory {settings.output_dir} to store files")
         except FileExistsError:
             LOG.debug(f"Output directory {settings.output_dir} already exists")
+        if self.template is not None and self.template_dict is None:
+            self.define_body()
+        digest = BodyDigest(self.generated_on)
         with open(self.file_path, "w") as template_fd:
-            template_fd.write(self.body)
-            if settings.no_upload:
-                LOG.info(
-                    f"Template {self.file_name} written successfully at {abspath(self.file_path)}"
+            stream = DigestWriter(template_fd, digest)
+            if self._body is not None:
+                stream.write(self._body)
+            elif self.template_dict is not None:
+                dump_template(
+                    self.template_dict, stream, self.mime, compact=settings.compact
                 )
+            elif self.content is not None:
+                try:
+                    dump_content(self.content, stream, self.mime)
+                except Exception as error:
+                    pp = pprint.PrettyPrinter(indent=2)
+                    pp.pprint(self.content)
+                    raise error
+            stream.flush()
+        self.body_hash = digest.hexdigest()
+        self.body_size = digest.size
+        if self.template_dict is not None and self.body_size > TEMPLATE_URL_MAX_SIZE:
+            LOG.warning(
+                f"Template {self.file_name} is {self.body_size} bytes, over the CloudFormation limit of"
+                f" {TEMPLATE_URL_MAX_SIZE} bytes."
+            )
+        if settings.no_upload:
+            LOG.info(
+                f"Template {self.file_name} written successfully at {abspath(self.file_path)}"
+            )
+
+    def get_validation_body(self) -> str | None:
+        """
+        Returns the body to validate with TemplateBody. Templates too big for it are validated in compact JSON,
+        if that fits.
+        """
+        if self.body_size < TEMPLATE_BODY_MAX_SIZE:
+            return self.body
+        if self.template_dict is not None:
+            body = compact_json(self.template_dict)
+            if len(body.encode("utf-8")) < TEMPLATE_BODY_MAX_SIZE:
+                LOG.debug(f"Validating {self.file_name} in compact JSON")
+                return body
+        return None
 
     def validate(self, settings):
         """
-        Method to validate the CloudFormation template, either via URL once uploaded to S3 or via TemplateBody
+        Method to validate the CloudFormation template, either via URL once uploaded to S3 or via TemplateBody.
+        Templates are first checked locally for dangling references. Bodies already validated by CloudFormation,
+        per the validation cache, are not sent to CloudFormation again, nor any in offline mode.
         """
+        if self.template_dict is not None:
+            validate_template_references(self.template_dict, self.file_name)
+        if settings.offline:
+            LOG.debug(f"Offline - {self.file_name} not validated by CloudFormation")
+            return
+        if self.body_hash is None:
+            self.write(settings)
+        body_hash = self.body_hash
+        if settings.validation_cache and settings.validation_cache.is_valid(body_hash):
+            LOG.debug(f"Template {self.file_name} unchanged since last validation.")
+            return
         try:
             if not settings.no_upload and self.url:
                 validate_wrapper(settings.session, url=self.url)
             elif settings.no_upload or not self.url:
-                if not self.file_path:
-                    self.write(settings)
                 LOG.debug(f"No upload - Validating template body - {self.file_path}")
-                if len(self.body) >= 51200:
+                validation_body = self.get_validation_body()
+                if validation_body is None:
                     LOG.warning(
                         f"Template body for {self.file_name} is too big for local validation."
                         " No upload is True, so skipping."
                     )
+                    return
                 else:
-                    validate_wrapper(settings.session, body=self.body)
+                    validate_wrapper(settings.session, body=validation_body)
             LOG.debug(f"Template {self.file_name} was validated successfully by CFN")
+            if settings.validation_cache:
+                settings.validation_cache.record(body_hash)
         except ClientError as error:
             LOG.error(error)
             with open(f"/tmp/{settings.name}.{settings.format}", "w") as failed_file_fd:
@@ -227,28 +577,27 @@ class FileArtifact:
 
     def define_body(self):
         """
-        Method to define the body of the file artifact. Sets the mime type that will be used for upload into S3.
+        Method to define the template dict of the file artifact, which is serialized when writing the file.
+        The compose-x metadata of the template is stamped with the generation date of the render.
         """
         if isinstance(self.template, Template):
             try:
-                if self.mime == YAML_MIME:
-                    self.body = self.template.to_yaml(clean_up=True, long_form=True)
-                else:
-                    self.body = self.template.to_json()
+                self.template_dict = self.template.to_dict()
             except Exception as error:
-                pp = pprint.PrettyPrinter(indent=2)
-                pp.pprint(self.template.to_dict())
-                raise error
-        elif isinstance(self.content, (list, dict, tuple)):
-            try:
-                if self.mime == YAML_MIME:
-                    self.body = yaml.dump(self.content, Dumper=Dumper)
-                elif self.mime == JSON_MIME:
-                    self.body = json.dumps(self.content, indent=4)
-            except Exception as error:
-                pp = pprint.PrettyPrinter(indent=2)
-                pp.pprint(self.content)
+                LOG.error(f"Failed to render {self.file_name}")
                 raise error
+            metadata = self.template_dict.get("Metadata")
+            if (
+                isinstance(metadata, dict)
+                and metadata.get("Type") == "ComposeX"
+                and isinstance(metadata.get("Properties"), dict)
+            ):
+                self.template_dict["Metadata"] = dict(
+                    metadata,
+                    Properties=dict(
+                        metadata["Properties"], GeneratedOn=self.generated_on
+                    ),
+                )
 
     def define_file_specs(self, file_name, file_format, settings):
         """
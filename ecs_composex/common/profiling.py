@@ -0,0 +1,194 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2025 John Mille <john@compose-x.io>
+
+"""
+Profiling of the templates generation, per phase, module, family and stack.
+
+Records the wall time, CPU time and peak memory of each phase, and writes them as a Chrome trace (JSON), which
+can be opened with chrome://tracing or https://ui.perfetto.dev. The memory is traced with tracemalloc, for the
+phases of the main thread only, as the stacks rendered concurrently share the process memory.
+"""
+
+from __future__ import annotations
+
+import json
+import tracemalloc
+from contextlib import contextmanager
+from os import getpid, makedirs, path
+from threading import Lock, current_thread, get_ident, local, main_thread
+from time import perf_counter_ns, process_time_ns, thread_time_ns
+
+from ecs_composex import __version__
+from ecs_composex.common.logging import LOG
+
+SCOPES = ("module", "family", "stack")
+
+
+class PhaseFrame:
+    """
+    Phase in progress, with its start time and memory peak so far
+    """
+
+    def __init__(self, memory: int):
+        self.wall_start: int = perf_counter_ns()
+        self.cpu_start: int = (
+            process_time_ns() if memory is not None else thread_time_ns()
+        )
+        self.memory_start = memory
+        self.memory_peak: int = memory or 0
+
+
+class Profiler:
+    """
+    Records the phases of the execution as Chrome trace events. When disabled, phases are no-op.
+
+    :ivar bool enabled: whether phases are recorded
+    :ivar list[dict] events: the trace events recorded
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.events: list[dict] = []
+        self._lock = Lock()
+        self._local = local()
+        self._threads: dict = {}
+        self._origin: int = perf_counter_ns()
+        self._traces_memory = False
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._traces_memory = True
+
+    def _get_frames(self) -> list[PhaseFrame]:
+        if not hasattr(self._local, "frames"):
+            self._local.frames = []
+            with self._lock:
+                self._threads[get_ident()] = current_thread().name
+        return self._local.frames
+
+    @contextmanager
+    def phase(self, name: str, **scope):
+        """
+        Records the phase, as a complete event, once done.
+
+        :param str name: name of the phase
+        :param scope: the module, family or stack the phase is for, if any.
+        """
+        if not self.enabled:
+            yield
+            return
+        frames = self._get_frames()
+        memory = None
+        if current_thread() is main_thread() and tracemalloc.is_tracing():
+            memory, peak = tracemalloc.get_traced_memory()
+            if frames:
+                frames[-1].memory_peak = max(frames[-1].memory_peak, peak)
+            tracemalloc.reset_peak()
+        frame = PhaseFrame(memory)
+        frames.append(frame)
+        try:
+            yield
+        finally:
+            frames.pop()
+            self.record(name, frame, scope, frames)
+
+    def record(
+        self, name: str, frame: PhaseFrame, scope: dict, frames: list[PhaseFrame]
+    ) -> None:
+        wall_end = perf_counter_ns()
+        if frame.memory_start is not None:
+            cpu_time = process_time_ns() - frame.cpu_start
+        else:
+            cpu_time = thread_time_ns() - frame.cpu_start
+        category = next((key for key in SCOPES if key in scope), "phase")
+        args: dict = {"cpu_ms": round(cpu_time / 1e6, 3)}
+        args.update(scope)
+        if frame.memory_start is not None:
+            memory, peak = tracemalloc.get_traced_memory()
+            frame.memory_peak = max(frame.memory_peak, peak)
+            args["peak_memory_kb"] = frame.memory_peak // 1024
+            args["memory_delta_kb"] = (memory - frame.memory_start) // 1024
+            if frames:
+                frames[-1].memory_peak = max(frames[-1].memory_peak, frame.memory_peak)
+            tracemalloc.reset_peak()
+        event = {
+            "name": f"{name} ({scope[category]})" if category in scope else name,
+            "cat": category,
+            "ph": "X",
+            "ts": (frame.wall_start - self._origin) / 1e3,
+            "dur": (wall_end - frame.wall_start) / 1e3,
+            "pid": getpid(),
+            "tid": get_ident(),
+            "args": args,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def get_trace(self) -> dict:
+        """
+        :return: the Chrome trace, with the threads names
+        """
+        threads_names = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": getpid(),
+                "tid": thread_id,
+                "args": {"name": thread_name},
+            }
+            for thread_id, thread_name in self._threads.items()
+        ]
+        return {
+            "traceEvents": threads_names + sorted(self.events, key=lambda e: e["ts"]),
+            "displayTimeUnit": "ms",
+            "otherData": {"version": __version__},
+        }
+
+    def save(self, file_path: str) -> None:
+        """
+        Writes the Chrome trace to file_path
+        """
+        if path.dirname(file_path):
+            makedirs(path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w") as trace_fd:
+            json.dump(self.get_trace(), trace_fd)
+        LOG.info(f"Profile trace written to {path.abspath(file_path)}")
+
+    def get_totals(self, category: str) -> dict:
+        """
+        :return: total wall time (ms) of the events of the category, per scope (module, family, stack)
+        """
+        totals: dict = {}
+        for event in self.events:
+            if event["cat"] != category:
+                continue
+            key = event["args"].get(category, event["name"])
+            totals[key] = totals.get(key, 0.0) + event["dur"] / 1e3
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def log_summary(self, top: int = 5) -> None:
+        """
+        Logs the time of each phase, and the slowest modules, families and stacks.
+        """
+        if not self.enabled:
+            return
+        for event in sorted(self.events, key=lambda e: e["ts"]):
+            if event["cat"] == "phase":
+                LOG.info(
+                    f"Profile - {event['name']}: {event['dur'] / 1e3:.1f}ms"
+                    f" (CPU {event['args']['cpu_ms']:.1f}ms)"
+                )
+        for category in SCOPES:
+            totals = self.get_totals(category)
+            if totals:
+                LOG.info(
+                    f"Profile - slowest {category}: "
+                    + ", ".join(
+                        f"{key} {value:.1f}ms"
+                        for key, value in list(totals.items())[:top]
+                    )
+                )
+
+    def stop(self) -> None:
+        if self._traces_memory:
+            tracemalloc.stop()
+            self._traces_memory = False
@@ -0,0 +1,232 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille <john@compose-x.io>
+
+"""
+Serializers writing the templates and files content straight to their output stream, in JSON or YAML.
+
+The default rendering is the indented JSON, or the long-form YAML of cfn-flip. The compact rendering removes the
+indentation, with JSON without whitespaces and YAML in flow style on a single line, so that bodies stay further away
+from the CloudFormation size limits. YAML is emitted by libyaml when available.
+"""
+
+from __future__ import annotations
+
+import json
+from hashlib import sha256
+from typing import IO
+
+import yaml
+from cfn_clean import cfn_literal_parser, clean
+from cfn_flip.yaml_dumper import LongCleanDumper
+from cfn_tools._config import config
+from cfn_tools.odict import ODict
+from yaml.representer import Representer
+from yaml.resolver import Resolver
+
+try:
+    from yaml.cyaml import CDumper as Dumper
+    from yaml.cyaml import CEmitter
+except ImportError:
+    from yaml import Dumper
+
+    CEmitter = None
+
+JSON_MIME = "application/json"
+YAML_MIME = "application/x-yaml"
+
+# Maximum size of a template body for CloudFormation ValidateTemplate
+TEMPLATE_BODY_MAX_SIZE = 51200
+# Maximum size of a template body from S3 for CloudFormation
+TEMPLATE_URL_MAX_SIZE = 1024 * 1024
+
+
+class BodyDigest:
+    """
+    SHA256 and size of a body written in chunks. The generation date is left out of the SHA256, as per
+    get_body_hash, so the end of each chunk is kept until the next one, in case the date starts there.
+    """
+
+    def __init__(self, generated_on: str = None):
+        self._sha256 = sha256()
+        self._generated_on = generated_on
+        self._pending: str = ""
+        self.size: int = 0
+
+    def update(self, chunk: str) -> None:
+        self.size += len(chunk.encode("utf-8"))
+        text = self._pending + chunk
+        keep = 0
+        if self._generated_on:
+            text = text.replace(self._generated_on, "")
+            keep = len(self._generated_on) - 1
+        if len(text) > keep:
+            self._sha256.update(text[: len(text) - keep].encode("utf-8"))
+            text = text[len(text) - keep :]
+        self._pending = text
+
+    def hexdigest(self) -> str:
+        sha = self._sha256.copy()
+        sha.update(self._pending.encode("utf-8"))
+        return sha.hexdigest()
+
+
+class DigestWriter:
+    """
+    Text stream that writes to the underlying stream in blocks of buffer_size, and updates the digest with
+    each block written. Must be flushed once done.
+    """
+
+    buffer_size = 64 * 1024
+
+    def __init__(self, stream: IO, digest: BodyDigest):
+        self.stream = stream
+        self.digest = digest
+        self._chunks: list[str] = []
+        self._buffered: int = 0
+
+    def write(self, chunk: str) -> None:
+        self._chunks.append(chunk)
+        self._buffered += len(chunk)
+        if self._buffered >= self.buffer_size:
+            self._write_buffer()
+
+    def _write_buffer(self) -> None:
+        block = "".join(self._chunks)
+        self._chunks.clear()
+        self._buffered = 0
+        self.stream.write(block)
+        self.digest.update(block)
+
+    def flush(self) -> None:
+        if self._chunks:
+            self._write_buffer()
+        self.stream.flush()
+
+
+if CEmitter is not None:
+
+    class CompactCfnDumper(CEmitter, LongCleanDumper):
+        """
+        The cfn-flip long-form YAML representation, emitted by libyaml
+        """
+
+        def __init__(
+            self,
+            stream,
+            default_style=None,
+            default_flow_style=False,
+            canonical=None,
+            indent=None,
+            width=None,
+            allow_unicode=None,
+            line_break=None,
+            encoding=None,
+            explicit_start=None,
+            explicit_end=None,
+            version=None,
+            tags=None,
+            sort_keys=True,
+        ):
+            CEmitter.__init__(
+                self,
+                stream,
+                canonical=canonical,
+                indent=indent,
+                width=width,
+                encoding=encoding,
+                allow_unicode=allow_unicode,
+                line_break=line_break,
+                explicit_start=explicit_start,
+                explicit_end=explicit_end,
+                version=version,
+                tags=tags,
+            )
+            Representer.__init__(
+                self,
+                default_style=default_style,
+                default_flow_style=default_flow_style,
+                sort_keys=sort_keys,
+            )
+            Resolver.__init__(self)
+
+    # libyaml does not wrap the lines when the width is negative
+    COMPACT_YAML_WIDTH = -1
+
+else:
+    CompactCfnDumper = LongCleanDumper
+    COMPACT_YAML_WIDTH = float("inf")
+
+
+def to_cfn_data(value):
+    """
+    Returns the value with the dicts as cfn-flip ODict, with their keys sorted, as cfn-flip loads them
+    from the JSON dump of the template.
+    """
+    if isinstance(value, dict):
+        return ODict(
+            (
+                key if isinstance(key, str) else json.dumps(key),
+                to_cfn_data(sub_value),
+            )
+            for key, sub_value in sorted(value.items())
+        )
+    if isinstance(value, (list, tuple)):
+        return [to_cfn_data(item) for item in value]
+    return value
+
+
+def dump_template(
+    template_dict: dict, stream: IO, mime: str, compact: bool = False
+) -> None:
+    """
+    Writes the template to the stream, in JSON or in the cfn-flip cleaned-up long-form YAML.
+
+    :param dict template_dict: the template, from Template.to_dict()
+    :param stream: text stream to write to
+    :param str mime: JSON_MIME or YAML_MIME
+    :param bool compact: Removes the indentation. YAML is in flow style.
+    """
+    if mime == YAML_MIME and compact:
+        yaml.dump(
+            clean(to_cfn_data(template_dict)),
+            stream,
+            Dumper=CompactCfnDumper,
+            default_flow_style=True,
+            allow_unicode=True,
+            width=COMPACT_YAML_WIDTH,
+        )
+    elif mime == YAML_MIME:
+        data = cfn_literal_parser(clean(to_cfn_data(template_dict)))
+        yaml.dump(
+            data,
+            stream,
+            Dumper=LongCleanDumper,
+            default_flow_style=False,
+            allow_unicode=True,
+            width=config.max_col_width,
+        )
+    elif compact:
+        stream.write(compact_json(template_dict))
+    else:
+        json.dump(
+            template_dict, stream, indent=1, sort_keys=True, separators=(",", ": ")
+        )
+
+
+def compact_json(template_dict: dict) -> str:
+    """
+    Returns the template as JSON without whitespaces, from the C encoder.
+    """
+    return json.dumps(template_dict, sort_keys=True, separators=(",", ":"))
+
+
+def dump_content(content: dict | list | tuple | str, stream: IO, mime: str) -> None:
+    """
+    Writes the file content to the stream
+    """
+    if isinstance(content, str):
+        stream.write(content)
+    elif mime == YAML_MIME:
+        yaml.dump(content, stream, Dumper=Dumper)
+    elif mime == JSON_MIME:
+        json.dump(content, stream, indent=4)
@@ -7,17 +7,18 @@ Module for the ComposeXSettings class
 
 from __future__ import annotations
 
-import json
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ecs_composex.ecs_cluster import EcsCluster
+    from ecs_composex.mods_manager import XResourcesRegistry
 
 from copy import deepcopy
 from datetime import datetime as dt
-from re import compile, sub
+from os import path
+from re import sub
+from uuid import uuid4
 
-import boto3
 import yaml
 
 try:
@@ -29,7 +30,7 @@ except ImportError:
 
 from botocore.exceptions import ClientError
 from cfn_flip.yaml_dumper import LongCleanDumper
-from compose_x_common.aws import get_account_id, validate_iam_role_arn
+from compose_x_common.aws import validate_iam_role_arn
 from compose_x_common.compose_x_common import keyisset, set_else_none
 from compose_x_render.compose_x_render import ComposeDefinition
 from importlib_resources import files as pkg_files
@@ -37,21 +38,44 @@ from troposphere import AWSObject
 
 from ecs_composex import __version__
 from ecs_composex.common import NONALPHANUM
-from ecs_composex.common.aws import get_cross_role_session
+from ecs_composex.common.aws import (
+    ThreadSafeSession,
+    block_api_calls,
+    get_account_id,
+    get_cross_role_session,
+)
+from ecs_composex.common.aws_calls import API_CALLS, parse_budgets
+from ecs_composex.common.ecs_composex import X_RESOURCE_ARN_RE, X_RESOURCE_ATTRIBUTE_RE
+from ecs_composex.common.files import (
+    AvailabilityZonesCache,
+    UploadsManifest,
+    ValidationCache,
+)
 from ecs_composex.common.logging import LOG
+from ecs_composex.common.profiling import Profiler
+from ecs_composex.common.settings_args import DEFAULT_IMAGE_DIGESTS_TTL, SettingsArgs
 from ecs_composex.common.stacks import ComposeXStack
+from ecs_composex.compose.compose_document import CopyOnWriteDict
 from ecs_composex.compose.compose_networks import ComposeNetwork
 from ecs_composex.compose.compose_secrets import ComposeSecret
 from ecs_composex.compose.compose_services import ComposeService
+from ecs_composex.compose.compose_services.service_image.ecr_helpers import (
+    EcrImagesIndex,
+)
+from ecs_composex.compose.compose_services.service_image.registry_digests import (
+    ImageDigestsCache,
+    ImageDigestsResolver,
+)
 from ecs_composex.compose.compose_volumes import ComposeVolume
 from ecs_composex.compose.x_resources import XResource
+from ecs_composex.compose.x_resources.lookup_cache import LookupCache, parse_ttl
 from ecs_composex.ecs.ecs_family import ComposeFamily
 from ecs_composex.iam import ROLE_ARN_ARG
 from ecs_composex.utils.init_ecs import set_ecs_settings
 from ecs_composex.utils.init_s3 import create_bucket
 
 
-class ComposeXSettings:
+class ComposeXSettings(SettingsArgs):
     """
     Class to handle the settings to use for ECS ComposeX.
 
@@ -60,92 +84,40 @@ class ComposeXSettings:
     :ivar ModManager mod_manager:
     """
 
-    name_arg = "Name"
-    cluster_name_arg = "ClusterName"
-
-    create_vpc_arg = "CreateVpc"
-    create_ec2_arg = "AddComputeResources"
-
-    region_arg = "RegionName"
-    zones_arg = "Zones"
-    arn_arg = ROLE_ARN_ARG
-
-    deploy_arg = "up"
-    render_arg = "render"
-    create_arg = "create"
-    plan_arg = "plan"
-    config_render_arg = "config"
-    command_arg = "command"
-
-    bucket_arg = "BucketName"
-    bucket_prefix_path_arg: str = "S3PrefixPath"
-    input_file_arg = "DockerComposeXFile"
-    output_dir_arg = "OutputDirectory"
-    format_arg = "TemplateFormat"
-    default_format = "json"
-    allowed_formats = ["json", "yaml", "text"]
-    ecr_arg = "SkipScanEcrImages"
-
-    vpc_cidr_arg = "VpcCidr"
-    single_nat_arg = "SingleNat"
-
-    default_vpc_cidr = "100.127.254.0/24"
-    default_output_dir = f"/tmp/{int(dt.utcnow().timestamp())}"
-
-    active_commands = [
-        {
-            "name": deploy_arg,
-            "help": "Generates & Validates the CFN templates, Creates/Updates stack in CFN",
-        },
-        {
-            "name": render_arg,
-            "help": "Generates & Validates the CFN templates locally. No upload to S3",
-        },
-        {
-            "name": create_arg,
-            "help": "Generates & Validates the CFN templates locally. Uploads files to S3",
-        },
-        {
-            "name": plan_arg,
-            "help": "Creates a recursive change-set to show the diff prior to an update",
-        },
-    ]
-    validation_commands = [
-        {
-            "name": config_render_arg,
-            "help": "Merges docker-compose files to provide with the final compose content version",
-        }
-    ]
-    neutral_commands = [
-        {
-            "name": "init",
-            "help": "Initializes your AWS Account with prerequisites settings for ECS",
-        },
-        {"name": "version", "help": "ECS ComposeX Version"},
-    ]
-    all_commands = active_commands + validation_commands + neutral_commands
-
     def __init__(
         self,
         content=None,
         profile_name=None,
         session=None,
         for_macro=False,
+        lookup_cache: LookupCache = None,
         **kwargs,
     ):
         """
         Class to init the configuration
+
+        :param LookupCache lookup_cache: the lookup cache to use, instead of the one set by the arguments
         """
         self.__args = deepcopy(kwargs)
+        self.profiler = Profiler(keyisset(self.profile_arg, kwargs))
+        self._profile_trace = set_else_none(self.profile_arg, kwargs)
         self.for_cfn_macro = for_macro
-        self.session = boto3.session.Session()
+        self.session = ThreadSafeSession()
+        self.offline = keyisset(self.offline_arg, kwargs)
         self.override_session(session, profile_name, kwargs)
+        generated_on = dt.utcnow()
+        self.generated_on: str = generated_on.isoformat()
+        self.file_prefix: str = (
+            f'{generated_on.strftime("%Y/%m/%d/%H%M")}/{uuid4().hex[:6]}'
+        )
         self.aws_region = (
             kwargs[self.region_arg]
             if keyisset(self.region_arg, kwargs)
             else self.session.region_name
         )
-        self.region_mappings = self.import_regional_mapping()
+        self.zones: list[str] = set_else_none(self.zones_arg, kwargs, [])
+        self._region_mappings: list[dict] | None = None
+        self._azs_cache: AvailabilityZonesCache | None = None
 
         self.bucket_name = (
             None if not keyisset(self.bucket_arg, kwargs) else kwargs[self.bucket_arg]
@@ -162,9 +134,18 @@ class ComposeXSettings:
         self.secrets_mappings = {}
         self.mappings = {}
         self.families: dict[str, ComposeFamily] = {}
-        self.account_id = None
+        self._account_id: str | None = None
+        self._ecr_images: EcrImagesIndex | None = None
+        self._image_digests: ImageDigestsResolver | None = None
+        self.lookup_workers = set_else_none(
+            self.lookup_workers_arg, kwargs, self.default_lookup_workers
+        )
+        self.image_digests_ttl = parse_ttl(
+            set_else_none(self.image_digests_ttl_arg, kwargs, DEFAULT_IMAGE_DIGESTS_TTL)
+        )
         self.output_dir = self.default_output_dir
         self.format = self.default_format
+        self.compact = False
 
         self.requires_private_namespace = False
         self.vpc_cidr = None
@@ -173,20 +154,60 @@ class ComposeXSettings:
         self.deploy = True if keyisset(self.deploy_arg, kwargs) else False
         self.plan = True if keyisset(self.plan_arg, kwargs) else False
         self.no_upload = True if keyisset(self.render_arg, kwargs) else False
+        self.force_update = keyisset(self.force_update_arg, kwargs)
+        self.wait_for_deployment = keyisset(self.wait_arg, kwargs)
+        self.wait_timeout = set_else_none(
+            self.wait_timeout_arg, kwargs, self.default_wait_timeout
+        )
 
         self.upload = False if self.no_upload else True
         self.parse_command(kwargs, content)
+        if self.offline and (self.upload or self.plan):
+            LOG.warning("Offline - Templates are rendered locally only.")
+            self.upload = False
+            self.no_upload = True
+            self.plan = False
         self.compose_content: dict = {}
         self.original_content: dict = {}
+        if lookup_cache is None and (
+            keyisset(self.lookup_cache_arg, kwargs) or self.offline
+        ):
+            lookup_cache = LookupCache(
+                set_else_none(self.lookup_cache_arg, kwargs),
+                set_else_none(self.lookup_ttl_arg, kwargs),
+                offline=self.offline,
+            )
+        self.lookup_cache: LookupCache | None = lookup_cache
         self.input_file = (
             kwargs[self.input_file_arg] if keyisset(self.input_file_arg, kwargs) else {}
         )
-        self.set_content(kwargs, content)
+        with self.profiler.phase("set_content"):
+            self.set_content(kwargs, content)
         self.set_output_settings(kwargs)
         self.evaluate_private_namespace()
         self.name = kwargs.get(self.name_arg)
         self._ecs_cluster = None
         self.ignore_ecr_findings = keyisset(self.ecr_arg, kwargs)
+        self.ecr_scans_timeout = set_else_none(
+            self.ecr_scans_timeout_arg, kwargs, self.default_ecr_scans_timeout
+        )
+        self.ecr_scans_workers = set_else_none(
+            self.ecr_scans_workers_arg, kwargs, self.default_ecr_scans_workers
+        )
+        self.render_workers = set_else_none(
+            self.render_workers_arg, kwargs, self.default_render_workers
+        )
+        self.api_calls_budgets: dict = parse_budgets(
+            set_else_none(self.api_calls_budget_arg, kwargs)
+        )
+        self.content_hash_uploads = keyisset(self.content_hash_uploads_arg, kwargs)
+        self.verify_uploads = keyisset(self.verify_uploads_arg, kwargs)
+        self._uploads_manifest = None
+        self.validation_cache = (
+            None
+            if keyisset(self.no_validation_cache_arg, kwargs)
+            else ValidationCache()
+        )
         self.x_resources_void = []
         self.mod_manager = None
         self.root_stack = None
@@ -195,10 +216,101 @@ class ComposeXSettings:
     def disable_rollback(self) -> bool:
         return bool(set_else_none("DisableRollback", self.__args, alt_value=False))
 
+    @property
+    def profile_file(self) -> str:
+        """
+        Path to the profile trace file, from --profile or in the output directory.
+        """
+        if isinstance(self._profile_trace, str):
+            return self._profile_trace
+        return path.join(self.output_dir, f"{self.name}.trace.json")
+
+    @property
+    def account_id(self) -> str:
+        """
+        The AWS Account ID of the session, retrieved on first use.
+        """
+        if self._account_id is None:
+            if self.offline:
+                raise LookupError("Offline - The AWS Account ID cannot be retrieved")
+            self._account_id = get_account_id(self.session)
+        return self._account_id
+
+    @account_id.setter
+    def account_id(self, account_id: str) -> None:
+        self._account_id = account_id
+
+    @property
+    def region_mappings(self) -> list[dict]:
+        if self._region_mappings is None:
+            self._region_mappings = self.import_regional_mapping()
+        return self._region_mappings
+
+    @property
+    def azs_cache(self) -> AvailabilityZonesCache:
+        if self._azs_cache is None:
+            self._azs_cache = AvailabilityZonesCache()
+        return self._azs_cache
+
+    @property
+    def aws_azs(self) -> list[str]:
+        """
+        The availability zones names to use, from --azs if set, else from the local cache for the account and region,
+        else from DescribeAvailabilityZones, which are then cached for the account and region.
+        Offline, the account is not known: the zones last cached for the region are used.
+
+        :raises: LookupError when offline and the zones are not set nor cached
+        """
+        if self.zones:
+            return self.zones
+        if self.offline:
+            zones = self.azs_cache.get_latest_zones(self.aws_region)
+            if zones:
+                return zones
+            raise LookupError(
+                f"Offline - No availability zones cached for region {self.aws_region}. Use --azs"
+            )
+        zones = self.azs_cache.get_zones(self.account_id, self.aws_region)
+        if zones:
+            return zones
+        zones = [zone["ZoneName"] for zone in self.region_mappings]
+        self.azs_cache.record(self.account_id, self.aws_region, zones)
+        self.azs_cache.save()
+        return zones
+
     @property
     def ecs_cluster(self) -> EcsCluster:
         return self._ecs_cluster
 
+    @property
+    def uploads_manifest(self) -> UploadsManifest:
+        if self._uploads_manifest is None:
+            self._uploads_manifest = UploadsManifest()
+        return self._uploads_manifest
+
+    @property
+    def ecr_images(self) -> EcrImagesIndex:
+        """
+        The private ECR images of the services, resolved once per repository and image for the execution.
+        """
+        if self._ecr_images is None:
+            self._ecr_images = EcrImagesIndex(self.session)
+        return self._ecr_images
+
+    @property
+    def image_digests(self) -> ImageDigestsResolver:
+        """
+        The docker images digests, resolved once per image from the registries, or the local cache, for the execution.
+        """
+        if self._image_digests is None:
+            self._image_digests = ImageDigestsResolver(
+                ImageDigestsCache(),
+                self.image_digests_ttl,
+                self.lookup_workers,
+                self.offline,
+            )
+        return self._image_digests
+
     @property
     def family_names(self) -> list[str]:
         return [_family.name for _family in self.families.values()]
@@ -233,21 +345,16 @@ class ComposeXSettings:
         return x_resources
 
     def find_resource(self, compose_resource_arn: str) -> XResource:
-        resource_attribute_match_re = compile(
-            r"^(?P<res_key>x-[\S]+)::(?P<res_name>[\S]+)$"
-        )
-        parts = resource_attribute_match_re.match(compose_resource_arn)
+        parts = X_RESOURCE_ARN_RE.match(compose_resource_arn)
         if not parts:
             raise ValueError(
                 compose_resource_arn,
                 "does not match",
-                resource_attribute_match_re.pattern,
+                X_RESOURCE_ARN_RE.pattern,
             )
-        for resource in self.x_resources:
-            if resource.module.res_key == parts.group(
-                "res_key"
-            ) and resource.name == parts.group("res_name"):
-                return resource
+        resource = self.x_resources_registry.by_arn.get(compose_resource_arn)
+        if resource is not None:
+            return resource
         raise LookupError(
             "Unable to find any resource matching",
             compose_resource_arn,
@@ -256,15 +363,10 @@ class ComposeXSettings:
         )
 
     def get_resource_attribute(self, compose_resource_arn: str) -> tuple:
-        import re
-
-        resource_attribute_match_re = re.compile(
-            r"^(?P<res_key>x-[\S]+)::(?P<res_name>[\S]+)::(?P<return_value>[\S]+)$"
-        )
-        parts = resource_attribute_match_re.match(compose_resource_arn)
+        parts = X_RESOURCE_ATTRIBUTE_RE.match(compose_resource_arn)
         if not parts:
             LOG.error(
-                f"{compose_resource_arn} if invalid. Must match, {resource_attribute_match_re.pattern}"
+                f"{compose_resource_arn} if invalid. Must match, {X_RESOURCE_ATTRIBUTE_RE.pattern}"
             )
             return None, None
         try:
@@ -305,19 +407,23 @@ class ComposeXSettings:
         return _stacks
 
     @property
-    def x_resources(self):
+    def x_resources_registry(self) -> XResourcesRegistry:
+        """
+        The indexes of the XResource defined in the execution, maintained by the ModManager.
+        """
+        return self.mod_manager.registry
+
+    @property
+    def x_resources(self) -> list[XResource]:
         """
-        Iterates over all resources defined and returns the list of them
+        Returns the list of all resources defined, in the modules order.
         Only resources that are created from XResource(and children classes) are considered.
         Avoids having to go through stacks down to resources and work backwards
 
         Returns: the list of XResource in the execution.
 
         """
-        _resources = []
-        for name, module in self.mod_manager.modules.items():
-            _resources += module.resources_list
-        return _resources
+        return self.x_resources_registry.resources
 
     def evaluate_private_namespace(self):
         """
@@ -336,7 +442,7 @@ class ComposeXSettings:
         """
         Determines whether the execution will require a VPC.
         """
-        x_resources_require_vpc = any([res.requires_vpc for res in self.x_resources])
+        x_resources_require_vpc = any(res.requires_vpc for res in self.x_resources)
         services_require_vpc = any(
             [
                 family.service_compute.launch_type != "EXTERNAL"
@@ -449,6 +555,38 @@ class ComposeXSettings:
             )
             self.compose_content[ComposeService.main_key][service_name] = service
             self.services.append(service)
+        docker_opts_services = [
+            service
+            for service in self.services
+            if isinstance(service.image.image, str)
+            and keyisset(
+                "InterpolateWithDigest",
+                set_else_none("x-docker_opts", service.definition, {}),
+            )
+        ]
+        if not self.offline:
+            self.ecr_images.resolve(
+                [
+                    service
+                    for service in self.services
+                    if keyisset("InterpolateWithDigest", service.x_ecr)
+                ]
+                + [
+                    service
+                    for service in docker_opts_services
+                    if service.image.private_ecr
+                ]
+            )
+        docker_images = [
+            service.image.image
+            for service in docker_opts_services
+            if self.offline
+            or not service.image.private_ecr
+            or not self.ecr_images.get_resolved_image(service)
+        ]
+        if docker_images:
+            self.image_digests.resolve(docker_images)
+        for service in self.services:
             service.image.interpolate_image_digest(self)
 
     def add_new_family(
@@ -459,6 +597,7 @@ class ComposeXSettings:
                 f"New family {family_name} - "
                 f"Detected {service.name} has multiple families defined. Making a duplicate"
             )
+            # Only the definition view shares its values with the original. The rest of the service is copied.
             the_service = deepcopy(service)
             family = ComposeFamily([the_service], family_name)
             self.families[family.logical_name] = family
@@ -519,9 +658,7 @@ class ComposeXSettings:
 
     def set_content(self, kwargs, content=None, fully_load=True):
         """Method to initialize the compose content and validate as per the compose-x specs schemas."""
-        from jsonschema import Draft7Validator
-
-        from ecs_composex.specs import REGISTRY
+        from ecs_composex.specs import get_spec_validator
 
         files = (
             []
@@ -531,16 +668,10 @@ class ComposeXSettings:
         LOG.debug(f"Input files: {files}")
         content_def = ComposeDefinition(files, content)
         self.original_content = content_def.definition
-        self.compose_content: dict = deepcopy(content_def.definition)
+        self.compose_content: dict = CopyOnWriteDict(content_def.definition)
         source = str(pkg_files("ecs_composex").joinpath("specs/compose-spec.json"))
         LOG.debug(f"Validating against input schema {source}")
-
-        with open(source) as compose_fd:
-            content = compose_fd.read()
-            schema = json.loads(content)
-
-        _eval = Draft7Validator(schema, registry=REGISTRY)
-        _eval.validate(content_def.definition)
+        get_spec_validator(source).validate(content_def.definition)
         if fully_load:
             self.set_secrets()
             self.set_volumes()
@@ -593,10 +724,14 @@ class ComposeXSettings:
         :param dict kwargs: CLI kwargs
         """
         if profile_name and not session:
-            self.session = boto3.session.Session(profile_name=profile_name)
+            self.session = ThreadSafeSession(profile_name=profile_name)
         elif session and not (profile_name or keyisset(self.arn_arg, kwargs)):
             self.session = session
-        if keyisset(self.arn_arg, kwargs):
+        if self.offline:
+            block_api_calls(self.session)
+        if keyisset(self.arn_arg, kwargs) and self.offline:
+            LOG.warning(f"Offline - {kwargs[self.arn_arg]} is not assumed")
+        elif keyisset(self.arn_arg, kwargs):
             validate_iam_role_arn(arn=kwargs[self.arn_arg])
             if session:
                 self.session = get_cross_role_session(
@@ -610,11 +745,12 @@ class ComposeXSettings:
                     kwargs[ROLE_ARN_ARG],
                     session_name=f"ComposeXSettings@{kwargs[self.command_arg]}",
                 )
+        API_CALLS.attach(self.session)
 
     def import_regional_mapping(self) -> list[dict]:
-        return self.session.client("ec2").describe_availability_zones()[
-            "AvailabilityZones"
-        ]
+        return self.session.client(
+            "ec2", region_name=self.aws_region
+        ).describe_availability_zones()["AvailabilityZones"]
 
     def set_output_settings(self, kwargs):
         """
@@ -626,6 +762,7 @@ class ComposeXSettings:
             and kwargs[self.format_arg] in self.allowed_formats
         ):
             self.format = kwargs[self.format_arg]
+        self.compact = keyisset(self.compact_arg, kwargs)
 
         self.output_dir = (
             kwargs[self.output_dir_arg]
@@ -639,23 +776,21 @@ class ComposeXSettings:
         """
         if self.bucket_name and isinstance(self.bucket_name, str):
             return
-        if self.account_id is None:
-            try:
-                self.account_id = get_account_id(session=self.session)
-                self.bucket_name = f"ecs-composex-{self.account_id}-{self.aws_region}"
-            except ClientError as error:
-                code = error.response["Error"]["Code"]
-                message = error.response["Error"]["Message"]
-                if code == "ExpiredToken":
-                    LOG.error(message)
-                    LOG.warning(
-                        "Due to credentials error, we won't attempt to upload to S3."
-                    )
-                else:
-                    LOG.error(error)
-                self.bucket_name = None
-                self.upload = False
-                self.no_upload = True
+        try:
+            self.bucket_name = f"ecs-composex-{self.account_id}-{self.aws_region}"
+        except ClientError as error:
+            code = error.response["Error"]["Code"]
+            message = error.response["Error"]["Message"]
+            if code == "ExpiredToken":
+                LOG.error(message)
+                LOG.warning(
+                    "Due to credentials error, we won't attempt to upload to S3."
+                )
+            else:
+                LOG.error(error)
+            self.bucket_name = None
+            self.upload = False
+            self.no_upload = True
 
     def init_s3(self):
         """
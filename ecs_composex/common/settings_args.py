@@ -0,0 +1,114 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2025 John Mille <john@compose-x.io>
+
+"""
+Arguments names, defaults and commands of ComposeXSettings, kept apart from the settings and their dependencies
+so that the CLI can parse the arguments without importing them.
+"""
+
+from datetime import datetime as dt
+
+from ecs_composex.common.ecs_composex import ROLE_ARN_ARG
+
+DEFAULT_LOOKUP_TTL = "1h"
+DEFAULT_IMAGE_DIGESTS_TTL = "15m"
+
+
+class SettingsArgs:
+    """
+    Names of the ComposeXSettings arguments, their defaults, and the CLI commands.
+    """
+
+    name_arg = "Name"
+    cluster_name_arg = "ClusterName"
+
+    create_vpc_arg = "CreateVpc"
+    create_ec2_arg = "AddComputeResources"
+
+    region_arg = "RegionName"
+    zones_arg = "Zones"
+    arn_arg = ROLE_ARN_ARG
+
+    deploy_arg = "up"
+    render_arg = "render"
+    create_arg = "create"
+    plan_arg = "plan"
+    config_render_arg = "config"
+    command_arg = "command"
+
+    bucket_arg = "BucketName"
+    bucket_prefix_path_arg: str = "S3PrefixPath"
+    input_file_arg = "DockerComposeXFile"
+    output_dir_arg = "OutputDirectory"
+    format_arg = "TemplateFormat"
+    default_format = "json"
+    allowed_formats = ["json", "yaml", "text"]
+    compact_arg = "CompactTemplates"
+    ecr_arg = "SkipScanEcrImages"
+    ecr_scans_timeout_arg = "EcrScansTimeout"
+    default_ecr_scans_timeout = 900
+    render_workers_arg = "RenderWorkers"
+    default_render_workers = 8
+    lookup_workers_arg = "LookupWorkers"
+    default_lookup_workers = 8
+    ecr_scans_workers_arg = "EcrScansWorkers"
+    default_ecr_scans_workers = 4
+    content_hash_uploads_arg = "ContentHashUploads"
+    verify_uploads_arg = "VerifyUploads"
+    no_validation_cache_arg = "NoValidationCache"
+    lookup_cache_arg = "LookupCache"
+    lookup_ttl_arg = "LookupTtl"
+    image_digests_ttl_arg = "ImageDigestsTtl"
+    offline_arg = "Offline"
+    profile_arg = "ProfileTrace"
+    api_calls_budget_arg = "ApiCallsBudget"
+    force_update_arg = "ForceUpdate"
+    wait_arg = "WaitForDeployment"
+    wait_timeout_arg = "WaitTimeout"
+    default_wait_timeout = 3600
+
+    serve_arg = "serve"
+    serve_host_arg = "ServeHost"
+    default_serve_host = "127.0.0.1"
+    serve_port_arg = "ServePort"
+    default_serve_port = 8080
+    serve_socket_arg = "ServeSocket"
+
+    vpc_cidr_arg = "VpcCidr"
+    single_nat_arg = "SingleNat"
+
+    default_vpc_cidr = "100.127.254.0/24"
+    default_output_dir = f"/tmp/{int(dt.utcnow().timestamp())}"
+
+    active_commands = [
+        {
+            "name": deploy_arg,
+            "help": "Generates & Validates the CFN templates, Creates/Updates stack in CFN",
+        },
+        {
+            "name": render_arg,
+            "help": "Generates & Validates the CFN templates locally. No upload to S3",
+        },
+        {
+            "name": create_arg,
+            "help": "Generates & Validates the CFN templates locally. Uploads files to S3",
+        },
+        {
+            "name": plan_arg,
+            "help": "Creates a recursive change-set to show the diff prior to an update",
+        },
+    ]
+    validation_commands = [
+        {
+            "name": config_render_arg,
+            "help": "Merges docker-compose files to provide with the final compose content version",
+        }
+    ]
+    neutral_commands = [
+        {
+            "name": "init",
+            "help": "Initializes your AWS Account with prerequisites settings for ECS",
+        },
+        {"name": "version", "help": "ECS ComposeX Version"},
+    ]
+    all_commands = active_commands + validation_commands + neutral_commands
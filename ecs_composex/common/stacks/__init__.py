@@ -14,6 +14,7 @@ if TYPE_CHECKING:
     from ecs_composex.common.settings import ComposeXSettings
     from ecs_composex.vpc.vpc_stack import XStack as VpcStack
 
+from concurrent.futures import ThreadPoolExecutor
 from os import path
 
 from compose_x_common.compose_x_common import keyisset
@@ -30,9 +31,14 @@ from troposphere import (
 from troposphere.cloudformation import Stack
 
 from ecs_composex.common import NONALPHANUM, cfn_conditions
+from ecs_composex.common.aws_calls import API_CALLS
 from ecs_composex.common.cfn_params import ROOT_STACK_NAME_T
 from ecs_composex.common.files import FileArtifact
 from ecs_composex.common.logging import LOG
+from ecs_composex.common.stacks.template_budget import (
+    TemplateSize,
+    define_template_shards,
+)
 from ecs_composex.common.troposphere_tools import add_parameters, add_update_mapping
 from ecs_composex.vpc.vpc_params import (
     APP_SUBNETS,
@@ -66,6 +72,7 @@ class ComposeXStack(Stack):
     Class to define a CFN Stack as a composition of its template object, parameters, tags etc.
 
     :cvar ecs_composex.common.files.FileArtifact template_file: The FileArtifact associated with the stack.
+    :cvar ecs_composex.common.stacks.template_budget.TemplateSize template_size: The size of the rendered template
     """
 
     attributes = [
@@ -108,6 +115,8 @@ class ComposeXStack(Stack):
         title = NONALPHANUM.sub("", self.name)
         self.file_name = file_name if file_name else title
         self.lookup_resources = []
+        self.template_file = None
+        self.template_size = None
         if not isinstance(stack_template, Template):
             raise TypeError(
                 "stack_template is", type(stack_template), "expected", Template
@@ -239,17 +248,20 @@ class ComposeXStack(Stack):
     def render(self, settings: ComposeXSettings):
         """
         Function to use when the template is finalized and can be uploaded to S3.
+        Templates over budget for the CloudFormation limits are sharded, and written again once their shards are
+        rendered.
         """
         LOG.debug(f"Rendering {self.title}")
-        self.DependsOn = list(set(self.DependsOn))
-        template_file: FileArtifact = FileArtifact(
-            file_name=self.file_name,
-            template=self.stack_template,
-            settings=settings,
-            file_format=settings.format,
-        )
-        template_file.define_body()
-        template_file.write(settings)
+        self.DependsOn = list(dict.fromkeys(self.DependsOn))
+        template_file = self.write_template(settings)
+        while self.template_size.over_budget():
+            shards = self.shard_template()
+            if not shards:
+                break
+            for shard in shards:
+                shard.render(settings)
+            template_file = self.write_template(settings)
+        self.template_size.check_limits()
         setattr(self, "TemplateURL", template_file.file_path)
         if not settings.upload and settings.bucket_name and settings.bucket_prefix_path:
             setattr(
@@ -264,6 +276,59 @@ class ComposeXStack(Stack):
         template_file.validate(settings)
         self.write_config_file(settings)
 
+    def write_template(self, settings: ComposeXSettings) -> FileArtifact:
+        """
+        Writes the stack template to its file, and measures it against the CloudFormation limits
+        """
+        self.template_file = FileArtifact(
+            file_name=self.file_name,
+            template=self.stack_template,
+            settings=settings,
+            file_format=settings.format,
+        )
+        self.template_file.define_body()
+        self.template_file.write(settings)
+        self.template_size = TemplateSize(
+            self.title, self.template_file.template_dict, self.template_file.body_size
+        )
+        return self.template_file
+
+    def shard_template(self) -> list[ComposeXStack]:
+        """
+        Moves leaf resources of the template over budget to nested shard stacks, added to the template.
+
+        :return: the shard stacks
+        """
+        first_index = 1
+        while f"{self.title}Shard{first_index}" in self.stack_template.resources:
+            first_index += 1
+        shards: list[ComposeXStack] = []
+        for shard in define_template_shards(
+            self.title,
+            self.stack_template,
+            self.template_file.template_dict,
+            self.template_size,
+            first_index,
+        ):
+            shard_stack = ComposeXStack(
+                shard.title,
+                shard.template,
+                stack_parameters=shard.stack_parameters,
+                file_name=f"{self.file_name}-{shard.title[len(self.title):].lower()}",
+                module_name=self.module_name,
+                DependsOn=shard.depends_on,
+            )
+            shard_stack.parent_stack = self
+            self.stack_template.add_resource(shard_stack)
+            shards.append(shard_stack)
+        if shards:
+            LOG.info(
+                f"{self.title} - {self.template_size.over_budget()} over budget."
+                f" Moved {sum(len(_shard.stack_template.resources) for _shard in shards)} resources"
+                f" to {[_shard.title for _shard in shards]}"
+            )
+        return shards
+
     def set_vpc_parameters_from_vpc_stack(
         self, vpc_stack: VpcStack, settings: ComposeXSettings, *parameters
     ):
@@ -363,24 +428,28 @@ class ComposeXStack(Stack):
                 )
 
 
-def process_stacks(root_stack, settings, is_root=True):
+def set_stacks_render_levels(
+    stack: ComposeXStack, levels: dict, is_root: bool = True
+) -> int:
     """
-    Function to go through all stacks of a given template and update the template
-    It will recursively render sub stacks defined.
+    Walks the nested stacks of the given stack, sets the root stack name parameter onto each nested stack and
+    groups the stacks per height in the stacks tree. Stacks with a height of 0 have no nested stack.
 
-    :param root_stack: the root template to iterate over the resources.
-    :type root_stack: ecs_composex.common.stacks.ComposeXStack
-    :param settings: The settings for execution
-    :type settings: ecs_composex.common.settings.ComposeXSettings
+    :param ComposeXStack stack: the stack to iterate over the resources.
+    :param dict levels: the stacks grouped per height
     :param bool is_root: Allows to know whether the stack is parent stack
+    :return: the height of the stack
+    :rtype: int
     """
-    for resource_name, resource in root_stack.stack_template.resources.items():
+    height = 0
+    for resource_name, resource in stack.stack_template.resources.items():
         if isinstance(resource, ComposeXStack) or issubclass(
             type(resource), ComposeXStack
         ):
-            LOG.debug(resource)
             LOG.debug(resource.title)
-            process_stacks(resource, settings, is_root=False)
+            height = max(
+                height, set_stacks_render_levels(resource, levels, is_root=False) + 1
+            )
             if is_root:
                 resource.Parameters.update({ROOT_STACK_NAME_T: Ref(AWS_STACK_NAME)})
             else:
@@ -388,4 +457,65 @@ def process_stacks(root_stack, settings, is_root=True):
         elif isinstance(resource, Stack):
             LOG.warning(resource_name)
             LOG.warning(resource)
-    root_stack.render(settings)
+    levels.setdefault(height, []).append(stack)
+    return height
+
+
+def log_templates_sizes(stack: ComposeXStack) -> None:
+    """
+    Logs the size of the rendered templates, against the CloudFormation limits, of the stack and its nested stacks.
+    """
+    stacks = [stack]
+    while stacks:
+        _stack = stacks.pop(0)
+        template_size = _stack.template_size
+        if template_size is not None:
+            over_budget = template_size.over_budget()
+            if over_budget:
+                LOG.warning(f"{template_size} - close to the limits for {over_budget}")
+            else:
+                LOG.info(template_size)
+        stacks += [
+            resource
+            for resource in _stack.stack_template.resources.values()
+            if isinstance(resource, ComposeXStack)
+        ]
+
+
+def render_stack(stack: ComposeXStack, settings: ComposeXSettings) -> None:
+    with settings.profiler.phase("render", stack=stack.title), API_CALLS.scoped(
+        f"stacks::{stack.title}"
+    ):
+        stack.render(settings)
+
+
+def process_stacks(root_stack, settings, is_root=True):
+    """
+    Function to go through all stacks of a given template and update the template
+    It will render all the nested stacks, from the leaves up to the root stack. Stacks at the same height in the tree
+    do not depend on each other, so they are rendered concurrently. A parent stack is only rendered once all of
+    its nested stacks are, so that their TemplateURL is set.
+
+    :param root_stack: the root template to iterate over the resources.
+    :type root_stack: ecs_composex.common.stacks.ComposeXStack
+    :param settings: The settings for execution
+    :type settings: ecs_composex.common.settings.ComposeXSettings
+    :param bool is_root: Allows to know whether the stack is parent stack
+    """
+    levels: dict = {}
+    set_stacks_render_levels(root_stack, levels, is_root=is_root)
+    with ThreadPoolExecutor(max_workers=settings.render_workers) as executor:
+        for height in sorted(levels.keys()):
+            stacks = levels[height]
+            LOG.debug(f"Rendering {[_stack.title for _stack in stacks]}")
+            for future in [
+                executor.submit(render_stack, _stack, settings) for _stack in stacks
+            ]:
+                future.result()
+    log_templates_sizes(root_stack)
+    if settings.upload and settings.content_hash_uploads:
+        settings.uploads_manifest.save()
+    if settings.validation_cache:
+        settings.validation_cache.save()
+    if settings.lookup_cache:
+        settings.lookup_cache.save()
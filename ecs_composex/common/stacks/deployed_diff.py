@@ -0,0 +1,366 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille <john@compose-x.io>
+
+"""
+Compares the rendered stacks with the deployed ones, to skip the stack updates and change sets that would not
+change anything. The deployed templates of the root stack and of all its nested stacks are retrieved concurrently,
+level by level of the nested stacks tree, and compared resource by resource with the rendered templates.
+CloudFormation resolves the SSM parameters types and the dynamic references again on every update, so the stacks
+using them are always updated, even when their templates did not change.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ecs_composex.common.settings import ComposeXSettings
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from cfn_flip import load as load_template_body
+from tabulate import tabulate
+
+from ecs_composex.common.logging import LOG
+from ecs_composex.common.stacks import ComposeXStack
+
+NESTED_STACK_TYPE = "AWS::CloudFormation::Stack"
+SSM_PARAMETER_TYPE_PREFIX = "AWS::SSM::Parameter::Value<"
+DYNAMIC_REFERENCE_PREFIX = "{{resolve:"
+TEMPLATE_SECTIONS = [
+    "AWSTemplateFormatVersion",
+    "Description",
+    "Metadata",
+    "Transform",
+    "Parameters",
+    "Mappings",
+    "Conditions",
+    "Outputs",
+]
+
+
+class TemplateChange:
+    """
+    A difference between the deployed and the rendered stack, with the same Action names as the change sets.
+
+    :ivar str stack: path of the stack in the nested stacks tree, i.e. root/ecs/app01
+    :ivar str logical_id: the resource logical ID, or the key of the template section entry
+    :ivar str resource_type: the resource type, or the template section
+    :ivar str action: Add, Remove or Modify
+    :ivar list[str] details: the paths of the modified properties
+    """
+
+    def __init__(
+        self,
+        stack: str,
+        logical_id: str,
+        resource_type: str,
+        action: str,
+        details: list[str] = None,
+    ):
+        self.stack = stack
+        self.logical_id = logical_id
+        self.resource_type = resource_type
+        self.action = action
+        self.details = details if details else []
+
+    def __repr__(self):
+        return f"{self.stack}::{self.logical_id} {self.action}"
+
+
+class StacksDiff:
+    """
+    The differences between the rendered root stack, and its nested stacks, and the deployed ones.
+
+    :ivar str stack_id: the deployed root stack ID
+    :ivar list[TemplateChange] changes:
+    :ivar list[str] dynamic_values: the SSM parameters and resources with dynamic references, i.e. root/ecs::ImageId
+    """
+
+    def __init__(self, stack_id: str):
+        self.stack_id = stack_id
+        self.changes: list[TemplateChange] = []
+        self.dynamic_values: list[str] = []
+
+    @property
+    def has_changes(self) -> bool:
+        """
+        The values resolved by CloudFormation might have changed since the last update, so they count as changes.
+        """
+        return bool(self.changes or self.dynamic_values)
+
+    def format(self) -> str:
+        report = tabulate(
+            [
+                [
+                    change.stack,
+                    change.logical_id,
+                    change.resource_type,
+                    change.action,
+                    "\n".join(change.details),
+                ]
+                for change in self.changes
+            ],
+            ["Stack", "LogicalResourceId", "ResourceType", "Action", "Details"],
+            tablefmt="rst",
+        )
+        if self.dynamic_values:
+            report += "\nResolved by CloudFormation on update: " + ", ".join(
+                self.dynamic_values
+            )
+        return report
+
+
+def get_changed_paths(
+    deployed, rendered, prefix: str = "", depth: int = 2
+) -> list[str]:
+    """
+    :return: the paths, up to depth, of the values that differ, i.e. Properties.ContainerDefinitions
+    """
+    if deployed == rendered:
+        return []
+    if depth == 0 or not isinstance(deployed, dict) or not isinstance(rendered, dict):
+        return [prefix]
+    paths: list[str] = []
+    for key in sorted(set(deployed) | set(rendered)):
+        paths += get_changed_paths(
+            deployed.get(key),
+            rendered.get(key),
+            f"{prefix}.{key}" if prefix else key,
+            depth - 1,
+        )
+    return paths
+
+
+def normalize_template(template: dict) -> dict:
+    """
+    Removes the generation date from the compose-x template metadata, which changes with every rendering.
+    """
+    metadata = template.get("Metadata")
+    if not isinstance(metadata, dict) or metadata.get("Type") != "ComposeX":
+        return template
+    properties = {
+        key: value
+        for key, value in metadata.get("Properties", {}).items()
+        if key != "GeneratedOn"
+    }
+    return {**template, "Metadata": {**metadata, "Properties": properties}}
+
+
+def normalize_resource(resource: dict) -> dict:
+    """
+    The DependsOn order does not matter to CloudFormation. The nested stacks TemplateURL changes with the upload
+    path, their templates are compared instead.
+    """
+    if isinstance(resource.get("DependsOn"), list):
+        resource = {**resource, "DependsOn": sorted(resource["DependsOn"])}
+    if resource.get("Type") != NESTED_STACK_TYPE:
+        return resource
+    properties = {
+        key: value
+        for key, value in resource.get("Properties", {}).items()
+        if key != "TemplateURL"
+    }
+    return {**resource, "Properties": properties}
+
+
+def diff_templates(stack: str, deployed: dict, rendered: dict) -> list[TemplateChange]:
+    deployed = normalize_template(deployed)
+    rendered = normalize_template(rendered)
+    changes: list[TemplateChange] = []
+    for section in TEMPLATE_SECTIONS:
+        deployed_section = deployed.get(section)
+        rendered_section = rendered.get(section)
+        if deployed_section == rendered_section:
+            continue
+        if not isinstance(deployed_section, dict) or not isinstance(
+            rendered_section, dict
+        ):
+            changes.append(TemplateChange(stack, section, section, "Modify"))
+            continue
+        for key in sorted(set(deployed_section) | set(rendered_section)):
+            if key not in deployed_section:
+                changes.append(TemplateChange(stack, key, section, "Add"))
+            elif key not in rendered_section:
+                changes.append(TemplateChange(stack, key, section, "Remove"))
+            elif deployed_section[key] != rendered_section[key]:
+                changes.append(
+                    TemplateChange(
+                        stack,
+                        key,
+                        section,
+                        "Modify",
+                        get_changed_paths(
+                            deployed_section[key], rendered_section[key], depth=1
+                        ),
+                    )
+                )
+    deployed_resources = deployed.get("Resources", {})
+    rendered_resources = rendered.get("Resources", {})
+    for logical_id in sorted(set(deployed_resources) | set(rendered_resources)):
+        if logical_id not in deployed_resources:
+            resource = rendered_resources[logical_id]
+            changes.append(TemplateChange(stack, logical_id, resource["Type"], "Add"))
+            continue
+        if logical_id not in rendered_resources:
+            resource = deployed_resources[logical_id]
+            changes.append(
+                TemplateChange(stack, logical_id, resource["Type"], "Remove")
+            )
+            continue
+        deployed_resource = normalize_resource(deployed_resources[logical_id])
+        rendered_resource = normalize_resource(rendered_resources[logical_id])
+        if deployed_resource != rendered_resource:
+            changes.append(
+                TemplateChange(
+                    stack,
+                    logical_id,
+                    rendered_resource["Type"],
+                    "Modify",
+                    get_changed_paths(deployed_resource, rendered_resource),
+                )
+            )
+    return changes
+
+
+def diff_parameters(
+    stack: str, deployed: list[dict], rendered: list[dict], template: dict
+) -> list[TemplateChange]:
+    """
+    Compares the deployed stack parameters values with the rendered ones, or else the parameters defaults.
+    """
+    deployed_values = {
+        parameter["ParameterKey"]: parameter.get("ParameterValue")
+        for parameter in deployed
+    }
+    rendered_values = {
+        key: str(parameter["Default"])
+        for key, parameter in template.get("Parameters", {}).items()
+        if "Default" in parameter
+    }
+    rendered_values.update(
+        {
+            parameter["ParameterKey"]: str(parameter["ParameterValue"])
+            for parameter in rendered
+        }
+    )
+    return [
+        TemplateChange(stack, key, "ParameterValue", "Modify")
+        for key in sorted(set(deployed_values) | set(rendered_values))
+        if deployed_values.get(key) != rendered_values.get(key)
+    ]
+
+
+def get_dynamic_values(stack: str, template: dict) -> list[str]:
+    """
+    :return: the parameters of SSM parameter types, and the resources using dynamic references, of the template
+    """
+    dynamic_values = [
+        f"{stack}::{key}"
+        for key, parameter in template.get("Parameters", {}).items()
+        if str(parameter.get("Type", "")).startswith(SSM_PARAMETER_TYPE_PREFIX)
+    ]
+    dynamic_values += [
+        f"{stack}::{logical_id}"
+        for logical_id, resource in template.get("Resources", {}).items()
+        if DYNAMIC_REFERENCE_PREFIX in json.dumps(resource, default=str)
+    ]
+    return dynamic_values
+
+
+def load_rendered_template(stack: ComposeXStack) -> dict:
+    """
+    Loads the rendered template from its file, in the format it is deployed with.
+    """
+    with open(stack.template_file.file_path) as template_fd:
+        return load_template_body(template_fd.read())[0]
+
+
+def get_deployed_stack(client, stack_id: str) -> tuple[dict, dict[str, str]]:
+    """
+    :return: the deployed template of the stack, and the ID of its nested stacks per logical ID
+    """
+    template_body = client.get_template(StackName=stack_id, TemplateStage="Original")[
+        "TemplateBody"
+    ]
+    if isinstance(template_body, str):
+        template_body = load_template_body(template_body)[0]
+    nested_stacks: dict = {}
+    for page in client.get_paginator("list_stack_resources").paginate(
+        StackName=stack_id
+    ):
+        for resource in page["StackResourceSummaries"]:
+            if resource["ResourceType"] == NESTED_STACK_TYPE and resource.get(
+                "PhysicalResourceId"
+            ):
+                nested_stacks[resource["LogicalResourceId"]] = resource[
+                    "PhysicalResourceId"
+                ]
+    return template_body, nested_stacks
+
+
+def get_stacks_diff(
+    settings: ComposeXSettings, root_stack: ComposeXStack
+) -> StacksDiff:
+    """
+    Compares the rendered root stack, its parameters and nested stacks, with the deployed ones.
+    The nested stacks of each level of the tree are retrieved and compared concurrently.
+    """
+    client = settings.session.client("cloudformation")
+    deployed_stack = client.describe_stacks(StackName=settings.name)["Stacks"][0]
+    stacks_diff = StacksDiff(deployed_stack["StackId"])
+    level: list[tuple[str, ComposeXStack, str]] = [
+        (settings.name, root_stack, deployed_stack["StackId"])
+    ]
+    with ThreadPoolExecutor(max_workers=settings.render_workers) as executor:
+        while level:
+            deployed_stacks = list(
+                executor.map(
+                    lambda _stack: get_deployed_stack(client, _stack[2]), level
+                )
+            )
+            next_level = []
+            for (stack_path, stack, stack_id), (template, nested_stacks) in zip(
+                level, deployed_stacks
+            ):
+                rendered = load_rendered_template(stack)
+                if stack is root_stack:
+                    stacks_diff.changes += diff_parameters(
+                        stack_path,
+                        deployed_stack.get("Parameters", []),
+                        root_stack.render_parameters_list_cfn(),
+                        rendered,
+                    )
+                stacks_diff.changes += diff_templates(stack_path, template, rendered)
+                stacks_diff.dynamic_values += get_dynamic_values(stack_path, rendered)
+                for resource in stack.stack_template.resources.values():
+                    if not isinstance(resource, ComposeXStack):
+                        continue
+                    if resource.title in nested_stacks:
+                        next_level.append(
+                            (
+                                f"{stack_path}/{resource.title}",
+                                resource,
+                                nested_stacks[resource.title],
+                            )
+                        )
+                    elif resource.title in template.get("Resources", {}):
+                        stacks_diff.changes.append(
+                            TemplateChange(
+                                stack_path,
+                                resource.title,
+                                NESTED_STACK_TYPE,
+                                "Modify",
+                                ["Properties.TemplateURL"],
+                            )
+                        )
+            level = next_level
+    LOG.info(
+        f"{settings.name} - {len(stacks_diff.changes)} changes with the deployed stacks"
+    )
+    if stacks_diff.dynamic_values:
+        LOG.info(
+            f"{settings.name} - {len(stacks_diff.dynamic_values)} values resolved by CloudFormation on update"
+        )
+    return stacks_diff
@@ -0,0 +1,286 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille <john@compose-x.io>
+
+"""
+Follows the deployment of the root stack and of its nested stacks from their events, until the root stack
+reaches a final status. The events of each stack are read from the last one seen, concurrently, and polled more
+often while resources change than while the deployment is idle. Reports how long each resource took.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime as dt
+from time import monotonic, sleep
+from typing import Callable
+
+from botocore.exceptions import ClientError
+from tabulate import tabulate
+
+from ecs_composex.common.logging import LOG
+
+NESTED_STACK_TYPE = "AWS::CloudFormation::Stack"
+SUCCESS_STATUSES = ["CREATE_COMPLETE", "UPDATE_COMPLETE", "IMPORT_COMPLETE"]
+
+
+class AdaptivePolling:
+    """
+    Polling interval which goes back to the minimum on activity, and grows up to the maximum while idle.
+
+    :ivar float interval: the current interval, in seconds
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 2.0,
+        max_interval: float = 30.0,
+        factor: float = 1.5,
+        sleep_function: Callable = sleep,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.factor = factor
+        self.interval = min_interval
+        self._sleep = sleep_function
+
+    def activity(self) -> None:
+        self.interval = self.min_interval
+
+    def idle(self) -> None:
+        self.interval = min(self.max_interval, self.interval * self.factor)
+
+    def wait(self) -> None:
+        self._sleep(self.interval)
+
+
+def is_final_status(status: str) -> bool:
+    return not status.endswith("_IN_PROGRESS")
+
+
+class StackEventsCursor:
+    """
+    Reads the new events of a stack, from the most recent one back to the last event seen, or to the deployment start.
+
+    :ivar str stack_id: the stack ID, or name
+    :ivar datetime since: the events before are ignored
+    :ivar str last_event_id: the ID of the most recent event seen
+    """
+
+    def __init__(self, client, stack_id: str, since: dt = None):
+        self.client = client
+        self.stack_id = stack_id
+        self.since = since
+        self.last_event_id: str | None = None
+
+    @property
+    def stack_name(self) -> str:
+        return self.stack_id.split("/")[1] if "/" in self.stack_id else self.stack_id
+
+    def mark(self) -> None:
+        """
+        Sets the most recent event as seen, so that only the events of the next deployment are read.
+        """
+        try:
+            events = self.client.describe_stack_events(StackName=self.stack_id)[
+                "StackEvents"
+            ]
+        except ClientError:
+            LOG.debug(f"{self.stack_id} - No events. Stack does not exist yet")
+            return
+        if events:
+            self.last_event_id = events[0]["EventId"]
+
+    def get_new_events(self) -> list[dict]:
+        """
+        :return: the events since the last call, oldest first
+        """
+        events: list[dict] = []
+        for page in self.client.get_paginator("describe_stack_events").paginate(
+            StackName=self.stack_id
+        ):
+            for event in page["StackEvents"]:
+                if event["EventId"] == self.last_event_id or (
+                    self.since and event["Timestamp"] < self.since
+                ):
+                    break
+                events.append(event)
+            else:
+                continue
+            break
+        if events:
+            self.last_event_id = events[0]["EventId"]
+        return list(reversed(events))
+
+
+class ResourceDeployment:
+    """
+    Deployment of a resource, from its first IN_PROGRESS event to its last final status event.
+    """
+
+    def __init__(self, stack: str, logical_id: str, resource_type: str, start: dt):
+        self.stack = stack
+        self.logical_id = logical_id
+        self.resource_type = resource_type
+        self.start = start
+        self.end: dt | None = None
+        self.status: str | None = None
+
+    @property
+    def duration(self) -> float | None:
+        if self.end is None:
+            return None
+        return (self.end - self.start).total_seconds()
+
+
+class DeploymentMonitor:
+    """
+    Follows the events of the root stack and of the nested stacks it deploys. The root stack events are read from
+    the last event before the deployment, see mark(), the nested stacks events from the first event of the root stack.
+
+    :ivar StackEventsCursor root: the events cursor of the root stack
+    :ivar dict[str, StackEventsCursor] cursors: the events cursors of the stacks, by stack ID
+    :ivar dict resources: the resources deployments, by stack name and logical ID
+    """
+
+    def __init__(
+        self,
+        client,
+        stack_name: str,
+        workers: int = 8,
+        polling: AdaptivePolling = None,
+    ):
+        self.client = client
+        self.workers = workers
+        self.polling = polling if polling else AdaptivePolling()
+        self.root = StackEventsCursor(client, stack_name)
+        self.cursors: dict[str, StackEventsCursor] = {}
+        self.deployment_start: dt | None = None
+        self.resources: dict[tuple[str, str], ResourceDeployment] = {}
+
+    def mark(self) -> None:
+        self.root.mark()
+
+    def get_root_status(self) -> str:
+        return self.client.describe_stacks(StackName=self.root.stack_id)["Stacks"][0][
+            "StackStatus"
+        ]
+
+    def process_event(self, cursor: StackEventsCursor, event: dict) -> None:
+        status = event["ResourceStatus"]
+        LOG.info(
+            f"{event['Timestamp'].strftime('%H:%M:%S')} {cursor.stack_name}"
+            f" - {event['LogicalResourceId']} ({event['ResourceType']}) {status}"
+            + (
+                f": {event['ResourceStatusReason']}"
+                if event.get("ResourceStatusReason")
+                else ""
+            )
+        )
+        if cursor is self.root and self.deployment_start is None:
+            self.deployment_start = event["Timestamp"]
+        physical_id = event.get("PhysicalResourceId")
+        if (
+            event["ResourceType"] == NESTED_STACK_TYPE
+            and physical_id
+            and physical_id.startswith("arn:")
+            and physical_id not in self.cursors
+        ):
+            self.cursors[physical_id] = StackEventsCursor(
+                self.client, physical_id, self.deployment_start
+            )
+        key = (cursor.stack_name, event["LogicalResourceId"])
+        resource = self.resources.get(key)
+        if resource is None or (resource.end and not is_final_status(status)):
+            resource = ResourceDeployment(
+                cursor.stack_name,
+                event["LogicalResourceId"],
+                event["ResourceType"],
+                event["Timestamp"],
+            )
+            self.resources[key] = resource
+        resource.status = status
+        if is_final_status(status):
+            resource.end = event["Timestamp"]
+
+    def poll(
+        self, executor: ThreadPoolExecutor, cursors: list[StackEventsCursor] = None
+    ) -> int:
+        """
+        Reads the new events of the given stacks, or of all the stacks, concurrently.
+
+        :return: the number of new events
+        """
+        if cursors is None:
+            cursors = list(self.cursors.values())
+        new_events = 0
+        for cursor, events in zip(
+            cursors, executor.map(lambda _cursor: _cursor.get_new_events(), cursors)
+        ):
+            for event in events:
+                self.process_event(cursor, event)
+            new_events += len(events)
+        return new_events
+
+    def wait(self, stack_id: str, timeout: float = None) -> str:
+        """
+        Polls the stacks events until the root stack status is final. The status is read before the events, so
+        that the events leading to the final status are all reported. The nested stacks found in the last events
+        are then read too, until no new nested stack is found.
+
+        :param stack_id: the root stack ID
+        :param timeout: maximum time to wait for, in seconds
+        :return: the final status of the root stack
+        :raises: TimeoutError
+        """
+        self.root.stack_id = stack_id
+        self.cursors[stack_id] = self.root
+        started = monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                status = self.get_root_status()
+                polled = set(self.cursors)
+                if self.poll(executor):
+                    self.polling.activity()
+                else:
+                    self.polling.idle()
+                if is_final_status(status):
+                    while len(self.cursors) > len(polled):
+                        new_cursors = [
+                            cursor
+                            for stack_id, cursor in self.cursors.items()
+                            if stack_id not in polled
+                        ]
+                        polled.update(self.cursors)
+                        self.poll(executor, new_cursors)
+                    return status
+                if timeout and monotonic() - started > timeout:
+                    raise TimeoutError(
+                        f"{self.root.stack_name} still {status} after {int(timeout)} seconds"
+                    )
+                self.polling.wait()
+
+    def format_report(self) -> str:
+        """
+        The resources deployments, longest first.
+        """
+        return tabulate(
+            [
+                [
+                    resource.stack,
+                    resource.logical_id,
+                    resource.resource_type,
+                    resource.status,
+                    (
+                        f"{resource.duration:.0f}"
+                        if resource.duration is not None
+                        else "-"
+                    ),
+                ]
+                for resource in sorted(
+                    self.resources.values(),
+                    key=lambda _resource: -(_resource.duration or 0),
+                )
+            ],
+            ["Stack", "LogicalResourceId", "ResourceType", "Status", "Seconds"],
+            tablefmt="rst",
+        )
@@ -0,0 +1,469 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2025 John Mille <john@compose-x.io>
+
+"""
+Sizing of the rendered templates against the CloudFormation limits, and sharding of the templates over budget.
+
+Templates over budget have their leaf resources (security group rules, alarms, IAM policies), which no other
+resource, output or condition refers to, moved into nested shard stacks. The references these resources have
+to the parent template are passed to the shard stack as parameters.
+"""
+
+from __future__ import annotations
+
+import json
+
+from troposphere import (
+    AWS_STACK_ID,
+    AWS_STACK_NAME,
+    MAX_OUTPUTS,
+    MAX_PARAMETERS,
+    MAX_RESOURCES,
+    GetAtt,
+    Join,
+    Ref,
+    Template,
+)
+
+from ecs_composex.common import NONALPHANUM, cfn_conditions
+from ecs_composex.common.cfn_params import ROOT_STACK_NAME_T, Parameter
+from ecs_composex.common.cfn_validation import SUB_VARIABLE
+from ecs_composex.common.serializers import TEMPLATE_URL_MAX_SIZE
+from ecs_composex.common.troposphere_tools import build_template
+from ecs_composex.exceptions import TemplateLimitsExceeded
+
+CFN_TEMPLATE_LIMITS: dict = {
+    "resources": MAX_RESOURCES,
+    "parameters": MAX_PARAMETERS,
+    "outputs": MAX_OUTPUTS,
+    "size": TEMPLATE_URL_MAX_SIZE,
+}
+TEMPLATE_BUDGET_RATIO = 0.9
+
+SHARDABLE_TYPES: tuple = (
+    "AWS::EC2::SecurityGroupIngress",
+    "AWS::EC2::SecurityGroupEgress",
+    "AWS::CloudWatch::Alarm",
+    "AWS::IAM::Policy",
+)
+
+# Pseudo parameters which value is different in the nested stack, passed as parameters to the shards.
+STACK_PSEUDO_PARAMETERS: dict = {
+    AWS_STACK_NAME: "ParentStackName",
+    AWS_STACK_ID: "ParentStackId",
+}
+
+
+class TemplateSize:
+    """
+    Counts and size of a rendered template, against the CloudFormation limits
+
+    :cvar float budget_ratio: ratio of the limits over which the template is over budget
+    :ivar str name: name of the stack
+    :ivar int size: size of the template body, in bytes
+    """
+
+    budget_ratio: float = TEMPLATE_BUDGET_RATIO
+
+    def __init__(self, name: str, template_dict: dict, size: int):
+        self.name = name
+        self.resources: int = len(template_dict.get("Resources", {}))
+        self.parameters: int = len(template_dict.get("Parameters", {}))
+        self.outputs: int = len(template_dict.get("Outputs", {}))
+        self.size: int = size
+
+    @property
+    def usage(self) -> dict:
+        """Ratio of each limit used by the template"""
+        return {
+            key: getattr(self, key) / limit
+            for key, limit in CFN_TEMPLATE_LIMITS.items()
+        }
+
+    def over_budget(self, ratio: float = None) -> list[str]:
+        """
+        :return: the limits for which the template uses more than the given ratio, budget_ratio by default.
+        """
+        if ratio is None:
+            ratio = self.budget_ratio
+        return [key for key, usage in self.usage.items() if usage > ratio]
+
+    def check_limits(self) -> None:
+        """
+        :raises: TemplateLimitsExceeded if the template would be rejected by CloudFormation
+        """
+        over_limits = self.over_budget(1.0)
+        if over_limits:
+            raise TemplateLimitsExceeded(
+                f"{self.name} - template is over the CloudFormation limits for {', '.join(over_limits)}",
+                str(self),
+            )
+
+    def __str__(self):
+        return (
+            f"{self.name}: {self.resources}/{MAX_RESOURCES} resources, "
+            f"{self.parameters}/{MAX_PARAMETERS} parameters, "
+            f"{self.outputs}/{MAX_OUTPUTS} outputs, "
+            f"{self.size / 1024:.1f}/{TEMPLATE_URL_MAX_SIZE // 1024} KiB"
+        )
+
+
+class RenderedResource:
+    """
+    Resource already rendered to its dict, moved as-is to a shard template
+    """
+
+    def __init__(self, title: str, definition: dict):
+        self.title = title
+        self.definition = definition
+
+    def to_dict(self) -> dict:
+        return self.definition
+
+
+class TemplateShard:
+    """
+    Template and stack properties of a shard, with the parameters to pass from the parent template.
+
+    :ivar str title: title of the shard stack in the parent template
+    :ivar troposphere.Template template: the shard template
+    :ivar dict stack_parameters: the shard stack parameters values, from the parent template
+    :ivar list depends_on: resources of the parent template the shard resources depend on
+    """
+
+    def __init__(self, title: str, parent_stack_title: str):
+        self.title = title
+        self.template: Template = build_template(
+            f"Resources of {parent_stack_title} moved to a nested stack"
+        )
+        self.stack_parameters: dict = {}
+        self.depends_on: list = []
+        self.size: int = 0
+        self.references: set = set()
+
+
+def resource_references(definition, names: set = None) -> set:
+    """
+    Finds the names of the parameters, resources, conditions and mappings the definition refers to.
+    GetAtt are kept as a tuple of the resource and attribute, with None for the parts set with a function.
+    """
+    if names is None:
+        names = set()
+    if isinstance(definition, dict):
+        for key, value in definition.items():
+            if key == "Ref" and isinstance(value, str):
+                names.add(value)
+            elif key == "Fn::GetAtt":
+                attribute = value.split(".", 1) if isinstance(value, str) else value
+                names.add(
+                    tuple(part if isinstance(part, str) else None for part in attribute)
+                )
+            elif key == "Fn::Sub":
+                sub_references(value, names)
+            elif key == "Fn::If" and isinstance(value, list) and value:
+                names.add(value[0])
+            elif key == "Condition" and isinstance(value, str):
+                names.add(value)
+            elif key == "Fn::FindInMap" and isinstance(value, list) and value:
+                names.add(value[0])
+            resource_references(value, names)
+    elif isinstance(definition, list):
+        for item in definition:
+            resource_references(item, names)
+    return names
+
+
+def sub_references(value, names: set) -> None:
+    local_variables: dict = {}
+    if isinstance(value, list) and value:
+        if len(value) > 1 and isinstance(value[1], dict):
+            local_variables = value[1]
+        value = value[0]
+    if not isinstance(value, str):
+        return
+    for variable in SUB_VARIABLE.findall(value):
+        if variable in local_variables:
+            continue
+        names.add(tuple(variable.split(".", 1)) if "." in variable else variable)
+
+
+def get_names(references: set) -> set:
+    """Returns the names referred to, GetAtt replaced with the resource name"""
+    return {
+        reference[0] if isinstance(reference, tuple) else reference
+        for reference in references
+    }
+
+
+def get_shardable_resources(template_dict: dict) -> dict:
+    """
+    Returns the resources of the template that can be moved to a shard: of the SHARDABLE_TYPES, with only
+    string GetAtt, and which nothing else refers to.
+    """
+    resources = template_dict.get("Resources", {})
+    referenced: set = set()
+    for name, definition in resources.items():
+        resource_names = get_names(resource_references(definition))
+        resource_names.discard(name)
+        referenced.update(resource_names)
+        depends_on = definition.get("DependsOn", [])
+        referenced.update([depends_on] if isinstance(depends_on, str) else depends_on)
+    for section in ["Outputs", "Conditions"]:
+        referenced.update(get_names(resource_references(template_dict.get(section))))
+    shardable: dict = {}
+    for name, definition in resources.items():
+        if name in referenced or definition.get("Type") not in SHARDABLE_TYPES:
+            continue
+        references = resource_references(definition)
+        if all(
+            len(reference) == 2 and all(isinstance(part, str) for part in reference)
+            for reference in references
+            if isinstance(reference, tuple)
+        ):
+            shardable[name] = references
+    return shardable
+
+
+def get_parameter_name(reference) -> str:
+    if isinstance(reference, tuple):
+        return NONALPHANUM.sub("", "".join(reference))
+    return STACK_PSEUDO_PARAMETERS.get(reference, reference)
+
+
+def rewrite_references(definition, parameters: dict):
+    """
+    Returns the definition with the GetAtt and the stack pseudo parameters replaced with the Ref to the shard
+    parameters passing them.
+    """
+    if isinstance(definition, dict):
+        if "Fn::GetAtt" in definition and len(definition) == 1:
+            value = definition["Fn::GetAtt"]
+            reference = tuple(value.split(".", 1) if isinstance(value, str) else value)
+            return {"Ref": parameters[reference]}
+        if "Ref" in definition and definition["Ref"] in STACK_PSEUDO_PARAMETERS:
+            return {"Ref": STACK_PSEUDO_PARAMETERS[definition["Ref"]]}
+        if "Fn::Sub" in definition and len(definition) == 1:
+            return {"Fn::Sub": rewrite_sub(definition["Fn::Sub"], parameters)}
+        return {
+            key: rewrite_references(value, parameters)
+            for key, value in definition.items()
+        }
+    if isinstance(definition, list):
+        return [rewrite_references(item, parameters) for item in definition]
+    return definition
+
+
+def rewrite_sub(value, parameters: dict):
+    if isinstance(value, list) and value:
+        return [rewrite_sub(value[0], parameters)] + [
+            rewrite_references(item, parameters) for item in value[1:]
+        ]
+    if not isinstance(value, str):
+        return value
+
+    def replace(match):
+        variable = match.group(1)
+        reference = tuple(variable.split(".", 1)) if "." in variable else variable
+        if reference in parameters:
+            return f"${{{parameters[reference]}}}"
+        return match.group(0)
+
+    return SUB_VARIABLE.sub(replace, value)
+
+
+def get_parameter_value(reference, parameters_types: dict) -> tuple:
+    """
+    :return: the type of the shard parameter, and its value in the parent template
+    """
+    if isinstance(reference, tuple):
+        return "String", GetAtt(*reference)
+    if reference in STACK_PSEUDO_PARAMETERS:
+        return "String", Ref(reference)
+    param_type = parameters_types.get(reference, "String")
+    if "List<" in param_type or "CommaDelimitedList" in param_type:
+        return "CommaDelimitedList", Join(",", Ref(reference))
+    if param_type.startswith("AWS::SSM::Parameter::Value<"):
+        return "String", Ref(reference)
+    return param_type, Ref(reference)
+
+
+def add_conditions_and_mappings(
+    shard: TemplateShard, names: set, template_dict: dict
+) -> set:
+    """
+    Adds to the shard template the conditions, with the conditions they use, and the mappings, used by its resources
+
+    :return: the parameters and resources the conditions refer to
+    """
+    conditions = template_dict.get("Conditions", {})
+    mappings = template_dict.get("Mappings", {})
+    references: set = set()
+    pending = [name for name in names if name in conditions]
+    while pending:
+        name = pending.pop()
+        if name in shard.template.conditions:
+            continue
+        shard.template.add_condition(name, conditions[name])
+        condition_references = resource_references(conditions[name])
+        pending += [
+            _name
+            for _name in get_names(condition_references)
+            if _name in conditions and _name not in shard.template.conditions
+        ]
+        references.update(
+            reference
+            for reference in condition_references
+            if get_names({reference}).isdisjoint(conditions)
+        )
+    for name in names:
+        if name in mappings and name not in shard.template.mappings:
+            shard.template.add_mapping(name, mappings[name])
+    return references
+
+
+def set_shard_parameters(shard: TemplateShard, template_dict: dict) -> None:
+    """
+    Defines the shard parameters, and their values in the parent template, from the references of its resources
+    to the parent template parameters, resources and stack pseudo parameters.
+    """
+    parameters_types = {
+        name: definition.get("Type", "String")
+        for name, definition in template_dict.get("Parameters", {}).items()
+    }
+    for reference in sorted(shard.references, key=str):
+        name = get_parameter_name(reference)
+        if name in shard.template.parameters or name == ROOT_STACK_NAME_T:
+            continue
+        param_type, value = get_parameter_value(reference, parameters_types)
+        shard.template.add_parameter(Parameter(name, Type=param_type))
+        shard.stack_parameters[name] = value
+    if ROOT_STACK_NAME_T in template_dict.get(
+        "Parameters", {}
+    ) and cfn_conditions.USE_STACK_NAME_CON_T in template_dict.get("Conditions", {}):
+        shard.stack_parameters.update(cfn_conditions.pass_root_stack_name())
+    else:
+        shard.stack_parameters[ROOT_STACK_NAME_T] = Ref(AWS_STACK_NAME)
+
+
+def get_resources_to_move(
+    template_size: TemplateSize,
+    shardable: dict,
+    resources_sizes: dict,
+) -> list[str]:
+    """
+    Selects the resources to move out of the template to get it within budget, assuming one shard per
+    chunk of resources.
+    """
+    ratio = template_size.budget_ratio
+    resources_budget = int(MAX_RESOURCES * ratio)
+    size_budget = int(TEMPLATE_URL_MAX_SIZE * ratio)
+    resources = template_size.resources
+    size = template_size.size
+    to_move: list[str] = []
+    for name in shardable:
+        shards_count = len(to_move) // resources_budget + 1
+        if resources - len(to_move) + shards_count <= resources_budget and (
+            size <= size_budget
+        ):
+            break
+        to_move.append(name)
+        size -= resources_sizes[name]
+    return to_move
+
+
+def define_template_shards(
+    stack_title: str,
+    stack_template: Template,
+    template_dict: dict,
+    template_size: TemplateSize,
+    first_index: int = 1,
+) -> list[TemplateShard]:
+    """
+    Moves leaf resources of the template to shard templates, so that the template gets within the budget.
+    Each shard is kept within budget for resources, parameters and size.
+
+    :param str stack_title: title of the stack the template belongs to
+    :param troposphere.Template stack_template: the template to move resources out of
+    :param dict template_dict: the rendered template
+    :param TemplateSize template_size: the size of the rendered template
+    :param int first_index: index of the first shard
+    :return: the shards, with the resources moved out of the template
+    """
+    shardable = get_shardable_resources(template_dict)
+    if not shardable:
+        return []
+    total_chars = len(json.dumps(template_dict, separators=(",", ":"))) or 1
+    resources_sizes = {
+        name: int(
+            template_size.size
+            * len(json.dumps(template_dict["Resources"][name], separators=(",", ":")))
+            / total_chars
+        )
+        for name in shardable
+    }
+    to_move = get_resources_to_move(template_size, shardable, resources_sizes)
+    ratio = template_size.budget_ratio
+    resources_budget = int(MAX_RESOURCES * ratio) - 1
+    parameters_budget = int(MAX_PARAMETERS * ratio) - 1
+    size_budget = int(TEMPLATE_URL_MAX_SIZE * ratio)
+    shards: list[TemplateShard] = []
+    shard = None
+    for name in to_move:
+        references = shardable[name]
+        if (
+            shard is None
+            or len(shard.template.resources) >= resources_budget
+            or len(shard.references | references) >= parameters_budget
+            or shard.size + resources_sizes[name] >= size_budget
+        ):
+            shard = TemplateShard(
+                f"{stack_title}Shard{first_index + len(shards)}", stack_title
+            )
+            shards.append(shard)
+        move_resource(shard, name, references, template_dict)
+        shard.size += resources_sizes[name]
+        del stack_template.resources[name]
+    for shard in shards:
+        set_shard_parameters(shard, template_dict)
+    return shards
+
+
+def move_resource(
+    shard: TemplateShard, name: str, references: set, template_dict: dict
+) -> None:
+    """
+    Adds the resource to the shard template, keeps track of the references to the parent template.
+    """
+    definition = template_dict["Resources"][name]
+    parent_names = set(template_dict.get("Parameters", {})) | set(
+        template_dict.get("Resources", {})
+    )
+    references = references | add_conditions_and_mappings(
+        shard, get_names(references), template_dict
+    )
+    depends_on = definition.get("DependsOn", [])
+    shard.depends_on += [
+        dependency
+        for dependency in ([depends_on] if isinstance(depends_on, str) else depends_on)
+        if dependency not in shard.depends_on
+    ]
+    shard.references.update(
+        reference
+        for reference in references
+        if reference in STACK_PSEUDO_PARAMETERS
+        or (isinstance(reference, tuple) and reference[0] in parent_names)
+        or (isinstance(reference, str) and reference in parent_names)
+    )
+    parameters = dict(STACK_PSEUDO_PARAMETERS)
+    parameters.update(
+        {
+            reference: get_parameter_name(reference)
+            for reference in shard.references
+            if isinstance(reference, tuple)
+        }
+    )
+    definition = rewrite_references(
+        {key: value for key, value in definition.items() if key != "DependsOn"},
+        parameters,
+    )
+    shard.template.add_resource(RenderedResource(name, definition))
@@ -22,7 +22,6 @@ otherwise you could not, i.e., *vpc::usage::ecsapps*
 
 from __future__ import annotations
 
-from imaplib import Commands
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -30,8 +29,6 @@ if TYPE_CHECKING:
 
     from ecs_composex.common.settings import ComposeXSettings
 
-import copy
-
 from compose_x_common.compose_x_common import keyisset
 from troposphere import Ref, Tags
 from troposphere.ec2 import LaunchTemplate, TagSpecifications
@@ -120,47 +117,6 @@ def expand_launch_template_tags_specs(lt: LaunchTemplate, tags: Tags) -> None:
         LOG.error(error)
 
 
-def merge_tags_lists(x_data, y_data):
-    x_keys = [x["Key"] for x in x_data]
-    result = [{a["Key"]: a["Value"]} for a in x_data]
-    for count, tag in enumerate(y_data):
-        if tag["Key"] not in x_keys:
-            result.append({y_data[count]["Key"]: y_data[count]["Value"]})
-    return result
-
-
-def add_object_tags(obj, tags):
-    """
-    Function to add tags to the object if the object supports it
-
-    :param obj: Troposphere object to add the tags to
-    :param troposphere.Tags tags: list of tags as defined in Docker composeX file
-    """
-    excluded_types = (SSMParameter, Cluster, Configuration, Rule)
-    if tags is None:
-        return
-    clean_tags = copy.deepcopy(tags)
-    if isinstance(obj, LaunchTemplate):
-        expand_launch_template_tags_specs(obj, clean_tags)
-        return
-    elif isinstance(obj, excluded_types):
-        return
-    if hasattr(obj, "props") and "Tags" not in obj.props:
-        LOG.debug(f"Item {obj} does not support tags")
-        return
-    if hasattr(obj, "Tags") and isinstance(getattr(obj, "Tags"), Tags):
-        LOG.debug(f"Adding the new tags {clean_tags} to {obj}")
-        existing_tags = getattr(obj, "Tags").to_dict()
-        new_tags = clean_tags.to_dict()
-        result = merge_tags_lists(existing_tags, new_tags)
-        result_tags = Tags(*result)
-        LOG.debug(result_tags)
-        setattr(obj, "Tags", result_tags)
-    elif not hasattr(obj, "Tags"):
-        LOG.debug(f"No existing tags. Adding tags to {obj}")
-        setattr(obj, "Tags", clean_tags)
-
-
 def default_tags(settings: ComposeXSettings) -> Tags:
     """
     Function to return default tags to set on resource
@@ -172,29 +128,110 @@ def default_tags(settings: ComposeXSettings) -> Tags:
     )
 
 
-def apply_tags_to_resources(settings, resource, params, xtags):
+def define_tags_and_parameters(
+    settings: ComposeXSettings,
+) -> tuple[list[Parameter] | None, Tags]:
+    """
+    Returns the parameters for the x-tags values, if any, and the tags to set on the resources
     """
+    if not keyisset("x-tags", settings.compose_content):
+        return None, default_tags(settings)
+    tags = settings.compose_content["x-tags"]
+    xtags = define_extended_tags(tags)
+    xtags += default_tags(settings)
+    return generate_tags_parameters(tags), xtags
 
-    :param ecs_composex.common.settings.ComposeXSettings settings: Execution settings
-    :param resource: The resource to add the tags to
-    :param list params: Parameters to add to template if any
-    :param troposphere.Tags xtags: List of Tags to add to the resources.
-    :return:
+
+class TagsEngine:
+    """
+    Applies the tags to the resources of all the nested stacks, in a single traversal.
+    The tags and their parameters are defined once, and the tags entries are shared between the resources.
     """
-    if isinstance(resource, ComposeXStack) or issubclass(type(resource), ComposeXStack):
-        LOG.debug(resource)
-        LOG.debug(resource.title)
-        add_all_tags(resource.stack_template, settings, params, xtags)
-        if params:
-            add_parameters(resource.stack_template, params)
-        if (
-            not resource
-            or not hasattr(resource, "stack_template")
-            or not resource.stack_template
+
+    excluded_types = (SSMParameter, Cluster, Configuration, Rule)
+
+    def __init__(
+        self, settings: ComposeXSettings, params: list = None, xtags: Tags = None
+    ):
+        if not params or not xtags:
+            params, xtags = define_tags_and_parameters(settings)
+        self.params = params
+        self.tags: tuple = tuple(xtags.tags)
+        self.tags_values: dict = {}
+        for tag in self.tags:
+            if isinstance(tag, dict):
+                self.tags_values.setdefault(tag["Key"], tag["Value"])
+        self.stacks_count: int = 0
+        self.tagged_count: int = 0
+        self.skipped_count: int = 0
+
+    def new_tags(self) -> Tags:
+        """Returns a new Tags with the shared entries"""
+        tags = Tags()
+        tags.tags = list(self.tags)
+        return tags
+
+    def merge_tags(self, existing_tags: Tags) -> Tags:
+        """
+        Merges the tags with the existing ones, indexed by key. The existing values take precedence.
+        """
+        helpers = []
+        merged: dict = {}
+        for tag in existing_tags.tags:
+            if isinstance(tag, dict):
+                merged[tag["Key"]] = tag["Value"]
+            else:
+                helpers.append(tag)
+        for key, value in self.tags_values.items():
+            merged.setdefault(key, value)
+        return Tags(*helpers, merged)
+
+    def tag_object(self, obj) -> None:
+        """
+        Adds the tags to the object if the object supports it
+        """
+        if isinstance(obj, LaunchTemplate):
+            expand_launch_template_tags_specs(obj, self.new_tags())
+        elif isinstance(obj, self.excluded_types) or (
+            hasattr(obj, "props") and "Tags" not in obj.props
         ):
+            self.skipped_count += 1
             return
-        for stack_resource in resource.stack_template.resources.values():
-            add_object_tags(stack_resource, xtags)
+        elif not hasattr(obj, "Tags"):
+            setattr(obj, "Tags", self.new_tags())
+        elif isinstance(getattr(obj, "Tags"), Tags):
+            setattr(obj, "Tags", self.merge_tags(getattr(obj, "Tags")))
+        else:
+            LOG.debug(f"{obj} Tags are not of type {Tags}. Skipping")
+            self.skipped_count += 1
+            return
+        self.tagged_count += 1
+
+    def apply(self, root_template: Template) -> None:
+        """
+        Goes over the stacks of the root template and of the nested stacks, adding the parameters and the tags
+        to the resources of each stack template.
+        """
+        templates = [root_template] if root_template else []
+        while templates:
+            template = templates.pop()
+            for resource in template.resources.values():
+                if (
+                    not isinstance(resource, ComposeXStack)
+                    or not resource.stack_template
+                ):
+                    continue
+                self.stacks_count += 1
+                stack_template = resource.stack_template
+                if self.params:
+                    add_parameters(stack_template, self.params)
+                for stack_resource in stack_template.resources.values():
+                    self.tag_object(stack_resource)
+                templates.append(stack_template)
+        LOG.info(
+            f"Tags set on {self.tagged_count} resources in {self.stacks_count} stacks."
+            f" {self.skipped_count} resources do not support tags."
+        )
 
 
 def add_all_tags(
@@ -202,26 +239,10 @@ def add_all_tags(
     settings: ComposeXSettings,
     params: list = None,
     xtags: Tags = None,
-) -> None:
+) -> TagsEngine:
     """
-    Function to go through all stacks of a given template and update the template
-    It will recursively render sub stacks defined.
-    If there are no substacks, it will go over the resources of the template add the tags.
-
+    Function to go through all stacks of a given template and add the tags to the resources of the nested stacks.
     """
-    if not params or not xtags:
-        if not keyisset("x-tags", settings.compose_content):
-            xtags = default_tags(settings)
-            params = None
-        else:
-            tags = settings.compose_content["x-tags"]
-            params = generate_tags_parameters(tags)
-            xtags = define_extended_tags(tags)
-            xtags += default_tags(settings)
-
-    resources = root_template.resources if root_template else {}
-    for resource_name, resource in resources.items():
-        LOG.debug(
-            "Applying tags to resource {}: {}".format(resource_name, type(resource))
-        )
-        apply_tags_to_resources(settings, resource, params, xtags)
+    engine = TagsEngine(settings, params, xtags)
+    engine.apply(root_template)
+    return engine
@@ -18,7 +18,7 @@ from troposphere import Parameter as CfnParameter
 from troposphere import Ref, Template
 
 from ecs_composex import __version__ as version
-from ecs_composex.common import DATE, cfn_conditions
+from ecs_composex.common import cfn_conditions
 from ecs_composex.common.cfn_params import ROOT_STACK_NAME, Parameter
 
 
@@ -54,7 +54,7 @@ def init_template(description=None):
         deepcopy(
             {
                 "Type": "ComposeX",
-                "Properties": {"Version": version, "GeneratedOn": DATE},
+                "Properties": {"Version": version},
             }
         )
     )
@@ -0,0 +1,203 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2025 John Mille <john@compose-x.io>
+
+"""
+Copy-on-write views of the compose document.
+
+The services, volumes, secrets, networks and x-resources each own their definition, which used to be a deepcopy
+of their part of the compose document. The views instead share the nested values with the document, and only
+copy (shallow) the dicts and lists along the paths that are accessed, so the shared values are never modified.
+"""
+
+from __future__ import annotations
+
+from copy import deepcopy
+from threading import Lock
+
+import yaml
+from cfn_flip.yaml_dumper import LongCleanDumper
+
+_WRAP_LOCK = Lock()
+
+
+def copy_on_write(value):
+    """
+    Returns a copy-on-write view of the dicts and lists, or the value itself for anything else.
+    Views given are copied, sharing with the new view the values that neither accessed yet.
+    """
+    if isinstance(value, (CopyOnWriteDict, CopyOnWriteList)):
+        return value.copy()
+    if isinstance(value, dict):
+        return CopyOnWriteDict(value)
+    if isinstance(value, list):
+        return CopyOnWriteList(value)
+    return value
+
+
+def to_plain(value):
+    """
+    Returns the value with all the views (recursively) converted to dict and list.
+    """
+    if isinstance(value, dict):
+        return {key: to_plain(sub_value) for key, sub_value in value.items()}
+    if isinstance(value, list):
+        return [to_plain(item) for item in value]
+    return value
+
+
+class CopyOnWriteDict(dict):
+    """
+    Dict view on a source mapping. The nested dicts and lists of the source are shared until accessed, at which point
+    they are replaced, in this view only, with a view of their own. Values set on the view are owned by it.
+    """
+
+    __slots__ = ("_owned",)
+
+    def __init__(self, source=None, **kwargs):
+        self._owned: set = set()
+        if isinstance(source, CopyOnWriteDict):
+            super().__init__()
+            for key, value in dict.items(source):
+                if key in source._owned:
+                    self._set_owned(key, copy_on_write(value))
+                else:
+                    dict.__setitem__(self, key, value)
+        elif source is not None:
+            super().__init__(source)
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def _set_owned(self, key, value) -> None:
+        dict.__setitem__(self, key, value)
+        self._owned.add(key)
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if key in self._owned or not isinstance(value, (dict, list)):
+            return value
+        with _WRAP_LOCK:
+            value = dict.__getitem__(self, key)
+            if key not in self._owned:
+                value = copy_on_write(value)
+                self._set_owned(key, value)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        self._set_owned(key, value)
+
+    def __delitem__(self, key) -> None:
+        dict.__delitem__(self, key)
+        self._owned.discard(key)
+
+    def __iter__(self):
+        """Overridden so that dict(), {**view} and update() read the values via __getitem__"""
+        return dict.__iter__(self)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def _own_all(self) -> None:
+        """Wraps all the nested values, so that items() and values() can return the dict views"""
+        for key in list(dict.keys(self)):
+            if key not in self._owned:
+                self.__getitem__(key)
+
+    def items(self):
+        self._own_all()
+        return dict.items(self)
+
+    def values(self):
+        self._own_all()
+        return dict.values(self)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = self[key]
+        del self[key]
+        return value
+
+    def popitem(self) -> tuple:
+        if not dict.__len__(self):
+            raise KeyError("popitem(): dictionary is empty")
+        key = next(reversed(dict.keys(self)))
+        return key, self.pop(key)
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        dict.clear(self)
+        self._owned.clear()
+
+    def copy(self) -> CopyOnWriteDict:
+        return CopyOnWriteDict(self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo) -> CopyOnWriteDict:
+        new_view = CopyOnWriteDict()
+        for key, value in dict.items(self):
+            if key in self._owned:
+                new_view._set_owned(key, deepcopy(value, memo))
+            else:
+                dict.__setitem__(new_view, key, value)
+        return new_view
+
+    def __reduce__(self):
+        return dict, (to_plain(self),)
+
+
+class CopyOnWriteList(list):
+    """
+    List view on a source list. The dicts and lists of the source are wrapped in views when the list is created,
+    so its items can be modified without changing the source.
+    """
+
+    def __init__(self, source=()):
+        super().__init__(copy_on_write(item) for item in source)
+
+    def copy(self) -> CopyOnWriteList:
+        return CopyOnWriteList(self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo) -> CopyOnWriteList:
+        new_view = CopyOnWriteList()
+        list.extend(new_view, (deepcopy(item, memo) for item in self))
+        return new_view
+
+    def __reduce__(self):
+        return list, (to_plain(self),)
+
+
+def represent_view(dumper: yaml.BaseDumper, data) -> yaml.Node:
+    return dumper.represent_data(to_plain(data))
+
+
+def register_yaml_representers(*dumpers) -> None:
+    """
+    Registers the views for the YAML dumpers, which would otherwise render them as python objects
+    """
+    for dumper in dumpers:
+        dumper.add_representer(CopyOnWriteDict, represent_view)
+        dumper.add_representer(CopyOnWriteList, represent_view)
+
+
+register_yaml_representers(yaml.Dumper, yaml.SafeDumper, LongCleanDumper)
+if hasattr(yaml, "CDumper"):
+    register_yaml_representers(yaml.CDumper, yaml.CSafeDumper)
@@ -5,11 +5,10 @@
 Class and functions to interact with the networks: defined in compose files.
 """
 
-from copy import deepcopy
-
 from compose_x_common.compose_x_common import set_else_none
 
 from ecs_composex.common.logging import LOG
+from ecs_composex.compose.compose_document import copy_on_write
 
 
 def match_networks_services_config(service, net_config, networks):
@@ -43,7 +42,7 @@ class ComposeNetwork:
 
     def __init__(self, name, definition, subnets_list):
         self.name = name
-        self.definition = deepcopy(definition)
+        self.definition = copy_on_write(definition)
         self.subnet_name = set_else_none("x-vpc", definition, None)
         subnet_names = [subnet.title for subnet in subnets_list]
         if self.subnet_name and self.subnet_name not in subnet_names:
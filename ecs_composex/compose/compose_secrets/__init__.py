@@ -16,7 +16,9 @@ from troposphere.ecs import Environment as EcsEnvVar
 from troposphere.ecs import Secret as EcsSecret
 
 from ecs_composex.common import NONALPHANUM
+from ecs_composex.common.aws import get_lookup_account_id
 from ecs_composex.common.logging import LOG
+from ecs_composex.compose.compose_document import copy_on_write
 from ecs_composex.ecs.ecs_params import EXEC_ROLE_T, TASK_ROLE_T
 from ecs_composex.secrets.secrets_aws import lookup_secret_config
 from ecs_composex.secrets.secrets_params import RES_KEY, XRES_KEY
@@ -49,7 +51,7 @@ class ComposeSecret:
         self.services = []
         self.name = name
         self.logical_name = NONALPHANUM.sub("", self.name)
-        self.definition = deepcopy(definition)
+        self.definition = copy_on_write(definition)
         self.links = [EXEC_ROLE_T, TASK_ROLE_T]
         self.arn = None
         self.iam_arn = None
@@ -61,7 +63,7 @@ class ComposeSecret:
         if not keyisset("Lookup", self.definition[self.x_key]):
             self.define_names_from_import()
         else:
-            self.define_names_from_lookup(settings.session)
+            self.define_names_from_lookup(settings)
 
         self.define_links()
         if self.mapping:
@@ -197,17 +199,30 @@ class ComposeSecret:
                     self.map_name, self.logical_name, self.map_kms_name
                 )
 
-    def define_names_from_lookup(self, session):
+    def define_names_from_lookup(self, settings):
         """
-        Method to Lookup the secret based on its tags.
+        Method to Lookup the secret based on its tags, or from the lookup cache if enabled.
+
+        :param ecs_composex.common.settings.ComposeXSettings settings:
         """
+        from ecs_composex.compose.x_resources.lookup_cache import lookup_with_cache
+
         lookup_info = self.definition[self.x_key]["Lookup"]
         if keyisset("Name", self.definition[self.x_key]):
             lookup_info["Name"] = self.definition[self.x_key]["Name"]
-        secret_config = lookup_secret_config(self.logical_name, lookup_info, session)
-        self.aws_name = get_secret_name_from_arn(secret_config[self.logical_name])
-        self.arn = secret_config[self.logical_name]
-        self.iam_arn = secret_config[self.logical_name]
+        session = settings.session
+        secret_config = lookup_with_cache(
+            settings,
+            f"{self.main_key}.{self.name}",
+            self.x_key,
+            lookup_info,
+            session.region_name,
+            lambda: get_lookup_account_id(lookup_info, session),
+            lambda: lookup_secret_config(self.map_arn_name, lookup_info, session),
+        )
+        self.aws_name = get_secret_name_from_arn(secret_config[self.map_arn_name])
+        self.arn = secret_config[self.map_arn_name]
+        self.iam_arn = secret_config[self.map_arn_name]
         if keyisset("KmsKeyId", secret_config) and not secret_config[
             "KmsKeyId"
         ].startswith("alias"):
@@ -220,7 +235,7 @@ class ComposeSecret:
             )
 
         self.mapping = {
-            self.map_arn_name: secret_config[self.logical_name],
+            self.map_arn_name: secret_config[self.map_arn_name],
             self.map_name_name: secret_config[self.map_name_name],
         }
         if self.kms_key:
@@ -10,7 +10,6 @@ from __future__ import annotations
 
 import re
 import shlex
-from copy import deepcopy
 from os import path
 from typing import TYPE_CHECKING, Union
 
@@ -34,7 +33,9 @@ from troposphere.ecs import (
 
 from ecs_composex.common import NONALPHANUM
 from ecs_composex.common.cfn_params import ROOT_STACK_NAME, Parameter
+from ecs_composex.common.files import LOCAL_FILES
 from ecs_composex.common.logging import LOG
+from ecs_composex.compose.compose_document import copy_on_write
 from ecs_composex.compose.compose_secrets.services_helpers import map_secrets
 from ecs_composex.compose.compose_services.docker_tools import (
     import_time_values_to_seconds,
@@ -99,7 +100,7 @@ class ComposeService:
                     "Expected",
                     setting[1],
                 )
-        self._definition = deepcopy(definition)
+        self._definition = copy_on_write(definition)
         self.name = name
         self.container_definition = None
 
@@ -842,9 +843,10 @@ class ComposeService:
                     "Files in the env_file is supposed to be a list of paths to files (str). Got",
                     type(file_path),
                 )
-            if not path.exists(path.abspath(file_path)):
-                raise FileNotFoundError("No file found at", path.abspath(file_path))
-            env_files.append(path.abspath(file_path))
+            env_file_path = LOCAL_FILES.get_path(file_path)
+            if not path.exists(env_file_path):
+                raise FileNotFoundError("No file found at", env_file_path)
+            env_files.append(env_file_path)
         return env_files
 
     def handle_expose_ports(self, aws_vpc_mappings):
@@ -15,9 +15,6 @@ if TYPE_CHECKING:
     from ecs_composex.common.settings import ComposeXSettings
     from . import ComposeService
 
-import docker
-import requests
-import urllib3
 from compose_x_common.aws import get_session
 from compose_x_common.aws.ecr import PRIVATE_ECR_URI_RE, PUBLIC_ECR_URI_RE
 from compose_x_common.compose_x_common import keyisset
@@ -27,6 +24,7 @@ from ecs_composex.common.cfn_params import Parameter
 from ecs_composex.common.logging import LOG
 
 from .ecr_helpers import define_service_image, interpolate_ecr_uri_tag_with_digest
+from .registry_digests import ImageDigestsResolver
 
 
 def get_image_from_ssm_parameter(
@@ -107,7 +105,7 @@ class ServiceImage:
         return PUBLIC_ECR_URI_RE.match(self.image_uri)
 
     def private_ecr_digest(self, settings: ComposeXSettings):
-        if not self.service.x_ecr:
+        if not self.service.x_ecr or settings.offline:
             return
         service_image = define_service_image(self.service, settings)
         if not keyisset("imageDigest", service_image):
@@ -150,14 +148,22 @@ class ServiceImage:
             if keyisset("x-docker_opts", self.service.definition) and keyisset(
                 "InterpolateWithDigest", self.service.definition["x-docker_opts"]
             ):
-                try:
-                    import docker
+                self.retrieve_image_digest(settings)
 
-                    self.retrieve_image_digest()
-                except ImportError:
-                    print("Unable to use docker to resolve image")
-
-    def retrieve_image_digest(self):
+    def get_private_ecr_digest(self, settings: ComposeXSettings) -> dict | None:
+        """
+        Uses the private ECR image resolved with the ECR API, with the images of the other services.
+        When the ECR index could not get a session for the account, or the image, falls back to the registry API.
+        """
+        image_id = settings.ecr_images.get_resolved_image(self.service)
+        if image_id:
+            return {"digest": image_id["imageDigest"], "mediaType": None}
+        LOG.debug(
+            f"services.{self.service.name} - {self.image} not resolved with ECR. Using the registry API"
+        )
+        return settings.image_digests.get_digest(self.image)
+
+    def retrieve_image_digest(self, settings: ComposeXSettings = None):
         """
         Retrieves the docker images digest from the repository to use instead of the image tag.
         """
@@ -165,29 +171,23 @@ class ServiceImage:
             return
         valid_media_types = [
             "application/vnd.oci.image.index.v1+json",
+            "application/vnd.oci.image.manifest.v1+json",
             "application/vnd.docker.distribution.manifest.v1+json",
             "application/vnd.docker.distribution.manifest.v2+json",
             "application/vnd.docker.distribution.manifest.v1+prettyjws",
             "application/vnd.docker.distribution.manifest.list.v2+json",
         ]
-        try:
-            original_image = self.image
-            dkr_client = docker.APIClient()
-            image_details = dkr_client.inspect_distribution(self.image)
-            if not keyisset("Descriptor", image_details):
-                raise KeyError(f"No information retrieved for {self.image}")
-        except (docker.errors.APIError, docker.errors.DockerException) as error:
-            LOG.error(f"Failed to retrieve the image digest for {self.image}: {error}")
-            image_details = {}
-        except (FileNotFoundError, urllib3.exceptions, requests.exceptions) as error:
-            LOG.error("Failed to connect to any docker engine: {error}")
-            image_details = {}
-        if not image_details:
-            LOG.warn(
+        original_image = self.image
+        if settings and self.private_ecr and not settings.offline:
+            details = self.get_private_ecr_digest(settings)
+        else:
+            resolver = settings.image_digests if settings else ImageDigestsResolver()
+            details = resolver.get_digest(self.image)
+        if not details:
+            LOG.warning(
                 f"services.{self.service.name}: Failed to interpolate Docker image tag with digest"
             )
             return
-        details = image_details["Descriptor"]
         if (
             keyisset("mediaType", details)
             and details["mediaType"] not in valid_media_types
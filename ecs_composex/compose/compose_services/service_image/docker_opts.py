@@ -12,11 +12,15 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ecs_composex.common.settings import ComposeXSettings
+    from ecs_composex.compose.compose_services import ComposeService
 
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 
+from botocore.exceptions import ClientError
 from compose_x_common.compose_x_common import keyisset, set_else_none
 
+from ecs_composex.common.aws_calls import API_CALLS
 from ecs_composex.common.logging import LOG
 from ecs_composex.compose.compose_services.service_image.ecr_helpers import (
     define_service_image,
@@ -24,6 +28,7 @@ from ecs_composex.compose.compose_services.service_image.ecr_helpers import (
 
 try:
     from ecs_composex.compose.compose_services.service_image.ecr_scans_eval import (
+        ScansBackoff,
         scan_service_image,
     )
 
@@ -33,12 +38,28 @@ except ImportError as error:
     warnings.warn(str(error))
 
 
+def evaluate_service_image(
+    service: ComposeService, settings: ComposeXSettings, backoff: ScansBackoff
+) -> tuple[bool, list[str], list[str]]:
+    with API_CALLS.scoped(f"services::{service.name}"):
+        service_image = define_service_image(service, settings)
+        return scan_service_image(service, settings, service_image, backoff)
+
+
 def evaluate_ecr_configs(settings: ComposeXSettings) -> int:
     """
     Function to go over each service of each family in its final state and evaluate the ECR Image validity.
+    The scans are evaluated concurrently, sharing the API calls backoff and deadline, and the results are reported
+    for all services. The services which scan could not be evaluated count as failed.
+
+    :return: 1 if any service image failed the scan and the findings are not ignored, 0 otherwise
     """
     if not SCANS_POSSIBLE:
         return 0
+    if settings.offline:
+        LOG.warning("Offline - ECR images scans are not evaluated")
+        return 0
+    services: list = []
     for family in settings.families.values():
         for service in family.services:
             x_ecr_config = set_else_none("x-ecr", service.definition)
@@ -50,29 +71,53 @@ def evaluate_ecr_configs(settings: ComposeXSettings) -> int:
                     )
                 )
                 continue
-            service_image = define_service_image(service, settings)
-            scan_pass, findings, failed_findings = scan_service_image(
-                service, settings, service_image
+            services.append((family, service))
+    if not services:
+        return 0
+    settings.ecr_images.resolve([service for _, service in services])
+    backoff = ScansBackoff(settings.ecr_scans_timeout)
+    with ThreadPoolExecutor(
+        max_workers=max(min(settings.ecr_scans_workers, len(services)), 1),
+        thread_name_prefix="ecr-scan",
+    ) as executor:
+        futures = [
+            executor.submit(evaluate_service_image, service, settings, backoff)
+            for _, service in services
+        ]
+    failed: list[str] = []
+    for (family, service), future in zip(services, futures):
+        try:
+            scan_pass, findings, failed_findings = future.result()
+        except (ClientError, LookupError, ValueError, TypeError) as error:
+            LOG.error(
+                f"{family.name}.{service.name} - Unable to evaluate the scan: {error}"
+            )
+            failed.append(f"{family.name}.{service.name}")
+            continue
+        LOG.debug("%s %s %s", scan_pass, findings, failed_findings)
+        if scan_pass and not findings:
+            LOG.info(
+                f"{family.name}.{service.name} - ECR Scan Pass (No vulnerabilities found)"
             )
-            LOG.debug("%s %s %s", scan_pass, findings, failed_findings)
-            if scan_pass and not findings:
-                LOG.info(
-                    f"{family.name}.{service.name} - ECR Scan Pass (No vulnerabilities found)"
+            continue
+        if findings:
+            LOG.warn(
+                "{}.{} - ECR Scan Findings(LEVEL:findings/threshold): {}".format(
+                    family.name, service.name, "|".join(findings)
                 )
-                return 0
-            if findings:
-                LOG.warn(
-                    "{}.{} - ECR Scan Findings(LEVEL:findings/threshold): {}".format(
-                        family.name, service.name, "|".join(findings)
+            )
+            if failed_findings:
+                LOG.error(
+                    "{}.{} - Findings above thresholds: {}".format(
+                        family.name, service.name, "|".join(failed_findings)
                     )
                 )
-                if failed_findings:
-                    LOG.error(
-                        "{}.{} - Findings above thresholds: {}".format(
-                            family.name, service.name, "|".join(failed_findings)
-                        )
-                    )
-            if not scan_pass and not settings.ignore_ecr_findings:
-                LOG.error(f"{family.name}.{service.name} - vulnerabilities found")
-                return 1
+        if not scan_pass and not settings.ignore_ecr_findings:
+            LOG.error(f"{family.name}.{service.name} - vulnerabilities found")
+            failed.append(f"{family.name}.{service.name}")
+    if failed:
+        LOG.error(
+            f"ECR Scans failed for {len(failed)}/{len(services)} services: {', '.join(failed)}"
+        )
+        return 1
     return 0
@@ -1,76 +1,234 @@
 #  SPDX-License-Identifier: MPL-2.0
 #  Copyright 2020-2025 John Mille <john@compose-x.io>
 
+from __future__ import annotations
+
 import re
+from threading import Lock
 
 from boto3.session import Session
-from compose_x_common.aws.ecr.images import list_all_images
+from botocore.exceptions import ClientError
 from compose_x_common.compose_x_common import keyisset, set_else_none
 
-from ecs_composex.common.aws import get_cross_role_session
+from ecs_composex.common.aws import (
+    ThreadSafeSession,
+    get_account_id,
+    get_cross_role_session,
+)
 from ecs_composex.common.logging import LOG
 
 ECR_URI_RE = re.compile(
     r"(?P<account_id>\d{12}).dkr.ecr.(?P<region>[a-z0-9-]+).amazonaws.com/"
     r"(?P<repo_name>[a-zA-Z0-9-_./]+)(?P<tag>(?:\@sha[\d]+:[a-z-Z0-9]+$)|(?::[\S]+$))"
 )
+ECR_DESCRIBE_BATCH_SIZE = 100
 
 
-def define_ecr_session(account_id, repo_name, region, settings, role_arn=None):
+def get_image_reference(service) -> tuple[str, str, str, dict] | None:
     """
-    Function to determine the boto3 session to use for subsequent API calls to ECR
-    :param account_id:
-    :param repo_name:
-    :param region:
-    :param settings:
-    :param str role_arn:
-    :return:
+    :param ecs_composex.common.compose_services.ComposeService service:
+    :return: the account ID, region, repository name and image ID (tag or digest) of a private ECR image
     """
-    ecr_session = Session(region_name=region)
-    current_account_id = settings.session.client("sts").get_caller_identity()["Account"]
-    if account_id != current_account_id and role_arn is None:
-        raise KeyError(
-            f"The account for repository {repo_name} detected from image URI is in account "
-            f"{account_id}, execution session in {current_account_id} and no RoleArn provided"
-        )
-    elif account_id != current_account_id and role_arn:
-        ecr_session = get_cross_role_session(
-            settings.session,
-            role_arn,
-            region_name=region,
-            session_name="ecr-scan@compose-x",
-        )
-    return ecr_session
-
-
-def identify_service_image(service, repo_name, image_sha, image_tag, session):
+    parts = service.image.private_ecr
+    if not parts:
+        return None
+    tag = parts.group("tag")
+    if tag.startswith(r"@"):
+        image_id = {"imageDigest": tag.split("@")[-1]}
+    else:
+        image_id = {"imageTag": tag.split(":")[-1]}
+    return (
+        parts.group("account_id"),
+        parts.group("region"),
+        parts.group("repo_name"),
+        image_id,
+    )
+
+
+def get_image_key(image_id: dict) -> tuple[str, str]:
+    if keyisset("imageDigest", image_id):
+        return "imageDigest", image_id["imageDigest"]
+    return "imageTag", image_id["imageTag"]
+
+
+class EcrRepository:
     """
-    Function to identify the image in repository that matches the one defined in service
-    for a private ECR Based image.
-
-    :param str repo_name:
-    :param str image_sha:
-    :param str image_tag:
-    :param boto3.session.Session session:
-    :return: The image definition
-    :rtype: dict
+    Images of an ECR repository resolved so far, by tag and by digest. None for the images that do not exist.
     """
-    repo_images = list_all_images(repo_name=repo_name, ecr_session=session)
-    for image in repo_images:
-        if (
-            image_sha
-            and keyisset("imageDigest", image)
-            and image["imageDigest"] == image_sha
-        ) or (
-            image_tag and keyisset("imageTag", image) and image["imageTag"] == image_tag
-        ):
-            return image
-    else:
-        raise LookupError(
-            "Unable to find image",
-            service.image.image_uri,
-            "Deployment would result in failure.",
-        )
+
+    def __init__(self, registry_id: str, repo_name: str, session: Session):
+        self.registry_id = registry_id
+        self.repo_name = repo_name
+        self.session = session
+        self.images: dict = {}
+        self.lock = Lock()
+
+    def add_image_details(self, image_details: dict) -> None:
+        digest = image_details["imageDigest"]
+        tags = image_details.get("imageTags", [])
+        for tag in tags:
+            self.images[("imageTag", tag)] = {"imageDigest": digest, "imageTag": tag}
+        digest_id = {"imageDigest": digest}
+        if tags:
+            digest_id["imageTag"] = tags[0]
+        self.images.setdefault(("imageDigest", digest), digest_id)
+
+    def describe_images(self, image_ids: list[dict]) -> None:
+        """
+        Describes the images in one call. When some do not exist, ECR fails the whole call, so the images are split
+        in halves until the missing ones are identified.
+        """
+        client = self.session.client("ecr")
+        LOG.debug(f"ECR - Describing {len(image_ids)} images of {self.repo_name}")
+        try:
+            for page in client.get_paginator("describe_images").paginate(
+                registryId=self.registry_id,
+                repositoryName=self.repo_name,
+                imageIds=image_ids,
+            ):
+                for image_details in page["imageDetails"]:
+                    self.add_image_details(image_details)
+        except client.exceptions.ImageNotFoundException:
+            if len(image_ids) > 1:
+                middle = len(image_ids) // 2
+                self.describe_images(image_ids[:middle])
+                self.describe_images(image_ids[middle:])
+        for image_id in image_ids:
+            self.images.setdefault(get_image_key(image_id), None)
+
+    def resolve(self, image_ids: list[dict]) -> None:
+        """
+        Describes the images not resolved yet, by batches of ECR_DESCRIBE_BATCH_SIZE.
+        """
+        with self.lock:
+            missing: dict = {}
+            for image_id in image_ids:
+                if get_image_key(image_id) not in self.images:
+                    missing.setdefault(get_image_key(image_id), image_id)
+            image_ids = list(missing.values())
+            for index in range(0, len(image_ids), ECR_DESCRIBE_BATCH_SIZE):
+                self.describe_images(image_ids[index : index + ECR_DESCRIBE_BATCH_SIZE])
+
+
+class EcrImagesIndex:
+    """
+    Index of the private ECR images used by the services, shared for the execution. The images are resolved by tag
+    or digest with DescribeImages, batched per repository, instead of listing all the images of the repositories,
+    and each image is only described once. The ECR sessions are kept per account, region and IAM role.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self._lock = Lock()
+        self._sessions: dict = {}
+        self._repositories: dict = {}
+
+    def get_session(
+        self, account_id: str, repo_name: str, region: str, role_arn: str = None
+    ) -> Session:
+        """
+        Determines the boto3 session to use for subsequent API calls to ECR
+
+        :raises: KeyError if the repository is in another account and no role is set
+        """
+        with self._lock:
+            if (account_id, region, role_arn) in self._sessions:
+                return self._sessions[(account_id, region, role_arn)]
+        current_account_id = get_account_id(self.session)
+        if account_id != current_account_id and role_arn is None:
+            raise KeyError(
+                f"The account for repository {repo_name} detected from image URI is in account "
+                f"{account_id}, execution session in {current_account_id} and no RoleArn provided"
+            )
+        elif account_id != current_account_id and role_arn:
+            ecr_session = get_cross_role_session(
+                self.session,
+                role_arn,
+                region_name=region,
+                session_name="ecr-scan@compose-x",
+            )
+        else:
+            ecr_session = ThreadSafeSession(region_name=region)
+        with self._lock:
+            return self._sessions.setdefault(
+                (account_id, region, role_arn), ecr_session
+            )
+
+    def get_repository(self, service) -> tuple[EcrRepository, dict] | None:
+        """
+        :return: the repository of the service image, and the image ID to resolve in it
+        """
+        reference = get_image_reference(service)
+        if reference is None:
+            return None
+        account_id, region, repo_name, image_id = reference
+        role_arn = set_else_none("RoleArn", service.x_ecr)
+        session = self.get_session(account_id, repo_name, region, role_arn)
+        with self._lock:
+            key = (account_id, region, repo_name, role_arn)
+            if key not in self._repositories:
+                self._repositories[key] = EcrRepository(account_id, repo_name, session)
+            return self._repositories[key], image_id
+
+    def resolve(self, services: list) -> None:
+        """
+        Resolves the images of the services, with the images of the same repository described together.
+        """
+        images_per_repository: dict = {}
+        for service in services:
+            try:
+                repository_image = self.get_repository(service)
+            except KeyError as error:
+                LOG.debug(f"services.{service.name} - {error}")
+                continue
+            if repository_image:
+                images_per_repository.setdefault(repository_image[0], []).append(
+                    repository_image[1]
+                )
+        for repository, image_ids in images_per_repository.items():
+            try:
+                repository.resolve(image_ids)
+            except ClientError as error:
+                LOG.warning(
+                    f"ECR - Unable to describe the images of {repository.repo_name} - {error}"
+                )
+
+    def get_resolved_image(self, service) -> dict | None:
+        """
+        :return: the image ID of the service image if already resolved, without calling the ECR API.
+          None if the image is not in the index, could not be resolved, or does not exist.
+        """
+        reference = get_image_reference(service)
+        if reference is None:
+            return None
+        account_id, region, repo_name, image_id = reference
+        role_arn = set_else_none("RoleArn", service.x_ecr)
+        with self._lock:
+            repository = self._repositories.get(
+                (account_id, region, repo_name, role_arn)
+            )
+        if repository is None:
+            return None
+        return repository.images.get(get_image_key(image_id))
+
+    def get_image(self, service) -> dict | None:
+        """
+        :return: the image ID, with imageDigest and imageTag, of the service image. None if not a private ECR image.
+        :raises: LookupError if the image does not exist
+        """
+        repository_image = self.get_repository(service)
+        if repository_image is None:
+            return None
+        repository, image_id = repository_image
+        repository.resolve([image_id])
+        the_image = repository.images.get(get_image_key(image_id))
+        if the_image is None:
+            raise LookupError(
+                "Unable to find image",
+                service.image.image_uri,
+                "Deployment would result in failure.",
+            )
+        return the_image
 
 
 def interpolate_ecr_uri_tag_with_digest(image_url, image_digest):
@@ -94,29 +252,6 @@ def define_service_image(service, settings):
 
     :param ecs_composex.common.compose_services.ComposeService service:
     :param ecs_composex.common.settings.ComposeXSettings settings: The settings for the execution
-    :return:
+    :return: the image ID, with imageDigest and imageTag
     """
-    if not service.image.private_ecr:
-        return
-    image_sha = None
-    image_tag = None
-    parts = service.image.private_ecr
-    tag = parts.group("tag")
-    if tag.startswith(r":"):
-        image_tag = tag.split(":")[-1]
-    elif tag.startswith(r"@"):
-        image_sha = tag.split("@")[-1]
-    repo_name = parts.group("repo_name")
-    account_id = parts.group("account_id")
-    region = parts.group("region")
-    session = define_ecr_session(
-        account_id,
-        repo_name,
-        region,
-        settings,
-        role_arn=set_else_none("RoleArn", service.x_ecr),
-    )
-    the_image = identify_service_image(
-        service, repo_name, image_sha, image_tag, session
-    )
-    return the_image
+    return settings.ecr_images.get_image(service)
@@ -4,13 +4,14 @@
 from __future__ import annotations
 
 import re
-from time import sleep
-from typing import TYPE_CHECKING, Union
+from threading import Lock
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, Callable, Union
 
 if TYPE_CHECKING:
     from ecs_composex.compose.compose_services.service_image import ServiceImage
 
-from boto3.session import Session
+from botocore.exceptions import ClientError
 from compose_x_common.compose_x_common import keyisset, set_else_none
 
 try:
@@ -21,9 +22,11 @@ except ImportError:
     raise ImportError(
         "Run pip install ecs-composex[ecrscan] to enable this functionality."
     )
+from ecs_composex.common.aws import ThreadSafeSession
 from ecs_composex.common.logging import LOG
 
-from .ecr_helpers import define_ecr_session
+DEFAULT_SCANS_TIMEOUT = 900
+THROTTLING_ERRORS = ["LimitExceededException", "ThrottlingException"]
 
 ECR_URI_RE = re.compile(
     r"(?P<account_id>\d{12}).dkr.ecr.(?P<region>[a-z0-9-]+).amazonaws.com/"
@@ -31,8 +34,76 @@ ECR_URI_RE = re.compile(
 )
 
 
+class ScansBackoff:
+    """
+    Shared by the concurrent scans evaluations. When ECR throttles one of them, they all wait before their next call,
+    with the delay doubling up to max_delay, and reset once a call succeeds. Also holds the deadline for all scans.
+
+    :ivar float deadline: time.monotonic() value after which scans are no longer polled
+    """
+
+    def __init__(self, timeout: int | float, delay: int = 10, max_delay: int = 60):
+        self.deadline = monotonic() + timeout
+        self.delay = delay
+        self.max_delay = max_delay
+        self._current_delay = delay
+        self._resume_at: float = 0
+        self._lock = Lock()
+
+    @property
+    def expired(self) -> bool:
+        return monotonic() >= self.deadline
+
+    def sleep(self, seconds: int | float) -> None:
+        """Sleeps for the given time, without going past the deadline"""
+        sleep(max(min(seconds, self.deadline - monotonic()), 0))
+
+    def wait(self) -> None:
+        """Waits until the API calls can be made again, if throttled"""
+        with self._lock:
+            resume_at = self._resume_at
+        self.sleep(resume_at - monotonic())
+
+    def throttled(self) -> None:
+        with self._lock:
+            self._resume_at = max(self._resume_at, monotonic() + self._current_delay)
+            self._current_delay = min(self._current_delay * 2, self.max_delay)
+
+    def succeeded(self) -> None:
+        with self._lock:
+            self._current_delay = self.delay
+
+    def call(self, function: Callable, *args, **kwargs):
+        """
+        Calls the ECR API once not throttled, and again while throttled, until the deadline.
+
+        :raises: ClientError if the call fails, or is still throttled at the deadline
+        """
+        while True:
+            self.wait()
+            try:
+                result = function(*args, **kwargs)
+            except ClientError as error:
+                if error.response["Error"]["Code"] not in THROTTLING_ERRORS:
+                    self.succeeded()
+                    raise
+                LOG.warning(f"ECR - Exceeding API Calls quota. Backing off - {error}")
+                self.throttled()
+                if self.expired:
+                    raise
+                continue
+            self.succeeded()
+            return result
+
+
 def initial_scan_retrieval(
-    registry, repository_name, image, service_image, trigger_scan, ecr_session=None
+    registry,
+    repository_name,
+    image,
+    service_image,
+    trigger_scan,
+    ecr_session=None,
+    backoff: ScansBackoff = None,
 ):
     """
     Function to retrieve the scan findings from ECR, and if none, can trigger scan
@@ -43,15 +114,21 @@ def initial_scan_retrieval(
     :param ServiceImage service_image:
     :param bool trigger_scan:
     :param boto3.session.Session ecr_session:
+    :param ScansBackoff backoff: shared backoff and deadline for the scans
     :return: The scan report
     :rtype: dict
     """
     if ecr_session is None:
-        ecr_session = Session()
+        ecr_session = ThreadSafeSession()
+    if backoff is None:
+        backoff = ScansBackoff(DEFAULT_SCANS_TIMEOUT)
     client = ecr_session.client("ecr")
     try:
-        image_scan_r = client.describe_image_scan_findings(
-            registryId=registry, repositoryName=repository_name, imageId=image
+        image_scan_r = backoff.call(
+            client.describe_image_scan_findings,
+            registryId=registry,
+            repositoryName=repository_name,
+            imageId=image,
         )
         return image_scan_r
     except client.exceptions.ScanNotFoundException:
@@ -60,11 +137,13 @@ def initial_scan_retrieval(
             LOG.info(
                 f"Triggering scan for {service_image.image_uri}, trigger_scan={trigger_scan}"
             )
-            trigger_images_scan(
+            backoff.call(
+                trigger_images_scan,
                 repo_name=repository_name,
                 images_to_scan=[image],
                 ecr_session=ecr_session,
             )
+            return {"imageScanStatus": {"status": "PENDING"}}
         else:
             LOG.warn(
                 f"No scan was available and scanning not requested for {service_image.image_uri}. Skipping"
@@ -80,12 +159,19 @@ def scan_poll_and_wait(
     ecr_session=None,
     scan_frequency: str = None,
     scan_on_push: bool = False,
+    backoff: ScansBackoff = None,
 ):
-    """Function to pull the scans results until no longer in progress"""
+    """
+    Function to pull the scans results until no longer in progress, or until the backoff deadline is reached.
+    Returns None if the scan cannot be found or the deadline is reached.
+    """
+    if backoff is None:
+        backoff = ScansBackoff(DEFAULT_SCANS_TIMEOUT)
     client = ecr_session.client("ecr")
-    while True:
+    while not backoff.expired:
         try:
-            image_scan_r = client.describe_image_scan_findings(
+            image_scan_r = backoff.call(
+                client.describe_image_scan_findings,
                 registryId=registry,
                 repositoryName=repository_name,
                 imageId=image,
@@ -94,16 +180,19 @@ def scan_poll_and_wait(
                 LOG.info(
                     f"{image_url.image_uri} - Scan in progress - waiting 10 seconds"
                 )
-                sleep(10)
+                backoff.sleep(10)
             else:
                 return image_scan_r
         except client.exceptions.ScanNotFoundException:
             if scan_frequency and scan_frequency == "CONTINUOUS_SCAN" and scan_on_push:
                 LOG.info(f"{image_url.image_uri} - Pending enhanced scan")
-                sleep(10)
+                backoff.sleep(10)
+            else:
+                return None
         except client.exceptions.LimitExceededException:
-            LOG.warn(f"{image_url} - Exceeding API Calls quota. Waiting 10 seconds")
-            sleep(10)
+            break
+    LOG.error(f"{image_url} - Scan report not available before the deadline")
+    return None
 
 
 def wait_for_scan_report(
@@ -113,6 +202,7 @@ def wait_for_scan_report(
     image_url: ServiceImage,
     trigger_scan=False,
     ecr_session=None,
+    backoff: ScansBackoff = None,
 ) -> dict[str, dict | str]:
     """
     Function to wait for the scan report to go from In Progress to else
@@ -123,21 +213,21 @@ def wait_for_scan_report(
     :param str image_url::
     :param bool trigger_scan:
     :param boto3.session.Session ecr_session:
+    :param ScansBackoff backoff: shared backoff and deadline for the scans
     :return:
     """
     if not ecr_session:
-        ecr_session = Session()
+        ecr_session = ThreadSafeSession()
+    if backoff is None:
+        backoff = ScansBackoff(DEFAULT_SCANS_TIMEOUT)
     findings = {}
     scan_frequency = None
     scan_on_push = False
     try:
-        scanning_config = ecr_session.client(
-            "ecr"
-        ).batch_get_repository_scanning_configuration(
-            repositoryNames=[repository_name]
-        )[
-            "scanningConfigurations"
-        ]
+        scanning_config = backoff.call(
+            ecr_session.client("ecr").batch_get_repository_scanning_configuration,
+            repositoryNames=[repository_name],
+        )["scanningConfigurations"]
         scan_frequency = scanning_config[0]["scanFrequency"]
         scan_on_push = scanning_config[0]["scanOnPush"]
     except Exception as error:
@@ -145,7 +235,7 @@ def wait_for_scan_report(
             f"{repository_name} - Could not determine scanning configuration - {error}"
         )
     image_scan_r = initial_scan_retrieval(
-        registry, repository_name, image, image_url, trigger_scan, ecr_session
+        registry, repository_name, image, image_url, trigger_scan, ecr_session, backoff
     )
     LOG.info(
         "ECR Repository Scan configuration: {} - (ScanOnPush/scanFrequency): {}/{}".format(
@@ -173,6 +263,7 @@ def wait_for_scan_report(
             ecr_session,
             scan_frequency,
             scan_on_push,
+            backoff,
         )
 
     if image_scan_r is None:
@@ -272,7 +363,7 @@ def validate_the_image_input(the_image):
 
 
 def scan_service_image(
-    service, settings, the_image: dict = None
+    service, settings, the_image: dict = None, backoff: ScansBackoff = None
 ) -> tuple[bool, list[str], list[str]]:
     """
     Function to review the service definition and evaluate scan if properties defined
@@ -280,6 +371,7 @@ def scan_service_image(
     :param ecs_composex.common.compose_services.ComposeService service:
     :param ecs_composex.common.settings.ComposeXSettings settings: The settings for the execution
     :param the_image: The image to use for scanning references.
+    :param ScansBackoff backoff: shared backoff and deadline for the scans
     """
     region = None
     if validate_input(service):
@@ -296,11 +388,10 @@ def scan_service_image(
     repo_name = parts.group("repo_name")
     account_id = parts.group("account_id")
     region = parts.group("region")
-    session = define_ecr_session(
+    session = settings.ecr_images.get_session(
         account_id,
         repo_name,
         region,
-        settings,
         role_arn=(
             service.ecr_config["RoleArn"]
             if keyisset("RoleArn", vulnerability_config)
@@ -313,6 +404,7 @@ def scan_service_image(
         image=the_image,
         image_url=service.image,
         ecr_session=session,
+        backoff=backoff,
     )
     return define_result(
         service.image, security_findings, thresholds, vulnerability_config
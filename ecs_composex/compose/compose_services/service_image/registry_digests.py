@@ -0,0 +1,418 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2025 John Mille <john@compose-x.io>
+
+"""
+Resolves the docker images tags to their digest with the registries Distribution (v2) HTTP API, without docker engine.
+Identical images are resolved once, concurrently, over pooled connections, and the digests are cached locally.
+The private ECR images are resolved with the ECR API instead, see EcrImagesIndex.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import re
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime as dt
+from datetime import timedelta
+from hashlib import sha256
+from os import environ, path
+from threading import Lock
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ecs_composex.common.files import LocalJsonCache
+from ecs_composex.common.logging import LOG
+
+DOCKER_HUB = "docker.io"
+DOCKER_HUB_REGISTRY = "registry-1.docker.io"
+DOCKER_HUB_AUTH_KEY = "https://index.docker.io/v1/"
+IDENTITY_TOKEN_USERNAME = "<token>"
+
+MANIFEST_MEDIA_TYPES = [
+    "application/vnd.oci.image.index.v1+json",
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.docker.distribution.manifest.v2+json",
+    "application/vnd.docker.distribution.manifest.v1+prettyjws",
+    "application/vnd.docker.distribution.manifest.v1+json",
+]
+DIGEST_RE = re.compile(r"^sha256:[a-f0-9]{64}$")
+CHALLENGE_PARAM_RE = re.compile(r'(?P<key>\w+)="(?P<value>[^"]*)"')
+REQUESTS_TIMEOUT = 15
+
+
+class ImageReference:
+    """
+    Docker image name, normalized as docker does: images without registry come from Docker Hub, and official
+    images from its library/ namespace.
+
+    :ivar str registry: registry host, i.e. registry-1.docker.io, public.ecr.aws
+    :ivar str repository: repository name, i.e. library/nginx
+    :ivar str reference: tag or digest, i.e. latest, sha256:...
+    """
+
+    def __init__(self, image: str):
+        name, reference = self.split_reference(image)
+        parts = name.split("/", 1)
+        if len(parts) > 1 and (
+            "." in parts[0] or ":" in parts[0] or parts[0] == "localhost"
+        ):
+            registry, repository = parts
+        else:
+            registry, repository = DOCKER_HUB, name
+        if registry in [DOCKER_HUB, "index.docker.io", DOCKER_HUB_REGISTRY]:
+            registry = DOCKER_HUB_REGISTRY
+            if "/" not in repository:
+                repository = f"library/{repository}"
+        self.image = image
+        self.registry = registry
+        self.repository = repository
+        self.reference = reference
+
+    @staticmethod
+    def split_reference(image: str) -> tuple[str, str]:
+        if "@" in image:
+            return tuple(image.split("@", 1))
+        name, _, tag = image.rpartition(":")
+        if name and "/" not in tag:
+            return name, tag
+        return image, "latest"
+
+    @property
+    def is_digest(self) -> bool:
+        return bool(DIGEST_RE.match(self.reference))
+
+    @property
+    def key(self) -> str:
+        return f"{self.registry}/{self.repository}:{self.reference}"
+
+    def __repr__(self):
+        return self.key
+
+
+def normalize_registry(registry: str) -> str:
+    """
+    The registry host of a docker config key, i.e. https://index.docker.io/v1/ is registry-1.docker.io
+    """
+    registry = re.sub(r"^https?://|/.*$", "", registry)
+    if registry in [DOCKER_HUB, "index.docker.io"]:
+        return DOCKER_HUB_REGISTRY
+    return registry
+
+
+def get_helper_credentials(helper: str, registry: str) -> tuple[str, str] | None:
+    """
+    Username and password, or identity token, of the registry from the docker credentials helper, i.e.
+    docker-credential-ecr-login, docker-credential-desktop
+    """
+    server_url = DOCKER_HUB_AUTH_KEY if registry == DOCKER_HUB_REGISTRY else registry
+    try:
+        result = subprocess.run(
+            [f"docker-credential-{helper}", "get"],
+            input=server_url,
+            capture_output=True,
+            text=True,
+            timeout=REQUESTS_TIMEOUT,
+            check=True,
+        )
+        content = json.loads(result.stdout)
+    except (OSError, subprocess.SubprocessError, ValueError) as error:
+        LOG.debug(
+            f"{registry} - No credentials from docker-credential-{helper}: {error}"
+        )
+        return None
+    if not content.get("Username") or not content.get("Secret"):
+        return None
+    return content["Username"], content["Secret"]
+
+
+class DockerCredentials:
+    """
+    Credentials of the registries, as docker uses them: from the auths of the docker config file, or else from the
+    credentials helper of the registry, or else from the credentials store. The helpers are queried once per registry.
+
+    :ivar dict[str, tuple[str, str]] auths: the username and password of the registries logged into
+    :ivar dict[str, str] helpers: the credentials helper of the registries
+    :ivar str store: the credentials helper of the other registries
+    """
+
+    def __init__(self, auths: dict = None, helpers: dict = None, store: str = None):
+        self.auths = auths if auths else {}
+        self.helpers = helpers if helpers else {}
+        self.store = store
+        self._helpers_credentials: dict = {}
+        self._lock = Lock()
+
+    @classmethod
+    def from_config(cls, config_file: str = None) -> DockerCredentials:
+        if not config_file:
+            config_file = path.join(
+                environ.get("DOCKER_CONFIG", path.expanduser("~/.docker")),
+                "config.json",
+            )
+        try:
+            with open(config_file) as config_fd:
+                config = json.load(config_fd)
+        except (OSError, ValueError):
+            return cls()
+        auths: dict = {}
+        for registry, auth in config.get("auths", {}).items():
+            if not isinstance(auth, dict) or not auth.get("auth"):
+                continue
+            try:
+                username, password = (
+                    base64.b64decode(auth["auth"]).decode("utf-8").split(":", 1)
+                )
+            except ValueError:
+                continue
+            auths[normalize_registry(registry)] = (username, password)
+        return cls(
+            auths,
+            {
+                normalize_registry(registry): helper
+                for registry, helper in config.get("credHelpers", {}).items()
+            },
+            config.get("credsStore"),
+        )
+
+    def get(self, registry: str) -> tuple[str, str] | None:
+        if registry in self.auths:
+            return self.auths[registry]
+        helper = self.helpers.get(registry, self.store)
+        if not helper:
+            return None
+        with self._lock:
+            if registry not in self._helpers_credentials:
+                self._helpers_credentials[registry] = get_helper_credentials(
+                    helper, registry
+                )
+            return self._helpers_credentials[registry]
+
+
+class RegistryClient:
+    """
+    Queries the registries manifests over a pool of HTTP connections shared by the threads, and answers the
+    registries authentication challenges. The bearer tokens are kept per registry and repository.
+    """
+
+    def __init__(self, pool_size: int = 8, credentials: DockerCredentials = None):
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+        self.credentials = (
+            credentials if credentials else DockerCredentials.from_config()
+        )
+        self._tokens: dict = {}
+        self._lock = Lock()
+
+    def get_token(self, image: ImageReference, challenge: str) -> str | None:
+        """
+        Requests a bearer token from the realm of the challenge, i.e.
+        Bearer realm="https://auth.docker.io/token",service="registry.docker.io",scope="repository:library/nginx:pull"
+        Identity tokens, set by the credentials helpers with the <token> username, are exchanged with OAuth2.
+        """
+        params = dict(CHALLENGE_PARAM_RE.findall(challenge))
+        realm = params.pop("realm", None)
+        if not realm:
+            return None
+        params.setdefault("scope", f"repository:{image.repository}:pull")
+        credentials = self.credentials.get(image.registry)
+        if credentials and credentials[0] == IDENTITY_TOKEN_USERNAME:
+            response = self.http.post(
+                realm,
+                data={
+                    **params,
+                    "grant_type": "refresh_token",
+                    "refresh_token": credentials[1],
+                    "client_id": "compose-x",
+                },
+                timeout=REQUESTS_TIMEOUT,
+            )
+        else:
+            response = self.http.get(
+                realm, params=params, auth=credentials, timeout=REQUESTS_TIMEOUT
+            )
+        response.raise_for_status()
+        content = response.json()
+        return content.get("token") or content.get("access_token")
+
+    def get_authorization(self, image: ImageReference, challenge: str) -> str | None:
+        if challenge.lower().startswith("bearer"):
+            token = self.get_token(image, challenge)
+            return f"Bearer {token}" if token else None
+        credentials = self.credentials.get(image.registry)
+        if challenge.lower().startswith("basic") and credentials:
+            username, password = credentials
+            return "Basic " + base64.b64encode(
+                f"{username}:{password}".encode("utf-8")
+            ).decode("utf-8")
+        return None
+
+    def request_manifest(self, method: str, image: ImageReference) -> requests.Response:
+        """
+        Requests the manifest, authenticating once if the registry challenges the request.
+        """
+        url = f"https://{image.registry}/v2/{image.repository}/manifests/{image.reference}"
+        token_key = (image.registry, image.repository)
+        headers = {"Accept": ", ".join(MANIFEST_MEDIA_TYPES)}
+        with self._lock:
+            authorization = self._tokens.get(token_key)
+        if authorization:
+            headers["Authorization"] = authorization
+        response = self.http.request(
+            method, url, headers=headers, timeout=REQUESTS_TIMEOUT
+        )
+        if response.status_code == 401 and "WWW-Authenticate" in response.headers:
+            authorization = self.get_authorization(
+                image, response.headers["WWW-Authenticate"]
+            )
+            if authorization:
+                with self._lock:
+                    self._tokens[token_key] = authorization
+                headers["Authorization"] = authorization
+                response = self.http.request(
+                    method, url, headers=headers, timeout=REQUESTS_TIMEOUT
+                )
+        response.raise_for_status()
+        return response
+
+    def get_manifest_digest(self, image: ImageReference) -> dict:
+        """
+        The digest of the image manifest, from the Docker-Content-Digest header of the HEAD request, or else
+        computed from the manifest content.
+
+        :return: the digest and mediaType of the manifest
+        """
+        response = self.request_manifest("HEAD", image)
+        digest = response.headers.get("Docker-Content-Digest")
+        if not digest:
+            response = self.request_manifest("GET", image)
+            digest = response.headers.get(
+                "Docker-Content-Digest",
+                f"sha256:{sha256(response.content).hexdigest()}",
+            )
+        return {
+            "digest": digest,
+            "mediaType": response.headers.get("Content-Type", "").split(";")[0],
+        }
+
+
+class ImageDigestsCache(LocalJsonCache):
+    """
+    Local record of the images digests, indexed by registry, repository and tag, with the date they were resolved.
+    """
+
+    default_file_name = "image_digests.json"
+
+    def get_digest(self, image: ImageReference, ttl: timedelta | None) -> dict | None:
+        """
+        :param image:
+        :param ttl: how long the digests are valid for. None to use any cached digest.
+        """
+        entry = self.get(image.key)
+        if not entry:
+            return None
+        if ttl is not None and dt.fromisoformat(entry["Date"]) + ttl <= dt.utcnow():
+            return None
+        return {"digest": entry["Digest"], "mediaType": entry["MediaType"]}
+
+    def record(self, image: ImageReference, details: dict) -> None:
+        self.set(
+            image.key,
+            {
+                "Digest": details["digest"],
+                "MediaType": details["mediaType"],
+                "Date": dt.utcnow().isoformat(),
+            },
+        )
+
+
+class ImageDigestsResolver:
+    """
+    Resolves the services images digests for the execution. Identical images are resolved once, concurrently,
+    and from the local cache when resolved less than TTL ago. Offline, only the local cache is used.
+
+    :ivar ImageDigestsCache cache: the local cache, or None to always query the registries
+    :ivar timedelta ttl: how long the cached digests are valid for
+    """
+
+    def __init__(
+        self,
+        cache: ImageDigestsCache = None,
+        ttl: timedelta = None,
+        workers: int = 8,
+        offline: bool = False,
+    ):
+        self.cache = cache
+        self.ttl = ttl if ttl is not None else timedelta(0)
+        self.workers = workers
+        self.offline = offline
+        self.digests: dict[str, dict | None] = {}
+        self._client: RegistryClient | None = None
+
+    @property
+    def client(self) -> RegistryClient:
+        if self._client is None:
+            self._client = RegistryClient(self.workers)
+        return self._client
+
+    def get_cached(self, image: ImageReference) -> dict | None:
+        if image.is_digest:
+            return {"digest": image.reference, "mediaType": None}
+        if not self.cache:
+            return None
+        return self.cache.get_digest(image, None if self.offline else self.ttl)
+
+    def fetch(self, image: ImageReference) -> dict | None:
+        try:
+            details = self.client.get_manifest_digest(image)
+            LOG.debug(f"{image} - Resolved to {details['digest']}")
+            return details
+        except (requests.RequestException, ValueError) as error:
+            LOG.error(f"{image} - Failed to retrieve the image digest: {error}")
+            return None
+
+    def resolve(self, images: list[str]) -> None:
+        """
+        Resolves the digests of the images not resolved yet, from the cache or else from the registries.
+        """
+        to_fetch: dict[str, ImageReference] = {}
+        for image_name in images:
+            image = ImageReference(image_name)
+            if image.key in self.digests or image.key in to_fetch:
+                continue
+            cached = self.get_cached(image)
+            if cached or self.offline:
+                self.digests[image.key] = cached
+            else:
+                to_fetch[image.key] = image
+        if not to_fetch:
+            return
+        LOG.info(f"Resolving {len(to_fetch)} images digests")
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.workers, len(to_fetch)))
+        ) as executor:
+            for image, details in zip(
+                to_fetch.values(), executor.map(self.fetch, to_fetch.values())
+            ):
+                self.digests[image.key] = details
+                if details and self.cache and self.ttl:
+                    self.cache.record(image, details)
+        if self.cache and self.ttl:
+            self.cache.save()
+
+    def get_digest(self, image_name: str) -> dict | None:
+        """
+        :return: the digest and mediaType of the image, resolved if not already done.
+        """
+        image = ImageReference(image_name)
+        if image.key not in self.digests:
+            self.resolve([image_name])
+        details = self.digests.get(image.key)
+        if details is None and self.offline:
+            LOG.warning(f"Offline - No cached digest for {image_name}")
+        return details
@@ -8,11 +8,10 @@
 Class and functions to interact with the volumes: defined in compose files.
 """
 
-from copy import deepcopy
-
 from compose_x_common.compose_x_common import keyisset, set_else_none
 
 from ecs_composex.common.logging import LOG
+from ecs_composex.compose.compose_document import copy_on_write
 from ecs_composex.efs.efs_params import RES_KEY as EFS_KEY
 
 from .helpers import evaluate_plugin_efs_properties
@@ -43,7 +42,7 @@ class ComposeVolume:
         self.name = name
         self.volume_name = name
         self.autogenerated = False
-        self.definition = deepcopy(definition)
+        self.definition = copy_on_write(definition)
         self.is_shared = False
         self.services = []
         self.parameters = {}
@@ -9,7 +9,7 @@ if TYPE_CHECKING:
     from ecs_composex.compose.compose_services import ComposeService
 
 import re
-from uuid import uuid4
+from hashlib import sha1
 
 from compose_x_common.compose_x_common import keyisset, set_else_none
 
@@ -75,7 +75,9 @@ def handle_volume_str_config(service: ComposeService, config: str, volumes: list
             volume_config["source"] = path_match.group("source")
         else:
             LOG.warning(f"No source defined with {config}. Creating docker volume")
-            new_volume = ComposeVolume(str(uuid4().hex)[:6], {})
+            new_volume = ComposeVolume(
+                sha1(f"{service.name}:{config}".encode("utf-8")).hexdigest()[:6], {}
+            )
             new_volume.autogenerated = True
             volumes.append(new_volume)
             volume_config["source"] = new_volume.name
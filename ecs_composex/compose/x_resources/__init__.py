@@ -15,10 +15,8 @@ if TYPE_CHECKING:
 
 import json
 import re
-from copy import deepcopy
 
 import jsonschema
-from compose_x_common.aws import get_account_id
 from compose_x_common.compose_x_common import (
     attributes_to_mapping,
     keyisset,
@@ -31,6 +29,8 @@ from ecs_composex.common import NONALPHANUM, get_nested_property
 from ecs_composex.common.aws import (
     define_lookup_role_from_info,
     find_aws_resource_arn_from_tags_api,
+    get_account_id,
+    get_lookup_account_id,
 )
 from ecs_composex.common.cfn_conditions import define_stack_name
 from ecs_composex.common.cfn_params import Parameter
@@ -42,6 +42,7 @@ from ecs_composex.common.troposphere_tools import (
     add_update_mapping,
     add_update_parameter_recursively,
 )
+from ecs_composex.compose.compose_document import copy_on_write
 from ecs_composex.mods_manager import XResourceModule
 from ecs_composex.resource_settings import get_parameter_settings
 
@@ -83,7 +84,7 @@ class XResource:
         self.iam_manager = None
         self.cloud_control_attributes_mapping = {}
         self.native_attributes_mapping = {}
-        self.definition = deepcopy(definition)
+        self.definition = copy_on_write(definition)
         self.env_names = []
         self.env_vars = []
         self.validators = []
@@ -91,13 +92,12 @@ class XResource:
         self.settings = set_else_none("Settings", definition, alt_value={})
         self._parameters = {}
         self.lookup = set_else_none("Lookup", definition, alt_value={})
+        self.session = settings.session
+        self._lookup_session = None
         if self.lookup:
-            self.lookup_session = define_lookup_role_from_info(
-                self.lookup, settings.session
-            )
             self.properties = {}
         else:
-            self.lookup_session = settings.session
+            self._lookup_session = settings.session
             self.properties = set_else_none("Properties", definition)
         self.support_defaults: bool = False
         self.scaling = set_else_none("Scaling", self.definition)
@@ -127,6 +127,33 @@ class XResource:
     def __repr__(self):
         return self.logical_name
 
+    @property
+    def lookup_session(self):
+        """
+        The session to lookup the resource with, assuming the Lookup RoleArn on first use only, so that the
+        lookups restored from the cache do not assume the role.
+        """
+        if self._lookup_session is None:
+            self._lookup_session = define_lookup_role_from_info(
+                self.lookup, self.session
+            )
+        return self._lookup_session
+
+    @lookup_session.setter
+    def lookup_session(self, session) -> None:
+        self._lookup_session = session
+
+    @property
+    def lookup_region(self) -> str:
+        return self.session.region_name
+
+    @property
+    def lookup_account_id(self) -> str:
+        """
+        The account ID of the Lookup RoleArn if set, else of the session.
+        """
+        return get_lookup_account_id(self.lookup, self.session)
+
     @property
     def parameters(self) -> dict:
         return set_else_none("MacroParameters", self.definition, alt_value={})
@@ -179,14 +206,12 @@ class XResource:
         """
         JSON Validation of the resources module validation
         """
-        from jsonschema import Draft7Validator
-
-        from ecs_composex.specs import REGISTRY as COMPOSE_REGISTRY
-
         if not self.module.json_schema and not module_schema:
             return
 
-        _eval = Draft7Validator(self.module.json_schema, registry=COMPOSE_REGISTRY)
+        _eval = self.module.json_schema_validator
+        if not _eval:
+            return
         try:
             _eval.validate(definition)
         except jsonschema.exceptions.ValidationError:
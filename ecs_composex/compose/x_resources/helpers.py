@@ -20,9 +20,12 @@ if TYPE_CHECKING:
     )
 
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from compose_x_common.compose_x_common import keyisset
 
+from ecs_composex.common.aws import lookup_retries
+from ecs_composex.common.aws_calls import API_CALLS
 from ecs_composex.common.logging import LOG
 
 
@@ -94,6 +97,56 @@ def set_lookup_resources(
     return lookup_resources
 
 
+def lookup_resource(
+    settings: ComposeXSettings, resource: XResource, *lookup_args, **lookup_kwargs
+) -> None:
+    """
+    Restores the resource lookup from the lookup cache, if enabled, or runs its lookup_resource method and records
+    the result.
+    """
+    if settings.lookup_cache and settings.lookup_cache.restore(resource):
+        return
+    with API_CALLS.scoped(resource.compose_x_arn), lookup_retries():
+        resource.lookup_resource(*lookup_args, **lookup_kwargs)
+    if settings.lookup_cache:
+        settings.lookup_cache.record(resource)
+
+
+def lookup_resources_concurrently(
+    settings: ComposeXSettings,
+    lookup_resources: list[XResource],
+    *lookup_args,
+    **lookup_kwargs,
+) -> None:
+    """
+    Runs the lookup_resource method of the resources, with the same arguments, concurrently. Each lookup only sets
+    the properties of its own resource, and the first error, in the resources order, is raised once all lookups are
+    done. Anything that updates shared settings, i.e. mappings, must be done after, in the resources order.
+
+    :param ecs_composex.common.settings.ComposeXSettings settings:
+    :param list[XResource] lookup_resources: the resources to lookup
+    :param lookup_args: positional arguments for lookup_resource
+    :param lookup_kwargs: keyword arguments for lookup_resource
+    """
+    if len(lookup_resources) <= 1 or settings.lookup_workers <= 1:
+        for resource in lookup_resources:
+            lookup_resource(settings, resource, *lookup_args, **lookup_kwargs)
+    else:
+        with ThreadPoolExecutor(
+            max_workers=settings.lookup_workers, thread_name_prefix="lookup"
+        ) as executor:
+            futures = [
+                executor.submit(
+                    lookup_resource, settings, resource, *lookup_args, **lookup_kwargs
+                )
+                for resource in lookup_resources
+            ]
+        for future in futures:
+            future.result()
+    if settings.lookup_cache:
+        settings.lookup_cache.save()
+
+
 def set_resources(settings: ComposeXSettings, resource_class, module: XResourceModule):
     """
     Method to define the ComposeXResource for each service.
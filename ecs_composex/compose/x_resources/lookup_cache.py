@@ -0,0 +1,237 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2025 John Mille <john@compose-x.io>
+
+"""
+Persistent cache of the Lookup results, i.e. of the x-resources, x-vpc, x-cluster or secrets, to render again without
+querying AWS for each lookup.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from ecs_composex.common.settings import ComposeXSettings
+    from ecs_composex.compose.x_resources import XResource
+
+import json
+import re
+from copy import deepcopy
+from datetime import datetime as dt
+from datetime import timedelta
+from hashlib import sha256
+from os import path
+
+from ecs_composex.common.cfn_params import Parameter
+from ecs_composex.common.files import LocalJsonCache
+from ecs_composex.common.logging import LOG
+from ecs_composex.common.settings_args import DEFAULT_LOOKUP_TTL
+
+TTL_RE = re.compile(r"^(?P<value>\d+)(?P<unit>[smhd]?)$")
+TTL_UNITS = {"": "seconds", "s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+
+def parse_ttl(ttl: str | int) -> timedelta:
+    """
+    Parses a TTL, in seconds or with a unit suffix, i.e. 90, 30m, 1h, 2d
+
+    :raises: ValueError
+    """
+    parts = TTL_RE.match(str(ttl).strip())
+    if not parts:
+        raise ValueError(f"Invalid TTL {ttl}. Must match {TTL_RE.pattern}")
+    return timedelta(**{TTL_UNITS[parts.group("unit")]: int(parts.group("value"))})
+
+
+def serialize_lookup_properties(lookup_properties: dict) -> list[dict]:
+    """
+    The lookup properties are indexed by Parameter, stored with their settings to be re-created identical.
+    """
+    return [
+        {
+            "Title": parameter.title,
+            "ReturnValue": parameter.return_value,
+            "GroupLabel": parameter.group_label,
+            "Label": parameter.label,
+            "Properties": parameter.properties,
+            "Value": value,
+        }
+        for parameter, value in lookup_properties.items()
+    ]
+
+
+def deserialize_lookup_properties(properties: list[dict]) -> dict:
+    return {
+        Parameter(
+            _property["Title"],
+            return_value=_property["ReturnValue"],
+            group_label=_property["GroupLabel"],
+            label=_property["Label"],
+            **_property["Properties"],
+        ): _property["Value"]
+        for _property in properties
+    }
+
+
+class LookupCache(LocalJsonCache):
+    """
+    Lookup results (ARN, lookup properties and Cloud Control properties) of the x-resources, and the results of the
+    other lookups, indexed by account ID, region and hash of the module and Lookup definition.
+    In offline mode, entries never expire, and the account ID is not known, so the latest entry for the region and
+    definition is used.
+
+    :ivar timedelta ttl: how long the entries are valid for
+    :ivar bool offline: whether AWS must not be queried for lookups
+    """
+
+    default_file_name = "lookups.json"
+    default_ttl = DEFAULT_LOOKUP_TTL
+
+    def __init__(self, directory: str = None, ttl: str = None, offline: bool = False):
+        super().__init__(
+            path.join(directory, self.default_file_name) if directory else None
+        )
+        self.ttl = parse_ttl(ttl if ttl else self.default_ttl)
+        self.offline = offline
+        self.updated = False
+
+    @staticmethod
+    def lookup_hash(res_key: str, lookup: dict | str) -> str:
+        return sha256(
+            json.dumps(
+                {"Module": res_key, "Lookup": lookup},
+                sort_keys=True,
+                default=str,
+            ).encode("utf-8")
+        ).hexdigest()
+
+    @staticmethod
+    def definition_hash(resource: XResource) -> str:
+        return LookupCache.lookup_hash(resource.module.res_key, resource.lookup)
+
+    def get_valid_entry(
+        self,
+        title: str,
+        region: str,
+        definition_hash: str,
+        get_account_id: Callable[[], str],
+    ) -> dict | None:
+        """
+        :param str title: the name of the lookup, for the logs and errors
+        :param get_account_id: returns the account ID of the lookup, only called when not offline
+        :raises: LookupError if offline and the lookup is not cached
+        """
+        suffix = f":{region}:{definition_hash}"
+        if self.offline:
+            with self._lock:
+                entries = [
+                    entry for key, entry in self.objects.items() if key.endswith(suffix)
+                ]
+            if not entries:
+                raise LookupError(
+                    f"{title} - No cached Lookup result to render offline"
+                )
+            return max(entries, key=lambda entry: entry["Date"])
+        entry = self.get(f"{get_account_id()}{suffix}")
+        if entry and dt.fromisoformat(entry["Date"]) + self.ttl > dt.utcnow():
+            return entry
+        return None
+
+    def get_entry(self, resource: XResource) -> dict | None:
+        return self.get_valid_entry(
+            f"{resource.module.res_key}.{resource.name}",
+            resource.lookup_region,
+            self.definition_hash(resource),
+            lambda: resource.lookup_account_id,
+        )
+
+    def restore(self, resource: XResource) -> bool:
+        """
+        Sets the resource lookup results from the cache, as lookup_resource would.
+
+        :return: whether the resource was found in the cache
+        """
+        entry = self.get_entry(resource)
+        if not entry:
+            return False
+        LOG.info(f"{resource.module.res_key}.{resource.name} - Lookup from cache")
+        resource.init_outputs()
+        resource.arn = entry["Arn"]
+        resource.lookup_properties = deserialize_lookup_properties(entry["Properties"])
+        resource.cloud_control_properties = entry["CloudControlProperties"]
+        resource.generate_cfn_mappings_from_lookup_properties()
+        resource.generate_outputs()
+        return True
+
+    def set_entry(
+        self,
+        title: str,
+        account_id: str,
+        region: str,
+        definition_hash: str,
+        entry: dict,
+    ) -> None:
+        try:
+            entry = json.loads(json.dumps(dict(entry, Date=dt.utcnow().isoformat())))
+        except TypeError:
+            LOG.debug(f"{title} - Lookup result cannot be cached")
+            return
+        self.set(f"{account_id}:{region}:{definition_hash}", entry)
+        self.updated = True
+
+    def record(self, resource: XResource) -> None:
+        if self.offline:
+            return
+        self.set_entry(
+            f"{resource.module.res_key}.{resource.name}",
+            resource.lookup_account_id,
+            resource.lookup_region,
+            self.definition_hash(resource),
+            {
+                "Arn": resource.arn,
+                "Properties": serialize_lookup_properties(resource.lookup_properties),
+                "CloudControlProperties": resource.cloud_control_properties,
+            },
+        )
+
+    def save(self) -> None:
+        if self.updated:
+            super().save()
+            self.updated = False
+
+
+def lookup_with_cache(
+    settings: ComposeXSettings,
+    title: str,
+    res_key: str,
+    lookup: dict | str,
+    region: str,
+    get_account_id: Callable[[], str],
+    get_result: Callable[[], dict | None],
+) -> dict | None:
+    """
+    Returns the result of a lookup other than an x-resource one, i.e. of x-vpc or x-cluster, from the lookup cache
+    if enabled and valid, else from get_result, recording it. The result must be JSON serializable to be cached.
+
+    :param str title: the name of the lookup, for the logs and errors
+    :param str res_key: the module of the lookup
+    :param lookup: the Lookup definition
+    :param str region: the region of the lookup
+    :param get_account_id: returns the account ID of the lookup
+    :param get_result: makes the API calls of the lookup and returns its result
+    :raises: LookupError if offline and the lookup is not cached
+    """
+    lookup_cache = settings.lookup_cache
+    if not lookup_cache:
+        return get_result()
+    definition_hash = lookup_cache.lookup_hash(res_key, lookup)
+    entry = lookup_cache.get_valid_entry(title, region, definition_hash, get_account_id)
+    if entry:
+        LOG.info(f"{title} - Lookup from cache")
+        return deepcopy(entry["Result"])
+    result = get_result()
+    if result is not None:
+        lookup_cache.set_entry(
+            title, get_account_id(), region, definition_hash, {"Result": result}
+        )
+    return result
@@ -20,6 +20,7 @@ from troposphere.docdb import DBCluster as CfnDBCluster
 
 from ecs_composex.common.stacks import ComposeXStack
 from ecs_composex.compose.x_resources.helpers import (
+    lookup_resources_concurrently,
     set_lookup_resources,
     set_new_resources,
     set_resources,
@@ -203,14 +204,16 @@ def resolve_lookup(
     """
     if not keyisset(module.mapping_key, settings.mappings):
         settings.mappings[module.mapping_key] = {}
+    lookup_resources_concurrently(
+        settings,
+        lookup_resources,
+        RDS_DB_CLUSTER_ARN_RE,
+        get_db_cluster_config,
+        CfnDBCluster.resource_type,
+        "rds:cluster",
+        "cluster",
+    )
     for resource in lookup_resources:
-        resource.lookup_resource(
-            RDS_DB_CLUSTER_ARN_RE,
-            get_db_cluster_config,
-            CfnDBCluster.resource_type,
-            "rds:cluster",
-            "cluster",
-        )
         if keyisset("secret", resource.lookup):
             lookup_rds_secret(resource, resource.lookup["secret"])
         resource.generate_cfn_mappings_from_lookup_properties()
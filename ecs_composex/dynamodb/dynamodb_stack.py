@@ -23,6 +23,7 @@ from ecs_composex.common.logging import LOG
 from ecs_composex.common.stacks import ComposeXStack
 from ecs_composex.common.troposphere_tools import build_template
 from ecs_composex.compose.x_resources.api_x_resources import ApiXResource
+from ecs_composex.compose.x_resources.helpers import lookup_resources_concurrently
 from ecs_composex.dynamodb.dynamodb_params import TABLE_ARN, TABLE_NAME
 from ecs_composex.dynamodb.dynamodb_template import create_dynamodb_template
 
@@ -98,13 +99,15 @@ def resolve_lookup(
     """
     if not keyisset(module.mapping_key, settings.mappings):
         settings.mappings[module.mapping_key] = {}
+    lookup_resources_concurrently(
+        settings,
+        lookup_resources,
+        TABLE_ARN_RE,
+        get_dynamodb_table_config,
+        CfnTable.resource_type,
+        "dynamodb:table",
+    )
     for resource in lookup_resources:
-        resource.lookup_resource(
-            TABLE_ARN_RE,
-            get_dynamodb_table_config,
-            CfnTable.resource_type,
-            "dynamodb:table",
-        )
         LOG.info(f"{module.res_key}.{resource.name} - Matched to {resource.arn}")
         settings.mappings[module.mapping_key].update(
             {resource.logical_name: resource.mappings}
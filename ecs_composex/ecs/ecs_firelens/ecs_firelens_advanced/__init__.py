@@ -21,6 +21,7 @@ from compose_x_common.compose_x_common import keyisset, set_else_none
 from jinja2 import Environment, FileSystemLoader
 from troposphere import Ref, Region
 
+from ecs_composex.common.files import LOCAL_FILES
 from ecs_composex.common.logging import LOG
 from ecs_composex.compose.compose_services.service_logging import ServiceLogging
 from ecs_composex.compose.compose_volumes import ComposeVolume
@@ -227,7 +228,7 @@ class FireLensServiceManagedConfiguration:
         for _file in self._parser_files:
             file_name = path.basename(_file)
             try:
-                with open(_file) as file_fd:
+                with open(LOCAL_FILES.get_path(_file)) as file_fd:
                     content = file_fd.read()
                 files[file_name]: dict = {"content": content}
             except OSError:
@@ -242,7 +243,7 @@ class FireLensServiceManagedConfiguration:
     def source_file_content(self) -> str:
         if not self.source_file:
             return ""
-        with open(path.abspath(self.source_file)) as config_fd:
+        with open(LOCAL_FILES.get_path(self.source_file)) as config_fd:
             content = config_fd.read()
             return content
 
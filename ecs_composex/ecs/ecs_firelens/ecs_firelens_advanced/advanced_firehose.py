@@ -22,7 +22,6 @@ from ecs_composex.ecs.ecs_firelens.helpers.firehose_helpers import (
     add_firehose_delivery_stream_for_firelens,
 )
 from ecs_composex.kinesis_firehose.kinesis_firehose_params import FIREHOSE_ARN
-from ecs_composex.kinesis_firehose.kinesis_firehose_stack import DeliveryStream
 
 
 class FireLensFirehoseManagedDestination:
@@ -99,6 +98,8 @@ class FireLensFirehoseManagedDestination:
 
     @property
     def delivery_stream(self) -> str:
+        from ecs_composex.kinesis_firehose.kinesis_firehose_stack import DeliveryStream
+
         if isinstance(self._managed_firehose, DeliveryStream):
             return self._managed_firehose.name
         parts = KINESIS_FIREHOSE_ARN_RE.match(self._definition["delivery_stream"])
@@ -22,7 +22,6 @@ from ecs_composex.ecs.ecs_firelens.helpers.kinesis_helpers import (
     add_data_stream_for_firelens,
 )
 from ecs_composex.kinesis.kinesis_params import STREAM_ARN
-from ecs_composex.kinesis.kinesis_stack import Stream
 
 
 class FireLensKinesisManagedDestination:
@@ -100,6 +99,8 @@ class FireLensKinesisManagedDestination:
 
     @property
     def delivery_stream(self) -> str:
+        from ecs_composex.kinesis.kinesis_stack import Stream
+
         if isinstance(self._managed_data_stream, Stream):
             return self._managed_data_stream.name
         parts = KINESIS_STREAM_ARN_RE.match(self._definition["delivery_stream"])
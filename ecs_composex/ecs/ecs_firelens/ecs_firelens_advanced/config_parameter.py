@@ -13,10 +13,9 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from ecs_composex.ecs.ecs_family import ComposeFamily
     from ecs_composex.common.settings import ComposeXSettings
+    from ecs_composex.ssm_parameter.ssm_parameter_stack import SsmParameter
 
 from ecs_composex.common.troposphere_tools import add_outputs, add_resource
-from ecs_composex.ssm_parameter.ssm_parameter_helpers import render_new_parameters
-from ecs_composex.ssm_parameter.ssm_parameter_stack import SsmParameter
 
 
 def add_managed_ssm_parameter(
@@ -29,6 +28,8 @@ def add_managed_ssm_parameter(
     :param settings:
     :param content:
     """
+    from ecs_composex.ssm_parameter.ssm_parameter_helpers import render_new_parameters
+    from ecs_composex.ssm_parameter.ssm_parameter_stack import SsmParameter
 
     ssm_parameter_title = f"{family.logical_name}FireLensConfigurationSsm"
     ssm_parameter_definition = {
@@ -48,6 +49,7 @@ def add_managed_ssm_parameter(
         )
         settings.compose_content[ssm_module.res_key] = ssm_module.definition
         ssm_module.set_resources(settings)
+        settings.mod_manager.invalidate_registry()
     else:
         ssm_module = settings.mod_manager.modules["x-ssm_parameter"]
         settings.compose_content[ssm_module.res_key].update(
@@ -76,6 +78,8 @@ def add_managed_ssm_parameter(
         add_outputs(ssm_parameter.stack.stack_template, ssm_parameter.outputs)
         ssm_parameter.to_ecs(settings, settings.mod_manager)
         settings.compose_content[ssm_module.res_key][ssm_parameter.name] = ssm_parameter
-        ssm_module.resources[ssm_parameter_title] = ssm_parameter
+        settings.mod_manager.add_resource(
+            ssm_module, ssm_parameter_title, ssm_parameter
+        )
 
     return ssm_parameter
@@ -13,6 +13,7 @@ if TYPE_CHECKING:
     from ecs_composex.ecs.ecs_family import ComposeFamily
     from ecs_composex.compose.compose_services import ComposeService
     from ecs_composex.common.settings import ComposeXSettings
+    from ecs_composex.kinesis_firehose.kinesis_firehose_stack import DeliveryStream
 
 from compose_x_common.aws.kinesis import KINESIS_FIREHOSE_ARN_RE
 from compose_x_common.compose_x_common import keyisset
@@ -23,7 +24,6 @@ from ecs_composex.kinesis_firehose.kinesis_firehose_params import (
     FIREHOSE_ARN,
     FIREHOSE_ID,
 )
-from ecs_composex.kinesis_firehose.kinesis_firehose_stack import DeliveryStream
 
 
 def set_add_family_to_firehose(
@@ -58,6 +58,8 @@ def add_firehose_delivery_stream_for_firelens(
     family: ComposeFamily,
     settings: ComposeXSettings,
 ):
+    from ecs_composex.kinesis_firehose.kinesis_firehose_stack import DeliveryStream
+
     if not isinstance(firehose_stream, DeliveryStream):
         raise TypeError(
             "firehose_stream must be", DeliveryStream, "Got", type(firehose_stream)
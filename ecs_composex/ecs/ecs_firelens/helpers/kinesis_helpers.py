@@ -13,6 +13,7 @@ if TYPE_CHECKING:
     from ecs_composex.ecs.ecs_family import ComposeFamily
     from ecs_composex.compose.compose_services import ComposeService
     from ecs_composex.common.settings import ComposeXSettings
+    from ecs_composex.kinesis.kinesis_stack import Stream
 
 from compose_x_common.aws.kinesis import KINESIS_STREAM_ARN_RE
 from compose_x_common.compose_x_common import keyisset
@@ -20,7 +21,6 @@ from troposphere import FindInMap, Ref, Region
 
 from ecs_composex.common.logging import LOG
 from ecs_composex.kinesis.kinesis_params import STREAM_ARN, STREAM_ID
-from ecs_composex.kinesis.kinesis_stack import Stream
 
 
 def set_add_family_to_kinesis(
@@ -55,6 +55,8 @@ def add_data_stream_for_firelens(
     family: ComposeFamily,
     settings: ComposeXSettings,
 ):
+    from ecs_composex.kinesis.kinesis_stack import Stream
+
     if not isinstance(kinesis_stream, Stream):
         raise TypeError("kinesis_stream must be", Stream, "Got", type(kinesis_stream))
     set_add_family_to_kinesis(kinesis_stream, family, settings)
@@ -11,7 +11,6 @@ if TYPE_CHECKING:
     from ecs_composex.ecs.ecs_family import ComposeFamily
 
 import json
-from os import path
 
 import yaml
 from compose_x_common.compose_x_common import keyisset
@@ -26,6 +25,7 @@ except ImportError:
     from yaml import Loader as Loader
 
 from ecs_composex.common.cfn_params import STACK_ID_SHORT
+from ecs_composex.common.files import LOCAL_FILES
 from ecs_composex.common.troposphere_tools import add_resource
 from ecs_composex.ecs import ecs_params
 from ecs_composex.ecs.ecs_prometheus.emf_processors import generate_emf_processors
@@ -47,7 +47,7 @@ def set_cw_prometheus_config_parameter(
         scrape_config = options["ScrapingConfiguration"]
     if keyisset("ScrapingConfigurationFile", scrape_config):
         with open(
-            path.abspath(scrape_config["ScrapingConfigurationFile"])
+            LOCAL_FILES.get_path(scrape_config["ScrapingConfigurationFile"])
         ) as config_fd:
             value_py = yaml.load(config_fd.read(), Loader=Loader)
     else:
@@ -103,38 +103,39 @@ def add_compose_families(
     and template
     """
     for family_name, family in settings.families.items():
-        family.init_family()
-        initialize_family_services(settings, family)
-        add_parameters(
-            family.template,
-            [
-                family.iam_manager.task_role.arn_param,
-                family.iam_manager.task_role.name_param,
-                family.iam_manager.exec_role.arn_param,
-                family.iam_manager.exec_role.name_param,
-                families_sg_stack.services_mappings[family].parameter,
-            ],
-        )
-        family.stack.Parameters.update(
-            {
-                ecs_params.CLUSTER_NAME.title: settings.ecs_cluster.cluster_identifier,
-                ecs_params.FARGATE_VERSION.title: FindInMap(
-                    "ComposeXDefaults", "ECS", "PlatformVersion"
-                ),
-                family.iam_manager.task_role.arn_param.title: family.iam_manager.task_role.output_arn,
-                family.iam_manager.task_role.name_param.title: family.iam_manager.task_role.output_name,
-                family.iam_manager.exec_role.arn_param.title: family.iam_manager.exec_role.output_arn,
-                family.iam_manager.exec_role.name_param.title: family.iam_manager.exec_role.output_name,
-                ecs_params.SERVICE_HOSTNAME.title: family.family_hostname,
-                families_sg_stack.services_mappings[family].parameter.title: GetAtt(
-                    families_sg_stack.services_mappings[family].stack.title,
-                    f"Outputs.{families_sg_stack.services_mappings[family].parameter.title}",
-                ),
-            }
-        )
-        family.template.metadata.update(metadata)
-        add_resource(settings.root_stack.stack_template, family.stack)
-        family.validate_compute_configuration_for_task(settings)
+        with settings.profiler.phase("add_compose_families", family=family_name):
+            family.init_family()
+            initialize_family_services(settings, family)
+            add_parameters(
+                family.template,
+                [
+                    family.iam_manager.task_role.arn_param,
+                    family.iam_manager.task_role.name_param,
+                    family.iam_manager.exec_role.arn_param,
+                    family.iam_manager.exec_role.name_param,
+                    families_sg_stack.services_mappings[family].parameter,
+                ],
+            )
+            family.stack.Parameters.update(
+                {
+                    ecs_params.CLUSTER_NAME.title: settings.ecs_cluster.cluster_identifier,
+                    ecs_params.FARGATE_VERSION.title: FindInMap(
+                        "ComposeXDefaults", "ECS", "PlatformVersion"
+                    ),
+                    family.iam_manager.task_role.arn_param.title: family.iam_manager.task_role.output_arn,
+                    family.iam_manager.task_role.name_param.title: family.iam_manager.task_role.output_name,
+                    family.iam_manager.exec_role.arn_param.title: family.iam_manager.exec_role.output_arn,
+                    family.iam_manager.exec_role.name_param.title: family.iam_manager.exec_role.output_name,
+                    ecs_params.SERVICE_HOSTNAME.title: family.family_hostname,
+                    families_sg_stack.services_mappings[family].parameter.title: GetAtt(
+                        families_sg_stack.services_mappings[family].stack.title,
+                        f"Outputs.{families_sg_stack.services_mappings[family].parameter.title}",
+                    ),
+                }
+            )
+            family.template.metadata.update(metadata)
+            add_resource(settings.root_stack.stack_template, family.stack)
+            family.validate_compute_configuration_for_task(settings)
 
     families_stacks = [
         (family, settings.families[family].name)
@@ -9,7 +9,6 @@ if TYPE_CHECKING:
     from ecs_composex.common.settings import ComposeXSettings
 
 from botocore.exceptions import ClientError
-from compose_x_common.aws import get_assume_role_session
 from compose_x_common.aws.ecs import (
     CLUSTER_NAME_FROM_ARN,
     describe_all_ecs_clusters_from_ccapi,
@@ -38,11 +37,13 @@ from troposphere.ecs import (
 )
 from troposphere.logs import LogGroup
 
+from ecs_composex.common.aws import get_cross_role_session, get_lookup_account_id
 from ecs_composex.common.logging import LOG
 from ecs_composex.common.troposphere_tools import add_resource, add_update_mapping
 from ecs_composex.compose.compose_services.service_logging.helpers import (
     get_closest_valid_log_retention_period,
 )
+from ecs_composex.compose.x_resources.lookup_cache import lookup_with_cache
 from ecs_composex.ecs import metadata
 from ecs_composex.ecs.ecs_params import CLUSTER_NAME, CLUSTER_T
 from ecs_composex.ecs_cluster.ecs_cluster_params import (
@@ -56,7 +57,6 @@ from ecs_composex.ecs_cluster.helpers import (
     get_default_capacity_strategy,
     import_from_x_aws_cluster,
 )
-from ecs_composex.kms.kms_stack import KmsKey
 from ecs_composex.resources_import import import_record_properties
 
 MANAGED_KMS_KEY_NAME = "ecs-cluster-logging-cmk"
@@ -125,7 +125,7 @@ class EcsCluster:
 
     def set_from_definition(self, root_stack, session, settings):
         if self.lookup:
-            self.lookup_cluster(session)
+            self.lookup_cluster(session, settings)
             add_update_mapping(
                 root_stack.stack_template, self.mappings_key, self.mappings
             )
@@ -213,43 +213,61 @@ class EcsCluster:
                     )
                 self.import_log_config(exec_config)
 
-    def lookup_cluster(self, session):
+    def get_cluster_definition(self, cluster_name: str, session) -> dict:
         """
-        Define the ECS Cluster properties and definitions from ECS API.
+        Gets the ECS Cluster definition from the ECS and Cloud Control APIs.
 
+        :param str cluster_name: name of the cluster to lookup
         :param boto3.session.Session session: Boto3 session to make API calls.
         :return: The cluster details
         :rtype: dict
         """
+        ecs_session = session
+        if isinstance(self.lookup, dict) and keyisset("RoleArn", self.lookup):
+            ecs_session = get_cross_role_session(
+                session,
+                self.lookup["RoleArn"],
+                session_name="EcsClusterLookup@ComposeX",
+            )
+        clusters = list_all_ecs_clusters(session=ecs_session)
+        cluster_names = [
+            CLUSTER_NAME_FROM_ARN.match(c_name).group("name") for c_name in clusters
+        ]
+        clusters_config = describe_all_ecs_clusters_from_ccapi(
+            clusters, return_as_map=True, use_cluster_name=True, session=ecs_session
+        )
+        if cluster_name not in clusters_config.keys():
+            raise LookupError(
+                f"Failed to find {cluster_name}. Available clusters are",
+                cluster_names,
+            )
+        return clusters_config[cluster_name]
+
+    def lookup_cluster(self, session, settings: ComposeXSettings):
+        """
+        Define the ECS Cluster properties and definitions from ECS API, or from the lookup cache if enabled.
+
+        :param boto3.session.Session session: Boto3 session to make API calls.
+        :param ecs_composex.common.settings.ComposeXSettings settings:
+        """
         if not isinstance(self.lookup, (str, dict)):
             raise TypeError(
                 "The value for Lookup must be", str, dict, "Got", type(self.lookup)
             )
-        ecs_session = session
         if isinstance(self.lookup, dict):
-            if keyisset("RoleArn", self.lookup):
-                ecs_session = get_assume_role_session(
-                    session,
-                    self.lookup["RoleArn"],
-                    session_name="EcsClusterLookup@ComposeX",
-                )
             cluster_name = self.lookup["ClusterName"]
         else:
             cluster_name = self.lookup
         try:
-            clusters = list_all_ecs_clusters(session=ecs_session)
-            cluster_names = [
-                CLUSTER_NAME_FROM_ARN.match(c_name).group("name") for c_name in clusters
-            ]
-            clusters_config = describe_all_ecs_clusters_from_ccapi(
-                clusters, return_as_map=True, use_cluster_name=True, session=ecs_session
+            the_cluster = lookup_with_cache(
+                settings,
+                f"{RES_KEY}.{cluster_name}",
+                RES_KEY,
+                self.lookup,
+                session.region_name,
+                lambda: get_lookup_account_id(self.lookup, session),
+                lambda: self.get_cluster_definition(cluster_name, session),
             )
-            if cluster_name not in clusters_config.keys():
-                raise LookupError(
-                    f"Failed to find {cluster_name}. Available clusters are",
-                    cluster_names,
-                )
-            the_cluster = clusters_config[cluster_name]
             LOG.info(
                 f"x-cluster.{cluster_name} found. Setting {CLUSTER_NAME.title} accordingly."
             )
@@ -393,6 +411,8 @@ class EcsCluster:
         log_configuration["CloudWatchEncryptionEnabled"] = True
 
     def set_log_group(self, cluster_name, root_stack, log_configuration):
+        from ecs_composex.kms.kms_stack import KmsKey
+
         self.log_group = LogGroup(
             "EcsExecLogGroup",
             LogGroupName=Sub(
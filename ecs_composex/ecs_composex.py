@@ -131,17 +131,20 @@ def apply_x_configs_to_ecs(
             isinstance(resource, (ServicesXResource, AwsEnvironmentResource))
             or issubclass(type(resource), (ServicesXResource, AwsEnvironmentResource))
         ) and hasattr(resource, "to_ecs"):
-            resource.to_ecs(settings, modules, root_stack)
+            with settings.profiler.phase("to_ecs", module=resource.module.res_key):
+                resource.to_ecs(settings, modules, root_stack)
     for resource_stack in root_stack.stack_template.resources.values():
         if (
             issubclass(type(resource_stack), ComposeXStack)
             and not resource_stack.is_void
         ):
-            invoke_x_to_ecs(None, root_stack, resource_stack, settings)
+            with settings.profiler.phase("to_ecs", module=resource_stack.title):
+                invoke_x_to_ecs(None, root_stack, resource_stack, settings)
 
     for resource_stack in settings.x_resources_void:
         res_type = list(resource_stack.keys())[-1]
-        invoke_x_to_ecs(res_type, root_stack, resource_stack[res_type], settings)
+        with settings.profiler.phase("to_ecs", module=res_type):
+            invoke_x_to_ecs(res_type, root_stack, resource_stack[res_type], settings)
 
 
 def apply_x_resource_to_x(
@@ -167,7 +170,10 @@ def apply_x_resource_to_x(
         ):
             continue
         if hasattr(resource, "handle_x_dependencies"):
-            resource.handle_x_dependencies(settings, root_stack)
+            with settings.profiler.phase(
+                "handle_x_dependencies", module=resource.module.res_key
+            ):
+                resource.handle_x_dependencies(settings, root_stack)
     if vpc_stack and vpc_stack.vpc_resource:
         vpc_stack.vpc_resource.handle_x_dependencies(settings, root_stack)
 
@@ -178,12 +184,13 @@ def add_x_resources(settings: ComposeXSettings) -> None:
     """
     for name, module in settings.mod_manager.modules.items():
         LOG.info(f"Processing {name}")
-        x_stack = module.stack_class(
-            module.mapping_key,
-            settings=settings,
-            module=module,
-            Parameters={ROOT_STACK_NAME.title: Ref(AWS_STACK_NAME)},
-        )
+        with settings.profiler.phase("add_x_resources", module=name):
+            x_stack = module.stack_class(
+                module.mapping_key,
+                settings=settings,
+                module=module,
+                Parameters={ROOT_STACK_NAME.title: Ref(AWS_STACK_NAME)},
+            )
         if x_stack and x_stack.is_void:
             settings.x_resources_void.append({module.mod_key: x_stack})
         elif (
@@ -242,74 +249,97 @@ def generate_full_template(settings: ComposeXSettings):
     LOG.info(
         f"Service families to process {[family.name for family in settings.families.values()]}"
     )
+    profiler = settings.profiler
     settings.root_stack = create_root_stack(settings)
     for family in settings.families.values():
         family.stack.parent_stack = settings.root_stack
-    add_ecs_cluster(settings)
-    settings.mod_manager = ModManager(settings)
-    settings.mod_manager.modules_repr()
-    settings.mod_manager.init_mods_resources(settings)
-    iam_stack = add_resource(
-        settings.root_stack.stack_template, IamStack("iam", settings)
-    )
-    families_sg_stack = add_resource(
-        settings.root_stack.stack_template,
-        ServicesIngressStack("ServicesNetworking", settings),
-    )
-
-    add_x_resources(settings)
-    add_compose_families(settings, families_sg_stack)
-    if "x-vpc" not in settings.mod_manager.modules:
-        vpc_module = settings.mod_manager.load_module("x-vpc", {})
-    else:
-        vpc_module = settings.mod_manager.modules["x-vpc"]
-    vpc_stack = VpcStack("vpc", settings, vpc_module)
-    define_vpc_settings(settings, vpc_module, vpc_stack)
-    if vpc_stack.vpc_resource and (
-        vpc_stack.vpc_resource.cfn_resource or vpc_stack.vpc_resource.mappings
-    ):
-        settings.set_networks(vpc_stack)
-    vpc_module.resources.update({"x-vpc": vpc_stack.vpc_resource})
-    x_cloud_lookup_and_new_vpc(settings, vpc_stack)
-
-    for family in settings.families.values():
-        family.init_network_settings(settings, vpc_stack, families_sg_stack)
-
-    handle_families_cross_dependencies(settings, families_sg_stack)
-    update_network_resources_vpc_config(settings, vpc_stack)
-    set_families_ecs_service(settings)
-
-    apply_x_resource_to_x(
-        settings, settings.root_stack, vpc_stack, env_resources_only=True
-    )
-    for family in settings.families.values():
-        add_iam_dependency(iam_stack, family)
-        family.set_enable_execute_command()
-        if family.enable_execute_command:
-            family.apply_ecs_execute_command_permissions(settings)
-        family.import_all_sidecars()
-        family.handle_logging(settings)
-
-    apply_x_configs_to_ecs(settings, settings.root_stack, modules=settings.mod_manager)
-    apply_x_resource_to_x(settings, settings.root_stack, vpc_stack)
+    with profiler.phase("add_ecs_cluster"):
+        add_ecs_cluster(settings)
+    with profiler.phase("ModManager"):
+        settings.mod_manager = ModManager(settings)
+        settings.mod_manager.modules_repr()
+    with profiler.phase("init_mods_resources"):
+        settings.mod_manager.init_mods_resources(settings)
+    with profiler.phase("iam_and_ingress_stacks"):
+        iam_stack = add_resource(
+            settings.root_stack.stack_template, IamStack("iam", settings)
+        )
+        families_sg_stack = add_resource(
+            settings.root_stack.stack_template,
+            ServicesIngressStack("ServicesNetworking", settings),
+        )
 
-    for family in settings.families.values():
-        family.finalize_family_settings(settings)
-        map_resource_return_value_to_services_command(family, settings)
-        family.state_facts()
-        family.x_environment_processing()
-        family.composed_env_processing(settings)
+    with profiler.phase("add_x_resources"):
+        add_x_resources(settings)
+    with profiler.phase("add_compose_families"):
+        add_compose_families(settings, families_sg_stack)
+    with profiler.phase("vpc_settings"):
+        if "x-vpc" not in settings.mod_manager.modules:
+            vpc_module = settings.mod_manager.load_module("x-vpc", {})
+        else:
+            vpc_module = settings.mod_manager.modules["x-vpc"]
+        vpc_stack = VpcStack("vpc", settings, vpc_module)
+        define_vpc_settings(settings, vpc_module, vpc_stack)
+        if vpc_stack.vpc_resource and (
+            vpc_stack.vpc_resource.cfn_resource or vpc_stack.vpc_resource.mappings
+        ):
+            settings.set_networks(vpc_stack)
+        settings.mod_manager.add_resource(vpc_module, "x-vpc", vpc_stack.vpc_resource)
+        x_cloud_lookup_and_new_vpc(settings, vpc_stack)
+
+    with profiler.phase("families_network_settings"):
+        for family in settings.families.values():
+            with profiler.phase("init_network_settings", family=family.name):
+                family.init_network_settings(settings, vpc_stack, families_sg_stack)
+
+        handle_families_cross_dependencies(settings, families_sg_stack)
+        update_network_resources_vpc_config(settings, vpc_stack)
+        set_families_ecs_service(settings)
+
+    with profiler.phase("apply_x_resource_to_x (environment)"):
+        apply_x_resource_to_x(
+            settings, settings.root_stack, vpc_stack, env_resources_only=True
+        )
+    with profiler.phase("families_settings"):
+        for family in settings.families.values():
+            with profiler.phase("families_settings", family=family.name):
+                add_iam_dependency(iam_stack, family)
+                family.set_enable_execute_command()
+                if family.enable_execute_command:
+                    family.apply_ecs_execute_command_permissions(settings)
+                family.import_all_sidecars()
+                family.handle_logging(settings)
+
+    with profiler.phase("apply_x_configs_to_ecs"):
+        apply_x_configs_to_ecs(
+            settings, settings.root_stack, modules=settings.mod_manager
+        )
+    with profiler.phase("apply_x_resource_to_x"):
+        apply_x_resource_to_x(settings, settings.root_stack, vpc_stack)
+
+    with profiler.phase("finalize_families"):
+        for family in settings.families.values():
+            with profiler.phase("finalize_family", family=family.name):
+                family.finalize_family_settings(settings)
+                map_resource_return_value_to_services_command(family, settings)
+                family.state_facts()
+                family.x_environment_processing()
+                family.composed_env_processing(settings)
 
     set_ecs_cluster_identifier(settings.root_stack, settings)
-    add_all_tags(settings.root_stack.stack_template, settings)
+    with profiler.phase("add_all_tags"):
+        add_all_tags(settings.root_stack.stack_template, settings)
     set_all_mappings_to_root_stack(settings)
     families_sg_stack.update_vpc_settings(vpc_stack, settings.root_stack)
 
-    for resource in settings.x_resources:
-        if hasattr(resource, "post_processing") and hasattr(
-            resource, "post_processing_properties"
-        ):
-            resource.post_processing(settings)
+    with profiler.phase("post_processing"):
+        for resource in settings.x_resources:
+            if hasattr(resource, "post_processing") and hasattr(
+                resource, "post_processing_properties"
+            ):
+                with profiler.phase("post_processing", module=resource.module.res_key):
+                    resource.post_processing(settings)
 
     settings.mod_manager.modules.clear()
+    settings.mod_manager.invalidate_registry()
     return settings.root_stack
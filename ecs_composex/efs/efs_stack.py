@@ -25,6 +25,7 @@ from troposphere.efs import FileSystem, MountTarget
 from ecs_composex.common.cfn_params import STACK_ID_SHORT
 from ecs_composex.common.stacks import ComposeXStack
 from ecs_composex.common.troposphere_tools import build_template
+from ecs_composex.compose.x_resources.helpers import lookup_resources_concurrently
 from ecs_composex.compose.x_resources.network_x_resources import NetworkXResource
 from ecs_composex.efs.efs_params import (
     CONTROL_CLOUD_ATTR_MAPPING,
@@ -174,13 +175,7 @@ def get_efs_details(efs: Efs, account_id, resource_id: str) -> dict:
     return props
 
 
-def lookup_resource(module, resource: Efs, settings: ComposeXSettings):
-    resource.lookup_resource(
-        EFS_ARN_RE,
-        get_efs_details,
-        FileSystem.resource_type,
-        "elasticfilesystem",
-    )
+def set_lookup_resource_mappings(module, resource: Efs, settings: ComposeXSettings):
     resource.generate_cfn_mappings_from_lookup_properties()
     resource.generate_outputs()
     settings.mappings[module.mapping_key].update(
@@ -205,7 +200,15 @@ class XStack(ComposeXStack):
             self.is_void = True
         if module.lookup_resources and module.mapping_key not in settings.mappings:
             settings.mappings[module.mapping_key] = {}
+        lookup_resources_concurrently(
+            settings,
+            module.lookup_resources,
+            EFS_ARN_RE,
+            get_efs_details,
+            FileSystem.resource_type,
+            "elasticfilesystem",
+        )
         for resource in module.lookup_resources:
-            lookup_resource(module, resource, settings)
+            set_lookup_resource_mappings(module, resource, settings)
         for resource in module.resources_list:
             resource.stack = self
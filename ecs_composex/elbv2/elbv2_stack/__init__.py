@@ -22,6 +22,7 @@ from troposphere.elasticloadbalancingv2 import LoadBalancer as CfnLoadBalancer
 
 from ecs_composex.common.stacks import ComposeXStack
 from ecs_composex.common.troposphere_tools import add_update_mapping, build_template
+from ecs_composex.compose.x_resources.helpers import lookup_resources_concurrently
 from ecs_composex.elbv2.elbv2_stack.elbv2 import Elbv2
 from ecs_composex.vpc.vpc_params import APP_SUBNETS, PUBLIC_SUBNETS, VPC_ID
 
@@ -72,17 +73,19 @@ class XStack(ComposeXStack):
         if module.lookup_resources and not module.mapping_key in settings.mappings:
             settings.mappings[module.mapping_key] = {}
 
+        lookup_resources_concurrently(
+            settings,
+            module.lookup_resources,
+            LB_V2_LB_ARN_RE,
+            None,
+            cfn_resource_type=CfnLoadBalancer.resource_type,
+            tagging_api_id="elasticloadbalancing:loadbalancer",
+            subattribute_key="loadbalancer",
+            use_arn_for_id=True,
+        )
         for resource in module.lookup_resources:
-            resource.lookup_resource(
-                LB_V2_LB_ARN_RE,
-                None,
-                cfn_resource_type=CfnLoadBalancer.resource_type,
-                tagging_api_id="elasticloadbalancing:loadbalancer",
-                subattribute_key="loadbalancer",
-                use_arn_for_id=True,
-            )
             if keyisset("Listeners", resource.lookup):
-                resource.find_lookup_listeners()
+                resource.find_lookup_listeners(settings)
 
             resource.generate_cfn_mappings_from_lookup_properties()
             resource.generate_outputs()
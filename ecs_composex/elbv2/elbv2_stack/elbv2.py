@@ -215,16 +215,20 @@ class Elbv2(NetworkXResource):
                 "Listeners must be one of [list, dict]. Got", type(listeners)
             )
 
-    def find_lookup_listeners(self):
+    def find_lookup_listeners(self, settings: ComposeXSettings):
         """
         Method to lookup the listeners defined in the definition and sets them up.
         Will use them to add to the LB mappings
+
+        :param ecs_composex.common.settings.ComposeXSettings settings:
         """
         listeners: dict = set_else_none("Listeners", self.lookup, {})
         if not listeners:
             LOG.debug("No Listener to lookup.")
         for listener_port, listener_def in listeners.items():
-            listener: LookupListener = LookupListener(self, listener_port, listener_def)
+            listener: LookupListener = LookupListener(
+                self, listener_port, listener_def, settings
+            )
             self.lookup_listeners[listener_port] = listener
 
     def set_services_targets(self, settings):
@@ -6,6 +6,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from ecs_composex.common.settings import ComposeXSettings
     from ecs_composex.elbv2 import Elbv2
     from ecs_composex.elbv2.elbv2_ecs import MergedTargetGroup
     from troposphere import Template
@@ -19,10 +20,12 @@ from troposphere.elasticloadbalancingv2 import ListenerRule
 from ecs_composex.common import NONALPHANUM
 from ecs_composex.common.aws import find_aws_resource_arn_from_tags_api
 from ecs_composex.common.logging import LOG
+from ecs_composex.compose.x_resources.lookup_cache import lookup_with_cache
 from ecs_composex.elbv2.elbv2_stack.helpers import (
     LISTENER_TARGET_RE,
     define_actions,
     define_target_conditions,
+    get_rules_priority_offset,
     import_cognito_pool,
     map_service_target,
     validate_duplicate_targets,
@@ -35,25 +38,32 @@ class LookupListener:
 
     targets_keys = "Targets"
 
-    def __init__(self, lb: Elbv2, port: int, definition: dict):
+    def __init__(
+        self, lb: Elbv2, port: int, definition: dict, settings: ComposeXSettings
+    ):
         self._lb = lb
         self._port = port
         self._definition = definition
 
-        self.arn: str = find_aws_resource_arn_from_tags_api(
-            self.definition,
-            self.lb.lookup_session,
-            "elasticloadbalancing:listener",
+        listener = lookup_with_cache(
+            settings,
+            f"{lb.module.res_key}.{lb.name}.Listeners.{port}",
+            f"{lb.module.res_key}.Listeners",
+            {
+                "LoadBalancerArn": lb.arn,
+                "Listener": {
+                    key: value
+                    for key, value in definition.items()
+                    if key != self.targets_keys
+                },
+            },
+            lb.lookup_region,
+            lambda: lb.lookup_account_id,
+            self.get_listener,
         )
-        assert LB_V2_LISTENER_ARN_RE.match(self.arn)
-
-        client = self.lb.lookup_session.client("elbv2")
-        self.properties: dict = client.describe_listeners(ListenerArns=[self.arn])[
-            "Listeners"
-        ][0]
-        self.rules_r: list[dict] = client.describe_rules(
-            ListenerArn=self.arn, PageSize=100
-        )["Rules"]
+        self.arn: str = listener["Arn"]
+        self.properties: dict = listener["Properties"]
+        self.rules_r: list[dict] = listener["Rules"]
         if self.lb.is_nlb():
             self.rules = self.rules_r
             self.default_rule = self.rules_r[0]
@@ -84,6 +94,26 @@ class LookupListener:
     def __repr__(self):
         return self.arn
 
+    def get_listener(self) -> dict:
+        """
+        Looks up the listener of the load balancer, and its rules.
+
+        :return: the listener ARN, properties and rules
+        """
+        arn = find_aws_resource_arn_from_tags_api(
+            self.definition,
+            self.lb.lookup_session,
+            "elasticloadbalancing:listener",
+        )
+        assert LB_V2_LISTENER_ARN_RE.match(arn)
+
+        client = self.lb.lookup_session.client("elbv2")
+        return {
+            "Arn": arn,
+            "Properties": client.describe_listeners(ListenerArns=[arn])["Listeners"][0],
+            "Rules": client.describe_rules(ListenerArn=arn, PageSize=100)["Rules"],
+        }
+
     @property
     def Protocol(self) -> str:
         return self.properties["Protocol"]
@@ -232,21 +262,31 @@ class LookupListener:
         :param troposphere.Template template:
         :return:
         """
-        import random
-
         listener_id = LB_V2_LISTENER_ARN_RE.match(self.arn).group("id")
         last_rule_offset = int(self.rules[-1]["Priority"]) if self.rules else 49999
-        starting_offset = last_rule_offset + random.randint(1, 1000)
-        offset = starting_offset + random.randint(1, 100)
+        rules_definitions = [
+            (
+                define_actions(self, service_def, True),
+                define_target_conditions(service_def),
+            )
+            for service_def in self.services
+        ]
+        rules_offset = get_rules_priority_offset(
+            self.arn, rules_definitions, 1000 * 100
+        )
+        starting_offset = last_rule_offset + (rules_offset - 1) // 100 + 1
+        offset = starting_offset + (rules_offset - 1) % 100 + 1
         rules = []
-        for count, service_def in enumerate(self.services):
+        for count, (service_def, (actions, conditions)) in enumerate(
+            zip(self.services, rules_definitions)
+        ):
             priority = offset - count - 1
             rule = ListenerRule(
                 f"{NONALPHANUM.sub('', listener_id)}{NONALPHANUM.sub('', service_def['name'])}Rule{count}",
                 ListenerArn=self.arn,
-                Actions=define_actions(self, service_def, True),
+                Actions=actions,
                 Priority=priority,
-                Conditions=define_target_conditions(service_def),
+                Conditions=conditions,
             )
             rules.append(rule)
         for rule in rules:
@@ -3,7 +3,6 @@
 
 from __future__ import annotations
 
-import random
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -15,10 +14,11 @@ if TYPE_CHECKING:
 
 import re
 from copy import deepcopy
+from hashlib import sha256
 from json import dumps
 
 from compose_x_common.compose_x_common import keyisset, set_else_none
-from troposphere import AWS_NO_VALUE, FindInMap, Ref
+from troposphere import AWS_NO_VALUE, FindInMap, Ref, encode_to_dict
 from troposphere.elasticloadbalancingv2 import (
     Action,
     AuthenticateCognitoConfig,
@@ -377,6 +377,22 @@ def define_actions(listener, target_def, rule_actions: bool = False) -> list:
     return actions
 
 
+def get_rules_priority_offset(listener_id: str, rules: list, modulo: int) -> int:
+    """
+    Offset of the listener rules priorities, derived from the listener and the actions and conditions of its rules.
+    The priorities change with the rules, so that CloudFormation can create the new rules before deleting the old
+    ones, but are the same from one render to the next.
+
+    :param listener_id: the listener title or ARN
+    :param rules: the actions and conditions of each rule
+    :param modulo: the offset is between 1 and modulo
+    """
+    digest = sha256(
+        dumps([listener_id, encode_to_dict(rules)], sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return int(digest, 16) % modulo + 1
+
+
 def define_listener_rules_actions(
     listener: ComposeListener, left_services: list
 ) -> list[ListenerRule]:
@@ -384,15 +400,24 @@ def define_listener_rules_actions(
     Function to identify the Target definition and create the resulting rule appropriately.
     """
     rules = []
-    offset = random.randint(1, 100)
-    for count, service_def in enumerate(left_services):
+    rules_definitions = [
+        (
+            define_actions(listener, service_def, True),
+            define_target_conditions(service_def),
+        )
+        for service_def in left_services
+    ]
+    offset = get_rules_priority_offset(listener.title, rules_definitions, 100)
+    for count, (service_def, (actions, conditions)) in enumerate(
+        zip(left_services, rules_definitions)
+    ):
         priority = count + 1 + offset
         rule = ListenerRule(
             f"{listener.title}{NONALPHANUM.sub('', service_def['name'])}Rule{count}",
             ListenerArn=Ref(listener),
-            Actions=define_actions(listener, service_def, True),
+            Actions=actions,
             Priority=priority,
-            Conditions=define_target_conditions(service_def),
+            Conditions=conditions,
         )
         rules.append(rule)
     return rules
@@ -534,11 +559,7 @@ def import_cognito_pool(src_name, settings: ComposeXSettings, listener_stack):
         raise LookupError(
             f"There is no {COGNITO_KEY} defined in your docker-compose files"
         )
-    pools = [
-        res
-        for res in settings.x_resources
-        if res.module.res_key == "x-cognito_userpool"
-    ]
+    pools = settings.x_resources_registry.by_module.get("x-cognito_userpool", [])
     if src_name not in [__pool.name for __pool in pools]:
         raise KeyError(
             f"{COGNITO_KEY} - pool {src_name} not found",
@@ -19,3 +19,27 @@ class IncompatibleOptions(ComposeBaseException):
     """
     Exception when two x-resources conflict, i.e. when you try to use Lookup on x-cloudmap and create a new VPC
     """
+
+
+class TemplateValidationError(ComposeBaseException):
+    """
+    Exception when a rendered CloudFormation template is not valid, i.e. refers to undeclared parameters or resources
+    """
+
+
+class TemplateLimitsExceeded(ComposeBaseException):
+    """
+    Exception when a rendered CloudFormation template is over the CloudFormation limits, and cannot be sharded
+    """
+
+
+class ApiCallsBudgetExceeded(ComposeBaseException):
+    """
+    Exception when the execution made more AWS API calls than budgeted
+    """
+
+
+class InvalidRenderRequest(ComposeBaseException):
+    """
+    Exception when a request to the render server is not valid, i.e. has no compose files or unsupported arguments
+    """
@@ -7,10 +7,9 @@ import re
 from troposphere import Join, Ref, Sub
 from troposphere.iam import Role
 
+from ecs_composex.common.ecs_composex import ROLE_ARN_ARG
 from ecs_composex.common.logging import LOG
 
-ROLE_ARN_ARG = "RoleArn"
-
 
 def service_role_trust_policy(service_name: str) -> dict:
     """
@@ -6,9 +6,42 @@ Module to import Policies templates from AWS SAM policies templates.
 """
 
 import json
+from copy import deepcopy
+from threading import Lock
 
 from importlib_resources import files as pkg_files
 
+_POLICIES_MODELS: dict = {}
+_POLICIES_MODELS_LOCK = Lock()
+
+
+class PoliciesModels(dict):
+    """
+    Read-only mapping of the IAM policies models, shared process-wide. Copies are regular, mutable, dicts.
+    The models themselves are shared too: callers that need to change a model must work on a copy of it.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("The IAM policies models are read-only. Work on a copy instead")
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __ior__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def copy(self) -> dict:
+        return dict(self)
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo) -> dict:
+        return {key: deepcopy(value, memo) for key, value in self.items()}
+
 
 def import_and_cleanse_sam_policies():
     """
@@ -31,16 +64,39 @@ def import_and_cleanse_sam_policies():
     return import_policies
 
 
-def get_access_types(module_name: str, perms_path: str = None) -> dict:
+def get_policies_models(perms_path: str = None) -> PoliciesModels:
+    """
+    Returns the AWS SAM policies merged with the module permissions, if any. The SAM policies and each permissions
+    file are only loaded once per process.
+
+    :param str perms_path: path to the module permissions definition file
+    :return: the policies
+    :rtype: PoliciesModels
+    """
+    with _POLICIES_MODELS_LOCK:
+        if None not in _POLICIES_MODELS:
+            _POLICIES_MODELS[None] = PoliciesModels(import_and_cleanse_sam_policies())
+        if perms_path in _POLICIES_MODELS:
+            return _POLICIES_MODELS[perms_path]
+        policies = dict(_POLICIES_MODELS[None])
+        try:
+            with open(perms_path, encoding="utf-8-sig") as perms_fd:
+                policies.update(json.loads(perms_fd.read()))
+        except OSError:
+            pass
+        _POLICIES_MODELS[perms_path] = PoliciesModels(policies)
+        return _POLICIES_MODELS[perms_path]
+
+
+def get_access_types(module_name: str, perms_path: str = None) -> PoliciesModels:
     """
     Retrieves the Permissions definitions for a given module
 
     :param str module_name:
     :param str perms_path: Override path to the permissions, instead of relying on module name
     :return: the policies
-    :rtype: dict
+    :rtype: PoliciesModels
     """
-    sam_policies = import_and_cleanse_sam_policies()
     if not perms_path:
         source = str(
             pkg_files("ecs_composex").joinpath(
@@ -49,13 +105,4 @@ def get_access_types(module_name: str, perms_path: str = None) -> dict:
         )
     else:
         source = perms_path
-    try:
-        with open(
-            source,
-            encoding="utf-8-sig",
-        ) as perms_fd:
-            dyn_policies = json.loads(perms_fd.read())
-        sam_policies.update(dyn_policies)
-        return sam_policies
-    except OSError:
-        return sam_policies
+    return get_policies_models(source)
@@ -22,6 +22,7 @@ from troposphere.kinesis import Stream as CfnStream
 from ecs_composex.common.logging import LOG
 from ecs_composex.common.stacks import ComposeXStack
 from ecs_composex.compose.x_resources.api_x_resources import ApiXResource
+from ecs_composex.compose.x_resources.helpers import lookup_resources_concurrently
 from ecs_composex.kinesis.kinesis_params import STREAM_ARN, STREAM_ID, STREAM_KMS_KEY_ID
 from ecs_composex.kinesis.kinesis_template import create_streams_template
 from ecs_composex.kinesis_firehose.kinesis_firehose_stack import DeliveryStream
@@ -180,12 +181,15 @@ def resolve_lookup(
         LOG.info(
             f"{resource.module.res_key}.{resource.logical_name} - Looking up AWS Resource"
         )
-        resource.lookup_resource(
-            KINESIS_STREAM_ARN_RE,
-            get_stream_config,
-            CfnStream.resource_type,
-            "kinesis:stream",
-        )
+    lookup_resources_concurrently(
+        settings,
+        lookup_resources,
+        KINESIS_STREAM_ARN_RE,
+        get_stream_config,
+        CfnStream.resource_type,
+        "kinesis:stream",
+    )
+    for resource in lookup_resources:
         LOG.info(f"{module.res_key}.{resource.name} - Matched to {resource.arn}")
         settings.mappings[module.mapping_key].update(
             {resource.logical_name: resource.mappings}
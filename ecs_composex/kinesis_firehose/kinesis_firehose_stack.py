@@ -26,6 +26,7 @@ from ecs_composex.compose.x_resources.api_x_resources import ApiXResource
 from ecs_composex.compose.x_resources.environment_x_resources import (
     AwsEnvironmentResource,
 )
+from ecs_composex.compose.x_resources.helpers import lookup_resources_concurrently
 from ecs_composex.iam.iam_stack import ResourceIamManager
 from ecs_composex.kinesis_firehose.kinesis_firehose_params import (
     FIREHOSE_ARN,
@@ -158,12 +159,15 @@ def resolve_lookup(
         LOG.info(
             f"{resource.module.res_key}.{resource.logical_name} - Looking up AWS Resource"
         )
-        resource.lookup_resource(
-            KINESIS_FIREHOSE_ARN_RE,
-            get_delivery_stream_config,
-            CfnDeliveryStream.resource_type,
-            "firehose:deliverystream",
-        )
+    lookup_resources_concurrently(
+        settings,
+        lookup_resources,
+        KINESIS_FIREHOSE_ARN_RE,
+        get_delivery_stream_config,
+        CfnDeliveryStream.resource_type,
+        "firehose:deliverystream",
+    )
+    for resource in lookup_resources:
         LOG.info(f"{module.res_key}.{resource.name} - Matched to {resource.arn}")
         settings.mappings[module.mapping_key].update(
             {resource.logical_name: resource.mappings}
@@ -27,6 +27,7 @@ from ecs_composex.compose.x_resources.api_x_resources import ApiXResource
 from ecs_composex.compose.x_resources.environment_x_resources import (
     AwsEnvironmentResource,
 )
+from ecs_composex.compose.x_resources.helpers import lookup_resources_concurrently
 from ecs_composex.kinesis_firehose.kinesis_firehose_stack import DeliveryStream
 from ecs_composex.kms import metadata
 from ecs_composex.kms.kms_ecs_cluster import handle_ecs_cluster
@@ -241,10 +242,15 @@ class XStack(ComposeXStack):
         if module.lookup_resources:
             if not keyisset(module.mapping_key, settings.mappings):
                 settings.mappings[module.mapping_key] = {}
+            lookup_resources_concurrently(
+                settings,
+                module.lookup_resources,
+                KMS_KEY_ARN_RE,
+                get_key_config,
+                Key.resource_type,
+                "kms:key",
+            )
             for resource in module.lookup_resources:
-                resource.lookup_resource(
-                    KMS_KEY_ARN_RE, get_key_config, Key.resource_type, "kms:key"
-                )
                 settings.mappings[module.mapping_key].update(
                     {resource.logical_name: resource.mappings}
                 )
@@ -20,7 +20,8 @@ import warnings
 from typing import TYPE_CHECKING, Union
 
 if TYPE_CHECKING:
-    from ecs_composex.common.settings import ComposeXSettings
+    from jsonschema import Draft7Validator
+
     from ecs_composex.common.settings import ComposeXSettings
     from ecs_composex.compose.x_resources import XResource
     from ecs_composex.compose.x_resources.services_resources import ServicesXResource
@@ -35,16 +36,16 @@ if TYPE_CHECKING:
 
 import re
 from collections import OrderedDict
-from copy import deepcopy
 from importlib import import_module
-from json import loads
 
 from compose_x_common.compose_x_common import keyisset, set_else_none
 
 from ecs_composex.common import NONALPHANUM
 from ecs_composex.common.ecs_composex import X_KEY
 from ecs_composex.common.logging import LOG
-from ecs_composex.iam.import_sam_policies import import_and_cleanse_sam_policies
+from ecs_composex.compose.compose_document import copy_on_write
+from ecs_composex.iam.import_sam_policies import PoliciesModels, get_policies_models
+from ecs_composex.specs import get_spec_validator, load_spec
 
 
 class XResourceModule:
@@ -70,9 +71,7 @@ class XResourceModule:
         self._resource_class = resource_class
         self._stack = None
         self._path = posix_path
-        self._mod_policies = {}
         self._json_schema = {}
-        self.import_perms_definition()
         self.import_json_schema()
         self._resources: dict = {}
         self._definition: dict = {}
@@ -80,7 +79,7 @@ class XResourceModule:
         self._mappings: dict = {}
         if definition:
             self.definition = definition
-            self._original_definition = deepcopy(definition)
+            self._original_definition = copy_on_write(definition)
         self.module_deletion_policy: str = "Delete"
 
     def __del__(self):
@@ -208,12 +207,10 @@ class XResourceModule:
         return str(self._path)
 
     @property
-    def iam_policies(self) -> dict:
-        if not self._mod_policies:
-            self.import_perms_definition()
-        sam_policies = import_and_cleanse_sam_policies()
-        sam_policies.update(self._mod_policies)
-        return sam_policies
+    def iam_policies(self) -> PoliciesModels:
+        return get_policies_models(
+            str(self._path.joinpath(f"{self.mod_key}_perms.json"))
+        )
 
     @property
     def json_schema(self):
@@ -222,19 +219,16 @@ class XResourceModule:
     def __repr__(self):
         return self.res_key
 
-    def import_perms_definition(self):
-        perms_file_path = self._path.joinpath(f"{self.mod_key}_perms.json")
-        try:
-            with open(perms_file_path, encoding="utf-8-sig") as perms_fd:
-                self._mod_policies = loads(perms_fd.read())
-        except OSError:
-            pass
+    @property
+    def json_schema_validator(self) -> Draft7Validator | None:
+        if not self._json_schema:
+            return None
+        return get_spec_validator(self._path.joinpath(f"{self.res_key}.spec.json"))
 
     def import_json_schema(self):
         json_schema_file_path = self._path.joinpath(f"{self.res_key}.spec.json")
         try:
-            with open(json_schema_file_path, encoding="utf-8-sig") as json_schema_fd:
-                self._json_schema = loads(json_schema_fd.read())
+            self._json_schema = load_spec(json_schema_file_path)
         except OSError:
             LOG.warning(
                 f"{self.res_key} - JSON Schema not found for validation. Render may contain errors."
@@ -274,14 +268,54 @@ class XResourceModule:
             self.resources[resource_name] = new_definition
 
 
+def get_resource_kind(resource: XResource) -> str:
+    """
+    :return: lookup if the resource is imported from AWS, void if it has no properties set, new otherwise
+    """
+    if resource.lookup:
+        return "lookup"
+    if resource.uses_default:
+        return "void"
+    return "new"
+
+
+class XResourcesRegistry:
+    """
+    Indexes the x-resources of all the modules, once, so that the resources can be found by compose-x ARN,
+    by module, or by kind, without going over all the resources.
+
+    :ivar list[XResource] resources: all the resources, in the modules order
+    :ivar dict[str, XResource] by_arn: the resources indexed by compose_x_arn, i.e. x-sqs::queue
+    :ivar dict[str, list[XResource]] by_module: the resources of each module, indexed by res_key
+    :ivar dict[str, list[XResource]] by_kind: the resources indexed by kind (new, lookup or void)
+    """
+
+    kinds = ("new", "lookup", "void")
+
+    def __init__(self, modules: dict[str, XResourceModule]):
+        self.resources: list = []
+        self.by_arn: dict = {}
+        self.by_module: dict = {}
+        self.by_kind: dict = {kind: [] for kind in self.kinds}
+        for res_key, module in modules.items():
+            module_resources = module.resources_list
+            self.by_module[res_key] = module_resources
+            for resource in module_resources:
+                self.resources.append(resource)
+                self.by_arn.setdefault(resource.compose_x_arn, resource)
+                self.by_kind[get_resource_kind(resource)].append(resource)
+
+
 class ModManager:
     """
-    Class to manage the modules
+    Class to manage the modules, and the registry of their resources.
+    The registry is built on first access, and invalidated when modules or resources are added via the ModManager.
     """
 
     def __init__(self, settings: ComposeXSettings):
         self.modules = {}
         self.loaded_modules: list = []
+        self._registry: XResourcesRegistry | None = None
 
         for res_key, res_def in settings.compose_content.items():
             if not res_def:
@@ -297,17 +331,37 @@ class ModManager:
                 del sys.modules[module]
             del module
 
+    @property
+    def registry(self) -> XResourcesRegistry:
+        if self._registry is None:
+            self._registry = XResourcesRegistry(self.modules)
+        return self._registry
+
+    def invalidate_registry(self) -> None:
+        self._registry = None
+
+    def add_resource(
+        self, module: XResourceModule, name: str, resource: XResource
+    ) -> None:
+        """
+        Adds a resource to the module, outside of the compose definition, and invalidates the registry.
+        """
+        module.resources[name] = resource
+        self.invalidate_registry()
+
     def init_mods_resources(self, settings: ComposeXSettings):
         for module in self.modules.values():
             if not module.resource_class or not isinstance(
                 settings.compose_content[module.res_key], dict
             ):
                 continue
-            if module.definition:
-                module.set_resources(settings)
-            elif keyisset(module.res_key, settings.compose_content):
-                module.definition = settings.compose_content[module.res_key]
-                module.set_resources(settings)
+            with settings.profiler.phase("init_mods_resources", module=module.res_key):
+                if module.definition:
+                    module.set_resources(settings)
+                elif keyisset(module.res_key, settings.compose_content):
+                    module.definition = settings.compose_content[module.res_key]
+                    module.set_resources(settings)
+        self.invalidate_registry()
 
     def modules_repr(self):
         for key, module in self.modules.items():
@@ -355,6 +409,7 @@ class ModManager:
         if res_def and isinstance(res_def, dict):
             module.definition = res_def
         self.modules[res_key] = module
+        self.invalidate_registry()
         return module
 
 
@@ -21,6 +21,7 @@ from troposphere.neptune import DBCluster as CfnDBCluster
 from ecs_composex.common.logging import LOG
 from ecs_composex.common.stacks import ComposeXStack
 from ecs_composex.common.troposphere_tools import build_template
+from ecs_composex.compose.x_resources.helpers import lookup_resources_concurrently
 from ecs_composex.compose.x_resources.network_x_resources import DatabaseXResource
 from ecs_composex.neptune.neptune_params import (
     DB_CLUSTER_RESOURCES_ARN,
@@ -235,13 +236,15 @@ class XStack(ComposeXStack):
         if module.lookup_resources:
             if not keyisset(module.mapping_key, settings.mappings):
                 settings.mappings[module.mapping_key] = {}
+            lookup_resources_concurrently(
+                settings,
+                module.lookup_resources,
+                NEPTUNE_DB_CLUSTER_ARN_RE,
+                get_db_cluster_config,
+                CfnDBCluster.resource_type,
+                "rds:cluster",
+            )
             for resource in module.lookup_resources:
-                resource.lookup_resource(
-                    NEPTUNE_DB_CLUSTER_ARN_RE,
-                    get_db_cluster_config,
-                    CfnDBCluster.resource_type,
-                    "rds:cluster",
-                )
                 resource.generate_cfn_mappings_from_lookup_properties()
                 resource.generate_outputs()
                 settings.mappings[module.mapping_key].update(
@@ -346,7 +346,7 @@ def define_parameters_group_from_engine_and_version(
         raise KeyError(
             "Engine and EngineVersion must be set in either Properties or MacroParameters"
         )
-    db_family = get_family_from_engine_version(engine_name, engine_version)
+    db_family = get_family_from_engine_version(engine_name, engine_version, session)
     if not db_family:
         raise LookupError(
             f"Failed to retrieve the DB Engine Family for {engine_name}@{engine_version}"
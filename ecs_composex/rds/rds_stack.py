@@ -23,6 +23,7 @@ from troposphere.rds import DBInstance as CfnDBInstance
 from ecs_composex.common.logging import LOG
 from ecs_composex.common.stacks import ComposeXStack
 from ecs_composex.common.troposphere_tools import build_template
+from ecs_composex.compose.x_resources.helpers import lookup_resources_concurrently
 from ecs_composex.compose.x_resources.network_x_resources import DatabaseXResource
 from ecs_composex.rds.rds_features import apply_extra_parameters
 from ecs_composex.rds.rds_params import (
@@ -271,29 +272,37 @@ class XStack(ComposeXStack):
             self.is_void = True
         if module.lookup_resources and module.mapping_key not in settings.mappings:
             settings.mappings[module.mapping_key] = {}
+        clusters, instances = [], []
         for resource in module.lookup_resources:
             resource.stack = self
             if keyisset("cluster", resource.lookup):
-                resource.lookup_resource(
-                    RDS_DB_CLUSTER_ARN_RE,
-                    get_db_cluster_config,
-                    CfnDBCluster.resource_type,
-                    "rds:cluster",
-                    "cluster",
-                )
+                clusters.append(resource)
             elif keyisset("db", resource.lookup):
-                resource.lookup_resource(
-                    RDS_DB_INSTANCE_ARN_RE,
-                    get_db_instance_config,
-                    CfnDBInstance.resource_type,
-                    "rds:db",
-                    "db",
-                )
+                instances.append(resource)
             else:
                 raise KeyError(
                     f"{resource.module.res_key}.{resource.name} - "
                     "You must specify the cluster or instance to lookup"
                 )
+        lookup_resources_concurrently(
+            settings,
+            clusters,
+            RDS_DB_CLUSTER_ARN_RE,
+            get_db_cluster_config,
+            CfnDBCluster.resource_type,
+            "rds:cluster",
+            "cluster",
+        )
+        lookup_resources_concurrently(
+            settings,
+            instances,
+            RDS_DB_INSTANCE_ARN_RE,
+            get_db_instance_config,
+            CfnDBInstance.resource_type,
+            "rds:db",
+            "db",
+        )
+        for resource in module.lookup_resources:
             if keyisset("secret", resource.lookup):
                 lookup_rds_secret(resource, resource.lookup["secret"])
 
@@ -20,7 +20,6 @@ if TYPE_CHECKING:
     from ecs_composex.ecs.ecs_stack import ServiceStack
 
 from botocore.exceptions import ClientError
-from compose_x_common.aws import get_account_id
 from compose_x_common.aws.rds import RDS_DB_ID_CLUSTER_ARN_RE
 from compose_x_common.compose_x_common import keyisset, keypresent, set_else_none
 from troposphere import FindInMap, GetAtt, Ref, Sub
@@ -29,7 +28,7 @@ from troposphere.ecs import Environment
 from troposphere.ecs import Secret as EcsSecret
 from troposphere.iam import PolicyType
 
-from ecs_composex.common.aws import find_aws_resource_arn_from_tags_api
+from ecs_composex.common.aws import find_aws_resource_arn_from_tags_api, get_account_id
 from ecs_composex.common.cfn_params import Parameter
 from ecs_composex.common.logging import LOG
 from ecs_composex.common.troposphere_tools import (
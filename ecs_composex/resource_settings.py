@@ -25,6 +25,7 @@ from troposphere.iam import Policy as IamPolicy
 from troposphere.iam import PolicyType
 
 from ecs_composex.common.cfn_params import STACK_ID_SHORT, Parameter
+from ecs_composex.common.ecs_composex import X_RESOURCE_ATTRIBUTE_RE
 from ecs_composex.common.logging import LOG
 from ecs_composex.common.stacks import ComposeXStack
 from ecs_composex.common.troposphere_tools import add_parameters, add_update_mapping
@@ -320,9 +321,6 @@ def set_update_container_env_vars_from_resource_attribute(
     :param target:
     :return:
     """
-    resource_attribute_match_re = re.compile(
-        r"^(?P<res_key>x-[\S]+)::(?P<res_name>[\S]+)::(?P<return_value>[\S]+)$"
-    )
     for defined_env_var in svc_container_environment:
         value = (
             defined_env_var.Value
@@ -331,7 +329,7 @@ def set_update_container_env_vars_from_resource_attribute(
         )
         if not isinstance(value, str):
             continue
-        parts = resource_attribute_match_re.match(value)
+        parts = X_RESOURCE_ATTRIBUTE_RE.match(value)
         if not parts or not (
             parts.group("res_name") == resource.name
             and parts.group("res_key") == resource.module.res_key
@@ -404,9 +402,6 @@ def map_resource_return_value_to_services_command(
     """
     Checks if their is a x-<res_key>::<name>::<return_value>
     """
-    resource_attribute_match_re = re.compile(
-        r"^(?P<res_key>x-[\S]+)::(?P<res_name>[\S]+)::(?P<return_value>[\S]+)$"
-    )
     from itertools import chain
 
     for service in chain(family.managed_sidecars, family.ordered_services):
@@ -417,7 +412,7 @@ def map_resource_return_value_to_services_command(
             continue
         new_command = []
         for sh_part in command:
-            parts = resource_attribute_match_re.match(sh_part)
+            parts = X_RESOURCE_ATTRIBUTE_RE.match(sh_part)
             if not parts:
                 new_command.append(sh_part)
                 continue
@@ -484,13 +479,11 @@ def map_service_perms_to_resource(
         resource.module.mapping_key if resource else resource_mapping_key
     )
     policies_models = (
-        deepcopy(resource_policies)
-        if not access_subkey
-        else deepcopy(resource_policies[access_subkey])
+        resource_policies if not access_subkey else resource_policies[access_subkey]
     )
     access_definition = target[3] if not access_definition else access_definition
-    access_type_policy_model = get_access_type_policy_model(
-        access_definition, policies_models, access_subkey
+    access_type_policy_model = deepcopy(
+        get_access_type_policy_model(access_definition, policies_models, access_subkey)
     )
     resource_arns = determine_arns(
         arn_value, access_type_policy_model, ignore_missing_primary
@@ -543,12 +536,10 @@ def map_x_resource_perms_to_resource(
         resource.module.mapping_key if resource else resource_mapping_key
     )
     policies_models = (
-        deepcopy(resource_policies)
-        if not access_subkey
-        else deepcopy(resource_policies[access_subkey])
+        resource_policies if not access_subkey else resource_policies[access_subkey]
     )
-    access_type_policy_model = get_access_type_policy_model(
-        access_definition, policies_models, access_subkey
+    access_type_policy_model = deepcopy(
+        get_access_type_policy_model(access_definition, policies_models, access_subkey)
     )
     resource_arns = determine_arns(
         arn_value, access_type_policy_model, ignore_missing_primary
@@ -14,6 +14,7 @@ from compose_x_common.compose_x_common import keyisset
 from troposphere.route53 import HostedZone as CfnHostedZone
 
 from ecs_composex.common.logging import LOG
+from ecs_composex.compose.x_resources.helpers import lookup_resources_concurrently
 from ecs_composex.route53.route53_params import (
     LAST_DOT_RE,
     PUBLIC_DNS_ZONE_ID,
@@ -102,10 +103,15 @@ def resolve_lookup(
     """
     if not keyisset(module.mapping_key, settings.mappings):
         settings.mappings[module.mapping_key] = {}
+    lookup_resources_concurrently(
+        settings,
+        lookup_resources,
+        ZONES_PATTERN,
+        lookup_hosted_zone,
+        CfnHostedZone.resource_type,
+        "",
+    )
     for resource in lookup_resources:
-        resource.lookup_resource(
-            ZONES_PATTERN, lookup_hosted_zone, CfnHostedZone.resource_type, ""
-        )
         settings.mappings[module.mapping_key].update(
             {resource.logical_name: resource.mappings}
         )
@@ -21,6 +21,7 @@ from troposphere.s3 import Bucket as CfnBucket
 from ecs_composex.common.logging import LOG
 from ecs_composex.common.stacks import ComposeXStack
 from ecs_composex.common.troposphere_tools import build_template
+from ecs_composex.compose.x_resources.helpers import lookup_resources_concurrently
 from ecs_composex.s3.s3_bucket import Bucket
 from ecs_composex.s3.s3_params import (
     CONTROL_CLOUD_ATTR_MAPPING,
@@ -77,9 +78,15 @@ def define_bucket_mappings(
     """
     for bucket in lookup_buckets:
         bucket.init_outputs()
-        bucket.lookup_resource(
-            S3_BUCKET_ARN_RE, get_bucket_config, CfnBucket.resource_type, "s3"
-        )
+    lookup_resources_concurrently(
+        settings,
+        lookup_buckets,
+        S3_BUCKET_ARN_RE,
+        get_bucket_config,
+        CfnBucket.resource_type,
+        "s3",
+    )
+    for bucket in lookup_buckets:
         settings.mappings[module.mapping_key].update(
             {bucket.logical_name: bucket.mappings}
         )
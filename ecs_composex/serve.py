@@ -0,0 +1,345 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2025 John Mille <john@compose-x.io>
+
+"""
+Long-running render server, over HTTP or a Unix socket. The compose-x specs registry and validators, the IAM policies
+models, the x-resources modules, the AWS sessions and the lookup and validation caches are loaded once and kept warm
+across renders. Clients post the compose files and receive the rendered templates.
+
+Renders are done one at a time: run several servers to render concurrently.
+"""
+
+from __future__ import annotations
+
+import json
+import pkgutil
+import re
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import import_module
+from os import path, remove, walk
+from socketserver import ThreadingMixIn, UnixStreamServer
+from tempfile import TemporaryDirectory
+from threading import Lock
+from time import perf_counter
+from types import SimpleNamespace
+
+from compose_x_common.compose_x_common import keyisset, set_else_none
+from importlib_resources import files as pkg_files
+
+from ecs_composex import __version__
+from ecs_composex.common.logging import LOG
+from ecs_composex.common.settings_args import SettingsArgs
+from ecs_composex.exceptions import InvalidRenderRequest
+
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+STACK_NAME_PATTERN = re.compile(r"^[a-zA-Z][-a-zA-Z0-9]{0,127}$")
+
+
+def warm_up() -> None:
+    """
+    Loads the specs registry and validators, the IAM policies models, and imports the x-resources modules.
+    """
+    import ecs_composex
+    from ecs_composex.iam.import_sam_policies import get_policies_models
+    from ecs_composex.specs import get_registry, get_spec_validator
+
+    started = perf_counter()
+    get_registry()
+    get_policies_models()
+    for spec_file in pkg_files("ecs_composex").joinpath("specs").iterdir():
+        if spec_file.name.endswith(".json"):
+            get_spec_validator(str(spec_file))
+    for module in pkgutil.iter_modules(ecs_composex.__path__):
+        if module.ispkg and path.exists(
+            path.join(
+                module.module_finder.path, module.name, f"{module.name}_module.py"
+            )
+        ):
+            import_module(f"ecs_composex.{module.name}.{module.name}_module")
+    LOG.info(f"Warmed up in {(perf_counter() - started) * 1000:.0f}ms")
+
+
+@contextmanager
+def compose_environment(environment: dict[str, str]):
+    """
+    Within the context, the compose files are interpolated with the environment variables given instead of the
+    environment of the process. Set for the whole process, so only used under the RenderService lock.
+    """
+    from compose_x_render import envsubst
+
+    process_os = envsubst.os
+    envsubst.os = SimpleNamespace(environ=environment)
+    try:
+        yield
+    finally:
+        envsubst.os = process_os
+
+
+class RenderService:
+    """
+    Renders compose projects, re-using the same AWS session, lookup cache and validation cache for all renders.
+    Can also be kept at the module level of a CloudFormation macro handler, for warm invocations to re-use it.
+
+    A render request is a dict with the project ``Name``, the ``ComposeFiles`` content, in order, and optionally
+    the allowed_args settings, i.e. ``{"Name": "app", "ComposeFiles": ["services: ..."], "TemplateFormat": "yaml"}``
+
+    The compose files are interpolated with the optional ``Environment`` variables of the request, never with the
+    environment of the server, and can only refer to files in the request directory.
+
+    :ivar int renders: number of successful renders
+    """
+
+    allowed_args = [
+        SettingsArgs.name_arg,
+        SettingsArgs.format_arg,
+        SettingsArgs.compact_arg,
+        SettingsArgs.region_arg,
+        SettingsArgs.zones_arg,
+        SettingsArgs.bucket_arg,
+        SettingsArgs.bucket_prefix_path_arg,
+    ]
+
+    def __init__(
+        self,
+        session=None,
+        lookup_cache_dir: str = None,
+        lookup_ttl: str = None,
+        offline: bool = False,
+    ):
+        from ecs_composex.common.aws import ThreadSafeSession, block_api_calls
+        from ecs_composex.common.files import ValidationCache
+        from ecs_composex.compose.x_resources.lookup_cache import LookupCache
+
+        self.session = session if session else ThreadSafeSession()
+        self.offline = offline
+        if offline:
+            block_api_calls(self.session)
+        self.lookup_cache = LookupCache(lookup_cache_dir, lookup_ttl, offline=offline)
+        self.validation_cache = ValidationCache()
+        self.renders = 0
+        self._lock = Lock()
+
+    def get_settings_args(
+        self, request: dict, input_files: list[str], output_dir: str
+    ) -> dict:
+        """
+        :raises: InvalidRenderRequest
+        """
+        unsupported = (
+            set(request) - set(self.allowed_args) - {"ComposeFiles", "Environment"}
+        )
+        if unsupported:
+            raise InvalidRenderRequest(
+                f"Unsupported arguments {sorted(unsupported)}. Allowed: {self.allowed_args}"
+            )
+        name = request.get(SettingsArgs.name_arg)
+        if not isinstance(name, str) or not STACK_NAME_PATTERN.fullmatch(name):
+            raise InvalidRenderRequest(
+                f"{SettingsArgs.name_arg} must be a valid stack name, matching {STACK_NAME_PATTERN.pattern}"
+            )
+        args = {key: request[key] for key in self.allowed_args if key in request}
+        args.update(
+            {
+                SettingsArgs.command_arg: SettingsArgs.render_arg,
+                SettingsArgs.input_file_arg: input_files,
+                SettingsArgs.output_dir_arg: output_dir,
+                SettingsArgs.offline_arg: self.offline,
+            }
+        )
+        return args
+
+    @staticmethod
+    def write_compose_files(request: dict, directory: str) -> list[str]:
+        compose_files = set_else_none("ComposeFiles", request)
+        if (
+            not isinstance(compose_files, list)
+            or not compose_files
+            or not all(isinstance(content, str) for content in compose_files)
+        ):
+            raise InvalidRenderRequest(
+                "ComposeFiles must be the list of the compose files content"
+            )
+        input_files = []
+        for index, content in enumerate(compose_files):
+            file_path = path.join(directory, f"docker-compose.{index}.yaml")
+            with open(file_path, "w") as compose_fd:
+                compose_fd.write(content)
+            input_files.append(file_path)
+        return input_files
+
+    @staticmethod
+    def get_environment(request: dict) -> dict[str, str]:
+        environment = set_else_none("Environment", request, {})
+        if not isinstance(environment, dict) or not all(
+            isinstance(value, str) for value in environment.values()
+        ):
+            raise InvalidRenderRequest(
+                "Environment must be the variables to interpolate the compose files with, by name"
+            )
+        return environment
+
+    @staticmethod
+    def read_rendered_files(output_dir: str) -> dict[str, str]:
+        rendered: dict = {}
+        for dir_path, _, file_names in walk(output_dir):
+            for file_name in sorted(file_names):
+                file_path = path.join(dir_path, file_name)
+                with open(file_path) as rendered_fd:
+                    rendered[path.relpath(file_path, output_dir)] = rendered_fd.read()
+        return rendered
+
+    def render(self, request: dict) -> dict:
+        """
+        Renders the project of the request.
+
+        :return: the rendered files content, by file name, and the root template file name
+        :raises: InvalidRenderRequest
+        """
+        from ecs_composex.common.aws import clear_tagged_resources_indexes
+        from ecs_composex.common.aws_calls import API_CALLS
+        from ecs_composex.common.files import LOCAL_FILES
+        from ecs_composex.common.settings import ComposeXSettings
+        from ecs_composex.common.stacks import process_stacks
+        from ecs_composex.ecs_composex import generate_full_template
+
+        if not isinstance(request, dict):
+            raise InvalidRenderRequest("The request must be a JSON object")
+        with self._lock, TemporaryDirectory(prefix="compose-x-serve-") as work_dir:
+            started = perf_counter()
+            environment = self.get_environment(request)
+            input_files = self.write_compose_files(request, work_dir)
+            output_dir = path.join(work_dir, "output")
+            args = self.get_settings_args(request, input_files, output_dir)
+            API_CALLS.reset()
+            clear_tagged_resources_indexes()
+            with compose_environment(environment), LOCAL_FILES.scoped(work_dir):
+                settings = ComposeXSettings(
+                    session=self.session, lookup_cache=self.lookup_cache, **args
+                )
+                settings.validation_cache = self.validation_cache
+                root_stack = generate_full_template(settings)
+                process_stacks(root_stack, settings)
+            self.lookup_cache.save()
+            self.renders += 1
+            return {
+                "Name": settings.name,
+                "RootTemplate": root_stack.template_file.file_name,
+                "Files": self.read_rendered_files(output_dir),
+                "ApiCalls": API_CALLS.total_calls,
+                "DurationMs": round((perf_counter() - started) * 1000),
+            }
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """
+    GET /health returns the server status. POST /render renders the project of the JSON request body.
+    """
+
+    server_version = f"compose-x/{__version__}"
+
+    def log_message(self, format, *args):
+        LOG.debug(f"serve - {format % args}")
+
+    def send_json(self, status: int, body: dict) -> None:
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self.send_json(404, {"Error": f"{self.path} not found"})
+        self.send_json(
+            200,
+            {
+                "Status": "Ready",
+                "Version": __version__,
+                "Renders": self.server.render_service.renders,
+            },
+        )
+
+    def do_POST(self):
+        if self.path != "/render":
+            return self.send_json(404, {"Error": f"{self.path} not found"})
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_REQUEST_SIZE:
+            return self.send_json(413, {"Error": "Request too large"})
+        try:
+            request = json.loads(self.rfile.read(length))
+            self.send_json(200, self.server.render_service.render(request))
+        except (InvalidRenderRequest, ValueError) as error:
+            self.send_json(400, {"Error": str(error.args[0])})
+        except Exception as error:
+            LOG.exception(error)
+            self.send_json(422, {"Error": f"{type(error).__name__}: {error}"})
+
+
+class UnixRenderServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("unix-socket", 0)
+
+
+def get_server(
+    render_service: RenderService,
+    host: str = None,
+    port: int = None,
+    socket_path: str = None,
+):
+    """
+    :return: the server, listening on the Unix socket if set, else on host and port
+    """
+    if socket_path:
+        if path.exists(socket_path):
+            remove(socket_path)
+        server = UnixRenderServer(socket_path, RenderRequestHandler)
+    else:
+        server = ThreadingHTTPServer(
+            (
+                host if host else SettingsArgs.default_serve_host,
+                SettingsArgs.default_serve_port if port is None else port,
+            ),
+            RenderRequestHandler,
+        )
+        server.daemon_threads = True
+    server.render_service = render_service
+    return server
+
+
+def serve(args: dict) -> int:
+    """
+    Runs the render server until interrupted.
+
+    :param dict args: the serve command arguments
+    :return: status code
+    """
+    warm_up()
+    render_service = RenderService(
+        lookup_cache_dir=set_else_none(SettingsArgs.lookup_cache_arg, args),
+        lookup_ttl=set_else_none(SettingsArgs.lookup_ttl_arg, args),
+        offline=keyisset(SettingsArgs.offline_arg, args),
+    )
+    socket_path = set_else_none(SettingsArgs.serve_socket_arg, args)
+    server = get_server(
+        render_service,
+        set_else_none(SettingsArgs.serve_host_arg, args),
+        set_else_none(SettingsArgs.serve_port_arg, args),
+        socket_path,
+    )
+    LOG.info(
+        f"Listening on {socket_path if socket_path else '%s:%d' % server.server_address[:2]}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        LOG.info("Stopping")
+    finally:
+        server.server_close()
+        if socket_path and path.exists(socket_path):
+            remove(socket_path)
+    return 0
@@ -16,6 +16,7 @@ from compose_x_common.compose_x_common import attributes_to_mapping, keyisset
 from troposphere.sns import Topic as CfnTopic
 
 from ecs_composex.common.logging import LOG
+from ecs_composex.compose.x_resources.helpers import lookup_resources_concurrently
 from ecs_composex.sns.sns_params import TOPIC_ARN, TOPIC_KMS_KEY, TOPIC_NAME
 
 
@@ -27,10 +28,15 @@ def create_sns_mappings(
     """
     if not keyisset(module.mapping_key, settings.mappings):
         settings.mappings[module.mapping_key] = {}
+    lookup_resources_concurrently(
+        settings,
+        resources,
+        SNS_TOPIC_ARN_RE,
+        get_topic_config,
+        CfnTopic.resource_type,
+        "sns",
+    )
     for resource in resources:
-        resource.lookup_resource(
-            SNS_TOPIC_ARN_RE, get_topic_config, CfnTopic.resource_type, "sns"
-        )
         resource.generate_cfn_mappings_from_lookup_properties()
         resource.generate_outputs()
         settings.mappings[module.mapping_key].update(
@@ -1,9 +1,76 @@
 #  SPDX-License-Identifier: MPL-2.0
 #  Copyright 2020-2025 John Mille <john@compose-x.io>
 
-from referencing.jsonschema import EMPTY_REGISTRY as _EMPTY_REGISTRY
+from __future__ import annotations
 
-from ecs_composex.specs._core import _schemas
+from typing import TYPE_CHECKING
 
-REGISTRY = (_schemas() @ _EMPTY_REGISTRY).crawl()
-__all__ = ["REGISTRY"]
+if TYPE_CHECKING:
+    from jsonschema import Draft7Validator
+    from referencing import Registry
+
+import json
+from threading import Lock
+
+_REGISTRY: Registry | None = None
+_SPECS: dict = {}
+_VALIDATORS: dict = {}
+_LOCK = Lock()
+
+
+def get_registry() -> Registry:
+    """
+    Returns the registry of the compose-x specs, crawled on first use only.
+    """
+    global _REGISTRY
+    with _LOCK:
+        if _REGISTRY is None:
+            from referencing.jsonschema import EMPTY_REGISTRY
+
+            from ecs_composex.specs._core import _schemas
+
+            _REGISTRY = (_schemas() @ EMPTY_REGISTRY).crawl()
+        return _REGISTRY
+
+
+def __getattr__(name: str):
+    if name == "REGISTRY":
+        return get_registry()
+    raise AttributeError(f"module {__name__} has no attribute {name}")
+
+
+def load_spec(spec_path: str) -> dict:
+    """
+    Loads the JSON schema from file, once per process. The returned schema is shared and must not be modified.
+
+    :param str spec_path: path to the JSON schema file
+    :raises: OSError
+    """
+    spec_path = str(spec_path)
+    with _LOCK:
+        if spec_path not in _SPECS:
+            with open(spec_path, encoding="utf-8-sig") as spec_fd:
+                _SPECS[spec_path] = json.loads(spec_fd.read())
+        return _SPECS[spec_path]
+
+
+def get_spec_validator(spec_path: str) -> Draft7Validator:
+    """
+    Returns the validator for the JSON schema file, compiled once per process against the compose-x specs REGISTRY,
+    and re-used across resources, modules and ComposeXSettings.
+
+    :param str spec_path: path to the JSON schema file
+    :raises: OSError
+    """
+    from jsonschema import Draft7Validator
+
+    spec_path = str(spec_path)
+    schema = load_spec(spec_path)
+    registry = get_registry()
+    with _LOCK:
+        if spec_path not in _VALIDATORS:
+            _VALIDATORS[spec_path] = Draft7Validator(schema, registry=registry)
+        return _VALIDATORS[spec_path]
+
+
+__all__ = ["REGISTRY", "get_registry", "load_spec", "get_spec_validator"]
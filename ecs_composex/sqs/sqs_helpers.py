@@ -16,6 +16,7 @@ from compose_x_common.compose_x_common import keyisset
 from troposphere.sqs import Queue as CfnQueue
 
 from ecs_composex.common.logging import LOG
+from ecs_composex.compose.x_resources.helpers import lookup_resources_concurrently
 from ecs_composex.sqs.sqs_params import (
     SQS_ARN,
     SQS_KMS_KEY,
@@ -82,13 +83,15 @@ def resolve_lookup(
     """
     if not keyisset(module.mapping_key, settings.mappings):
         settings.mappings[module.mapping_key] = {}
+    lookup_resources_concurrently(
+        settings,
+        lookup_resources,
+        SQS_QUEUE_ARN_RE,
+        get_queue_config,
+        CfnQueue.resource_type,
+        TAGGING_API_ID,
+    )
     for resource in lookup_resources:
-        resource.lookup_resource(
-            SQS_QUEUE_ARN_RE,
-            get_queue_config,
-            CfnQueue.resource_type,
-            TAGGING_API_ID,
-        )
         settings.mappings[module.mapping_key].update(
             {resource.logical_name: resource.mappings}
         )
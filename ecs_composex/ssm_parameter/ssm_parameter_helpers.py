@@ -12,7 +12,6 @@ if TYPE_CHECKING:
     from ecs_composex.ssm_parameter.ssm_parameter_stack import SsmParameter
 
 import json
-from os import path
 
 import yaml
 from compose_x_common.compose_x_common import keyisset
@@ -20,6 +19,7 @@ from troposphere import Base64
 from troposphere.ssm import Parameter as CfnSsmParameter
 from yaml import Loader
 
+from ecs_composex.common.files import LOCAL_FILES
 from ecs_composex.common.logging import LOG
 from ecs_composex.common.troposphere_tools import add_outputs
 from ecs_composex.resources_import import import_record_properties
@@ -104,7 +104,7 @@ def import_value_from_file(resource: SsmParameter) -> str | Base64:
     :param SsmParameter resource:
     :return: The value
     """
-    file_path = path.abspath(resource.parameters["FromFile"])
+    file_path = LOCAL_FILES.get_path(resource.parameters["FromFile"])
     with open(file_path) as file_fd:
         value = file_fd.read()
     if keyisset("ValidateJson", resource.parameters):
@@ -23,6 +23,7 @@ from ecs_composex.common.stacks import ComposeXStack
 from ecs_composex.common.troposphere_tools import build_template
 from ecs_composex.compose.x_resources.api_x_resources import ApiXResource
 from ecs_composex.compose.x_resources.helpers import (
+    lookup_resources_concurrently,
     set_lookup_resources,
     set_new_resources,
     set_resources,
@@ -82,13 +83,15 @@ def resolve_lookup(lookup_resources, settings, module: XResourceModule):
     """
     if not keyisset(module.mapping_key, settings.mappings):
         settings.mappings[module.mapping_key] = {}
+    lookup_resources_concurrently(
+        settings,
+        lookup_resources,
+        SSM_PARAMETER_ARN_RE,
+        get_parameter_config,
+        CfnSsmParameter.resource_type,
+        "ssm:parameter",
+    )
     for resource in lookup_resources:
-        resource.lookup_resource(
-            SSM_PARAMETER_ARN_RE,
-            get_parameter_config,
-            CfnSsmParameter.resource_type,
-            "ssm:parameter",
-        )
         LOG.info(f"{module.res_key}.{resource.name} - Matched to {resource.arn}")
         settings.mappings[module.mapping_key].update(
             {resource.logical_name: resource.mappings}
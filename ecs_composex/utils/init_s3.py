@@ -1,9 +1,9 @@
 # SPDX-License-Identifier: MPL-2.0
 # Copyright 2020-2025 John Mille <john@compose-x.io>
 
-from boto3.session import Session
 from botocore.exceptions import ClientError
 
+from ecs_composex.common.aws import ThreadSafeSession
 from ecs_composex.common.logging import LOG
 
 
@@ -19,7 +19,7 @@ def create_bucket(bucket_name, session, no_location=False):
     :returns: True/False, Returns whether the bucket exists or not for upload
     :rtype: bool
     """
-    s3_session = Session()
+    s3_session = ThreadSafeSession()
     client = s3_session.resource("s3")
     bucket = client.Bucket(bucket_name)
     params = {
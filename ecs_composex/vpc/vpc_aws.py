@@ -5,7 +5,11 @@ from boto3.session import Session
 from compose_x_common.aws.arns import ARNS_PER_CFN_TYPE, ARNS_PER_TAGGINGAPI_TYPE
 from compose_x_common.compose_x_common import keyisset, set_else_none
 
-from ecs_composex.common.aws import find_aws_resource_arn_from_tags_api
+from ecs_composex.common.aws import (
+    ThreadSafeSession,
+    find_aws_resource_arn_from_tags_api,
+    get_account_id,
+)
 from ecs_composex.common.logging import LOG
 from ecs_composex.vpc.vpc_params import (
     APP_SUBNETS,
@@ -50,7 +54,7 @@ def validate_subnets_belong_with_vpc(
 
     """
     if session is None:
-        session = Session()
+        session = ThreadSafeSession()
     client = session.client("ec2")
     filters = [
         {
@@ -111,8 +115,7 @@ def lookup_vpc_id(vpc_id_details: dict, lookup_session: Session) -> str:
             return vpc_arn
         else:
             ec2_client = lookup_session.client("ec2")
-            sts_client = lookup_session.client("sts")
-            account_id = sts_client.get_caller_identity()["Account"]
+            account_id = get_account_id(lookup_session)
             return (
                 f"arn:aws:ec2:{ec2_client.meta.region_name}:{account_id}:vpc/{vpc_id}"
             )
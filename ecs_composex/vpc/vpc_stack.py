@@ -57,6 +57,7 @@ from ecs_composex.vpc.vpc_template import add_vpc_core, add_vpc_flow
 
 from ..common.troposphere_tools import add_outputs, build_template
 from ..compose.x_resources.environment_x_resources import AwsEnvironmentResource
+from ..compose.x_resources.lookup_cache import lookup_with_cache
 from .vpc_cloudmap import x_vpc_to_x_cloudmap
 
 AZ_INDEX_PATTERN = r"(([a-z0-9-]+)([a-z]{1}$))"
@@ -114,13 +115,8 @@ class Vpc(AwsEnvironmentResource):
             VPC_CIDR.title, self.properties, self.default_ipv4_cidr
         )
         self.dhcp_options = set_else_none("DHCPOptions", self.properties, {})
-        region_account_zones = settings.session.client(
-            "ec2"
-        ).describe_availability_zones()
         curated_azs = []
-        current_region_azs = [
-            zone["ZoneName"] for zone in region_account_zones["AvailabilityZones"][:2]
-        ]
+        current_region_azs = settings.zones if settings.zones else settings.aws_azs[:2]
         for az in current_region_azs:
             if isinstance(az, dict):
                 curated_azs.append(az["ZoneName"])
@@ -169,19 +165,37 @@ class Vpc(AwsEnvironmentResource):
         self.subnets_parameters.append(PUBLIC_SUBNETS)
         self.subnets_parameters.append(STORAGE_SUBNETS)
 
-    def lookup_vpc(self) -> None:
-        """Method to set VPC settings from x-vpc"""
-        vpc_settings = lookup_x_vpc_settings(self)
-        self.create_vpc_mappings(vpc_settings)
+    def lookup_vpc(self, settings: ComposeXSettings) -> None:
+        """Method to set VPC settings from x-vpc, from the lookup cache if enabled"""
+        vpc_lookup = lookup_with_cache(
+            settings,
+            f"{self.module.res_key}.{self.name}",
+            self.module.res_key,
+            self.lookup,
+            self.lookup_region,
+            lambda: self.lookup_account_id,
+            self.get_vpc_lookup,
+        )
+        self.create_vpc_mappings(vpc_lookup["VpcSettings"], vpc_lookup["SubnetsAzs"])
         LOG.info(f"{RES_KEY} - Found VPC - {self.mappings[VPC_ID.title][VPC_ID.title]}")
 
-    def create_vpc_mappings(self, vpc_settings):
+    def get_vpc_lookup(self) -> dict:
+        """
+        Looks up the VPC and subnets IDs from x-vpc, and the AZs of the subnets.
+        """
+        vpc_settings = lookup_x_vpc_settings(self)
+        session = vpc_settings.pop("session")
+        return {
+            "VpcSettings": vpc_settings,
+            "SubnetsAzs": self.get_subnets_azs(vpc_settings, session),
+        }
+
+    def create_vpc_mappings(self, vpc_settings: dict, subnets_azs: dict) -> None:
         """
         Generates the VPC CFN Mappings
 
-        :param vpc_settings:
-        :param ecs_composex.common.settings.ComposeXSettings settings:
-        :return:
+        :param dict vpc_settings: the VPC and subnets IDs
+        :param dict subnets_azs: the AZs and zone IDs of the subnets, as per get_subnets_azs
         """
         self.mappings = {
             VPC_ID.title: {VPC_ID.title: vpc_settings[VPC_ID.title]},
@@ -202,12 +216,7 @@ class Vpc(AwsEnvironmentResource):
                 param = Parameter(setting_name, Type=SUBNETS_TYPE)
                 self.subnets_parameters.append(param)
 
-        self.set_azs_from_vpc_import(
-            vpc_settings,
-            session=(
-                vpc_settings["session"] if keyisset("session", vpc_settings) else None
-            ),
-        )
+        self.set_azs_from_vpc_import(subnets_azs)
 
     def set_azs_from_api(self) -> None:
         """Method to set the AWS Azs based on DescribeAvailabilityZones"""
@@ -223,15 +232,35 @@ class Vpc(AwsEnvironmentResource):
             else:
                 LOG.error(error)
 
-    def set_azs_from_vpc_import(self, subnets: dict, session: Session = None) -> None:
-        """Function to get the list of AZs for a given set of subnets"""
+    def get_subnets_azs(self, subnets: dict, session: Session = None) -> dict:
+        """
+        Function to get the list of AZs and zone IDs for a given set of subnets
+
+        :return: the AZs and zone IDs, per subnets name
+        """
         if session is None:
             client = self.lookup_session.client("ec2")
         else:
             client = session.client("ec2")
+        subnets_azs: dict = {}
         for subnet_name, subnet_definition in subnets.items():
             if not isinstance(subnet_definition, list):
                 continue
+            try:
+                subnets_r = client.describe_subnets(SubnetIds=subnet_definition)[
+                    "Subnets"
+                ]
+                subnets_azs[subnet_name] = {
+                    "Azs": [subnet["AvailabilityZone"] for subnet in subnets_r],
+                    "ZoneIds": [subnet["AvailabilityZoneId"] for subnet in subnets_r],
+                }
+            except ClientError:
+                LOG.warning("Could not define the AZs based on the imported subnets")
+        return subnets_azs
+
+    def set_azs_from_vpc_import(self, subnets_azs: dict) -> None:
+        """Function to set the AZs of the subnets, as per get_subnets_azs"""
+        for subnet_name, subnet_azs in subnets_azs.items():
             for subnet_param in self.subnets_parameters:
                 if subnet_param.title == subnet_name:
                     subnets_param = subnet_param
@@ -240,18 +269,10 @@ class Vpc(AwsEnvironmentResource):
                 raise KeyError(
                     f"x-vpc.set_azs_from_vpc_import - No parameter defined for {subnet_name}"
                 )
-            try:
-                subnets_r = client.describe_subnets(SubnetIds=subnet_definition)[
-                    "Subnets"
-                ]
-                azs = [subnet["AvailabilityZone"] for subnet in subnets_r]
-                zone_ids = [subnet["AvailabilityZoneId"] for subnet in subnets_r]
-                self.mappings[subnet_name]["Azs"] = azs
-                self.mappings[subnet_name]["ZoneIds"] = zone_ids
-                self.azs[subnets_param] = azs
-                self.zone_ids[subnets_param] = zone_ids
-            except ClientError:
-                LOG.warning("Could not define the AZs based on the imported subnets")
+            self.mappings[subnet_name]["Azs"] = subnet_azs["Azs"]
+            self.mappings[subnet_name]["ZoneIds"] = subnet_azs["ZoneIds"]
+            self.azs[subnets_param] = subnet_azs["Azs"]
+            self.zone_ids[subnets_param] = subnet_azs["ZoneIds"]
 
     def init_outputs(self) -> None:
         """
@@ -369,7 +390,7 @@ class XStack(ComposeXStack):
                 "vpc", settings.compose_content[module.res_key], module, settings
             )
             if self.vpc_resource.lookup:
-                self.vpc_resource.lookup_vpc()
+                self.vpc_resource.lookup_vpc(settings)
             elif self.vpc_resource.properties:
                 template = init_vpc_template()
                 self.vpc_resource.create_vpc(template, settings)
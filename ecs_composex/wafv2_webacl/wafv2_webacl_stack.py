@@ -13,11 +13,11 @@ if TYPE_CHECKING:
     from ecs_composex.common.settings import ComposeXSettings
     from ecs_composex.mods_manager import XResourceModule
 
-from compose_x_common.aws import get_account_id
 from compose_x_common.aws.wafv2 import WAF_V2_WEB_ACL_ARN_RE, WAF_V2_WEB_ACL_REF_RE
 from compose_x_common.compose_x_common import keyisset, set_else_none
 from troposphere import GetAtt, Ref
 
+from ecs_composex.common.aws import get_account_id
 from ecs_composex.common.logging import LOG
 from ecs_composex.common.stacks import ComposeXStack
 from ecs_composex.common.troposphere_tools import (
@@ -28,6 +28,7 @@ from ecs_composex.common.troposphere_tools import (
 from ecs_composex.compose.x_resources.environment_x_resources import (
     AwsEnvironmentResource,
 )
+from ecs_composex.compose.x_resources.helpers import lookup_resources_concurrently
 from ecs_composex.wafv2_webacl.wafv2_webacl_params import (
     CONTROL_CLOUD_ATTR_MAPPING,
     WEB_ACL_ARN,
@@ -228,12 +229,14 @@ def resolve_lookup(lookup_resources, settings, module: XResourceModule):
 
     if not keyisset(module.mapping_key, settings.mappings):
         settings.mappings[module.mapping_key] = {}
+    lookup_resources_concurrently(
+        settings,
+        lookup_resources,
+        WAF_V2_WEB_ACL_ARN_RE,
+        None,
+        CfnWebACL.resource_type,
+    )
     for resource in lookup_resources:
-        resource.lookup_resource(
-            WAF_V2_WEB_ACL_ARN_RE,
-            None,
-            CfnWebACL.resource_type,
-        )
         LOG.info(f"{module.res_key}.{resource.name} - Matched to {resource.arn}")
         settings.mappings[module.mapping_key].update(
             {resource.logical_name: resource.mappings}
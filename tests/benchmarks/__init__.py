@@ -0,0 +1,8 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2025 John Mille <john@compose-x.io>
+
+"""
+Render benchmarks of ECS Compose-X, run against synthetic compose projects and recorded AWS responses.
+
+Run with ``python tests/benchmarks --help``
+"""
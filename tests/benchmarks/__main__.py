@@ -0,0 +1,18 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2025 John Mille <john@compose-x.io>
+
+"""
+Entrypoint of the benchmarks. The repository root comes first in the path, so that the benchmarks measure the
+working tree rather than an installed version of ecs_composex.
+"""
+
+import sys
+from os import path
+
+TESTS_DIR = path.abspath(path.join(path.dirname(__file__), ".."))
+sys.path[0:1] = [path.dirname(TESTS_DIR), TESTS_DIR]
+
+from benchmarks.runner import main  # noqa: E402
+
+if __name__ == "__main__":
+    sys.exit(main())
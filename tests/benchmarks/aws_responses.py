@@ -0,0 +1,150 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2025 John Mille <john@compose-x.io>
+
+"""
+Writes the AWS API responses, in placebo format, that the render of a synthetic compose project needs, so that the
+benchmarks run without network nor AWS account. The tagging API responses list all the resources to lookup, with
+the tags the generator set on them; the other operations return the same response for every resource.
+"""
+
+from __future__ import annotations
+
+import json
+from os import makedirs, path
+
+from benchmarks.compose_generator import LOOKUP_TAG, get_lookup_names
+
+ACCOUNT_ID = "000000000000"
+REGION = "eu-west-1"
+ZONES = [f"{REGION}a", f"{REGION}b", f"{REGION}c"]
+
+
+def get_resource_arns(module_key: str, name: str) -> dict[str, str]:
+    """
+    :return: the ARN of the resource(s) to lookup, per value of the lookup tag
+    """
+    if module_key == "x-sqs":
+        return {name: f"arn:aws:sqs:{REGION}:{ACCOUNT_ID}:{name}"}
+    elif module_key == "x-sns":
+        return {name: f"arn:aws:sns:{REGION}:{ACCOUNT_ID}:{name}"}
+    elif module_key == "x-s3":
+        return {name: f"arn:aws:s3:::{name}"}
+    return {
+        name: f"arn:aws:rds:{REGION}:{ACCOUNT_ID}:cluster:{name}",
+        f"{name}-secret": f"arn:aws:secretsmanager:{REGION}:{ACCOUNT_ID}:secret:{name}-AbCdEf",
+    }
+
+
+def get_tagged_resources(compose: dict) -> list[dict]:
+    return [
+        {
+            "ResourceARN": arn,
+            "Tags": [
+                {"Key": LOOKUP_TAG, "Value": tag_value},
+                {"Key": "CreatedByComposeX", "Value": "true"},
+            ],
+        }
+        for module_key, names in get_lookup_names(compose).items()
+        for name in names
+        for tag_value, arn in get_resource_arns(module_key, name).items()
+    ]
+
+
+def get_responses(compose: dict) -> dict[str, dict]:
+    """
+    :return: the response data, per service.Operation
+    """
+    responses = {
+        "cloudformation.ValidateTemplate": {
+            "Parameters": [],
+            "Description": "Benchmark template",
+        },
+        "sts.GetCallerIdentity": {
+            "UserId": "AIDAEXAMPLEBENCHMARK",
+            "Account": ACCOUNT_ID,
+            "Arn": f"arn:aws:iam::{ACCOUNT_ID}:user/benchmark",
+        },
+        "tagging.GetResources": {
+            "PaginationToken": "",
+            "ResourceTagMappingList": get_tagged_resources(compose),
+        },
+        "sqs.GetQueueUrl": {
+            "QueueUrl": f"https://sqs.{REGION}.amazonaws.com/{ACCOUNT_ID}/queue"
+        },
+        "sqs.GetQueueAttributes": {
+            "Attributes": {"QueueArn": f"arn:aws:sqs:{REGION}:{ACCOUNT_ID}:queue"}
+        },
+        "sns.GetTopicAttributes": {
+            "Attributes": {"TopicArn": f"arn:aws:sns:{REGION}:{ACCOUNT_ID}:topic"}
+        },
+        "s3.ListBuckets": {"Buckets": []},
+        "s3.GetBucketEncryption": {
+            "ServerSideEncryptionConfiguration": {
+                "Rules": [
+                    {"ApplyServerSideEncryptionByDefault": {"SSEAlgorithm": "AES256"}}
+                ]
+            }
+        },
+        "rds.DescribeDBEngineVersions": {
+            "DBEngineVersions": [
+                {
+                    "Engine": "aurora-postgresql",
+                    "EngineVersion": "14.6",
+                    "DBParameterGroupFamily": "aurora-postgresql14",
+                }
+            ]
+        },
+        "rds.DescribeEngineDefaultClusterParameters": {
+            "EngineDefaults": {
+                "DBParameterGroupFamily": "aurora-postgresql14",
+                "Parameters": [
+                    {
+                        "ParameterName": name,
+                        "ParameterValue": value,
+                        "IsModifiable": True,
+                    }
+                    for name, value in (
+                        ("log_min_duration_statement", "-1"),
+                        ("log_rotation_age", "60"),
+                        ("max_connections", "500"),
+                        ("ssl", "1"),
+                        ("timezone", "UTC"),
+                    )
+                ],
+            }
+        },
+        "rds.DescribeDBClusters": {
+            "DBClusters": [
+                {
+                    "DBClusterIdentifier": "db",
+                    "DBClusterArn": f"arn:aws:rds:{REGION}:{ACCOUNT_ID}:cluster:db",
+                    "DatabaseName": "db",
+                    "Port": 5432,
+                    "Endpoint": f"db.cluster-abcdef.{REGION}.rds.amazonaws.com",
+                    "ReaderEndpoint": f"db.cluster-ro-abcdef.{REGION}.rds.amazonaws.com",
+                    "VpcSecurityGroups": [
+                        {
+                            "VpcSecurityGroupId": "sg-0123456789abcdef0",
+                            "Status": "active",
+                        }
+                    ],
+                }
+            ]
+        },
+    }
+    for response in responses.values():
+        response["ResponseMetadata"] = {"HTTPStatusCode": 200, "RetryAttempts": 0}
+    return responses
+
+
+def write_responses(compose: dict, data_path: str) -> str:
+    """
+    Writes the responses as placebo files, which placebo plays back in a loop for each operation.
+
+    :return: the placebo data path
+    """
+    makedirs(data_path, exist_ok=True)
+    for operation, data in get_responses(compose).items():
+        with open(path.join(data_path, f"{operation}_1.json"), "w") as response_fd:
+            json.dump({"status_code": 200, "data": data}, response_fd, indent=2)
+    return data_path
@@ -0,0 +1,208 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2025 John Mille <john@compose-x.io>
+
+"""
+Generates synthetic compose projects, of N services in M families, with K x-sqs, x-sns, x-s3 and x-rds resources
+each. With lookups, every other resource of each module is looked up by tags instead of being created.
+"""
+
+from __future__ import annotations
+
+import re
+from os import makedirs, path
+
+import yaml
+
+SCENARIO_RE = re.compile(r"^(?P<services>\d+)x(?P<families>\d+)x(?P<resources>\d+)$")
+LOOKUP_TAG = "ComposeXName"
+RESOURCES_PREFIXES = {
+    "x-sqs": "queue",
+    "x-sns": "topic",
+    "x-s3": "bucket",
+    "x-rds": "db",
+}
+
+
+class Scenario:
+    """
+    Size of a synthetic compose project
+
+    :ivar int services: number of services
+    :ivar int families: number of families the services are spread over
+    :ivar int resources: number of resources of each x-resource module
+    :ivar bool lookups: whether every other resource is looked up
+    """
+
+    def __init__(
+        self, services: int, families: int, resources: int, lookups: bool = False
+    ):
+        if not 1 <= families <= services:
+            raise ValueError(
+                f"The number of families ({families}) must be between 1 and the number of services ({services})"
+            )
+        self.services = services
+        self.families = families
+        self.resources = resources
+        self.lookups = lookups
+
+    @classmethod
+    def from_string(cls, size: str, lookups: bool = False) -> Scenario:
+        """
+        :param str size: SERVICESxFAMILIESxRESOURCES, i.e. 40x10x8
+        """
+        parts = SCENARIO_RE.match(size)
+        if not parts:
+            raise ValueError(
+                f"Scenario size {size} is not valid. Expected SERVICESxFAMILIESxRESOURCES, i.e. 40x10x8"
+            )
+        return cls(
+            int(parts.group("services")),
+            int(parts.group("families")),
+            int(parts.group("resources")),
+            lookups,
+        )
+
+    @property
+    def size(self) -> str:
+        return f"{self.services}x{self.families}x{self.resources}"
+
+    @property
+    def name(self) -> str:
+        return f"{self.size}-lookups" if self.lookups else self.size
+
+    @property
+    def units(self) -> int:
+        """
+        Number of services and x-resources, used as the scale of the scenario
+        """
+        return self.services + self.resources * len(RESOURCES_PREFIXES)
+
+    def __repr__(self):
+        return self.name
+
+
+def get_family_name(index: int) -> str:
+    return f"family{index:03d}"
+
+
+def get_service_name(index: int) -> str:
+    return f"svc{index:04d}"
+
+
+def is_lookup(scenario: Scenario, index: int) -> bool:
+    return scenario.lookups and index % 2 == 1
+
+
+def generate_services(scenario: Scenario) -> dict:
+    """
+    Services, spread over the families in turns.
+    """
+    services: dict = {}
+    for index in range(scenario.services):
+        family_index = index % scenario.families
+        service = {
+            "image": "nginx:latest",
+            "ports": [8000 + index],
+            "deploy": {
+                "labels": {"ecs.task.family": get_family_name(family_index)},
+                "resources": {
+                    "reservations": {"cpus": "0.25", "memory": "128M"},
+                    "limits": {"cpus": "0.5", "memory": "256M"},
+                },
+            },
+            "environment": {
+                "SERVICE_NAME": get_service_name(index),
+                "LOGLEVEL": "INFO",
+            },
+        }
+        if index >= scenario.families:
+            service["depends_on"] = [get_service_name(family_index)]
+        services[get_service_name(index)] = service
+    return services
+
+
+def get_lookup(name: str, module_key: str) -> dict:
+    if module_key == "x-rds":
+        return {
+            "cluster": {"Tags": [{LOOKUP_TAG: name}]},
+            "secret": {"Tags": [{LOOKUP_TAG: f"{name}-secret"}]},
+        }
+    return {"Tags": [{LOOKUP_TAG: name}]}
+
+
+def get_new_resource(module_key: str) -> dict:
+    if module_key == "x-rds":
+        return {
+            "MacroParameters": {
+                "Engine": "aurora-postgresql",
+                "EngineVersion": "14.6",
+            }
+        }
+    return {"Properties": {}}
+
+
+def get_access(module_key: str):
+    if module_key == "x-sqs":
+        return "RWMessages"
+    elif module_key == "x-sns":
+        return "Publish"
+    elif module_key == "x-s3":
+        return {"bucket": "ListOnly", "objects": "RW"}
+    return {"DBCluster": "RO"}
+
+
+def generate_x_resources(scenario: Scenario) -> dict:
+    """
+    Resources of each module, each one used by one family, in turns.
+    """
+    x_resources: dict = {}
+    for module_key, prefix in RESOURCES_PREFIXES.items():
+        resources = x_resources.setdefault(module_key, {})
+        for index in range(scenario.resources):
+            name = f"{prefix}{index:03d}"
+            resource = (
+                {"Lookup": get_lookup(name, module_key)}
+                if is_lookup(scenario, index)
+                else get_new_resource(module_key)
+            )
+            resource["Services"] = {
+                get_family_name(index % scenario.families): {
+                    "Access": get_access(module_key)
+                }
+            }
+            resources[name] = resource
+    return x_resources
+
+
+def generate_compose(scenario: Scenario) -> dict:
+    compose = {"version": "3.8", "services": generate_services(scenario)}
+    if scenario.resources:
+        compose.update(generate_x_resources(scenario))
+    return compose
+
+
+def get_lookup_names(compose: dict) -> dict[str, list[str]]:
+    """
+    :return: the names of the resources to lookup, per x-resource module
+    """
+    return {
+        module_key: [
+            name
+            for name, definition in compose.get(module_key, {}).items()
+            if "Lookup" in definition
+        ]
+        for module_key in RESOURCES_PREFIXES
+    }
+
+
+def write_compose(scenario: Scenario, directory: str) -> str:
+    """
+    Writes the compose file of the scenario in the directory
+
+    :return: the path to the compose file
+    """
+    makedirs(directory, exist_ok=True)
+    compose_file = path.join(directory, f"docker-compose.{scenario.name}.yaml")
+    with open(compose_file, "w") as compose_fd:
+        yaml.dump(generate_compose(scenario), compose_fd, sort_keys=False)
+    return compose_file
@@ -0,0 +1,51 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+from typing import Callable
+
+import pytest
+
+from ecs_composex.common.settings_args import SettingsArgs
+
+
+class FakeSettings:
+    """
+    Stand-in for ComposeXSettings, with the defaults the tests share. The tests set the other attributes they need.
+    """
+
+    name = "test"
+    allowed_formats = SettingsArgs.allowed_formats
+    format = SettingsArgs.default_format
+    compact = False
+    no_upload = True
+    upload = False
+    offline = True
+    bucket_name = None
+    bucket_prefix_path = None
+    generated_on = "2025-01-01T00:00:00.000000"
+    file_prefix = "2025/01/01/0000/abcdef"
+    render_workers = 1
+    lookup_workers = 4
+    lookup_cache = None
+    ecr_scans_workers = 4
+    ecr_scans_timeout = 10
+    ignore_ecr_findings = False
+
+    def __init__(self, **attributes):
+        self.compose_content: dict = {}
+        for name, value in attributes.items():
+            setattr(self, name, value)
+
+
+@pytest.fixture
+def fake_settings(tmp_path) -> Callable[..., FakeSettings]:
+    """
+    :return: a function returning FakeSettings with the given attributes, writing the templates to tmp_path by default
+    """
+
+    def get_settings(**attributes) -> FakeSettings:
+        attributes.setdefault("output_dir", str(tmp_path))
+        return FakeSettings(**attributes)
+
+    return get_settings
@@ -0,0 +1,70 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+from boto3.session import Session
+from botocore.awsrequest import AWSResponse
+from botocore.exceptions import ClientError
+from pytest import raises
+
+from ecs_composex.common.aws_calls import ApiCallsRecorder, parse_budgets
+from ecs_composex.exceptions import ApiCallsBudgetExceeded
+
+
+def get_client(recorder: ApiCallsRecorder, status_code: int, parsed: dict):
+    session = Session(
+        region_name="eu-west-1", aws_access_key_id="AKIA", aws_secret_access_key="x"
+    )
+    recorder.attach(session)
+    client = session.client("sts")
+    client.meta.events.register(
+        "before-call.*.*",
+        lambda **kwargs: (AWSResponse("https://sts", status_code, {}, None), parsed),
+    )
+    return client
+
+
+def test_api_calls_recorder():
+    recorder = ApiCallsRecorder()
+    client = get_client(
+        recorder, 200, {"Account": "000", "ResponseMetadata": {"RetryAttempts": 2}}
+    )
+    with recorder.scoped("x-vpc::vpc"):
+        client.get_caller_identity()
+        client.get_caller_identity()
+    client.get_caller_identity()
+    throttled = get_client(
+        recorder, 400, {"Error": {"Code": "Throttling", "Message": "Rate exceeded"}}
+    )
+    with raises(ClientError):
+        throttled.get_caller_identity()
+    recorder.needs_retry(
+        response=(None, {"Error": {"Code": "Throttling"}}),
+        operation=client.meta.service_model.operation_model("GetCallerIdentity"),
+    )
+
+    calls = recorder.to_dict()["Operations"]["sts.GetCallerIdentity"]
+    assert calls["Calls"] == 4
+    assert calls["Retries"] == 6
+    assert calls["Errors"] == 1
+    assert calls["Throttles"] == 1
+    assert recorder.to_dict()["Scopes"] == {"-": 2, "x-vpc::vpc": 2}
+    assert recorder.get_calls("sts") == recorder.get_calls("sts.GetCallerIdentity")
+    assert recorder.get_calls("ec2") == 0
+
+    recorder.enforce_budgets(parse_budgets(["4", "ec2=0"]))
+    with raises(ApiCallsBudgetExceeded, match="sts.GetCallerIdentity: 4 calls"):
+        recorder.enforce_budgets(parse_budgets(["sts.GetCallerIdentity=3"]))
+    recorder.reset()
+    assert recorder.total_calls == 0
+
+
+def test_parse_budgets():
+    assert parse_budgets(None) == {}
+    assert parse_budgets(["10", "ec2=4", "ec2.DescribeVpcs=1"]) == {
+        None: 10,
+        "ec2": 4,
+        "ec2.DescribeVpcs": 1,
+    }
+    with raises(ValueError):
+        parse_budgets(["ec2:4"])
@@ -0,0 +1,87 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+import json
+from os import path
+
+import yaml
+from benchmarks.aws_responses import get_responses
+from benchmarks.compose_generator import Scenario, generate_compose
+from benchmarks.runner import (
+    compare_results,
+    get_scaling_exponent,
+    measure_scenario,
+    write_project,
+)
+from pytest import raises
+
+
+def test_scenario():
+    scenario = Scenario.from_string("40x10x8", lookups=True)
+    assert scenario.name == "40x10x8-lookups"
+    assert scenario.units == 72
+    with raises(ValueError):
+        Scenario.from_string("40x10")
+    with raises(ValueError):
+        Scenario(2, 3, 1)
+
+
+def test_generate_compose(tmp_path):
+    scenario = Scenario(6, 3, 4, lookups=True)
+    compose = generate_compose(scenario)
+    assert len(compose["services"]) == 6
+    assert {
+        service["deploy"]["labels"]["ecs.task.family"]
+        for service in compose["services"].values()
+    } == {"family000", "family001", "family002"}
+    for module_key in ("x-sqs", "x-sns", "x-s3", "x-rds"):
+        resources = compose[module_key]
+        assert len(resources) == 4
+        assert [
+            name for name, resource in resources.items() if "Lookup" in resource
+        ] == list(resources)[1::2]
+    assert not any(
+        "Lookup" in resource
+        for resource in generate_compose(Scenario(6, 3, 4))["x-sqs"].values()
+    )
+
+    tagged = get_responses(compose)["tagging.GetResources"]["ResourceTagMappingList"]
+    assert len(tagged) == 2 * 3 + 2 * 2
+    assert "arn:aws:sqs:eu-west-1:000000000000:queue001" in [
+        resource["ResourceARN"] for resource in tagged
+    ]
+
+    compose_file, data_path = write_project(scenario, str(tmp_path))
+    with open(compose_file) as compose_fd:
+        assert yaml.safe_load(compose_fd) == compose
+    with open(path.join(data_path, "tagging.GetResources_1.json")) as response_fd:
+        assert json.load(response_fd)["status_code"] == 200
+
+
+def test_compare_results():
+    base = {
+        "Id": "base",
+        "Scenarios": [{"Scenario": "10x5x2", "WallMs": 100.0, "ApiCalls": 10}],
+    }
+    head = {
+        "Id": "head",
+        "Scenarios": [{"Scenario": "10x5x2", "WallMs": 105.0, "ApiCalls": 12}],
+    }
+    table, regressions = compare_results(base, head, 0.1)
+    assert regressions == ["10x5x2 ApiCalls"]
+    assert "+5.0%" in table
+    assert (
+        get_scaling_exponent(
+            [{"Units": 10, "WallMs": 100}, {"Units": 100, "WallMs": 1000}], "WallMs"
+        )
+        == 1.0
+    )
+    assert get_scaling_exponent([{"Units": 10, "WallMs": 100}], "WallMs") is None
+
+
+def test_measure_scenario():
+    summary = measure_scenario(Scenario(2, 1, 2, lookups=True), repeat=1)
+    assert summary["WallMs"] > 0
+    assert summary["Templates"] > 1
+    assert summary["ApiCalls"] > 0
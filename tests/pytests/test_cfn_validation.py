@@ -0,0 +1,47 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+from pytest import raises
+from troposphere import FindInMap, GetAtt, If, Parameter, Ref, Sub, Template
+from troposphere.sqs import Queue
+
+from ecs_composex.common.cfn_validation import validate_template_references
+from ecs_composex.exceptions import TemplateValidationError
+
+
+def test_valid_template_references():
+    template = Template()
+    param = template.add_parameter(Parameter("QueueName", Type="String"))
+    template.add_mapping("Settings", {"Queue": {"Delay": 10}})
+    template.add_condition("Always", {"Fn::Equals": ["a", "a"]})
+    queue = template.add_resource(
+        Queue(
+            "Queue",
+            QueueName=Sub("${QueueName}-${AWS::Region}-${!Literal}"),
+            DelaySeconds=If("Always", FindInMap("Settings", "Queue", "Delay"), 0),
+        )
+    )
+    template.add_resource(
+        Queue("Dlq", QueueName=GetAtt(queue, "QueueName"), DependsOn=[queue])
+    )
+    validate_template_references(template.to_dict(), "valid")
+
+
+def test_dangling_template_references():
+    template = Template()
+    template.add_mapping("Settings", {"Queue": {"Delay": 10}})
+    template.add_resource(
+        Queue(
+            "Queue",
+            QueueName=Sub("${Undeclared}"),
+            DelaySeconds=If(
+                "NoCondition", FindInMap("Settings", "Topic", "Delay"), Ref("Nope")
+            ),
+            KmsMasterKeyId=GetAtt("Dlq", "Arn"),
+            DependsOn=["Dlq"],
+        )
+    )
+    with raises(TemplateValidationError) as error:
+        validate_template_references(template.to_dict(), "invalid")
+    assert len(error.value.args[1]) == 6
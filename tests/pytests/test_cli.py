@@ -0,0 +1,39 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+import pytest
+
+from ecs_composex.cli import main_parser
+from ecs_composex.common.settings_args import SettingsArgs
+
+
+@pytest.mark.parametrize(
+    "argument, dest",
+    [
+        ("--render-workers", SettingsArgs.render_workers_arg),
+        ("--lookup-workers", SettingsArgs.lookup_workers_arg),
+        ("--ecr-scans-workers", SettingsArgs.ecr_scans_workers_arg),
+    ],
+)
+def test_workers_arguments(argument, dest, capsys):
+    parser = main_parser()
+    base = ["render", "-n", "test", "-f", "docker-compose.yml"]
+    args = parser.parse_args(base + [argument, "2"])
+    assert getattr(args, dest) == 2
+    for value in ["0", "-1", "two"]:
+        with pytest.raises(SystemExit):
+            parser.parse_args(base + [argument, value])
+        assert argument in capsys.readouterr().err
+
+
+def test_api_calls_budget_argument(capsys):
+    parser = main_parser()
+    base = ["render", "-n", "test", "-f", "docker-compose.yml"]
+    args = parser.parse_args(
+        base + ["--api-calls-budget", "10", "--api-calls-budget", "ec2=4"]
+    )
+    assert getattr(args, SettingsArgs.api_calls_budget_arg) == ["10", "ec2=4"]
+    with pytest.raises(SystemExit):
+        parser.parse_args(base + ["--api-calls-budget", "ec2:4"])
+    assert "ec2:4 is not valid" in capsys.readouterr().err
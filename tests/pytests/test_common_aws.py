@@ -2,11 +2,22 @@
 # SPDX-License-Identifier: MPL-2.0
 # Copyright 2020-2025 John Mille<john@compose-x.io>
 
+from datetime import datetime, timedelta, timezone
+
+from boto3.session import Session
+from botocore.stub import Stubber
 from pytest import fixture, raises
 
 from ecs_composex.common.aws import (
+    SessionPool,
+    TaggedResourcesIndex,
+    ThreadSafeSession,
+    clear_tagged_resources_indexes,
+    define_tagsgroups_filter_tags,
+    get_resources_from_tags,
     handle_multi_results,
     handle_search_results,
+    lookup_retries,
     validate_search_input,
 )
 
@@ -61,3 +72,147 @@ def test_validate_search_input_exceptions(res_types):
         validate_search_input(res_types, "abcd")
     with raises(KeyError):
         validate_search_input(res_types, 1)
+
+
+@fixture()
+def tagged_resources():
+    return [
+        {
+            "ResourceARN": "arn:aws:sqs:eu-west-1:123456789012:queue-a",
+            "Tags": [
+                {"Key": "Name", "Value": "queue-a"},
+                {"Key": "env", "Value": "dev"},
+            ],
+        },
+        {
+            "ResourceARN": "arn:aws:sqs:eu-west-1:123456789012:queue-b",
+            "Tags": [
+                {"Key": "Name", "Value": "queue-b"},
+                {"Key": "env", "Value": "prod"},
+            ],
+        },
+        {
+            "ResourceARN": "arn:aws:sqs:eu-west-1:123456789012:queue-c",
+            "Tags": [{"Key": "env", "Value": "1"}],
+        },
+    ]
+
+
+def test_tagged_resources_index_search(tagged_resources):
+    index = TaggedResourcesIndex(tagged_resources)
+    assert len(index.search([])) == 3
+    assert len(index.search([{"Key": "env", "Values": ()}])) == 3
+    assert len(index.search([{"Key": "env", "Values": ("dev", "prod")}])) == 2
+    assert len(index.search(define_tagsgroups_filter_tags({"env": 1}))) == 1
+    found = index.search(
+        define_tagsgroups_filter_tags([{"env": "prod"}, {"Name": "queue-b"}])
+    )
+    assert [i["ResourceARN"] for i in found] == [tagged_resources[1]["ResourceARN"]]
+    assert not index.search(
+        [{"Key": "env", "Values": ("dev",)}, {"Key": "Name", "Values": ("queue-b",)}]
+    )
+
+
+def test_get_resources_from_tags_paginates_once(tagged_resources):
+    session = Session(region_name="eu-west-1")
+    client = session.client(
+        "resourcegroupstaggingapi",
+        aws_access_key_id="AKIDEXAMPLE",
+        aws_secret_access_key="SECRET",
+    )
+    session.client = lambda *args, **kwargs: client
+    with Stubber(client) as stubber:
+        stubber.add_response(
+            "get_resources",
+            {
+                "ResourceTagMappingList": tagged_resources[:2],
+                "PaginationToken": "next",
+            },
+            {"ResourceTypeFilters": ["sqs"]},
+        )
+        stubber.add_response(
+            "get_resources",
+            {"ResourceTagMappingList": tagged_resources[2:]},
+            {"ResourceTypeFilters": ["sqs"], "PaginationToken": "next"},
+        )
+        first = get_resources_from_tags(
+            session, "sqs", [{"Key": "Name", "Values": ("queue-a",)}]
+        )
+        second = get_resources_from_tags(
+            session, "sqs", [{"Key": "env", "Values": ("1",)}]
+        )
+        stubber.assert_no_pending_responses()
+
+        clear_tagged_resources_indexes()
+        stubber.add_response(
+            "get_resources",
+            {"ResourceTagMappingList": tagged_resources},
+            {"ResourceTypeFilters": ["sqs"]},
+        )
+        third = get_resources_from_tags(
+            session, "sqs", [{"Key": "Name", "Values": ("queue-a",)}]
+        )
+        stubber.assert_no_pending_responses()
+    assert first["ResourceTagMappingList"] == tagged_resources[:1]
+    assert second["ResourceTagMappingList"] == tagged_resources[2:]
+    assert third == first
+
+
+def test_thread_safe_session_retries(monkeypatch):
+    monkeypatch.delenv("AWS_RETRY_MODE", raising=False)
+    session = ThreadSafeSession(region_name="eu-west-1")
+    client = session.client("sqs")
+    assert client.meta.config.retries["mode"] != "adaptive"
+    with lookup_retries():
+        lookup_client = session.client("sqs")
+        assert session.client("sqs") is lookup_client
+    assert lookup_client is not client
+    assert lookup_client.meta.config.retries["mode"] == "adaptive"
+    assert lookup_client.meta.config.retries["total_max_attempts"] == 10
+    assert session.client("sqs") is client
+
+    monkeypatch.setenv("AWS_RETRY_MODE", "standard")
+    with lookup_retries():
+        client = ThreadSafeSession(region_name="eu-west-1").client("sqs")
+    assert client.meta.config.retries["mode"] == "standard"
+
+
+def test_session_pool_roles_and_identity():
+    session = Session(region_name="eu-west-1")
+    client = session.client(
+        "sts", aws_access_key_id="AKIDEXAMPLE", aws_secret_access_key="SECRET"
+    )
+    session.client = lambda *args, **kwargs: client
+    role_arn = "arn:aws:iam::123456789012:role/lookup"
+    pool = SessionPool()
+
+    def role_response(expiration):
+        return {
+            "Credentials": {
+                "AccessKeyId": "ASIAROLEEXAMPLE01",
+                "SecretAccessKey": "SECRET",
+                "SessionToken": "TOKEN",
+                "Expiration": expiration,
+            }
+        }
+
+    with Stubber(client) as stubber:
+        stubber.add_response(
+            "assume_role",
+            role_response(datetime.now(timezone.utc) + timedelta(minutes=2)),
+        )
+        stubber.add_response(
+            "assume_role",
+            role_response(datetime.now(timezone.utc) + timedelta(hours=1)),
+        )
+        stubber.add_response(
+            "get_caller_identity",
+            {"Account": "123456789012", "Arn": role_arn, "UserId": "AROAEXAMPLE"},
+        )
+        expiring = pool.get_role_session(session, role_arn)
+        renewed = pool.get_role_session(session, role_arn)
+        assert renewed is not expiring
+        assert pool.get_role_session(session, role_arn) is renewed
+        assert pool.get_caller_identity(session)["Account"] == "123456789012"
+        assert pool.get_caller_identity(session)["Account"] == "123456789012"
+        stubber.assert_no_pending_responses()
@@ -0,0 +1,89 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+import json
+from copy import deepcopy
+
+import pytest
+import yaml
+from cfn_flip.yaml_dumper import LongCleanDumper
+
+from ecs_composex.compose.compose_document import (
+    CopyOnWriteDict,
+    CopyOnWriteList,
+    copy_on_write,
+)
+
+
+def get_source() -> dict:
+    return {
+        "services": {
+            "app": {
+                "image": "nginx",
+                "ports": [{"target": 80}],
+                "deploy": {"labels": {"ecs.task.family": "app"}},
+            }
+        },
+        "x-s3": {"bucket": {"Properties": {"Tags": [{"Key": "a", "Value": "b"}]}}},
+    }
+
+
+def test_source_unchanged():
+    source = get_source()
+    original = deepcopy(source)
+    view = CopyOnWriteDict(source)
+    view["services"]["app"]["ports"][0]["target"] = 8080
+    view["services"]["app"]["ports"].append({"target": 443})
+    view["services"]["app"]["deploy"]["labels"].pop("ecs.task.family")
+    view["x-s3"]["bucket"].setdefault("Settings", {})["Subnets"] = "x"
+    del view["services"]["app"]["image"]
+    assert source == original
+    assert view["services"]["app"]["ports"] == [{"target": 8080}, {"target": 443}]
+    assert "image" not in view["services"]["app"]
+
+
+def test_views_isolation():
+    source = get_source()
+    first = CopyOnWriteDict(source)
+    first["services"]["app"]["deploy"]["labels"]["ecs.task.family"] = "first"
+    second = first.copy()
+    deep = deepcopy(first)
+    second["services"]["app"]["deploy"]["labels"]["ecs.task.family"] = "second"
+    deep["services"]["app"]["deploy"]["labels"]["ecs.task.family"] = "deep"
+    assert first["services"]["app"]["deploy"]["labels"]["ecs.task.family"] == "first"
+    assert source["services"]["app"]["deploy"]["labels"]["ecs.task.family"] == "app"
+
+    props = {}
+    first["x-s3"]["bucket"]["Properties"] = props
+    props["BucketName"] = "set-after"
+    assert first["x-s3"]["bucket"]["Properties"]["BucketName"] == "set-after"
+
+    assert isinstance(copy_on_write([{"a": 1}]), CopyOnWriteList)
+    assert copy_on_write("value") == "value"
+
+
+def test_views_rendering():
+    view = CopyOnWriteDict(get_source())
+    view["services"]["app"]["image"] = "nginx:latest"
+    expected = deepcopy(get_source())
+    expected["services"]["app"]["image"] = "nginx:latest"
+    assert view == expected
+    assert dict(view) == expected
+    assert json.loads(json.dumps(view)) == expected
+    assert yaml.safe_load(yaml.dump(view)) == expected
+    assert yaml.safe_load(yaml.dump(view, Dumper=LongCleanDumper)) == expected
+    tags = view["x-s3"]["bucket"]["Properties"]["Tags"]
+    assert {tag["Key"]: tag["Value"] for tag in tags} == {"a": "b"}
+
+
+def test_popitem():
+    source = get_source()
+    view = CopyOnWriteDict(source)
+    key, value = view.popitem()
+    assert key == "x-s3"
+    value["bucket"]["Properties"]["Tags"].clear()
+    assert source["x-s3"]["bucket"]["Properties"]["Tags"]
+    view.popitem()
+    with pytest.raises(KeyError):
+        view.popitem()
@@ -0,0 +1,145 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+import json
+from copy import deepcopy
+
+import boto3
+from botocore.stub import Stubber
+from troposphere import Parameter, Template
+from troposphere.sqs import Queue
+
+from ecs_composex.common.stacks import ComposeXStack
+from ecs_composex.common.stacks.deployed_diff import get_dynamic_values, get_stacks_diff
+
+ROOT_ID = "arn:aws:cloudformation:eu-west-1:000000000000:stack/root/abcd"
+NESTED_ID = "arn:aws:cloudformation:eu-west-1:000000000000:stack/root-sqs/efgh"
+
+
+def get_session(client):
+    return type("FakeSession", (), {"client": lambda _self, *_: client})()
+
+
+def get_stacks(
+    tmp_path, visibility_timeout: int = 30, ssm_parameter: bool = False
+) -> ComposeXStack:
+    nested_template = Template()
+    if ssm_parameter:
+        nested_template.add_parameter(
+            Parameter(
+                "QueueName",
+                Type="AWS::SSM::Parameter::Value<String>",
+                Default="/app/queue/name",
+            )
+        )
+    nested_template.add_resource(Queue("queue", VisibilityTimeout=visibility_timeout))
+    nested = ComposeXStack("sqs", nested_template)
+    root_template = Template()
+    root_template.add_parameter(Parameter("Env", Type="String", Default="dev"))
+    root_template.add_resource(nested)
+    root = ComposeXStack("root", root_template)
+    for stack, template_url in ((nested, "https://nested"), (root, None)):
+        if template_url:
+            stack.TemplateURL = template_url
+        file_path = str(tmp_path / f"{stack.title}.json")
+        with open(file_path, "w") as template_fd:
+            json.dump(stack.stack_template.to_dict(), template_fd)
+        stack.template_file = type("FakeFile", (), {"file_path": file_path})()
+    return root
+
+
+def stub_deployed_stacks(stubber: Stubber, root: ComposeXStack, env: str = "dev"):
+    root_template = deepcopy(root.stack_template.to_dict())
+    root_template["Resources"]["sqs"]["Properties"]["TemplateURL"] = "https://old"
+    nested_template = root.stack_template.resources["sqs"].stack_template.to_dict()
+    stubber.add_response(
+        "describe_stacks",
+        {
+            "Stacks": [
+                {
+                    "StackId": ROOT_ID,
+                    "StackName": "root",
+                    "CreationTime": "2025-01-01T00:00:00Z",
+                    "StackStatus": "UPDATE_COMPLETE",
+                    "Parameters": [{"ParameterKey": "Env", "ParameterValue": env}],
+                }
+            ]
+        },
+    )
+    for stack_id, template, nested in (
+        (ROOT_ID, root_template, [("sqs", NESTED_ID)]),
+        (NESTED_ID, nested_template, []),
+    ):
+        stubber.add_response(
+            "get_template",
+            {"TemplateBody": json.dumps(template)},
+            {"StackName": stack_id, "TemplateStage": "Original"},
+        )
+        stubber.add_response(
+            "list_stack_resources",
+            {
+                "StackResourceSummaries": [
+                    {
+                        "LogicalResourceId": logical_id,
+                        "PhysicalResourceId": physical_id,
+                        "ResourceType": "AWS::CloudFormation::Stack",
+                        "LastUpdatedTimestamp": "2025-01-01T00:00:00Z",
+                        "ResourceStatus": "UPDATE_COMPLETE",
+                    }
+                    for logical_id, physical_id in nested
+                ]
+            },
+            {"StackName": stack_id},
+        )
+
+
+def test_no_changes(tmp_path, fake_settings):
+    client = boto3.client("cloudformation", region_name="eu-west-1")
+    root = get_stacks(tmp_path)
+    with Stubber(client) as stubber:
+        stub_deployed_stacks(stubber, root)
+        stacks_diff = get_stacks_diff(
+            fake_settings(name="root", session=get_session(client)), root
+        )
+        stubber.assert_no_pending_responses()
+    assert stacks_diff.stack_id == ROOT_ID
+    assert not stacks_diff.has_changes
+
+
+def test_changes(tmp_path, fake_settings):
+    client = boto3.client("cloudformation", region_name="eu-west-1")
+    deployed = get_stacks(tmp_path)
+    (tmp_path / "rendered").mkdir()
+    rendered = get_stacks(tmp_path / "rendered", visibility_timeout=60)
+    with Stubber(client) as stubber:
+        stub_deployed_stacks(stubber, deployed, env="prod")
+        stacks_diff = get_stacks_diff(
+            fake_settings(name="root", session=get_session(client)), rendered
+        )
+    assert [
+        (change.stack, change.logical_id, change.action, change.details)
+        for change in stacks_diff.changes
+    ] == [
+        ("root", "Env", "Modify", []),
+        ("root/sqs", "queue", "Modify", ["Properties.VisibilityTimeout"]),
+    ]
+    assert "Properties.VisibilityTimeout" in stacks_diff.format()
+
+
+def test_ssm_parameters(tmp_path, fake_settings):
+    client = boto3.client("cloudformation", region_name="eu-west-1")
+    root = get_stacks(tmp_path, ssm_parameter=True)
+    with Stubber(client) as stubber:
+        stub_deployed_stacks(stubber, root)
+        stacks_diff = get_stacks_diff(
+            fake_settings(name="root", session=get_session(client)), root
+        )
+    assert not stacks_diff.changes
+    assert stacks_diff.dynamic_values == ["root/sqs::QueueName"]
+    assert stacks_diff.has_changes
+    assert "root/sqs::QueueName" in stacks_diff.format()
+    secret = "{{resolve:secretsmanager:db:SecretString:password}}"
+    assert get_dynamic_values(
+        "root", {"Resources": {"db": {"Properties": {"MasterUserPassword": secret}}}}
+    ) == ["root::db"]
@@ -0,0 +1,219 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+from datetime import datetime as dt
+from datetime import timedelta, timezone
+
+import boto3
+from botocore.stub import ANY, Stubber
+
+from ecs_composex.common.stacks.deployment_monitor import (
+    AdaptivePolling,
+    DeploymentMonitor,
+)
+
+ROOT_ID = "arn:aws:cloudformation:eu-west-1:000000000000:stack/root/abcd"
+NESTED_ID = "arn:aws:cloudformation:eu-west-1:000000000000:stack/root-app-ABC/efgh"
+START = dt(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def get_event(
+    event_id: str,
+    seconds: int,
+    logical_id: str,
+    status: str,
+    stack_id: str = ROOT_ID,
+    physical_id: str = None,
+    resource_type: str = "AWS::CloudFormation::Stack",
+) -> dict:
+    return {
+        "EventId": event_id,
+        "StackId": stack_id,
+        "StackName": stack_id.split("/")[1],
+        "LogicalResourceId": logical_id,
+        "PhysicalResourceId": physical_id if physical_id else "",
+        "ResourceType": resource_type,
+        "Timestamp": START + timedelta(seconds=seconds),
+        "ResourceStatus": status,
+    }
+
+
+def add_poll(stubber: Stubber, status: str, events: dict[str, list[dict]]):
+    stubber.add_response(
+        "describe_stacks",
+        {
+            "Stacks": [
+                {
+                    "StackId": ROOT_ID,
+                    "StackName": "root",
+                    "CreationTime": START,
+                    "StackStatus": status,
+                }
+            ]
+        },
+    )
+    for stack_id, stack_events in events.items():
+        stubber.add_response(
+            "describe_stack_events",
+            {"StackEvents": list(reversed(stack_events))},
+            {"StackName": stack_id},
+        )
+
+
+def test_adaptive_polling():
+    waits = []
+    polling = AdaptivePolling(2, 10, 2, sleep_function=waits.append)
+    for _ in range(4):
+        polling.wait()
+        polling.idle()
+    polling.activity()
+    polling.wait()
+    assert waits == [2, 4, 8, 10, 2]
+
+
+def test_deployment_monitor():
+    client = boto3.client("cloudformation", region_name="eu-west-1")
+    waits = []
+    monitor = DeploymentMonitor(
+        client,
+        "root",
+        workers=1,
+        polling=AdaptivePolling(sleep_function=waits.append),
+    )
+    previous = get_event("e0", -600, "root", "UPDATE_COMPLETE", physical_id=ROOT_ID)
+    with Stubber(client) as stubber:
+        stubber.add_response(
+            "describe_stack_events", {"StackEvents": [previous]}, {"StackName": ANY}
+        )
+        add_poll(
+            stubber,
+            "UPDATE_IN_PROGRESS",
+            {
+                ROOT_ID: [
+                    previous,
+                    get_event(
+                        "e1", 0, "root", "UPDATE_IN_PROGRESS", physical_id=ROOT_ID
+                    ),
+                    get_event(
+                        "e2", 5, "app", "UPDATE_IN_PROGRESS", physical_id=NESTED_ID
+                    ),
+                ]
+            },
+        )
+        add_poll(
+            stubber,
+            "UPDATE_IN_PROGRESS",
+            {
+                ROOT_ID: [],
+                NESTED_ID: [
+                    get_event(
+                        "old", -300, "Service", "UPDATE_COMPLETE", stack_id=NESTED_ID
+                    ),
+                    get_event(
+                        "n1",
+                        6,
+                        "Service",
+                        "UPDATE_IN_PROGRESS",
+                        stack_id=NESTED_ID,
+                        resource_type="AWS::ECS::Service",
+                    ),
+                ],
+            },
+        )
+        add_poll(
+            stubber,
+            "UPDATE_COMPLETE",
+            {
+                ROOT_ID: [
+                    get_event(
+                        "e3", 130, "app", "UPDATE_COMPLETE", physical_id=NESTED_ID
+                    ),
+                    get_event(
+                        "e4", 135, "root", "UPDATE_COMPLETE", physical_id=ROOT_ID
+                    ),
+                ],
+                NESTED_ID: [
+                    get_event(
+                        "n2",
+                        126,
+                        "Service",
+                        "UPDATE_COMPLETE",
+                        stack_id=NESTED_ID,
+                        resource_type="AWS::ECS::Service",
+                    ),
+                ],
+            },
+        )
+        monitor.mark()
+        assert monitor.wait(ROOT_ID) == "UPDATE_COMPLETE"
+        stubber.assert_no_pending_responses()
+    assert waits == [2.0, 2.0]
+    durations = {key: resource.duration for key, resource in monitor.resources.items()}
+    assert durations == {
+        ("root", "root"): 135.0,
+        ("root", "app"): 125.0,
+        ("root-app-ABC", "Service"): 120.0,
+    }
+    report = monitor.format_report()
+    assert report.index("135") < report.index("125") < report.index("120")
+
+
+def test_deployment_monitor_final_nested_stacks():
+    """
+    The nested stacks found in the events read with the final status are read before returning
+    """
+    client = boto3.client("cloudformation", region_name="eu-west-1")
+    monitor = DeploymentMonitor(
+        client,
+        "root",
+        workers=1,
+        polling=AdaptivePolling(sleep_function=lambda _interval: None),
+    )
+    with Stubber(client) as stubber:
+        add_poll(
+            stubber,
+            "CREATE_COMPLETE",
+            {
+                ROOT_ID: [
+                    get_event(
+                        "e1", 0, "root", "CREATE_IN_PROGRESS", physical_id=ROOT_ID
+                    ),
+                    get_event(
+                        "e2", 5, "app", "CREATE_IN_PROGRESS", physical_id=NESTED_ID
+                    ),
+                    get_event(
+                        "e3", 70, "app", "CREATE_COMPLETE", physical_id=NESTED_ID
+                    ),
+                    get_event("e4", 75, "root", "CREATE_COMPLETE", physical_id=ROOT_ID),
+                ]
+            },
+        )
+        stubber.add_response(
+            "describe_stack_events",
+            {
+                "StackEvents": [
+                    get_event(
+                        "n1",
+                        60,
+                        "Service",
+                        "CREATE_COMPLETE",
+                        stack_id=NESTED_ID,
+                        resource_type="AWS::ECS::Service",
+                    ),
+                    get_event(
+                        "n0",
+                        6,
+                        "Service",
+                        "CREATE_IN_PROGRESS",
+                        stack_id=NESTED_ID,
+                        resource_type="AWS::ECS::Service",
+                    ),
+                ]
+            },
+            {"StackName": NESTED_ID},
+        )
+        assert monitor.wait(ROOT_ID) == "CREATE_COMPLETE"
+        stubber.assert_no_pending_responses()
+    assert monitor.resources[("root-app-ABC", "Service")].duration == 54.0
+    assert "Service" in monitor.format_report()
@@ -0,0 +1,122 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+from compose_x_common.aws.ecr import PRIVATE_ECR_URI_RE
+
+from ecs_composex.compose.compose_services.service_image import ecr_helpers
+from ecs_composex.compose.compose_services.service_image.ecr_helpers import (
+    EcrImagesIndex,
+)
+
+REGISTRY = "012345678912"
+DIGEST = "sha256:" + "a" * 64
+
+
+class FakeImage:
+    def __init__(self, image_uri):
+        self.image_uri = image_uri
+        self.private_ecr = PRIVATE_ECR_URI_RE.match(image_uri)
+
+
+class FakeService:
+    def __init__(self, name, image):
+        self.name = name
+        self.x_ecr = {}
+        self.image = FakeImage(
+            f"{REGISTRY}.dkr.ecr.eu-west-1.amazonaws.com/{name.split('-')[0]}{image}"
+        )
+
+
+def get_index(client) -> EcrImagesIndex:
+    index = EcrImagesIndex(None)
+    index._sessions[(REGISTRY, "eu-west-1", None)] = type(
+        "FakeSession", (), {"client": lambda self, *args: client}
+    )()
+    return index
+
+
+def test_resolve_batched_per_repository():
+    client = boto3.client("ecr", region_name="eu-west-1")
+    stubber = Stubber(client)
+    stubber.add_response(
+        "describe_images",
+        {
+            "imageDetails": [
+                {"imageDigest": DIGEST, "imageTags": ["v1", "latest"]},
+                {"imageDigest": "sha256:" + "b" * 64, "imageTags": ["v2"]},
+            ]
+        },
+        {
+            "registryId": REGISTRY,
+            "repositoryName": "app",
+            "imageIds": [{"imageTag": "v1"}, {"imageTag": "v2"}],
+        },
+    )
+    stubber.add_response(
+        "describe_images",
+        {"imageDetails": [{"imageDigest": DIGEST}]},
+        {
+            "registryId": REGISTRY,
+            "repositoryName": "proxy",
+            "imageIds": [{"imageDigest": DIGEST}],
+        },
+    )
+    index = get_index(client)
+    services = [
+        FakeService("app-a", ":v1"),
+        FakeService("app-b", ":v2"),
+        FakeService("app-c", ":v1"),
+        FakeService("proxy", f"@{DIGEST}"),
+        FakeService("public", ""),
+    ]
+    services[-1].image.private_ecr = None
+    with stubber:
+        index.resolve(services)
+        assert index.get_image(services[0]) == {"imageDigest": DIGEST, "imageTag": "v1"}
+        assert index.get_image(services[2]) == index.get_image(services[0])
+        assert index.get_image(services[3]) == {"imageDigest": DIGEST}
+        assert index.get_image(services[4]) is None
+    stubber.assert_no_pending_responses()
+
+
+def test_missing_images():
+    client = boto3.client("ecr", region_name="eu-west-1")
+    stubber = Stubber(client)
+    stubber.add_client_error(
+        "describe_images", service_error_code="ImageNotFoundException"
+    )
+    stubber.add_response(
+        "describe_images",
+        {"imageDetails": [{"imageDigest": DIGEST, "imageTags": ["v1"]}]},
+        {
+            "registryId": REGISTRY,
+            "repositoryName": "app",
+            "imageIds": [{"imageTag": "v1"}],
+        },
+    )
+    stubber.add_client_error(
+        "describe_images", service_error_code="ImageNotFoundException"
+    )
+    index = get_index(client)
+    found, missing = FakeService("app-a", ":v1"), FakeService("app-b", ":nope")
+    with stubber:
+        index.resolve([found, missing])
+        assert index.get_image(found)["imageDigest"] == DIGEST
+        with pytest.raises(LookupError):
+            index.get_image(missing)
+    stubber.assert_no_pending_responses()
+
+
+def test_other_account_without_role(monkeypatch):
+    """
+    The images of other accounts without RoleArn are skipped by the batch, for the registry API to resolve them.
+    """
+    monkeypatch.setattr(ecr_helpers, "get_account_id", lambda session: "999999999999")
+    index = EcrImagesIndex(None)
+    other = FakeService("app-a", ":v1")
+    index.resolve([other])
+    assert index.get_resolved_image(other) is None
@@ -0,0 +1,192 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+from time import monotonic
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+
+from ecs_composex.compose.compose_services.service_image import docker_opts
+from ecs_composex.compose.compose_services.service_image.ecr_scans_eval import (
+    ScansBackoff,
+    initial_scan_retrieval,
+    scan_poll_and_wait,
+)
+
+
+class FakeImage:
+    image_uri = "012345678912.dkr.ecr.eu-west-1.amazonaws.com/app:latest"
+
+
+class FakeSession:
+    def __init__(self, client):
+        self._client = client
+
+    def client(self, *args, **kwargs):
+        return self._client
+
+
+def test_scan_poll_backoff():
+    """
+    Throttled calls delay the next call, and the report is returned once the scan is complete
+    """
+    client = boto3.client("ecr", region_name="eu-west-1")
+    stubber = Stubber(client)
+    params = {
+        "registryId": "012345678912",
+        "repositoryName": "app",
+        "imageId": {"imageTag": "latest"},
+    }
+    stubber.add_client_error(
+        "describe_image_scan_findings",
+        service_error_code="LimitExceededException",
+        expected_params=params,
+    )
+    stubber.add_response(
+        "describe_image_scan_findings",
+        {"imageScanStatus": {"status": "COMPLETE"}},
+        params,
+    )
+    backoff = ScansBackoff(timeout=5, delay=0.2, max_delay=1)
+    start = monotonic()
+    with stubber:
+        report = scan_poll_and_wait(
+            "012345678912",
+            "app",
+            {"imageTag": "latest"},
+            FakeImage(),
+            FakeSession(client),
+            backoff=backoff,
+        )
+    assert report["imageScanStatus"]["status"] == "COMPLETE"
+    assert monotonic() - start >= 0.2
+    stubber.assert_no_pending_responses()
+
+
+def test_initial_scan_retrieval_backoff():
+    """
+    The first scan report retrieval also waits for the throttled calls, and throttles the other scans
+    """
+    client = boto3.client("ecr", region_name="eu-west-1")
+    stubber = Stubber(client)
+    for _ in range(2):
+        stubber.add_client_error(
+            "describe_image_scan_findings",
+            service_error_code="ThrottlingException",
+        )
+    stubber.add_response(
+        "describe_image_scan_findings", {"imageScanStatus": {"status": "COMPLETE"}}
+    )
+    backoff = ScansBackoff(timeout=5, delay=0.1, max_delay=1)
+    start = monotonic()
+    with stubber:
+        report = initial_scan_retrieval(
+            "012345678912",
+            "app",
+            {"imageTag": "latest"},
+            FakeImage(),
+            False,
+            FakeSession(client),
+            backoff,
+        )
+    assert report["imageScanStatus"]["status"] == "COMPLETE"
+    assert monotonic() - start >= 0.3
+    stubber.assert_no_pending_responses()
+
+
+def test_scan_poll_deadline():
+    client = boto3.client("ecr", region_name="eu-west-1")
+    stubber = Stubber(client)
+    stubber.add_response(
+        "describe_image_scan_findings", {"imageScanStatus": {"status": "IN_PROGRESS"}}
+    )
+    with stubber:
+        assert (
+            scan_poll_and_wait(
+                "012345678912",
+                "app",
+                {"imageTag": "latest"},
+                FakeImage(),
+                FakeSession(client),
+                backoff=ScansBackoff(timeout=0.3),
+            )
+            is None
+        )
+
+
+class FakeService:
+    def __init__(self, name):
+        self.name = name
+        self.definition = {"x-ecr": {"VulnerabilitiesScan": {}}}
+        self.image = type("Image", (), {"private_ecr": True})()
+
+
+class FakeFamily:
+    def __init__(self, name, services):
+        self.name = name
+        self.services = services
+
+
+class FakeImagesIndex:
+    def __init__(self):
+        self.resolved = []
+
+    def resolve(self, services):
+        self.resolved.append(sorted(service.name for service in services))
+
+
+def get_settings(fake_settings):
+    return fake_settings(
+        offline=False,
+        families={
+            "clean": FakeFamily("clean", [FakeService("clean")]),
+            "vulnerable": FakeFamily("vulnerable", [FakeService("vulnerable")]),
+        },
+        ecr_images=FakeImagesIndex(),
+    )
+
+
+@pytest.mark.parametrize("ignore, expected", [(False, 1), (True, 0)])
+def test_evaluate_ecr_configs_aggregates(monkeypatch, fake_settings, ignore, expected):
+    """
+    A clean image evaluated first must not hide the failures of the other services
+    """
+    evaluated = []
+
+    def fake_evaluate(service, settings, backoff):
+        evaluated.append(service.name)
+        if service.name == "clean":
+            return True, [], []
+        return False, ["CRITICAL:1/0"], ["CRITICAL:1/0"]
+
+    monkeypatch.setattr(docker_opts, "evaluate_service_image", fake_evaluate)
+    settings = get_settings(fake_settings)
+    settings.ignore_ecr_findings = ignore
+    assert docker_opts.evaluate_ecr_configs(settings) == expected
+    assert sorted(evaluated) == ["clean", "vulnerable"]
+    assert settings.ecr_images.resolved == [["clean", "vulnerable"]]
+
+
+def test_evaluate_ecr_configs_scan_errors(monkeypatch, fake_settings):
+    """
+    A scan which fails to evaluate counts as failed, without hiding the results of the other services
+    """
+    evaluated = []
+
+    def fake_evaluate(service, settings, backoff):
+        evaluated.append(service.name)
+        if service.name == "clean":
+            raise ClientError(
+                {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+                "DescribeImageScanFindings",
+            )
+        return True, [], []
+
+    monkeypatch.setattr(docker_opts, "evaluate_service_image", fake_evaluate)
+    settings = get_settings(fake_settings)
+    settings.ignore_ecr_findings = True
+    assert docker_opts.evaluate_ecr_configs(settings) == 1
+    assert sorted(evaluated) == ["clean", "vulnerable"]
@@ -0,0 +1,42 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+from troposphere import Ref
+from troposphere.elasticloadbalancingv2 import (
+    ForwardConfig,
+    ListenerRuleAction,
+    TargetGroupTuple,
+)
+
+from ecs_composex.elbv2.elbv2_stack.helpers import (
+    get_rules_priority_offset,
+    handle_string_condition_format,
+)
+
+
+def get_rules(path: str) -> list:
+    return [
+        (
+            [
+                ListenerRuleAction(
+                    Type="forward",
+                    ForwardConfig=ForwardConfig(
+                        TargetGroups=[TargetGroupTuple(TargetGroupArn=Ref("tgt"))]
+                    ),
+                    Order=1,
+                )
+            ],
+            handle_string_condition_format(path),
+        )
+    ]
+
+
+def test_rules_priority_offset():
+    offset = get_rules_priority_offset("listener", get_rules("/api"), 100)
+    assert 1 <= offset <= 100
+    assert get_rules_priority_offset("listener", get_rules("/api"), 100) == offset
+    assert {
+        get_rules_priority_offset("listener", get_rules(f"/api{count}"), 100)
+        for count in range(10)
+    } != {offset}
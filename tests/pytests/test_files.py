@@ -0,0 +1,129 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+import json
+
+import pytest
+import yaml
+from troposphere import Sub, Tags, Template
+from troposphere.s3 import Bucket
+
+from ecs_composex.common.files import FileArtifact, UploadsManifest, get_body_hash
+from ecs_composex.common.serializers import (
+    TEMPLATE_BODY_MAX_SIZE,
+    BodyDigest,
+    compact_json,
+)
+from ecs_composex.common.troposphere_tools import build_template
+
+DATE = "2025-01-01T00:00:00.000000"
+
+
+def test_body_hash_ignores_generation_date():
+    assert get_body_hash(f"GeneratedOn: {DATE}", DATE) == get_body_hash("GeneratedOn: ")
+    assert get_body_hash(f"GeneratedOn: {DATE}") != get_body_hash("GeneratedOn: ")
+    assert get_body_hash("a") != get_body_hash("b")
+
+
+def test_uploads_manifest(tmp_path):
+    file_path = str(tmp_path / "manifest.json")
+    manifest = UploadsManifest(file_path)
+    assert manifest.get_url("bucket", "key/file.json", "abcd") is None
+    manifest.record("bucket", "key/file.json", "abcd", "https://url")
+    manifest.save()
+
+    manifest = UploadsManifest(file_path)
+    assert manifest.get_url("bucket", "key/file.json", "abcd") == "https://url"
+    assert manifest.get_url("bucket", "key/file.json", "efgh") is None
+
+
+def test_cache_save_failure(tmp_path):
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_text("")
+    manifest = UploadsManifest(str(not_a_dir / "manifest.json"))
+    manifest.record("bucket", "key", "abcd", "https://url")
+    manifest.save()
+
+    manifest = UploadsManifest(str(tmp_path / "manifest.json"))
+    manifest.save()
+    assert sorted(file.name for file in tmp_path.iterdir()) == ["file", "manifest.json"]
+
+
+def test_body_digest_chunks():
+    body = f'{{"Metadata": {{"GeneratedOn": "{DATE}"}}, "Resources": {{}}}}' * 3
+    for size in (1, 5, len(DATE) - 1, len(DATE), 64):
+        digest = BodyDigest(DATE)
+        for index in range(0, len(body), size):
+            digest.update(body[index : index + size])
+        assert digest.hexdigest() == get_body_hash(body, DATE)
+        assert digest.size == len(body)
+
+
+def test_file_artifact_streaming(fake_settings):
+    settings = fake_settings(format="yaml")
+    template = Template(Description="test")
+    template.add_resource(Bucket("bucket", BucketName=Sub("${AWS::StackName}-data")))
+
+    artifact = FileArtifact("test", settings, template=template)
+    artifact.define_body()
+    artifact.write(settings)
+    with open(artifact.file_path) as body_fd:
+        body = body_fd.read()
+    assert artifact.body == body
+    assert artifact.body_hash == get_body_hash(body, settings.generated_on)
+    assert artifact.body_size == len(body)
+    assert "BucketName:\n        Fn::Sub: ${AWS::StackName}-data" in body
+
+    settings.format = "json"
+    settings.compact = True
+    compact = FileArtifact("compact", settings, template=template)
+    compact.write(settings)
+    assert compact.body == compact_json(template.to_dict())
+    assert json.loads(compact.body) == template.to_dict()
+
+    settings.format = "yaml"
+    compact_yaml = FileArtifact("compact-yaml", settings, template=template)
+    compact_yaml.write(settings)
+    assert compact_yaml.body.count("\n") == 1
+    assert len(compact_yaml.body) < len(body)
+    assert yaml.safe_load(compact_yaml.body) == yaml.safe_load(body)
+
+
+def test_file_artifact_generated_on(tmp_path, fake_settings):
+    template = build_template("test")
+    template.add_resource(Bucket("bucket"))
+    artifacts = []
+    for generated_on in ("2025-01-01T00:00:00.000000", "2025-01-02T00:00:00.000000"):
+        settings = fake_settings(
+            output_dir=str(tmp_path / generated_on), generated_on=generated_on
+        )
+        artifact = FileArtifact("test", settings, template=template)
+        artifact.write(settings)
+        assert (
+            json.loads(artifact.body)["Metadata"]["Properties"]["GeneratedOn"]
+            == generated_on
+        )
+        artifacts.append(artifact)
+    assert "GeneratedOn" not in template.metadata["Properties"]
+    assert artifacts[0].body != artifacts[1].body
+    assert artifacts[0].body_hash == artifacts[1].body_hash
+
+
+def test_file_artifact_outside_output_dir(tmp_path, fake_settings):
+    settings = fake_settings(output_dir=str(tmp_path / "output"))
+    with pytest.raises(ValueError):
+        FileArtifact("../../escaped", settings, content="test")
+
+
+def test_file_artifact_validation_body(fake_settings):
+    settings = fake_settings()
+    template = Template()
+    for count in range(300):
+        template.add_resource(
+            Bucket(f"bucket{count}", BucketName=f"b-{count}", Tags=Tags(Name="b"))
+        )
+    artifact = FileArtifact("big", settings, template=template)
+    artifact.write(settings)
+    assert artifact.body_size >= TEMPLATE_BODY_MAX_SIZE
+    assert artifact.get_validation_body() == compact_json(artifact.template_dict)
@@ -0,0 +1,31 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+from copy import deepcopy
+from os import path
+
+from pytest import raises
+
+from ecs_composex.iam.import_sam_policies import get_policies_models
+
+HERE = path.abspath(path.dirname(__file__))
+SQS_PERMS = path.abspath(path.join(HERE, "../../ecs_composex/sqs/sqs_perms.json"))
+
+
+def test_policies_models_loaded_once():
+    models = get_policies_models(SQS_PERMS)
+    assert models is get_policies_models(SQS_PERMS)
+    assert "SQSPollerPolicy" in models and "RWMessages" in models
+    assert "SQSPollerPolicy" in get_policies_models()
+
+
+def test_policies_models_read_only():
+    models = get_policies_models(SQS_PERMS)
+    with raises(TypeError):
+        models["SQSPollerPolicy"] = {}
+    with raises(TypeError):
+        models.pop("SQSPollerPolicy")
+    copied = deepcopy(models)
+    copied["SQSPollerPolicy"] = {}
+    assert models["SQSPollerPolicy"] != {}
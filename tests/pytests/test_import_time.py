@@ -0,0 +1,68 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+"""
+Modules loaded when importing the CLI, checked in a fresh interpreter.
+"""
+
+import json
+import subprocess
+import sys
+from os import path
+
+REPO_ROOT = path.abspath(path.join(path.dirname(__file__), "..", ".."))
+HEAVY_MODULES = [
+    "boto3",
+    "botocore",
+    "troposphere",
+    "jsonschema",
+    "yaml",
+    "compose_x_common",
+    "compose_x_render",
+    "ecs_composex.common.settings",
+    "ecs_composex.specs",
+]
+
+
+def get_loaded_modules(statement: str) -> list[str]:
+    """
+    :return: the modules in sys.modules after running the statement in a new interpreter
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"{statement}; import json, sys; print(json.dumps(sorted(sys.modules)))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=REPO_ROOT,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_cli_does_not_import_heavy_modules():
+    modules = get_loaded_modules("import ecs_composex.cli")
+    assert "ecs_composex.cli" in modules
+    assert not [
+        module
+        for module in modules
+        if any(
+            module == heavy or module.startswith(f"{heavy}.") for heavy in HEAVY_MODULES
+        )
+    ]
+
+
+def test_specs_registry_is_lazy():
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import ecs_composex.specs as specs; assert specs._REGISTRY is None;"
+            "assert specs.REGISTRY is specs.get_registry()",
+        ],
+        check=True,
+        cwd=REPO_ROOT,
+    )
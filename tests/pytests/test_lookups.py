@@ -0,0 +1,305 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+import json
+from datetime import timedelta
+from threading import get_ident
+
+from pytest import raises
+
+from ecs_composex.compose.x_resources.helpers import lookup_resources_concurrently
+from ecs_composex.compose.x_resources.lookup_cache import (
+    LookupCache,
+    lookup_with_cache,
+    parse_ttl,
+)
+from ecs_composex.sqs.sqs_params import SQS_ARN, SQS_NAME, SQS_URL
+
+
+class FakeResource:
+    def __init__(self, name: str, fail: bool = False):
+        self.name = name
+        self.compose_x_arn = f"x-sqs::{name}"
+        self.fail = fail
+        self.lookup_properties = None
+
+    def lookup_resource(self, prefix, suffix=None):
+        if self.fail:
+            raise LookupError(self.name)
+        self.lookup_properties = {
+            "Name": f"{prefix}{self.name}{suffix}",
+            "Thread": get_ident(),
+        }
+
+
+def test_lookup_resources_concurrently(fake_settings):
+    resources = [FakeResource(f"queue-{count}") for count in range(10)]
+    lookup_resources_concurrently(fake_settings(), resources, "arn:", suffix="-dev")
+    assert [resource.lookup_properties["Name"] for resource in resources] == [
+        f"arn:queue-{count}-dev" for count in range(10)
+    ]
+    assert all(
+        resource.lookup_properties["Thread"] != get_ident() for resource in resources
+    )
+
+
+def test_lookup_resources_concurrently_raises_first_error(fake_settings):
+    resources = [
+        FakeResource("queue-0"),
+        FakeResource("queue-1", fail=True),
+        FakeResource("queue-2", fail=True),
+        FakeResource("queue-3"),
+    ]
+    with raises(LookupError, match="queue-1"):
+        lookup_resources_concurrently(fake_settings(), resources, "arn:")
+    assert resources[3].lookup_properties
+
+
+class FakeModule:
+    res_key = "x-sqs"
+
+
+class FakeLookupResource(FakeResource):
+    module = FakeModule()
+    lookup_region = "eu-west-1"
+    lookup_account_id = "123456789012"
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.lookup = {"Tags": [{"Name": name}]}
+        self.arn = None
+        self.cloud_control_properties = {}
+        self.mappings = {}
+
+    def lookup_resource(self, *args, **kwargs):
+        self.arn = f"arn:aws:sqs:eu-west-1:123456789012:{self.name}"
+        self.lookup_properties = {SQS_ARN: self.arn, SQS_URL: "https://queue"}
+        self.cloud_control_properties = {"QueueName": self.name}
+        self.generate_cfn_mappings_from_lookup_properties()
+
+    def init_outputs(self):
+        pass
+
+    def generate_cfn_mappings_from_lookup_properties(self):
+        self.mappings = {
+            parameter.title: value
+            for parameter, value in self.lookup_properties.items()
+        }
+
+    def generate_outputs(self):
+        pass
+
+
+def test_parse_ttl():
+    assert parse_ttl("90") == timedelta(seconds=90)
+    assert parse_ttl("30m") == timedelta(minutes=30)
+    assert parse_ttl("2d") == timedelta(days=2)
+    with raises(ValueError):
+        parse_ttl("1w")
+
+
+def test_lookup_cache_offline(tmp_path, fake_settings):
+    settings = fake_settings()
+    settings.lookup_cache = LookupCache(str(tmp_path), "1h")
+    resources = [FakeLookupResource(f"queue-{count}") for count in range(3)]
+    lookup_resources_concurrently(settings, resources)
+
+    settings.lookup_cache = LookupCache(str(tmp_path), offline=True)
+    cached = [FakeLookupResource(f"queue-{count}") for count in range(3)]
+    cached[0].lookup_resource = None
+    lookup_resources_concurrently(settings, cached)
+    for resource, cached_resource in zip(resources, cached):
+        assert cached_resource.arn == resource.arn
+        assert cached_resource.lookup_properties == resource.lookup_properties
+        assert cached_resource.mappings == resource.mappings
+    restored_arn = next(
+        parameter for parameter in cached[0].lookup_properties if parameter == SQS_ARN
+    )
+    assert restored_arn.return_value == SQS_ARN.return_value
+
+    with raises(LookupError):
+        lookup_resources_concurrently(settings, [FakeLookupResource("queue-new")])
+
+
+OFFLINE_COMPOSE = """
+services:
+  app:
+    image: nginx
+x-sqs:
+  queue:
+    Lookup:
+      Tags:
+        - Name: queue
+      RoleArn: arn:aws:iam::123456789012:role/lookup
+    Services:
+      app:
+        Access: RWMessages
+"""
+
+
+def test_offline_role_lookup(tmp_path):
+    from ecs_composex.common.settings import ComposeXSettings
+    from ecs_composex.ecs_composex import generate_full_template
+
+    compose_file = tmp_path / "docker-compose.yml"
+    compose_file.write_text(OFFLINE_COMPOSE)
+    resource = FakeLookupResource("queue")
+    resource.lookup = {
+        "Tags": [{"Name": "queue"}],
+        "RoleArn": "arn:aws:iam::123456789012:role/lookup",
+    }
+    resource.lookup_resource()
+    resource.lookup_properties[SQS_NAME] = "queue"
+    cache = LookupCache(str(tmp_path))
+    cache.record(resource)
+    cache.save()
+
+    settings = ComposeXSettings(
+        **{
+            ComposeXSettings.name_arg: "test",
+            ComposeXSettings.command_arg: ComposeXSettings.render_arg,
+            ComposeXSettings.input_file_arg: [str(compose_file)],
+            ComposeXSettings.output_dir_arg: str(tmp_path / "output"),
+            ComposeXSettings.region_arg: "eu-west-1",
+            ComposeXSettings.zones_arg: ["eu-west-1a", "eu-west-1b"],
+            ComposeXSettings.lookup_cache_arg: str(tmp_path),
+            ComposeXSettings.offline_arg: True,
+        }
+    )
+    root_stack = generate_full_template(settings)
+    assert resource.arn in json.dumps(root_stack.stack_template.mappings)
+
+    with raises(LookupError, match="Offline"):
+        settings.session.client("sts", region_name="eu-west-1").get_caller_identity()
+
+
+def test_lookup_with_cache(tmp_path, fake_settings):
+    settings = fake_settings()
+    settings.lookup_cache = LookupCache(str(tmp_path), "1h")
+    cluster = {"ClusterName": "cluster", "CapacityProviders": ["FARGATE"]}
+    calls: list = []
+
+    def lookup_cluster(cluster_name: str) -> dict:
+        def get_result() -> dict:
+            calls.append(cluster_name)
+            return json.loads(json.dumps(cluster))
+
+        return lookup_with_cache(
+            settings,
+            f"x-cluster.{cluster_name}",
+            "x-cluster",
+            {"ClusterName": cluster_name},
+            "eu-west-1",
+            lambda: "123456789012",
+            get_result,
+        )
+
+    lookup_cluster("cluster")["CapacityProviders"].append("EC2")
+    assert lookup_cluster("cluster") == cluster
+    assert calls == ["cluster"]
+    settings.lookup_cache.save()
+
+    settings.lookup_cache = LookupCache(str(tmp_path), offline=True)
+    assert lookup_cluster("cluster") == cluster
+    with raises(LookupError, match="x-cluster.other"):
+        lookup_cluster("other")
+    assert calls == ["cluster"]
+
+
+LOOKUPS_COMPOSE = """
+services:
+  app:
+    image: nginx
+    secrets:
+      - db
+secrets:
+  db:
+    x-secrets:
+      Name: db-secret
+      Lookup:
+        Tags:
+          - Name: db
+x-cluster:
+  Lookup:
+    ClusterName: cluster
+x-vpc:
+  Lookup:
+    VpcId:
+      Tags:
+        - Name: vpc
+    AppSubnets:
+      Tags:
+        - usage: application
+    StorageSubnets:
+      Tags:
+        - usage: storage
+    PublicSubnets:
+      Tags:
+        - usage: public
+"""
+
+
+def test_offline_environment_lookups(tmp_path):
+    import yaml
+
+    from ecs_composex.common.settings import ComposeXSettings
+    from ecs_composex.ecs_composex import generate_full_template
+
+    compose_file = tmp_path / "docker-compose.yml"
+    compose_file.write_text(LOOKUPS_COMPOSE)
+    compose = yaml.safe_load(LOOKUPS_COMPOSE)
+    secret_lookup = dict(compose["secrets"]["db"]["x-secrets"]["Lookup"])
+    secret_lookup["Name"] = "db-secret"
+    secret_arn = "arn:aws:secretsmanager:eu-west-1:123456789012:secret:db-secret-AbCdEf"
+    results = [
+        (
+            "x-vpc",
+            compose["x-vpc"]["Lookup"],
+            {
+                "VpcSettings": {
+                    "VpcId": "vpc-0123456789abcdef0",
+                    "AppSubnets": ["subnet-app"],
+                    "StorageSubnets": ["subnet-storage"],
+                    "PublicSubnets": ["subnet-public"],
+                },
+                "SubnetsAzs": {
+                    "AppSubnets": {"Azs": ["eu-west-1a"], "ZoneIds": ["euw1-az1"]}
+                },
+            },
+        ),
+        (
+            "x-cluster",
+            compose["x-cluster"]["Lookup"],
+            {"ClusterName": "cluster", "CapacityProviders": ["FARGATE"]},
+        ),
+        ("x-secrets", secret_lookup, {"Arn": secret_arn, "Name": "db-secret"}),
+    ]
+    cache = LookupCache(str(tmp_path))
+    for res_key, lookup, result in results:
+        cache.set_entry(
+            res_key,
+            "123456789012",
+            "eu-west-1",
+            cache.lookup_hash(res_key, lookup),
+            {"Result": result},
+        )
+    cache.save()
+
+    settings = ComposeXSettings(
+        **{
+            ComposeXSettings.name_arg: "test",
+            ComposeXSettings.command_arg: ComposeXSettings.render_arg,
+            ComposeXSettings.input_file_arg: [str(compose_file)],
+            ComposeXSettings.output_dir_arg: str(tmp_path / "output"),
+            ComposeXSettings.region_arg: "eu-west-1",
+            ComposeXSettings.lookup_cache_arg: str(tmp_path),
+            ComposeXSettings.offline_arg: True,
+        }
+    )
+    root_stack = generate_full_template(settings)
+    mappings = json.dumps(root_stack.stack_template.mappings)
+    assert "vpc-0123456789abcdef0" in mappings
+    assert "euw1-az1" in mappings
+    assert settings.secrets_mappings["db"]["Arn"] == secret_arn
+    assert settings.ecs_cluster.mappings == {"EcsCluster": {"Name": "cluster"}}
@@ -0,0 +1,65 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+from ecs_composex.mods_manager import ModManager, XResourcesRegistry
+
+
+class FakeModule:
+    def __init__(self, res_key):
+        self.res_key = res_key
+        self.resources = {}
+
+    @property
+    def resources_list(self):
+        return [_res for _res in self.resources.values() if _res is not None]
+
+
+class FakeResource:
+    def __init__(self, module, name, lookup=None, properties=None):
+        self.module = module
+        self.name = name
+        self.lookup = lookup
+        self.uses_default = not any([lookup, properties])
+
+    @property
+    def compose_x_arn(self):
+        return f"{self.module.res_key}::{self.name}"
+
+
+def test_registry_indexes():
+    sqs = FakeModule("x-sqs")
+    sns = FakeModule("x-sns")
+    sqs.resources = {
+        "queue": FakeResource(sqs, "queue", properties={"FifoQueue": True}),
+        "existing": FakeResource(sqs, "existing", lookup={"Tags": [{"a": "b"}]}),
+        "none": None,
+    }
+    sns.resources = {"topic": FakeResource(sns, "topic")}
+    registry = XResourcesRegistry({"x-sqs": sqs, "x-sns": sns})
+    assert [_res.name for _res in registry.resources] == ["queue", "existing", "topic"]
+    assert registry.by_arn["x-sqs::existing"] is sqs.resources["existing"]
+    assert registry.by_arn["x-sns::topic"] is sns.resources["topic"]
+    assert registry.by_module["x-sqs"] == [
+        sqs.resources["queue"],
+        sqs.resources["existing"],
+    ]
+    assert registry.by_kind["new"] == [sqs.resources["queue"]]
+    assert registry.by_kind["lookup"] == [sqs.resources["existing"]]
+    assert registry.by_kind["void"] == [sns.resources["topic"]]
+
+
+def test_registry_invalidated_on_add():
+    manager = ModManager.__new__(ModManager)
+    manager.modules = {}
+    manager.loaded_modules = []
+    manager._registry = None
+    sqs = FakeModule("x-sqs")
+    manager.modules["x-sqs"] = sqs
+    registry = manager.registry
+    assert manager.registry is registry
+    assert registry.resources == []
+    manager.add_resource(sqs, "queue", FakeResource(sqs, "queue"))
+    assert manager.registry is not registry
+    assert "x-sqs::queue" in manager.registry.by_arn
+    assert registry.resources == []
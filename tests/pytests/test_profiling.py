@@ -0,0 +1,67 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from ecs_composex.common.profiling import Profiler
+
+
+def test_profiler_disabled():
+    profiler = Profiler()
+    with profiler.phase("nothing"):
+        pass
+    assert not profiler.events
+
+
+def test_profiler_trace(tmp_path):
+    profiler = Profiler(True)
+    try:
+        with profiler.phase("generate"):
+            with profiler.phase("init", family="app"):
+                data = [str(index) for index in range(10000)]
+            with profiler.phase("init", family="app"):
+                del data
+            with profiler.phase("to_ecs", module="x-s3"):
+                pass
+    finally:
+        profiler.stop()
+
+    events = {event["name"]: event for event in profiler.events}
+    assert set(events) == {"generate", "init (app)", "to_ecs (x-s3)"}
+    generate = events["generate"]
+    assert generate["cat"] == "phase"
+    assert (
+        generate["args"]["peak_memory_kb"]
+        >= events["init (app)"]["args"]["peak_memory_kb"]
+    )
+    assert events["to_ecs (x-s3)"]["cat"] == "module"
+    assert profiler.get_totals("family") == {
+        "app": sum(
+            event["dur"] / 1e3 for event in profiler.events if event["cat"] == "family"
+        )
+    }
+
+    trace_file = str(tmp_path / "profile" / "trace.json")
+    profiler.save(trace_file)
+    with open(trace_file) as trace_fd:
+        trace = json.load(trace_fd)
+    assert trace["displayTimeUnit"] == "ms"
+    assert [event["ph"] for event in trace["traceEvents"]].count("X") == 4
+
+
+def test_profiler_threads():
+    profiler = Profiler(True)
+    profiler.stop()
+
+    def render(stack: str):
+        with profiler.phase("render", stack=stack):
+            return sum(range(1000))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(render, ["vpc", "app"]))
+    assert sorted(profiler.get_totals("stack")) == ["app", "vpc"]
+    for event in profiler.events:
+        assert "peak_memory_kb" not in event["args"]
+        assert event["tid"] in profiler._threads
@@ -0,0 +1,196 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+import json
+from datetime import timedelta
+from os import chmod, environ, pathsep
+from threading import Lock
+
+from requests import Response
+from requests.adapters import BaseAdapter
+
+from ecs_composex.compose.compose_services import ComposeService
+from ecs_composex.compose.compose_services.service_image.registry_digests import (
+    DockerCredentials,
+    ImageDigestsCache,
+    ImageDigestsResolver,
+    ImageReference,
+    RegistryClient,
+)
+
+DIGEST = "sha256:" + "b" * 64
+MEDIA_TYPE = "application/vnd.oci.image.index.v1+json"
+
+
+class FakeRegistry(BaseAdapter):
+    """
+    Registry requiring a bearer token, which records the requests it received.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+        self._lock = Lock()
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.requests.append((request.method, request.url))
+        response = Response()
+        response.request = request
+        response.url = request.url
+        if request.url.startswith("https://auth.docker.io/token"):
+            response.status_code = 200
+            response._content = b'{"token": "abcd"}'
+        elif request.headers.get("Authorization") != "Bearer abcd":
+            response.status_code = 401
+            response.headers["WWW-Authenticate"] = (
+                'Bearer realm="https://auth.docker.io/token",service="registry.docker.io"'
+            )
+        else:
+            response.status_code = 200
+            response.headers["Docker-Content-Digest"] = DIGEST
+            response.headers["Content-Type"] = MEDIA_TYPE
+        return response
+
+    def close(self):
+        pass
+
+
+def test_image_reference():
+    image = ImageReference("nginx")
+    assert (image.registry, image.repository, image.reference) == (
+        "registry-1.docker.io",
+        "library/nginx",
+        "latest",
+    )
+    image = ImageReference("localhost:5000/team/app:1.0")
+    assert (image.registry, image.repository, image.reference) == (
+        "localhost:5000",
+        "team/app",
+        "1.0",
+    )
+    image = ImageReference(f"public.ecr.aws/aws-observability/agent@{DIGEST}")
+    assert image.is_digest
+    assert image.repository == "aws-observability/agent"
+
+
+def test_resolve_images(tmp_path):
+    registry = FakeRegistry()
+    client = RegistryClient(credentials=DockerCredentials())
+    client.http.mount("https://", registry)
+    cache = ImageDigestsCache(str(tmp_path / "digests.json"))
+    resolver = ImageDigestsResolver(cache, timedelta(minutes=15), workers=4)
+    resolver._client = client
+    resolver.resolve(["nginx", "nginx:latest", "docker.io/library/nginx", "redis:7"])
+    assert resolver.get_digest("nginx:latest") == {
+        "digest": DIGEST,
+        "mediaType": MEDIA_TYPE,
+    }
+    assert sorted(url for method, url in registry.requests if method == "HEAD") == 2 * [
+        "https://registry-1.docker.io/v2/library/nginx/manifests/latest",
+    ] + 2 * [
+        "https://registry-1.docker.io/v2/library/redis/manifests/7",
+    ]
+    assert resolver.get_digest(f"nginx@{DIGEST}")["digest"] == DIGEST
+
+    cached = ImageDigestsResolver(
+        ImageDigestsCache(cache.file_path), timedelta(minutes=15)
+    )
+    assert cached.get_digest("redis:7")["digest"] == DIGEST
+    assert cached._client is None
+
+    offline = ImageDigestsResolver(
+        ImageDigestsCache(cache.file_path), timedelta(0), offline=True
+    )
+    assert offline.get_digest("nginx")["digest"] == DIGEST
+    assert offline.get_digest("postgres:16") is None
+    assert offline._client is None
+
+
+def test_docker_credentials_helpers(tmp_path, monkeypatch):
+    helper = tmp_path / "docker-credential-fake"
+    helper.write_text(
+        "#!/bin/sh\n"
+        "read server\n"
+        'echo "{\\"Username\\": \\"user\\", \\"Secret\\": \\"$server\\"}"\n'
+    )
+    chmod(helper, 0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{pathsep}{environ['PATH']}")
+    config_file = tmp_path / "config.json"
+    config_file.write_text(
+        json.dumps(
+            {
+                "auths": {"https://index.docker.io/v1/": {"auth": "dTpw"}},
+                "credHelpers": {"registry.example.com": "fake"},
+                "credsStore": "missing",
+            }
+        )
+    )
+    credentials = DockerCredentials.from_config(str(config_file))
+    assert credentials.get("registry-1.docker.io") == ("u", "p")
+    assert credentials.get("registry.example.com") == (
+        "user",
+        "registry.example.com",
+    )
+    assert credentials.get("other.example.com") is None
+
+
+class FakeEcrImages:
+    def __init__(self, images: dict):
+        self.images = images
+
+    def get_resolved_image(self, service):
+        return self.images.get(service.name)
+
+
+class FakeDigests:
+    def __init__(self):
+        self.images = []
+
+    def get_digest(self, image):
+        self.images.append(image)
+        return {"digest": DIGEST, "mediaType": MEDIA_TYPE}
+
+
+def test_private_ecr_image_digest(fake_settings):
+    service = ComposeService(
+        "app",
+        {
+            "image": "123456789012.dkr.ecr.eu-west-1.amazonaws.com/app:1.0",
+            "x-docker_opts": {"InterpolateWithDigest": True},
+        },
+        [],
+        [],
+    )
+    settings = fake_settings(
+        offline=False,
+        ecr_images=FakeEcrImages({"app": {"imageDigest": DIGEST, "imageTag": "1.0"}}),
+        image_digests=FakeDigests(),
+    )
+    service.image.retrieve_image_digest(settings)
+    assert service.image.image_uri == (
+        f"123456789012.dkr.ecr.eu-west-1.amazonaws.com/app@{DIGEST}"
+    )
+    assert not settings.image_digests.images
+
+
+def test_private_ecr_image_digest_fallback(fake_settings):
+    """
+    Images the ECR index could not resolve, such as in another account without RoleArn, use the registry API.
+    """
+    image = "210987654321.dkr.ecr.eu-west-1.amazonaws.com/app:1.0"
+    service = ComposeService(
+        "app",
+        {"image": image, "x-docker_opts": {"InterpolateWithDigest": True}},
+        [],
+        [],
+    )
+    settings = fake_settings(
+        offline=False, ecr_images=FakeEcrImages({}), image_digests=FakeDigests()
+    )
+    service.image.retrieve_image_digest(settings)
+    assert settings.image_digests.images == [image]
+    assert service.image.image_uri == (
+        f"210987654321.dkr.ecr.eu-west-1.amazonaws.com/app@{DIGEST}"
+    )
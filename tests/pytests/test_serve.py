@@ -0,0 +1,140 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+import json
+import sys
+from http.client import HTTPConnection
+from os import path
+from threading import Thread
+
+import pytest
+
+from ecs_composex.serve import RenderService, get_server, warm_up
+
+COMPOSE = """
+services:
+  web:
+    image: nginx:latest
+    ports:
+      - 80
+"""
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    render_service = RenderService(
+        lookup_cache_dir=str(tmp_path_factory.mktemp("lookups")), offline=True
+    )
+    _server = get_server(render_service, "127.0.0.1", 0)
+    Thread(target=_server.serve_forever, daemon=True).start()
+    yield _server
+    _server.shutdown()
+    _server.server_close()
+
+
+def post(server, body) -> tuple[int, dict]:
+    connection = HTTPConnection(*server.server_address[:2])
+    connection.request("POST", "/render", json.dumps(body))
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_warm_up():
+    warm_up()
+    assert "ecs_composex.sqs.sqs_module" in sys.modules
+
+
+def test_render(server):
+    request = {
+        "Name": "web",
+        "ComposeFiles": [COMPOSE],
+        "Zones": ["eu-west-1a", "eu-west-1b"],
+    }
+    status, first = post(server, request)
+    assert status == 200
+    assert first["RootTemplate"] == "web.json"
+    assert "Resources" in json.loads(first["Files"]["web.json"])
+    status, second = post(server, request)
+    assert status == 200
+    assert second["Files"].keys() == first["Files"].keys()
+
+    connection = HTTPConnection(*server.server_address[:2])
+    connection.request("GET", "/health")
+    assert json.loads(connection.getresponse().read())["Renders"] == 2
+
+
+def test_invalid_requests(server):
+    assert post(server, {"Name": "web"})[0] == 400
+    status, response = post(
+        server, {"Name": "web", "ComposeFiles": [COMPOSE], "Foo": 1}
+    )
+    assert status == 400
+    assert "Foo" in response["Error"]
+    assert post(server, {"Name": "web", "ComposeFiles": ["services: 1"]})[0] == 422
+
+
+def test_invalid_name(server, tmp_path):
+    target = tmp_path / "out"
+    status, response = post(
+        server,
+        {"Name": f"../../../..{target}", "ComposeFiles": [COMPOSE], "Zones": ["a"]},
+    )
+    assert status == 400
+    assert "Name" in response["Error"]
+    assert not path.exists(f"{target}.json")
+    for name in ["web\n", "w" * 129]:
+        status, response = post(
+            server, {"Name": name, "ComposeFiles": [COMPOSE], "Zones": ["a"]}
+        )
+        assert status == 400
+        assert "Name" in response["Error"]
+
+
+def test_render_environment(server, monkeypatch):
+    monkeypatch.setenv("SERVER_SECRET", "server-secret-value")
+    compose = COMPOSE + (
+        "    environment:\n"
+        "      LEAK: ${SERVER_SECRET}\n"
+        "      FROM_REQUEST: ${REQUEST_VAR}\n"
+    )
+    request = {
+        "Name": "app",
+        "ComposeFiles": [compose],
+        "Zones": ["eu-west-1a", "eu-west-1b"],
+    }
+    status, response = post(
+        server, dict(request, Environment={"REQUEST_VAR": "request-value"})
+    )
+    assert status == 200
+    assert "request-value" in response["Files"]["web.json"]
+    assert "server-secret-value" not in json.dumps(response["Files"])
+
+    status, response = post(server, dict(request, Environment=["REQUEST_VAR"]))
+    assert status == 400
+    assert "Environment" in response["Error"]
+
+
+def test_render_files_outside_request(server, tmp_path):
+    secret_file = tmp_path / "secret.txt"
+    secret_file.write_text("server-secret-value")
+    for file_path in [str(secret_file), "../secret.txt"]:
+        compose = COMPOSE + (
+            "x-ssm_parameter:\n"
+            "  param:\n"
+            "    Properties:\n"
+            "      DataType: text\n"
+            "      Type: String\n"
+            "    MacroParameters:\n"
+            f"      FromFile: {file_path}\n"
+        )
+        status, response = post(
+            server,
+            {
+                "Name": "app",
+                "ComposeFiles": [compose],
+                "Zones": ["eu-west-1a", "eu-west-1b"],
+            },
+        )
+        assert status == 400
+        assert "outside of the project directory" in response["Error"]
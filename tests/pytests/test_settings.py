@@ -0,0 +1,78 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+import boto3
+import pytest
+
+from ecs_composex.common.files import AvailabilityZonesCache
+from ecs_composex.common.settings import ComposeXSettings
+
+COMPOSE_FILE = """
+services:
+  app:
+    image: nginx
+"""
+
+
+@pytest.fixture()
+def no_network_session():
+    """Session that fails any API call"""
+    calls = []
+
+    def fail_call(request, **kwargs):
+        calls.append(request.url)
+        raise AssertionError(f"Unexpected API call to {request.url}")
+
+    session = boto3.session.Session(
+        aws_access_key_id="AKIAEXAMPLE",
+        aws_secret_access_key="secret",
+        region_name="eu-west-1",
+    )
+    session.events.register("before-send", fail_call)
+    return session, calls
+
+
+def get_settings(tmp_path, session, **kwargs):
+    compose_file = tmp_path.joinpath("docker-compose.yml")
+    compose_file.write_text(COMPOSE_FILE)
+    return ComposeXSettings(
+        session=session,
+        **{
+            ComposeXSettings.name_arg: "test",
+            ComposeXSettings.command_arg: "render",
+            ComposeXSettings.input_file_arg: [str(compose_file)],
+            ComposeXSettings.output_dir_arg: str(tmp_path.joinpath("out")),
+            **kwargs,
+        },
+    )
+
+
+def test_settings_offline_azs(tmp_path, no_network_session):
+    """
+    Settings make no API call on init, and the AZs come from --azs or the cache for the region
+    """
+    session, calls = no_network_session
+    cache = AvailabilityZonesCache(str(tmp_path.joinpath("azs.json")))
+    settings = get_settings(tmp_path, session, **{ComposeXSettings.offline_arg: True})
+    settings._azs_cache = cache
+    with pytest.raises(LookupError):
+        settings.aws_azs
+    with pytest.raises(LookupError):
+        settings.account_id
+    cache.record("123456789012", "eu-west-1", ["eu-west-1a", "eu-west-1b"])
+    cache.record("210987654321", "eu-west-1", ["eu-west-1a", "eu-west-1c"])
+    assert cache.get_zones("123456789012", "eu-west-1") == ["eu-west-1a", "eu-west-1b"]
+    assert cache.get_zones("123456789012", "us-east-1") is None
+    assert settings.aws_azs == ["eu-west-1a", "eu-west-1c"]
+
+    settings = get_settings(
+        tmp_path,
+        session,
+        **{
+            ComposeXSettings.offline_arg: True,
+            ComposeXSettings.zones_arg: ["eu-west-1b"],
+        },
+    )
+    assert settings.aws_azs == ["eu-west-1b"]
+    assert not calls
@@ -0,0 +1,19 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+from importlib_resources import files as pkg_files
+from jsonschema.exceptions import ValidationError
+from pytest import raises
+
+from ecs_composex.specs import get_spec_validator, load_spec
+
+
+def test_spec_validator_is_compiled_once():
+    spec_path = str(pkg_files("ecs_composex").joinpath("sqs/x-sqs.spec.json"))
+    assert load_spec(spec_path) is load_spec(spec_path)
+    validator = get_spec_validator(spec_path)
+    assert validator is get_spec_validator(spec_path)
+    validator.validate({"Properties": {}})
+    with raises(ValidationError):
+        validator.validate({"Properties": "not-an-object"})
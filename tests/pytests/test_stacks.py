@@ -0,0 +1,26 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+from troposphere import Template
+
+from ecs_composex.common.cfn_params import ROOT_STACK_NAME_T
+from ecs_composex.common.stacks import ComposeXStack, set_stacks_render_levels
+
+
+def test_stacks_render_levels():
+    root = ComposeXStack("root", Template())
+    parent = ComposeXStack("parent", Template())
+    child = ComposeXStack("child", Template())
+    leaf = ComposeXStack("leaf", Template())
+    parent.stack_template.add_resource(child)
+    root.stack_template.add_resource(parent)
+    root.stack_template.add_resource(leaf)
+
+    levels = {}
+    assert set_stacks_render_levels(root, levels) == 2
+    assert levels[0] == [child, leaf]
+    assert levels[1] == [parent]
+    assert levels[2] == [root]
+    assert ROOT_STACK_NAME_T in parent.Parameters
+    assert ROOT_STACK_NAME_T in child.Parameters
@@ -0,0 +1,68 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+from troposphere import Ref, Tags, Template
+from troposphere.ec2 import SecurityGroup
+from troposphere.logs import LogGroup
+from troposphere.ssm import Parameter as SSMParameter
+
+from ecs_composex.common.stacks import ComposeXStack
+from ecs_composex.common.tagging import add_all_tags
+
+
+def get_stacks() -> tuple:
+    root = Template()
+    parent = ComposeXStack("parent", Template())
+    child = ComposeXStack("child", Template())
+    parent.stack_template.add_resource(child)
+    root.add_resource(parent)
+    parent.stack_template.add_resource(
+        SecurityGroup(
+            "sg",
+            GroupDescription="sg",
+            Tags=Tags(costcentre="existing", Name="sg"),
+        )
+    )
+    parent.stack_template.add_resource(SSMParameter("param", Type="String", Value="x"))
+    child.stack_template.add_resource(LogGroup("logs"))
+    return root, parent, child
+
+
+def tags_to_dict(resource) -> dict:
+    return {tag["Key"]: tag["Value"] for tag in resource.Tags.to_dict()}
+
+
+def test_add_all_tags(fake_settings):
+    root, parent, child = get_stacks()
+    engine = add_all_tags(
+        root, fake_settings(compose_content={"x-tags": {"costcentre": "lambda"}})
+    )
+    assert engine.stacks_count == 2
+    assert engine.tagged_count == 3
+    assert engine.skipped_count == 1
+
+    sg = parent.stack_template.resources["sg"]
+    sg_tags = tags_to_dict(sg)
+    assert sg_tags["costcentre"] == "existing"
+    assert sg_tags["Name"] == "sg"
+    assert sg_tags["compose-x::project-name"] == "test"
+    assert [tag["Key"] for tag in sg.Tags.to_dict()] == sorted(sg_tags)
+
+    logs_tags = tags_to_dict(child.stack_template.resources["logs"])
+    assert logs_tags["costcentre"] == Ref("CostcentreTag").to_dict()
+    assert tags_to_dict(child) == logs_tags
+    assert not hasattr(parent.stack_template.resources["param"], "Tags")
+    assert not hasattr(parent, "Tags")
+    for stack in (parent, child):
+        assert "CostcentreTag" in stack.stack_template.parameters
+    assert "CostcentreTag" not in root.parameters
+
+
+def test_add_all_tags_defaults_only(fake_settings):
+    root, parent, child = get_stacks()
+    add_all_tags(root, fake_settings())
+    logs = child.stack_template.resources["logs"]
+    assert set(tags_to_dict(logs)) == {"compose-x::version", "compose-x::project-name"}
+    assert logs.Tags is not child.Tags
+    assert not child.stack_template.parameters
@@ -0,0 +1,108 @@
+#  -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2020-2025 John Mille<john@compose-x.io>
+
+import json
+
+import pytest
+from troposphere import Equals, GetAtt, If, Output, Ref, Sub
+from troposphere.cloudwatch import Alarm
+from troposphere.ec2 import SecurityGroup, SecurityGroupIngress
+
+from ecs_composex.common.cfn_params import Parameter
+from ecs_composex.common.stacks import ComposeXStack
+from ecs_composex.common.stacks.template_budget import TemplateSize
+from ecs_composex.common.troposphere_tools import build_template
+from ecs_composex.exceptions import TemplateLimitsExceeded
+
+
+def get_stack(rules_count: int) -> ComposeXStack:
+    template = build_template("test", [Parameter("VpcId", Type="AWS::EC2::VPC::Id")])
+    template.add_parameter(Parameter("Cidrs", Type="CommaDelimitedList"))
+    template.add_condition("WithAlarm", Equals(Ref("VpcId"), "vpc-123"))
+    sg = template.add_resource(
+        SecurityGroup("sg", GroupDescription="sg", VpcId=Ref("VpcId"))
+    )
+    for index in range(rules_count):
+        template.add_resource(
+            SecurityGroupIngress(
+                f"ingress{index:03d}",
+                GroupId=GetAtt(sg, "GroupId"),
+                CidrIp=Sub("${AWS::StackName}"),
+                Description=If("WithAlarm", Ref("Cidrs"), Ref("AWS::NoValue")),
+                IpProtocol="tcp",
+                FromPort=index,
+                ToPort=index,
+                DependsOn=[sg],
+            )
+        )
+    template.add_resource(
+        Alarm(
+            "alarm",
+            Condition="WithAlarm",
+            ComparisonOperator="GreaterThanThreshold",
+            EvaluationPeriods=1,
+            Threshold=1,
+            Statistic="Average",
+            MetricName="CPUUtilization",
+            Namespace="AWS/ECS",
+            Period=60,
+        )
+    )
+    template.add_output(Output("Rule", Value=Ref("ingress000")))
+    return ComposeXStack("family", template)
+
+
+def test_template_size():
+    size = TemplateSize("test", {"Resources": {"a": {}}, "Outputs": {}}, 1024 * 1024)
+    assert size.over_budget() == ["size"]
+    assert not size.over_budget(1.0)
+    assert "1/500 resources" in str(size)
+    with pytest.raises(TemplateLimitsExceeded):
+        TemplateSize("test", {}, 1024 * 1024 + 1).check_limits()
+
+
+def test_stack_sharding(fake_settings, monkeypatch):
+    monkeypatch.setattr(TemplateSize, "budget_ratio", 0.1)
+    stack = get_stack(130)
+    stack.render(fake_settings())
+    shards = [
+        resource
+        for resource in stack.stack_template.resources.values()
+        if isinstance(resource, ComposeXStack)
+    ]
+    assert [shard.title for shard in shards] == ["familyShard1", "familyShard2"]
+    assert stack.template_size.resources <= 50
+    assert "ingress000" in stack.stack_template.resources
+    assert "sg" in stack.stack_template.resources
+
+    with open(shards[0].TemplateURL) as template_fd:
+        shard_template = json.load(template_fd)
+    rule = shard_template["Resources"]["ingress001"]
+    assert "DependsOn" not in rule
+    assert rule["Properties"]["GroupId"] == {"Ref": "sgGroupId"}
+    assert rule["Properties"]["CidrIp"] == {"Fn::Sub": "${ParentStackName}"}
+    assert "WithAlarm" in shard_template["Conditions"]
+    assert shard_template["Parameters"]["Cidrs"]["Type"] == "CommaDelimitedList"
+    assert shard_template["Parameters"]["VpcId"]["Type"] == "AWS::EC2::VPC::Id"
+
+    shard = shards[0].to_dict()
+    assert shard["DependsOn"] == ["sg"]
+    assert shard["Properties"]["Parameters"]["sgGroupId"] == {
+        "Fn::GetAtt": ["sg", "GroupId"]
+    }
+    assert shard["Properties"]["Parameters"]["ParentStackName"] == {
+        "Ref": "AWS::StackName"
+    }
+    assert shard["Properties"]["Parameters"]["Cidrs"] == {
+        "Fn::Join": [",", {"Ref": "Cidrs"}]
+    }
+    moved = sum(len(_shard.stack_template.resources) for _shard in shards)
+    assert moved + len(stack.stack_template.resources) == 132 + len(shards)
+
+
+def test_stack_within_budget(fake_settings):
+    stack = get_stack(10)
+    stack.render(fake_settings())
+    assert len(stack.stack_template.resources) == 12
+    assert stack.template_size.resources == 12